@@ -2,33 +2,42 @@
 Admin configuration for accounts app.
 """
 
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils import timezone
+from django_countries import countries as all_countries
 
+from apps.core.db.counts import EstimatedCountPaginator
+from apps.core.exports import ExportMixin, chunks
+from apps.core.search import TrigramSearchMixin, search_filter
+
+from .facets import get_country_counts
+from .forms import UserImportForm
+from .imports import ImportFileError, UserImporter, read_rows
 from .models import User, PasswordResetToken, EmailVerificationToken, OTPToken
 
+# Row errors listed on the import page; the counts cover the rest
+IMPORT_ERRORS_SHOWN = 20
+
 
 class CountryFilter(admin.SimpleListFilter):
-    """Filter by country - shows only countries that have users."""
+    """Filter by country - shows only countries that have users, with their counts."""
     title = _('country')
     parameter_name = 'country'
 
     def lookups(self, request, model_admin):
-        countries = User.objects.exclude(
-            country__isnull=True
-        ).exclude(
-            country=''
-        ).values_list('country', flat=True).distinct()
-        from django_countries import countries as all_countries
+        # Cached counts (apps.accounts.facets) instead of a DISTINCT scan per page view
+        counts = get_country_counts()
         country_dict = dict(all_countries)
-        # Use set to remove duplicates, then sort by country name
-        unique_countries = set(countries)
         return sorted(
-            [(code, country_dict.get(code, code)) for code in unique_countries],
+            [(code, f'{country_dict.get(code, code)} ({users})') for code, users in counts.items()],
             key=lambda x: x[1]
         )
 
@@ -39,7 +48,7 @@ class CountryFilter(admin.SimpleListFilter):
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(TrigramSearchMixin, ExportMixin, BaseUserAdmin):
     """
     Custom User admin interface.
     """
@@ -54,7 +63,11 @@ class UserAdmin(BaseUserAdmin):
     )
     list_filter = ('is_staff', 'is_active', 'is_verified', CountryFilter, 'date_joined')
     search_fields = ('email', 'first_name', 'last_name', 'username')
+    trigram_search_fields = ('email', 'first_name', 'last_name', 'username')
+    prefix_search_fields = ('email',)
     ordering = ('-date_joined',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         (None, {
@@ -98,13 +111,18 @@ class UserAdmin(BaseUserAdmin):
     readonly_fields = ('date_joined', 'last_login', 'terms_accepted_at')
 
     actions = ['mark_as_verified', 'mark_as_unverified']
+    change_list_template = 'admin/accounts/user/change_list.html'
+    export_fields = (
+        'id', 'email', 'first_name', 'last_name', 'phone', 'country', 'date_of_birth',
+        'is_verified', 'is_active', 'is_staff', 'date_joined', 'last_login',
+    )
 
     def profile_picture_preview(self, obj):
         """Display profile picture thumbnail in admin."""
         if obj.profile_picture:
             return format_html(
-                '<img src="{}" style="width: 40px; height: 40px; border-radius: 50%; object-fit: cover;" />',
-                obj.profile_picture.url
+                '<img src="{}" style="width: 40px; height: 40px; border-radius: 50%; object-fit: cover;" loading="lazy" />',
+                obj.get_profile_picture_url('small')
             )
         initials = obj.initials or '?'
         return format_html(
@@ -135,16 +153,113 @@ class UserAdmin(BaseUserAdmin):
         updated = queryset.update(is_verified=False)
         self.message_user(request, _('%(count)d user(s) marked as unverified.') % {'count': updated})
 
+    def get_urls(self):
+        return [
+            path(
+                'import/',
+                self.admin_site.admin_view(self.import_view),
+                name='accounts_user_import',
+            ),
+            *super().get_urls(),
+        ]
+
+    def import_view(self, request):
+        """Bulk import from an uploaded CSV or XLSX file."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = UserImportForm(request.POST or None, request.FILES or None)
+        errors, result = [], None
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+
+            def collect(error):
+                if len(errors) < IMPORT_ERRORS_SHOWN:
+                    errors.append(error)
+
+            try:
+                result = UserImporter(invite=form.cleaned_data['invite'], on_error=collect).run(
+                    read_rows(upload, upload.name)
+                )
+            except ImportFileError as e:
+                form.add_error('file', str(e))
+            else:
+                self.message_user(request, _(
+                    '%(created)d user(s) imported, %(existing)d already existed, %(invalid)d row(s) skipped, '
+                    '%(invited)d invitation(s) sent.'
+                ) % {
+                    'created': result.created,
+                    'existing': result.existing,
+                    'invalid': result.invalid,
+                    'invited': result.invited,
+                })
+                if result.invite_failures:
+                    self.message_user(
+                        request,
+                        _('%(count)d invitation(s) could not be sent.') % {'count': result.invite_failures},
+                        messages.WARNING,
+                    )
+                if not errors:
+                    return redirect('admin:accounts_user_changelist')
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': _('Import users'),
+            'opts': self.model._meta,
+            'form': form,
+            'errors': errors,
+            'result': result,
+        }
+        return TemplateResponse(request, 'admin/accounts/user/import_users.html', context)
+
+
+class UserTokenAdminMixin:
+    """
+    Admin for token models linked to a user.
+
+    Token tables may live on a separate database, so users are prefetched
+    instead of joined, and searching by user fields first looks up the
+    matching user ids (with the indexed filters of apps.core.search).
+    """
+    user_search_fields = ('email',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('user')
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term:
+            return results, may_have_duplicates
+
+        lookup = search_filter(search_term, self.user_search_fields, UserAdmin.prefix_search_fields)
+        user_ids = list(User.objects.filter(lookup).values_list('id', flat=True)[:1000])
+        if user_ids:
+            results |= queryset.filter(user_id__in=user_ids)
+        return results, may_have_duplicates
+
+    def get_export_header(self):
+        return [*super().get_export_header(), 'user_email']
+
+    def get_export_rows(self, queryset):
+        # Emails are looked up per chunk of rows rather than joined
+        user_index = self.export_fields.index('user_id')
+        for chunk in chunks(super().get_export_rows(queryset)):
+            emails = dict(User.objects.filter(id__in={row[user_index] for row in chunk}).values_list('id', 'email'))
+            for row in chunk:
+                yield (*row, emails.get(row[user_index], ''))
+
 
 @admin.register(PasswordResetToken)
-class PasswordResetTokenAdmin(admin.ModelAdmin):
+class PasswordResetTokenAdmin(UserTokenAdminMixin, ExportMixin, admin.ModelAdmin):
     """
     Admin interface for password reset tokens.
     """
     list_display = ('user', 'is_used_status', 'is_valid_status', 'created_at', 'expires_at')
     list_filter = ('created_at', 'expires_at')
-    search_fields = ('user__email', 'token')
+    search_fields = ('token',)
     readonly_fields = ('user', 'token', 'created_at', 'updated_at', 'expires_at', 'used_at')
+    export_fields = ('id', 'user_id', 'created_at', 'expires_at', 'used_at')
 
     def is_used_status(self, obj):
         """Display if token has been used."""
@@ -170,15 +285,17 @@ class PasswordResetTokenAdmin(admin.ModelAdmin):
 
 
 @admin.register(EmailVerificationToken)
-class EmailVerificationTokenAdmin(admin.ModelAdmin):
+class EmailVerificationTokenAdmin(UserTokenAdminMixin, ExportMixin, admin.ModelAdmin):
     """
     Admin interface for email verification tokens.
     """
     list_display = ('user', 'token_preview', 'is_valid_status', 'created_at', 'expires_at', 'used_at')
     list_filter = ('created_at', 'expires_at', 'used_at')
-    search_fields = ('user__email', 'user__first_name', 'user__last_name', 'token')
+    search_fields = ('token',)
+    user_search_fields = ('email', 'first_name', 'last_name')
     readonly_fields = ('user', 'token', 'created_at', 'updated_at', 'expires_at', 'used_at')
     ordering = ('-created_at',)
+    export_fields = ('id', 'user_id', 'created_at', 'expires_at', 'used_at')
 
     fieldsets = (
         (None, {
@@ -232,7 +349,7 @@ class EmailVerificationTokenAdmin(admin.ModelAdmin):
 
 
 @admin.register(OTPToken)
-class OTPTokenAdmin(admin.ModelAdmin):
+class OTPTokenAdmin(ExportMixin, admin.ModelAdmin):
     """
     Admin interface for OTP tokens.
     """
@@ -246,6 +363,8 @@ class OTPTokenAdmin(admin.ModelAdmin):
     )
     list_filter = ('used', 'created_at', 'expires_at')
     search_fields = ('email', 'ip_address')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = (
         'id',
         'email',
@@ -258,6 +377,7 @@ class OTPTokenAdmin(admin.ModelAdmin):
         'ip_address',
     )
     ordering = ('-created_at',)
+    export_fields = ('id', 'email', 'created_at', 'expires_at', 'attempts', 'used', 'ip_address')
 
     fieldsets = (
         (None, {
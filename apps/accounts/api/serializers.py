@@ -8,6 +8,7 @@ from rest_framework import serializers
 
 from apps.accounts.models import User
 from apps.accounts.services import RegistrationService
+from apps.core.api.compiled import CompiledSerializerMixin
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -132,7 +133,7 @@ class ResendVerificationSerializer(serializers.Serializer):
         return value.lower()
 
 
-class LoginUserSerializer(serializers.ModelSerializer):
+class LoginUserSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for user data in login response.
     Includes profile fields (stubbed until FR-1.3 Onboarding).
@@ -140,10 +141,11 @@ class LoginUserSerializer(serializers.ModelSerializer):
 
     profile_completed = serializers.SerializerMethodField()
     language = serializers.SerializerMethodField()
+    profile_picture = serializers.SerializerMethodField()
 
     class Meta:
         model = User
-        fields = ['id', 'email', 'first_name', 'last_name', 'profile_completed', 'language']
+        fields = ['id', 'email', 'first_name', 'last_name', 'profile_completed', 'language', 'profile_picture']
         read_only_fields = fields
 
     def get_profile_completed(self, obj) -> bool:
@@ -162,6 +164,20 @@ class LoginUserSerializer(serializers.ModelSerializer):
         # Stub: Will be replaced with obj.profile.language after FR-1.3
         return 'en'
 
+    def get_profile_picture(self, obj) -> dict | None:
+        """
+        Returns profile picture rendition URLs (small, medium, large).
+        Absolute URLs when request is in context.
+        """
+        if not obj.profile_picture:
+            return None
+        request = self.context.get('request')
+        urls = {}
+        for size in ('small', 'medium', 'large'):
+            url = obj.get_profile_picture_url(size)
+            urls[size] = request.build_absolute_uri(url) if request else url
+        return urls
+
 
 class LoginSerializer(serializers.Serializer):
     """
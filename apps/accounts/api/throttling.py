@@ -2,7 +2,7 @@
 Custom throttling classes for authentication endpoints.
 """
 
-from rest_framework.throttling import AnonRateThrottle
+from apps.core.api.throttling import AnonRateThrottle
 
 
 class RegistrationThrottle(AnonRateThrottle):
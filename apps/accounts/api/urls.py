@@ -2,21 +2,35 @@
 Authentication API URL configuration.
 """
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'accounts_api'
 
+if settings.ASYNC_AUTH_VIEWS:
+    MeView = views.AsyncMeAPIView
+    ForgotPasswordView = views.AsyncForgotPasswordAPIView
+    OTPRequestView = views.AsyncOTPRequestAPIView
+    OTPVerifyView = views.AsyncOTPVerifyAPIView
+else:
+    MeView = views.MeAPIView
+    ForgotPasswordView = views.ForgotPasswordAPIView
+    OTPRequestView = views.OTPRequestAPIView
+    OTPVerifyView = views.OTPVerifyAPIView
+
 urlpatterns = [
     # Password-based authentication
     path('register/', views.RegisterAPIView.as_view(), name='register'),
     path('login/', views.LoginAPIView.as_view(), name='login'),
-    path('me/', views.MeAPIView.as_view(), name='me'),
+    path('me/', MeView.as_view(), name='me'),
+    path('me/profile-picture/upload-url/', views.ProfilePictureUploadURLAPIView.as_view(), name='profile_picture_upload_url'),
+    path('me/profile-picture/complete/', views.ProfilePictureUploadCompleteAPIView.as_view(), name='profile_picture_upload_complete'),
     path('verify-email/<str:token>/', views.VerifyEmailAPIView.as_view(), name='verify_email'),
     path('resend-verification/', views.ResendVerificationAPIView.as_view(), name='resend_verification'),
-    path('forgot-password/', views.ForgotPasswordAPIView.as_view(), name='forgot_password'),
+    path('forgot-password/', ForgotPasswordView.as_view(), name='forgot_password'),
 
     # OTP-based authentication (passwordless)
-    path('otp/request/', views.OTPRequestAPIView.as_view(), name='otp_request'),
-    path('otp/verify/', views.OTPVerifyAPIView.as_view(), name='otp_verify'),
+    path('otp/request/', OTPRequestView.as_view(), name='otp_request'),
+    path('otp/verify/', OTPVerifyView.as_view(), name='otp_verify'),
 ]
@@ -2,6 +2,8 @@
 API Views for authentication.
 """
 
+from dataclasses import asdict
+
 from django.shortcuts import render
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
 from rest_framework import status
@@ -10,6 +12,14 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.core.api.async_views import AsyncAPIView, schema_from
+from apps.core.api.serializers import (
+    DirectUploadCompleteSerializer,
+    DirectUploadRequestSerializer,
+    DirectUploadResponseSerializer,
+)
+from apps.core.api.views import direct_upload_unavailable_response
+from apps.core.direct_uploads import DirectUploadError, DirectUploadService, is_enabled
 from apps.accounts.services import (
     AuthErrorCode,
     EmailVerificationService,
@@ -48,6 +58,7 @@ class RegisterAPIView(APIView):
     """
 
     permission_classes = [AllowAny]
+    query_budget = 5
     throttle_classes = [RegistrationThrottle]
 
     @extend_schema(
@@ -127,6 +138,7 @@ class ResendVerificationAPIView(APIView):
 
     permission_classes = [AllowAny]
     throttle_classes = [ResendVerificationThrottle]
+    query_budget = 3
 
     @extend_schema(
         request=ResendVerificationSerializer,
@@ -182,6 +194,7 @@ class LoginAPIView(APIView):
 
     permission_classes = [AllowAny]
     throttle_classes = [LoginThrottle]
+    query_budget = 2
 
     @extend_schema(
         request=LoginSerializer,
@@ -278,7 +291,7 @@ class LoginAPIView(APIView):
             {
                 'access_token': str(refresh.access_token),
                 'refresh_token': str(refresh),
-                'user': LoginUserSerializer(user).data,
+                'user': LoginUserSerializer.represent(user, context={'request': request}),
             },
             status=status.HTTP_200_OK
         )
@@ -293,6 +306,7 @@ class MeAPIView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    query_budget = 1
 
     @extend_schema(
         responses={
@@ -309,7 +323,128 @@ class MeAPIView(APIView):
     def get(self, request):
         """Return current authenticated user data."""
         return Response(
-            LoginUserSerializer(request.user).data,
+            LoginUserSerializer.represent(request.user, context={'request': request}),
+            status=status.HTTP_200_OK
+        )
+
+
+class ProfilePictureUploadURLAPIView(APIView):
+    """
+    API endpoint to get a presigned URL for uploading a profile picture.
+
+    The file is uploaded directly to object storage, not through Django.
+    """
+
+    permission_classes = [IsAuthenticated]
+    query_budget = 1
+
+    @extend_schema(
+        request=DirectUploadRequestSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=DirectUploadResponseSerializer,
+                description="Presigned POST policy for the upload.",
+            ),
+            400: OpenApiResponse(description="Validation error"),
+            401: OpenApiResponse(description="Not authenticated"),
+            503: OpenApiResponse(description="Object storage not configured"),
+        },
+        summary="Get profile picture upload URL",
+        description=(
+            "Returns a presigned POST policy for uploading a profile picture directly "
+            "to object storage. After the upload, call the completion endpoint with "
+            "the returned upload_token."
+        ),
+        tags=["Authentication"],
+    )
+    def post(self, request):
+        if not is_enabled():
+            return direct_upload_unavailable_response()
+
+        serializer = DirectUploadRequestSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': True,
+                    'message': 'Validation failed',
+                    'details': serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        upload = DirectUploadService.create_upload(
+            prefix='profile_pictures',
+            filename=serializer.validated_data['filename'],
+            content_type=serializer.validated_data['content_type'],
+            purpose='profile_picture',
+            owner_id=request.user.pk,
+            max_size=DirectUploadService.get_max_size('profile_picture'),
+        )
+        return Response(asdict(upload), status=status.HTTP_200_OK)
+
+
+class ProfilePictureUploadCompleteAPIView(APIView):
+    """
+    API endpoint to attach a directly uploaded profile picture.
+
+    Validates the uploaded object and schedules rendition processing.
+    """
+
+    permission_classes = [IsAuthenticated]
+    query_budget = 2
+
+    @extend_schema(
+        request=DirectUploadCompleteSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=LoginUserSerializer,
+                description="Profile picture updated. Renditions are generated in the background.",
+            ),
+            400: OpenApiResponse(description="Invalid upload token or image"),
+            401: OpenApiResponse(description="Not authenticated"),
+            503: OpenApiResponse(description="Object storage not configured"),
+        },
+        summary="Complete profile picture upload",
+        description="Attach the uploaded file as the user's profile picture.",
+        tags=["Authentication"],
+    )
+    def post(self, request):
+        if not is_enabled():
+            return direct_upload_unavailable_response()
+
+        serializer = DirectUploadCompleteSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': True,
+                    'message': 'Validation failed',
+                    'details': serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            name = DirectUploadService.complete_upload(
+                serializer.validated_data['upload_token'],
+                purpose='profile_picture',
+                owner_id=request.user.pk,
+                max_size=DirectUploadService.get_max_size('profile_picture'),
+            )
+        except DirectUploadError as e:
+            return Response(
+                {'error': True, 'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = request.user
+        user.profile_picture.name = name
+        # save() detects the new picture and schedules renditions on commit
+        user.save(update_fields=['profile_picture'])
+
+        return Response(
+            LoginUserSerializer.represent(user, context={'request': request}),
             status=status.HTTP_200_OK
         )
 
@@ -324,6 +459,7 @@ class ForgotPasswordAPIView(APIView):
 
     permission_classes = [AllowAny]
     throttle_classes = [ForgotPasswordThrottle]
+    query_budget = 3
 
     @extend_schema(
         request=ForgotPasswordSerializer,
@@ -384,6 +520,7 @@ class OTPRequestAPIView(APIView):
 
     permission_classes = [AllowAny]
     throttle_classes = [OTPRequestThrottle]
+    query_budget = 3
 
     @extend_schema(
         request=OTPRequestSerializer,
@@ -454,6 +591,7 @@ class OTPVerifyAPIView(APIView):
 
     permission_classes = [AllowAny]
     throttle_classes = [OTPVerifyThrottle]
+    query_budget = 6
 
     @extend_schema(
         request=OTPVerifySerializer,
@@ -558,7 +696,129 @@ class OTPVerifyAPIView(APIView):
             {
                 'access_token': str(refresh.access_token),
                 'refresh_token': str(refresh),
-                'user': LoginUserSerializer(user).data,
+                'user': LoginUserSerializer.represent(user, context={'request': request}),
+                'is_new_user': result.is_new_user,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+# ---------------------------------------------------------------------------
+# Async variants, served instead of the views above when ASYNC_AUTH_VIEWS is
+# enabled (see urls.py). They share permissions, throttles and response
+# formats with the sync views; only the I/O is awaited.
+# ---------------------------------------------------------------------------
+
+class AsyncMeAPIView(AsyncAPIView, MeAPIView):
+    """Async version of MeAPIView."""
+
+    @schema_from(MeAPIView.get)
+    async def get(self, request):
+        return MeAPIView.get(self, request)
+
+
+class AsyncForgotPasswordAPIView(AsyncAPIView, ForgotPasswordAPIView):
+    """Async version of ForgotPasswordAPIView."""
+
+    @schema_from(ForgotPasswordAPIView.post)
+    async def post(self, request):
+        serializer = ForgotPasswordSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': True,
+                    'message': 'Validation failed',
+                    'details': serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        email = serializer.validated_data['email']
+        success, message = await PasswordResetService.arequest_reset(email)
+
+        return Response(
+            {
+                'error': False,
+                'message': message,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class AsyncOTPRequestAPIView(AsyncAPIView, OTPRequestAPIView):
+    """Async version of OTPRequestAPIView."""
+
+    @schema_from(OTPRequestAPIView.post)
+    async def post(self, request):
+        serializer = OTPRequestSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': True,
+                    'message': 'Validation failed',
+                    'details': serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        email = serializer.validated_data['email']
+        ip_address = OTPService.get_client_ip(request)
+
+        success, masked_email = await OTPService.acreate_and_send_otp(email, ip_address)
+
+        return Response(
+            {
+                'message': 'Verification code sent to your email',
+                'email_masked': masked_email,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class AsyncOTPVerifyAPIView(AsyncAPIView, OTPVerifyAPIView):
+    """Async version of OTPVerifyAPIView."""
+
+    @schema_from(OTPVerifyAPIView.post)
+    async def post(self, request):
+        serializer = OTPVerifySerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': True,
+                    'message': 'Validation failed',
+                    'details': serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        email = serializer.validated_data['email']
+        code = serializer.validated_data['code']
+
+        result = await OTPService.averify_otp(email, code)
+
+        if not result.success:
+            response_data = {
+                'error': True,
+                'message': result.error_message,
+                'code': result.error_code.value if result.error_code else None,
+            }
+            if result.attempts_remaining > 0:
+                response_data['attempts_remaining'] = result.attempts_remaining
+
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+        # Token signing and serialization are CPU-only; no database access
+        user = result.user
+        refresh = RefreshToken.for_user(user)
+
+        return Response(
+            {
+                'access_token': str(refresh.access_token),
+                'refresh_token': str(refresh),
+                'user': LoginUserSerializer.represent(user, context={'request': request}),
                 'is_new_user': result.is_new_user,
             },
             status=status.HTTP_200_OK
@@ -7,5 +7,4 @@ class AccountsConfig(AppConfig):
     verbose_name = 'Accounts & Authentication'
     
     def ready(self):
-        # Import signals here if needed in the future
-        pass
\ No newline at end of file
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Cached per-country user counts for the admin country filter.
+
+Counts are kept in the cache, one key per country, so the changelist
+renders the filter with a single get_many() instead of scanning the users
+table on every page view:
+
+- refresh_country_counts() recounts with one GROUP BY query. It runs when
+  the counts are missing or older than COUNTRY_COUNTS_REFRESH_SECONDS, or
+  from the accounts.refresh_country_counts task.
+- User signals adjust the counts with atomic cache.incr() when users are
+  created, deleted or change country, after the transaction commits.
+  Writes that send no signals (queryset.update(), bulk inserts) are picked
+  up by the next refresh; the bulk user import adjusts the counts itself.
+"""
+
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django_countries import countries
+
+from apps.core.metrics import record_cache_lookup
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+COUNT_KEY = 'accounts:country_count:{}'
+# Present while the per-country keys are complete; expires to force a recount
+READY_KEY = 'accounts:country_counts:ready'
+
+
+def _codes() -> list[str]:
+    return [code for code, _ in countries]
+
+
+def refresh_country_counts() -> dict[str, int]:
+    """Recount users per country and store the counts; returns the non-zero ones."""
+    counts = dict(
+        User.objects.order_by().values('country').annotate(users=Count('id')).values_list('country', 'users')
+    )
+    codes = _codes()
+    cache.set_many({COUNT_KEY.format(code): counts.get(code, 0) for code in codes}, timeout=None)
+    cache.set(READY_KEY, True, timeout=getattr(settings, 'COUNTRY_COUNTS_REFRESH_SECONDS', 3600))
+    return {code: counts[code] for code in codes if counts.get(code)}
+
+
+def invalidate_country_counts() -> None:
+    """Recount on the next read, e.g. after writes that sent no signals."""
+    cache.delete(READY_KEY)
+
+
+def get_country_counts() -> dict[str, int]:
+    """Users per country code, for countries that have users."""
+    ready = cache.get(READY_KEY) is not None
+    record_cache_lookup('country_counts', ready)
+    if not ready:
+        return refresh_country_counts()
+    keys = {COUNT_KEY.format(code): code for code in _codes()}
+    values = cache.get_many(list(keys))
+    if len(values) < len(keys):
+        # Some keys were evicted
+        return refresh_country_counts()
+    return {keys[key]: users for key, users in values.items() if users > 0}
+
+
+def adjust_country_counts(changes: Counter) -> None:
+    """Apply per-country deltas, e.g. Counter({'CH': 1, 'DE': -1})."""
+    if cache.get(READY_KEY) is None:
+        # Nothing cached: the next read recounts anyway
+        return
+    for code, delta in changes.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(COUNT_KEY.format(code), delta)
+        except ValueError:
+            # Key evicted, or a code outside the countries list: recount on next read
+            logger.warning("Country count missing, scheduling recount: country=%s", code)
+            invalidate_country_counts()
+            return
@@ -157,4 +157,29 @@ class ResetPasswordForm(DjangoSetPasswordForm):
             'placeholder': _('Confirm new password'),
             'autocomplete': 'new-password',
         }),
-    )
\ No newline at end of file
+    )
+
+
+class UserImportForm(forms.Form):
+    """
+    Admin form for bulk user imports (see apps.accounts.imports).
+    """
+    file = forms.FileField(
+        label=_('CSV or XLSX file'),
+        help_text=_('Header row with an "email" column; optional first_name, last_name, phone, country, date_of_birth.'),
+    )
+    invite = forms.ChoiceField(
+        label=_('Invitation'),
+        choices=[
+            ('verification', _('Email verification link')),
+            ('otp', _('One-time login code')),
+            ('none', _('No email')),
+        ],
+        initial='verification',
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        if not file.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError(_('Upload a .csv or .xlsx file.'))
+        return file
@@ -0,0 +1,370 @@
+"""
+Bulk user import from CSV or XLSX files.
+
+Clinic partners onboard patients in batches of thousands. Instead of
+RegistrationService.register_user() per row (existence query, password
+hash, INSERT, token INSERT and an email each), UserImporter works in
+batches of rows:
+
+- rows are validated in Python; invalid rows are reported with their line
+  number and skipped
+- emails that already exist are found with one query per batch
+- new users are written with COPY (apps.core.db.bulk.bulk_insert), with
+  unusable passwords: they sign in with OTP or set a password via the
+  invitation
+- invitation tokens (email verification links or OTP codes) are inserted
+  the same way, and the emails are handed to the async mailer as a batch;
+  OTP codes keep their usual OTP_EXPIRY_MINUTES lifetime, only links last
+  USER_IMPORT_INVITE_EXPIRY_HOURS
+
+Each batch reads from the primary database: users inserted by COPY are
+looked up right after the commit, before a replica may have them.
+
+Files are read as a stream and only one batch is held in memory, so the
+file size does not matter. Duplicates within a file are caught because
+earlier batches are already in the database when later ones are checked.
+
+Columns (header row, case-insensitive): email (required), first_name,
+last_name, phone, country (ISO code, default CH), date_of_birth (YYYY-MM-DD).
+"""
+
+import csv
+import io
+import logging
+import secrets
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Upper
+from django.utils import timezone
+from django_countries import countries
+
+from apps.core.async_mail import asend_messages, build_message
+from apps.core.db import routers
+from apps.core.db.bulk import bulk_insert
+from apps.core.validators import validate_swiss_phone
+
+from .facets import adjust_country_counts
+from .models import EmailVerificationToken, OTPToken, User
+from .services import EmailVerificationService, OTPService
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('email', 'first_name', 'last_name', 'phone', 'country', 'date_of_birth')
+NAME_MAX_LENGTH = 150
+
+INVITE_NONE = 'none'
+INVITE_VERIFICATION = 'verification'
+INVITE_OTP = 'otp'
+INVITE_CHOICES = (INVITE_NONE, INVITE_VERIFICATION, INVITE_OTP)
+
+USER_FIELDS = [
+    'password', 'is_superuser', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_active',
+    'date_joined', 'is_verified', 'terms_version_accepted', 'privacy_version_accepted', 'phone', 'country',
+    'date_of_birth',
+]
+VERIFICATION_TOKEN_FIELDS = ['created_at', 'updated_at', 'user_id', 'token', 'expires_at', 'used_at']
+OTP_FIELDS = ['id', 'created_at', 'updated_at', 'email', 'code_hash', 'expires_at', 'attempts', 'used', 'ip_address']
+
+
+class ImportFileError(Exception):
+    """The file cannot be read as a user import."""
+
+
+@dataclass
+class RowError:
+    line: int
+    email: str
+    message: str
+
+
+@dataclass
+class UserImportResult:
+    rows: int = 0
+    created: int = 0
+    existing: int = 0
+    invalid: int = 0
+    invited: int = 0
+    invite_failures: int = 0
+
+
+def _normalize_header(header) -> list[str]:
+    names = [str(name or '').strip().lower().replace(' ', '_') for name in header]
+    if 'email' not in names:
+        raise ImportFileError('The header row must contain an "email" column.')
+    return names
+
+
+def read_csv(file) -> Iterator[tuple[int, dict]]:
+    """(line number, row) pairs from a binary CSV file."""
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(text)
+        try:
+            header = _normalize_header(next(reader))
+        except StopIteration:
+            raise ImportFileError('The file is empty.') from None
+        for values in reader:
+            if any(value.strip() for value in values):
+                yield reader.line_num, dict(zip(header, values))
+    finally:
+        # Leave the underlying file open for the caller
+        text.detach()
+
+
+def read_xlsx(file) -> Iterator[tuple[int, dict]]:
+    """(line number, row) pairs from the first sheet of an XLSX file."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('XLSX imports need openpyxl; upload a CSV file instead.') from None
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f'Not a valid XLSX file: {e}') from None
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        try:
+            header = _normalize_header(next(rows))
+        except StopIteration:
+            raise ImportFileError('The file is empty.') from None
+        for line, values in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in values):
+                yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(file, file_name: str) -> Iterator[tuple[int, dict]]:
+    """Rows of a CSV or XLSX file, by extension."""
+    if file_name.lower().endswith('.xlsx'):
+        return read_xlsx(file)
+    if file_name.lower().endswith('.csv'):
+        return read_csv(file)
+    raise ImportFileError('Upload a .csv or .xlsx file.')
+
+
+def clean_row(row: dict) -> dict:
+    """
+    Validate and normalize one row.
+
+    Raises:
+        ValidationError: With a message naming the invalid column.
+    """
+    def text(name):
+        value = row.get(name)
+        return '' if value is None else str(value).strip()
+
+    email = text('email').lower()
+    if not email:
+        raise ValidationError('email: required')
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise ValidationError(f'email: "{email}" is not a valid address') from None
+
+    cleaned = {'email': email}
+    for name in ('first_name', 'last_name'):
+        cleaned[name] = text(name)
+        if len(cleaned[name]) > NAME_MAX_LENGTH:
+            raise ValidationError(f'{name}: longer than {NAME_MAX_LENGTH} characters')
+
+    cleaned['phone'] = text('phone')
+    if cleaned['phone']:
+        try:
+            validate_swiss_phone(cleaned['phone'])
+        except ValidationError as e:
+            raise ValidationError(f'phone: {e.messages[0]}') from None
+
+    country = text('country').upper() or 'CH'
+    if not countries.alpha2(country):
+        raise ValidationError(f'country: "{country}" is not an ISO country code')
+    cleaned['country'] = countries.alpha2(country)
+
+    value = row.get('date_of_birth')
+    if isinstance(value, datetime):
+        value = value.date()
+    elif not isinstance(value, date):
+        value = text('date_of_birth')
+        try:
+            value = date.fromisoformat(value) if value else None
+        except ValueError:
+            raise ValidationError(f'date_of_birth: "{value}" is not a YYYY-MM-DD date') from None
+    cleaned['date_of_birth'] = value
+    return cleaned
+
+
+class UserImporter:
+    """
+    Import users in batches.
+
+    Usage:
+        importer = UserImporter(invite='verification', on_error=report, on_progress=show)
+        result = importer.run(read_rows(file, name))
+    """
+
+    def __init__(
+        self,
+        invite: str = INVITE_VERIFICATION,
+        batch_size: int = 1000,
+        on_error: Callable[[RowError], None] | None = None,
+        on_progress: Callable[[UserImportResult], None] | None = None,
+    ):
+        if invite not in INVITE_CHOICES:
+            raise ValueError(f'invite must be one of {", ".join(INVITE_CHOICES)}')
+        self.invite = invite
+        self.batch_size = batch_size
+        self.on_error = on_error or (lambda error: None)
+        self.on_progress = on_progress or (lambda result: None)
+        self.result = UserImportResult()
+        if invite == INVITE_OTP:
+            # A code logs straight in: keep the normal OTP lifetime, not the invite's
+            self.invite_expiry = timedelta(minutes=getattr(settings, 'OTP_EXPIRY_MINUTES', 1))
+        else:
+            self.invite_expiry = timedelta(hours=getattr(settings, 'USER_IMPORT_INVITE_EXPIRY_HOURS', 72))
+
+    def run(self, rows: Iterable[tuple[int, dict]]) -> UserImportResult:
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            self.import_batch(batch)
+            self.on_progress(self.result)
+        logger.info(
+            "User import finished: rows=%s, created=%s, existing=%s, invalid=%s, invited=%s",
+            self.result.rows, self.result.created, self.result.existing, self.result.invalid, self.result.invited,
+        )
+        return self.result
+
+    def error(self, line: int, email: str, message: str):
+        self.result.invalid += 1
+        self.on_error(RowError(line, email, message))
+
+    def import_batch(self, batch: list[tuple[int, dict]]):
+        # Outside requests nothing pins reads: check and fetch ids on the primary
+        token = routers.use_primary()
+        try:
+            self._import_batch(batch)
+        finally:
+            routers.reset_use_primary(token)
+
+    def _import_batch(self, batch: list[tuple[int, dict]]):
+        self.result.rows += len(batch)
+        valid, lines = {}, {}
+        for line, row in batch:
+            try:
+                cleaned = clean_row(row)
+            except ValidationError as e:
+                self.error(line, str(row.get('email') or '').strip(), e.messages[0])
+                continue
+            if cleaned['email'] in valid:
+                self.error(line, cleaned['email'], 'email: duplicate of an earlier row')
+                continue
+            valid[cleaned['email']] = cleaned
+            lines[cleaned['email']] = line
+
+        try:
+            users, existing = self.insert_new(valid)
+        except IntegrityError:
+            # A user signed up between the existence check and COPY: check again
+            try:
+                users, existing = self.insert_new(valid)
+            except IntegrityError:
+                users, existing = self.insert_one_by_one(valid, lines)
+        self.result.existing += existing
+        self.result.created += len(users)
+        if users:
+            self.send_invitations(users)
+
+    def insert_new(self, valid: dict[str, dict]) -> tuple[list[User], int]:
+        """
+        Insert the rows whose email is not taken yet.
+
+        Returns:
+            Tuple of (new users with ids, number of rows skipped as existing).
+        """
+        # Emails are matched case-insensitively, as at login; UPPER(email) is indexed
+        upper = [email.upper() for email in valid]
+        taken = set()
+        for email, username in User.objects.alias(
+            email_upper=Upper('email'), username_upper=Upper('username')
+        ).filter(Q(email_upper__in=upper) | Q(username_upper__in=upper)).values_list('email', 'username'):
+            taken.update((email.lower(), username.lower()))
+        new = [row for email, row in valid.items() if email not in taken]
+        if not new:
+            return [], len(valid)
+
+        now = timezone.now()
+        # Unusable password: invited users sign in with OTP or set one via the link
+        password = make_password(None)
+        # One transaction for the whole batch, so a retry starts from a clean slate
+        bulk_insert(User, USER_FIELDS, (
+            (
+                password, False, row['email'], row['first_name'], row['last_name'], row['email'], False, True,
+                now, False, '', '', row['phone'], row['country'], row['date_of_birth'],
+            )
+            for row in new
+        ), batch_size=len(new))
+        # COPY sends no signals
+        countries = Counter(row['country'] for row in new)
+        transaction.on_commit(lambda: adjust_country_counts(countries))
+
+        ids = dict(User.objects.filter(email__in=[row['email'] for row in new]).values_list('email', 'id'))
+        users = [
+            User(id=ids[row['email']], email=row['email'], first_name=row['first_name'], last_name=row['last_name'])
+            for row in new
+        ]
+        return users, len(valid) - len(new)
+
+    def insert_one_by_one(self, valid: dict[str, dict], lines: dict[str, int]) -> tuple[list[User], int]:
+        """Insert rows separately, reporting the ones that still conflict."""
+        users, existing = [], 0
+        for email, row in valid.items():
+            try:
+                with transaction.atomic():
+                    inserted, skipped = self.insert_new({email: row})
+            except IntegrityError:
+                self.error(lines[email], email, 'email: conflicts with a user created during the import')
+                continue
+            users += inserted
+            existing += skipped
+        return users, existing
+
+    def send_invitations(self, users: list[User]):
+        if self.invite == INVITE_NONE:
+            return
+        now = timezone.now()
+        expires_at = now + self.invite_expiry
+        messages = []
+        if self.invite == INVITE_VERIFICATION:
+            rows = []
+            hours = int(self.invite_expiry.total_seconds() // 3600)
+            for user in users:
+                token = secrets.token_urlsafe(32)
+                rows.append((now, now, user.id, token, expires_at, None))
+                subject, plain, html = EmailVerificationService.build_verification_email(user, token, hours)
+                messages.append(build_message(subject, plain, settings.DEFAULT_FROM_EMAIL, [user.email], html))
+            bulk_insert(EmailVerificationToken, VERIFICATION_TOKEN_FIELDS, rows)
+        else:
+            rows = []
+            minutes = int(self.invite_expiry.total_seconds() // 60)
+            for user in users:
+                code = OTPToken.generate_code()
+                rows.append((uuid.uuid4(), now, now, user.email, OTPToken.hash_code(code), expires_at, 0, False, None))
+                subject, plain, html = OTPService.build_otp_email(user.email, code, expiry_minutes=minutes)
+                messages.append(build_message(subject, plain, settings.DEFAULT_FROM_EMAIL, [user.email], html))
+            bulk_insert(OTPToken, OTP_FIELDS, rows)
+
+        sent = async_to_sync(asend_messages)(messages)
+        self.result.invited += sent
+        self.result.invite_failures += len(messages) - sent
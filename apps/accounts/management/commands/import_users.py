@@ -0,0 +1,80 @@
+"""
+Management command to bulk import users from a CSV or XLSX file.
+
+See apps.accounts.imports for the columns and how rows are validated,
+deduplicated and inserted. Progress is written after every batch; rows
+that cannot be imported are listed on stderr or written to --errors.
+
+Usage:
+    python manage.py import_users patients.csv
+    python manage.py import_users patients.xlsx --invite otp --errors rejected.csv
+    python manage.py import_users patients.csv --invite none --batch-size 5000
+"""
+
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.imports import INVITE_CHOICES, INVITE_VERIFICATION, ImportFileError, UserImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk import users from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='Path to a .csv or .xlsx file')
+        parser.add_argument(
+            '--invite',
+            choices=INVITE_CHOICES,
+            default=INVITE_VERIFICATION,
+            help='Invitation emailed to new users (default: verification)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows validated, inserted and invited together (default: 1000)'
+        )
+        parser.add_argument(
+            '--errors',
+            help='Write rejected rows to this CSV file instead of stderr'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        errors_file = open(options['errors'], 'w', newline='', encoding='utf-8') if options['errors'] else None
+        try:
+            if errors_file:
+                writer = csv.writer(errors_file)
+                writer.writerow(['line', 'email', 'error'])
+
+                def report(error):
+                    writer.writerow([error.line, error.email, error.message])
+            else:
+                def report(error):
+                    self.stderr.write(f'Line {error.line} ({error.email or "no email"}): {error.message}')
+
+            def progress(result):
+                self.stdout.write(
+                    f'{result.rows} rows: {result.created} created, {result.existing} existing, '
+                    f'{result.invalid} invalid, {result.invited} invited'
+                )
+
+            importer = UserImporter(
+                invite=options['invite'], batch_size=options['batch_size'], on_error=report, on_progress=progress
+            )
+            try:
+                with open(options['file'], 'rb') as file:
+                    result = importer.run(read_rows(file, options['file']))
+            except (ImportFileError, OSError) as e:
+                raise CommandError(str(e))
+        finally:
+            if errors_file:
+                errors_file.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} users ({result.existing} existing, {result.invalid} invalid, '
+            f'{result.invited} invited, {result.invite_failures} invitations failed)'
+        ))
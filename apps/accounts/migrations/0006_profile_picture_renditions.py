@@ -0,0 +1,60 @@
+# Generated by Django 5.0.10 on 2026-10-19 00:24
+
+import apps.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_add_otp_token"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="profile_picture_large",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                help_text="Auto-generated 1024x1024 WebP rendition",
+                null=True,
+                upload_to="profile_pictures/renditions/%Y/%m/",
+                verbose_name="profile picture (large)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="profile_picture_medium",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                help_text="Auto-generated 256x256 WebP rendition",
+                null=True,
+                upload_to="profile_pictures/renditions/%Y/%m/",
+                verbose_name="profile picture (medium)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="profile_picture_small",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                help_text="Auto-generated 64x64 WebP rendition",
+                null=True,
+                upload_to="profile_pictures/renditions/%Y/%m/",
+                verbose_name="profile picture (small)",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="profile_picture",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to="profile_pictures/%Y/%m/",
+                validators=[apps.core.validators.validate_profile_picture],
+                verbose_name="profile picture",
+            ),
+        ),
+    ]
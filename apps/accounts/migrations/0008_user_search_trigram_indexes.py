@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.core.db.operations import PostgresOnly
+
+# Admin user search (apps.core.search.TrigramSearchMixin). Django compiles
+# icontains/istartswith to UPPER("column"::text) LIKE UPPER(...), so the
+# indexes are on UPPER(column): trigram GIN indexes for substring matches
+# and a pattern-ops btree index for email prefixes. They are kept out of
+# Meta.indexes so SQLite table rebuilds do not try to recreate them.
+SEARCH_FIELDS = ['email', 'first_name', 'last_name', 'username']
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0007_auth_token_user_without_constraint"),
+    ]
+
+    operations = [
+        PostgresOnly(TrigramExtension()),
+        *(
+            PostgresOnly(migrations.RunSQL(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_user_{field}_trgm '
+                f'ON accounts_user USING gin (UPPER({field}) gin_trgm_ops)',
+                f'DROP INDEX CONCURRENTLY IF EXISTS accounts_user_{field}_trgm',
+            ))
+            for field in SEARCH_FIELDS
+        ),
+        PostgresOnly(migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_user_email_prefix '
+            'ON accounts_user (UPPER(email) text_pattern_ops)',
+            'DROP INDEX CONCURRENTLY IF EXISTS accounts_user_email_prefix',
+        )),
+    ]
@@ -8,13 +8,13 @@ import uuid
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
 
 from apps.core.models import TimeStampedModel
-from apps.core.validators import validate_swiss_phone
+from apps.core.validators import validate_profile_picture, validate_swiss_phone
 
 
 class User(AbstractUser):
@@ -87,7 +87,34 @@ class User(AbstractUser):
         _('profile picture'),
         upload_to='profile_pictures/%Y/%m/',
         null=True,
-        blank=True
+        blank=True,
+        validators=[validate_profile_picture],
+    )
+
+    # WebP renditions generated off-request from profile_picture
+    profile_picture_small = models.ImageField(
+        _('profile picture (small)'),
+        upload_to='profile_pictures/renditions/%Y/%m/',
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Auto-generated 64x64 WebP rendition')
+    )
+    profile_picture_medium = models.ImageField(
+        _('profile picture (medium)'),
+        upload_to='profile_pictures/renditions/%Y/%m/',
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Auto-generated 256x256 WebP rendition')
+    )
+    profile_picture_large = models.ImageField(
+        _('profile picture (large)'),
+        upload_to='profile_pictures/renditions/%Y/%m/',
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Auto-generated 1024x1024 WebP rendition')
     )
 
     # Use email as username
@@ -101,7 +128,64 @@ class User(AbstractUser):
     
     def __str__(self):
         return self.email
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored picture so save() can detect a new upload
+        # without an extra query.
+        instance._loaded_profile_picture = instance.__dict__.get('profile_picture', models.DEFERRED)
+        # Likewise the country, for the cached country counts (apps.accounts.facets)
+        instance._loaded_country = instance.__dict__.get('country', models.DEFERRED)
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Clear stale renditions when a new profile picture is stored."""
+        update_fields = kwargs.get('update_fields')
+        stale = []
+        if update_fields is None or 'profile_picture' in update_fields:
+            loaded = getattr(self, '_loaded_profile_picture', None)
+            loaded_name = getattr(loaded, 'name', loaded) or ''
+            if loaded is not models.DEFERRED and (self.profile_picture.name or '') != loaded_name:
+                self._profile_picture_changed = True
+                stale = [
+                    (rendition.storage, rendition.name)
+                    for rendition in (self.profile_picture_small, self.profile_picture_medium, self.profile_picture_large)
+                    if rendition
+                ]
+                self.profile_picture_small = None
+                self.profile_picture_medium = None
+                self.profile_picture_large = None
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(update_fields) | {
+                        'profile_picture_small',
+                        'profile_picture_medium',
+                        'profile_picture_large',
+                    }
+        super().save(*args, **kwargs)
+        if 'profile_picture' in self.__dict__:
+            self._loaded_profile_picture = self.profile_picture.name
+        if stale:
+            transaction.on_commit(lambda: self._delete_files(stale))
+
+    @staticmethod
+    def _delete_files(files):
+        """Delete replaced rendition files once the new picture is committed."""
+        for storage, name in files:
+            storage.delete(name)
+
+    def get_profile_picture_url(self, size: str = 'medium'):
+        """
+        Return URL of the requested rendition ('small', 'medium', 'large').
+        Falls back to the original upload until renditions are generated.
+        """
+        if not self.profile_picture:
+            return None
+        rendition = getattr(self, f'profile_picture_{size}', None)
+        if rendition:
+            return rendition.url
+        return self.profile_picture.url
+
     def get_full_name(self):
         """Return the full name."""
         full_name = f"{self.first_name} {self.last_name}".strip()
@@ -124,9 +208,12 @@ class PasswordResetToken(TimeStampedModel):
     Model to store password reset tokens.
     Tokens expire after 1 hour (configurable via settings).
     """
+    # No database constraint: token tables may live on a separate database
+    # (see DATABASE_DEDICATED_MODELS). Tokens are deleted with the user by a signal.
     user = models.ForeignKey(
         User,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name='password_reset_tokens',
         verbose_name=_('user')
     )
@@ -194,15 +281,37 @@ class PasswordResetToken(TimeStampedModel):
         )
         return token
 
+    @classmethod
+    async def acreate_for_user(cls, user):
+        """Async version of create_for_user()."""
+        import secrets
+        from django.utils import timezone
+        from django.conf import settings
+
+        await cls.objects.filter(user=user, used_at__isnull=True).aupdate(
+            used_at=timezone.now()
+        )
+
+        expiry_hours = getattr(settings, 'PASSWORD_RESET_TOKEN_EXPIRY_HOURS', 1)
+
+        return await cls.objects.acreate(
+            user=user,
+            token=secrets.token_urlsafe(32),
+            expires_at=timezone.now() + timezone.timedelta(hours=expiry_hours)
+        )
+
 
 class EmailVerificationToken(TimeStampedModel):
     """
     Model to store email verification tokens.
     Tokens expire after configurable hours (default 24).
     """
+    # No database constraint: token tables may live on a separate database
+    # (see DATABASE_DEDICATED_MODELS). Tokens are deleted with the user by a signal.
     user = models.ForeignKey(
         User,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name='email_verification_tokens',
         verbose_name=_('user')
     )
@@ -392,6 +501,16 @@ class OTPToken(TimeStampedModel):
         self.used = True
         self.save(update_fields=['used', 'updated_at'])
 
+    async def aincrement_attempts(self) -> None:
+        """Async version of increment_attempts()."""
+        self.attempts += 1
+        await self.asave(update_fields=['attempts', 'updated_at'])
+
+    async def amark_used(self) -> None:
+        """Async version of mark_used()."""
+        self.used = True
+        await self.asave(update_fields=['used', 'updated_at'])
+
     @classmethod
     def generate_code(cls) -> str:
         """
@@ -451,6 +570,25 @@ class OTPToken(TimeStampedModel):
 
         return token, code
 
+    @classmethod
+    async def acreate_for_email(cls, email: str, ip_address: str = None) -> tuple['OTPToken', str]:
+        """Async version of create_for_email()."""
+        email = email.lower().strip()
+
+        await cls.objects.filter(email=email, used=False).aupdate(used=True)
+
+        code = cls.generate_code()
+        expiry_minutes = getattr(settings, 'OTP_EXPIRY_MINUTES', 1)
+
+        token = await cls.objects.acreate(
+            email=email,
+            code_hash=cls.hash_code(code),
+            expires_at=timezone.now() + timezone.timedelta(minutes=expiry_minutes),
+            ip_address=ip_address,
+        )
+
+        return token, code
+
     @classmethod
     def get_latest_valid(cls, email: str) -> 'OTPToken':
         """
@@ -467,4 +605,14 @@ class OTPToken(TimeStampedModel):
             email=email,
             used=False,
             expires_at__gt=timezone.now(),
-        ).order_by('-created_at').first()
\ No newline at end of file
+        ).order_by('-created_at').first()
+
+    @classmethod
+    async def aget_latest_valid(cls, email: str) -> 'OTPToken':
+        """Async version of get_latest_valid()."""
+        email = email.lower().strip()
+        return await cls.objects.filter(
+            email=email,
+            used=False,
+            expires_at__gt=timezone.now(),
+        ).order_by('-created_at').afirst()
\ No newline at end of file
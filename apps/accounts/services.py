@@ -10,10 +10,17 @@ from typing import Optional
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.core.mail import send_mail
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 
+from apps.core.async_mail import asend_mail
+from apps.core.db.routers import apin_to_primary, pin_to_primary
+from apps.core.images import render_webp_renditions
+from apps.core.metrics import OTP_REQUESTS, record_login, record_otp_verification, track_email
+from apps.core.tracing import trace_methods
+
 from .models import User, EmailVerificationToken, PasswordResetToken, OTPToken
 
 logger = logging.getLogger(__name__)
@@ -34,6 +41,7 @@ class AuthResult:
     error_code: Optional[AuthErrorCode] = None
 
 
+@trace_methods
 class AuthenticationService:
     """
     Service for handling user authentication business logic.
@@ -55,13 +63,14 @@ class AuthenticationService:
         email = email.lower().strip()
 
         # Log authentication attempt (without password)
-        logger.info(f"Login attempt: email={email}")
+        logger.info("Login attempt: email=%s", email)
 
         # Try to find user
         try:
             user = User.objects.get(email__iexact=email)
         except User.DoesNotExist:
-            logger.warning(f"Login failed: user not found, email={email}")
+            logger.warning("Login failed: user not found, email=%s", email)
+            record_login(AuthErrorCode.INVALID_CREDENTIALS)
             return AuthResult(
                 success=False,
                 error_message="Invalid credentials",
@@ -72,7 +81,8 @@ class AuthenticationService:
         authenticated_user = authenticate(username=email, password=password)
 
         if authenticated_user is None:
-            logger.warning(f"Login failed: invalid password, user_id={user.id}")
+            logger.warning("Login failed: invalid password, user_id=%s", user.id)
+            record_login(AuthErrorCode.INVALID_CREDENTIALS)
             return AuthResult(
                 success=False,
                 error_message="Invalid credentials",
@@ -81,7 +91,8 @@ class AuthenticationService:
 
         # Check if email is verified
         if not user.is_verified:
-            logger.warning(f"Login failed: email not verified, user_id={user.id}")
+            logger.warning("Login failed: email not verified, user_id=%s", user.id)
+            record_login(AuthErrorCode.EMAIL_NOT_VERIFIED)
             return AuthResult(
                 success=False,
                 user=user,
@@ -89,10 +100,12 @@ class AuthenticationService:
                 error_code=AuthErrorCode.EMAIL_NOT_VERIFIED,
             )
 
-        logger.info(f"Login successful: user_id={user.id}")
+        logger.info("Login successful: user_id=%s", user.id)
+        record_login()
         return AuthResult(success=True, user=user)
 
 
+@trace_methods
 class RegistrationService:
     """
     Service for handling user registration business logic.
@@ -143,10 +156,11 @@ class RegistrationService:
         # Send verification email
         EmailVerificationService.send_verification(user)
 
-        logger.info(f"User registered: user_id={user.id}")
+        logger.info("User registered: user_id=%s", user.id)
         return user
 
 
+@trace_methods
 class EmailVerificationService:
     """
     Service for handling email verification business logic.
@@ -166,6 +180,30 @@ class EmailVerificationService:
         """
         return EmailVerificationToken.create_for_user(user)
 
+    @staticmethod
+    def build_verification_email(user: User, token: str, expiry_hours: Optional[int] = None) -> tuple[str, str, str]:
+        """
+        Render the verification email.
+
+        Args:
+            user: User instance (only names and email are used)
+            token: Verification token string
+            expiry_hours: Token lifetime shown in the email (default: EMAIL_VERIFICATION_TOKEN_EXPIRY_HOURS)
+
+        Returns:
+            Tuple of (subject, plain_message, html_message).
+        """
+        if expiry_hours is None:
+            expiry_hours = getattr(settings, 'EMAIL_VERIFICATION_TOKEN_EXPIRY_HOURS', 24)
+        base_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
+        context = {
+            'user': user,
+            'verification_url': f"{base_url}/api/v1/auth/verify-email/{token}/",
+            'expiry_hours': expiry_hours,
+        }
+        html_message = render_to_string('accounts/emails/verification_email.html', context)
+        return 'Verify your Altea account', strip_tags(html_message), html_message
+
     @staticmethod
     def send_verification(user: User, request=None) -> bool:
         """
@@ -179,37 +217,22 @@ class EmailVerificationService:
             True if email was sent successfully
         """
         token = EmailVerificationService.create_token(user)
-
-        # Build verification URL
-        base_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
-        verification_url = f"{base_url}/api/v1/auth/verify-email/{token.token}/"
-
-        # Render email template
-        context = {
-            'user': user,
-            'verification_url': verification_url,
-            'expiry_hours': getattr(settings, 'EMAIL_VERIFICATION_TOKEN_EXPIRY_HOURS', 24),
-        }
-
-        html_message = render_to_string(
-            'accounts/emails/verification_email.html',
-            context
-        )
-        plain_message = strip_tags(html_message)
+        subject, plain_message, html_message = EmailVerificationService.build_verification_email(user, token.token)
 
         try:
-            send_mail(
-                subject='Verify your Altea account',
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-            logger.info(f"Verification email sent: user_id={user.id}")
+            with track_email('verification'):
+                send_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[user.email],
+                    html_message=html_message,
+                    fail_silently=False,
+                )
+            logger.info("Verification email sent: user_id=%s", user.id)
             return True
         except Exception as e:
-            logger.error(f"Failed to send verification email: user_id={user.id}, error={e}")
+            logger.error("Failed to send verification email: user_id=%s, error=%s", user.id, e)
             return False
 
     @staticmethod
@@ -223,10 +246,9 @@ class EmailVerificationService:
         Returns:
             Tuple of (success, message, user)
         """
+        # No select_related: tokens may live on a separate database
         try:
-            token = EmailVerificationToken.objects.select_related('user').get(
-                token=token_string
-            )
+            token = EmailVerificationToken.objects.get(token=token_string)
         except EmailVerificationToken.DoesNotExist:
             return False, 'Invalid verification link.', None
 
@@ -240,8 +262,10 @@ class EmailVerificationService:
         token.mark_used()
         token.user.is_verified = True
         token.user.save(update_fields=['is_verified'])
+        # Verification links are opened with GET; pin explicitly for read-your-writes
+        pin_to_primary(token.user.id)
 
-        logger.info(f"Email verified: user_id={token.user.id}")
+        logger.info("Email verified: user_id=%s", token.user.id)
         return True, 'Email verified successfully!', token.user
 
     @staticmethod
@@ -273,6 +297,7 @@ class EmailVerificationService:
             return False, 'Failed to send verification email. Please try again later.'
 
 
+@trace_methods
 class PasswordResetService:
     """
     Service for handling password reset business logic.
@@ -345,33 +370,52 @@ class PasswordResetService:
             user = User.objects.get(email__iexact=email)
         except User.DoesNotExist:
             # Don't reveal if email exists - security best practice
-            logger.info(f"Password reset requested for non-existent email: {email}")
+            logger.info("Password reset requested for non-existent email: %s", email)
             return True, 'If an account exists with this email, you will receive password reset instructions.'
 
         # Send password reset email
         success = PasswordResetService.send_reset_email(user)
 
         if success:
-            logger.info(f"Password reset email sent: user_id={user.id}")
+            logger.info("Password reset email sent: user_id=%s", user.id)
         else:
-            logger.error(f"Failed to send password reset email: user_id={user.id}")
+            logger.error("Failed to send password reset email: user_id=%s", user.id)
 
         # Always return success message (security)
         return True, 'If an account exists with this email, you will receive password reset instructions.'
 
     @staticmethod
-    def send_reset_email(user: User) -> bool:
+    async def arequest_reset(email: str) -> tuple[bool, str]:
+        """Async version of request_reset()."""
+        email = email.lower().strip()
+
+        try:
+            user = await User.objects.aget(email__iexact=email)
+        except User.DoesNotExist:
+            # Don't reveal if email exists - security best practice
+            logger.info("Password reset requested for non-existent email: %s", email)
+            return True, 'If an account exists with this email, you will receive password reset instructions.'
+
+        success = await PasswordResetService.asend_reset_email(user)
+
+        if success:
+            logger.info("Password reset email sent: user_id=%s", user.id)
+        else:
+            logger.error("Failed to send password reset email: user_id=%s", user.id)
+
+        return True, 'If an account exists with this email, you will receive password reset instructions.'
+
+    @staticmethod
+    def build_reset_email(user: User) -> tuple[str, str, str]:
         """
-        Create token and send password reset email.
+        Render the password reset email for a user.
 
         Args:
             user: User instance
 
         Returns:
-            True if email was sent successfully
+            Tuple of (subject, plain_message, html_message)
         """
-        token = PasswordResetToken.create_for_user(user)
-
         # Build reset URL (uses Django's web view)
         base_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
 
@@ -402,20 +446,55 @@ class PasswordResetService:
             'accounts/emails/password_reset_email.html',
             context
         )
-        plain_message = strip_tags(html_message)
+        return content['subject'], strip_tags(html_message), html_message
+
+    @staticmethod
+    def send_reset_email(user: User) -> bool:
+        """
+        Create token and send password reset email.
+
+        Args:
+            user: User instance
+
+        Returns:
+            True if email was sent successfully
+        """
+        PasswordResetToken.create_for_user(user)
+        subject, plain_message, html_message = PasswordResetService.build_reset_email(user)
 
         try:
-            send_mail(
-                subject=content['subject'],
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
-            )
+            with track_email('password_reset'):
+                send_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[user.email],
+                    html_message=html_message,
+                    fail_silently=False,
+                )
+            return True
+        except Exception as e:
+            logger.error("Failed to send password reset email: user_id=%s, error=%s", user.id, e)
+            return False
+
+    @staticmethod
+    async def asend_reset_email(user: User) -> bool:
+        """Async version of send_reset_email()."""
+        await PasswordResetToken.acreate_for_user(user)
+        subject, plain_message, html_message = PasswordResetService.build_reset_email(user)
+
+        try:
+            with track_email('password_reset'):
+                await asend_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[user.email],
+                    html_message=html_message,
+                )
             return True
         except Exception as e:
-            logger.error(f"Failed to send password reset email: user_id={user.id}, error={e}")
+            logger.error("Failed to send password reset email: user_id=%s, error=%s", user.id, e)
             return False
 
 
@@ -439,6 +518,7 @@ class OTPResult:
     attempts_remaining: int = 0
 
 
+@trace_methods
 class OTPService:
     """
     Service for handling OTP-based authentication business logic.
@@ -551,6 +631,17 @@ class OTPService:
             pass
         return 'en'
 
+    @staticmethod
+    async def aget_language_for_email(email: str) -> str:
+        """Async version of get_language_for_email()."""
+        try:
+            user = await User.objects.aget(email__iexact=email)
+            if hasattr(user, 'profile') and user.profile:
+                return user.profile.language or 'en'
+        except User.DoesNotExist:
+            pass
+        return 'en'
+
     @staticmethod
     def create_and_send_otp(email: str, ip_address: str = None) -> tuple[bool, str]:
         """
@@ -573,7 +664,7 @@ class OTPService:
             token, code = OTPToken.create_for_email(email, ip_address)
 
             # Log OTP code in debug mode (controlled by logging config, not DEBUG setting)
-            logger.debug(f"OTP CODE for {email}: {code}")
+            logger.debug("OTP CODE for %s: %s", email, code)
 
             # Get language for email
             language = OTPService.get_language_for_email(email)
@@ -582,31 +673,62 @@ class OTPService:
             success = OTPService.send_otp_email(email, code, language)
 
             if success:
-                logger.info(f"OTP sent: email={masked}, ip={ip_address}")
+                logger.info("OTP sent: email=%s, ip=%s", masked, ip_address)
             else:
-                logger.error(f"Failed to send OTP: email={masked}")
+                logger.error("Failed to send OTP: email=%s", masked)
+            OTP_REQUESTS.labels(outcome='sent' if success else 'send_failed').inc()
 
         except Exception as e:
-            logger.error(f"Error creating OTP: email={masked}, error={e}")
+            logger.error("Error creating OTP: email=%s, error=%s", masked, e)
+            OTP_REQUESTS.labels(outcome='error').inc()
 
         # Always return success to prevent email enumeration
         return True, masked
 
     @staticmethod
-    def send_otp_email(email: str, code: str, language: str = 'en') -> bool:
+    async def acreate_and_send_otp(email: str, ip_address: str = None) -> tuple[bool, str]:
+        """Async version of create_and_send_otp()."""
+        email = email.lower().strip()
+        masked = OTPService.mask_email(email)
+
+        try:
+            token, code = await OTPToken.acreate_for_email(email, ip_address)
+            logger.debug("OTP CODE for %s: %s", email, code)
+
+            language = await OTPService.aget_language_for_email(email)
+            success = await OTPService.asend_otp_email(email, code, language)
+
+            if success:
+                logger.info("OTP sent: email=%s, ip=%s", masked, ip_address)
+            else:
+                logger.error("Failed to send OTP: email=%s", masked)
+            OTP_REQUESTS.labels(outcome='sent' if success else 'send_failed').inc()
+
+        except Exception as e:
+            logger.error("Error creating OTP: email=%s, error=%s", masked, e)
+            OTP_REQUESTS.labels(outcome='error').inc()
+
+        return True, masked
+
+    @staticmethod
+    def build_otp_email(
+        email: str, code: str, language: str = 'en', expiry_minutes: Optional[int] = None
+    ) -> tuple[str, str, str]:
         """
-        Send OTP code via email.
+        Render the OTP email.
 
         Args:
             email: Recipient email address.
             code: The 6-digit OTP code.
             language: Language code for email content.
+            expiry_minutes: Code lifetime shown in the email (default: OTP_EXPIRY_MINUTES).
 
         Returns:
-            True if email was sent successfully.
+            Tuple of (subject, plain_message, html_message).
         """
         content = OTPService.EMAIL_CONTENT.get(language, OTPService.EMAIL_CONTENT['en'])
-        expiry_minutes = getattr(settings, 'OTP_EXPIRY_MINUTES', 1)
+        if expiry_minutes is None:
+            expiry_minutes = getattr(settings, 'OTP_EXPIRY_MINUTES', 1)
 
         context = {
             'code': code,
@@ -619,22 +741,110 @@ class OTPService:
             'accounts/emails/otp_code.html',
             context
         )
-        plain_message = strip_tags(html_message)
+        return content['subject'], strip_tags(html_message), html_message
+
+    @staticmethod
+    def send_otp_email(email: str, code: str, language: str = 'en') -> bool:
+        """
+        Send OTP code via email.
+
+        Args:
+            email: Recipient email address.
+            code: The 6-digit OTP code.
+            language: Language code for email content.
+
+        Returns:
+            True if email was sent successfully.
+        """
+        subject, plain_message, html_message = OTPService.build_otp_email(email, code, language)
 
         try:
-            send_mail(
-                subject=content['subject'],
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                html_message=html_message,
-                fail_silently=False,
-            )
+            with track_email('otp'):
+                send_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[email],
+                    html_message=html_message,
+                    fail_silently=False,
+                )
+            return True
+        except Exception as e:
+            logger.error("Failed to send OTP email: email=%s, error=%s", email, e)
+            return False
+
+    @staticmethod
+    async def asend_otp_email(email: str, code: str, language: str = 'en') -> bool:
+        """Async version of send_otp_email()."""
+        subject, plain_message, html_message = OTPService.build_otp_email(email, code, language)
+
+        try:
+            with track_email('otp'):
+                await asend_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[email],
+                    html_message=html_message,
+                )
             return True
         except Exception as e:
-            logger.error(f"Failed to send OTP email: email={email}, error={e}")
+            logger.error("Failed to send OTP email: email=%s, error=%s", email, e)
             return False
 
+    @staticmethod
+    def _missing_token_result(latest_token: Optional[OTPToken], masked: str) -> OTPResult:
+        """Build the failure result when no valid OTP token exists."""
+        if latest_token and latest_token.is_expired:
+            logger.warning("OTP verification failed: expired, email=%s", masked)
+            record_otp_verification(OTPErrorCode.OTP_EXPIRED)
+            return OTPResult(
+                success=False,
+                error_message='Code expired. Request a new one.',
+                error_code=OTPErrorCode.OTP_EXPIRED,
+            )
+
+        if latest_token and latest_token.is_max_attempts_reached:
+            logger.warning("OTP verification failed: max attempts, email=%s", masked)
+            record_otp_verification(OTPErrorCode.MAX_ATTEMPTS)
+            return OTPResult(
+                success=False,
+                error_message='Too many attempts. Request a new code.',
+                error_code=OTPErrorCode.MAX_ATTEMPTS,
+            )
+
+        logger.warning("OTP verification failed: no valid token, email=%s", masked)
+        record_otp_verification(OTPErrorCode.NO_OTP_FOUND)
+        return OTPResult(
+            success=False,
+            error_message='No valid code found. Request a new one.',
+            error_code=OTPErrorCode.NO_OTP_FOUND,
+        )
+
+    @staticmethod
+    def _invalid_code_result(remaining: int, masked: str) -> OTPResult:
+        """Build the failure result for a wrong code."""
+        logger.warning(
+            "OTP verification failed: invalid code, email=%s, attempts_remaining=%s", masked, remaining
+        )
+
+        if remaining <= 0:
+            record_otp_verification(OTPErrorCode.MAX_ATTEMPTS)
+            return OTPResult(
+                success=False,
+                error_message='Too many attempts. Request a new code.',
+                error_code=OTPErrorCode.MAX_ATTEMPTS,
+                attempts_remaining=0,
+            )
+
+        record_otp_verification(OTPErrorCode.INVALID_CODE)
+        return OTPResult(
+            success=False,
+            error_message=f'Invalid code. {remaining} attempt(s) remaining.',
+            error_code=OTPErrorCode.INVALID_CODE,
+            attempts_remaining=remaining,
+        )
+
     @staticmethod
     def verify_otp(email: str, code: str) -> OTPResult:
         """
@@ -663,54 +873,12 @@ class OTPService:
                 email=email,
                 used=False,
             ).order_by('-created_at').first()
-
-            if expired_token and expired_token.is_expired:
-                logger.warning(f"OTP verification failed: expired, email={masked}")
-                return OTPResult(
-                    success=False,
-                    error_message='Code expired. Request a new one.',
-                    error_code=OTPErrorCode.OTP_EXPIRED,
-                )
-
-            if expired_token and expired_token.is_max_attempts_reached:
-                logger.warning(f"OTP verification failed: max attempts, email={masked}")
-                return OTPResult(
-                    success=False,
-                    error_message='Too many attempts. Request a new code.',
-                    error_code=OTPErrorCode.MAX_ATTEMPTS,
-                )
-
-            logger.warning(f"OTP verification failed: no valid token, email={masked}")
-            return OTPResult(
-                success=False,
-                error_message='No valid code found. Request a new one.',
-                error_code=OTPErrorCode.NO_OTP_FOUND,
-            )
+            return OTPService._missing_token_result(expired_token, masked)
 
         # Verify the code
         if not token.verify_code(code):
             token.increment_attempts()
-            remaining = token.attempts_remaining
-
-            logger.warning(
-                f"OTP verification failed: invalid code, email={masked}, "
-                f"attempts_remaining={remaining}"
-            )
-
-            if remaining <= 0:
-                return OTPResult(
-                    success=False,
-                    error_message='Too many attempts. Request a new code.',
-                    error_code=OTPErrorCode.MAX_ATTEMPTS,
-                    attempts_remaining=0,
-                )
-
-            return OTPResult(
-                success=False,
-                error_message=f'Invalid code. {remaining} attempt(s) remaining.',
-                error_code=OTPErrorCode.INVALID_CODE,
-                attempts_remaining=remaining,
-            )
+            return OTPService._invalid_code_result(token.attempts_remaining, masked)
 
         # Code is valid - mark as used
         token.mark_used()
@@ -729,10 +897,61 @@ class OTPService:
             user.is_verified = True
             user.save(update_fields=['is_verified'])
 
+        # The client is anonymous until it uses the returned tokens
+        pin_to_primary(user.id)
+
+        if created:
+            logger.info("New user created via OTP: user_id=%s", user.id)
+        else:
+            logger.info("Existing user logged in via OTP: user_id=%s", user.id)
+        record_otp_verification()
+
+        return OTPResult(
+            success=True,
+            user=user,
+            is_new_user=created,
+        )
+
+    @staticmethod
+    async def averify_otp(email: str, code: str) -> OTPResult:
+        """Async version of verify_otp()."""
+        email = email.lower().strip()
+        masked = OTPService.mask_email(email)
+
+        token = await OTPToken.aget_latest_valid(email)
+
+        if not token:
+            expired_token = await OTPToken.objects.filter(
+                email=email,
+                used=False,
+            ).order_by('-created_at').afirst()
+            return OTPService._missing_token_result(expired_token, masked)
+
+        if not token.verify_code(code):
+            await token.aincrement_attempts()
+            return OTPService._invalid_code_result(token.attempts_remaining, masked)
+
+        await token.amark_used()
+
+        user, created = await User.objects.aget_or_create(
+            email=email,
+            defaults={
+                'username': email,
+                'is_verified': True,
+            }
+        )
+
+        if not created and not user.is_verified:
+            user.is_verified = True
+            await user.asave(update_fields=['is_verified'])
+
+        await apin_to_primary(user.id)
+
         if created:
-            logger.info(f"New user created via OTP: user_id={user.id}")
+            logger.info("New user created via OTP: user_id=%s", user.id)
         else:
-            logger.info(f"Existing user logged in via OTP: user_id={user.id}")
+            logger.info("Existing user logged in via OTP: user_id=%s", user.id)
+        record_otp_verification()
 
         return OTPResult(
             success=True,
@@ -755,6 +974,90 @@ class OTPService:
         ).delete()
 
         if deleted_count > 0:
-            logger.info(f"Cleaned up {deleted_count} expired OTP tokens")
+            logger.info("Cleaned up %s expired OTP tokens", deleted_count)
 
         return deleted_count
+
+
+@trace_methods
+class ProfilePictureService:
+    """
+    Service for generating profile picture renditions.
+
+    Renditions are produced after the upload transaction commits, either
+    inline or in a Celery worker (PROFILE_PICTURE_RENDITIONS_ASYNC).
+    """
+
+    RENDITION_FIELDS = {
+        'small': 'profile_picture_small',
+        'medium': 'profile_picture_medium',
+        'large': 'profile_picture_large',
+    }
+
+    @staticmethod
+    def schedule_renditions(user: User) -> None:
+        """
+        Schedule rendition generation once the current transaction commits.
+
+        Args:
+            user: User whose profile picture changed.
+        """
+        user_id = user.pk
+
+        def dispatch():
+            if getattr(settings, 'PROFILE_PICTURE_RENDITIONS_ASYNC', False):
+                from .tasks import process_profile_picture_task
+                process_profile_picture_task.delay(user_id)
+            else:
+                ProfilePictureService.generate_renditions(user_id)
+
+        transaction.on_commit(dispatch)
+
+    @staticmethod
+    def generate_renditions(user_id: int) -> bool:
+        """
+        Generate WebP renditions for the user's current profile picture.
+
+        Args:
+            user_id: ID of the user.
+
+        Returns:
+            True if renditions were generated.
+        """
+        try:
+            user = User.objects.get(pk=user_id)
+        except User.DoesNotExist:
+            return False
+
+        if not user.profile_picture:
+            return False
+
+        sizes = getattr(settings, 'PROFILE_PICTURE_RENDITIONS', {'small': 64, 'medium': 256, 'large': 1024})
+        quality = getattr(settings, 'PROFILE_PICTURE_RENDITION_QUALITY', 82)
+        source_name = user.profile_picture.name
+
+        try:
+            with user.profile_picture.open('rb') as source:
+                renditions = render_webp_renditions(source, sizes, quality=quality)
+        except Exception as e:
+            logger.error("Failed to generate profile picture renditions: user_id=%s, error=%s", user_id, e)
+            return False
+
+        base_name = source_name.split('/')[-1].rsplit('.', 1)[0]
+        update_fields = []
+        for size, content in renditions.items():
+            field_name = ProfilePictureService.RENDITION_FIELDS.get(size)
+            if not field_name:
+                continue
+            getattr(user, field_name).save(f"{base_name}_{size}.webp", content, save=False)
+            update_fields.append(field_name)
+
+        # Picture may have been replaced while we were rendering
+        if User.objects.filter(pk=user_id, profile_picture=source_name).exists():
+            user.save(update_fields=update_fields)
+            logger.info("Profile picture renditions generated: user_id=%s", user_id)
+            return True
+
+        for field_name in update_fields:
+            getattr(user, field_name).delete(save=False)
+        return False
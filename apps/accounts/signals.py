@@ -0,0 +1,61 @@
+"""
+Signal handlers for accounts app.
+"""
+
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .facets import adjust_country_counts
+from .models import EmailVerificationToken, PasswordResetToken, User
+
+
+@receiver(post_save, sender=User)
+def schedule_profile_picture_renditions(sender, instance, **kwargs):
+    """Generate renditions when a new profile picture was stored."""
+    if not instance.__dict__.pop('_profile_picture_changed', False):
+        return
+    if not instance.profile_picture:
+        return
+
+    from .services import ProfilePictureService
+
+    ProfilePictureService.schedule_renditions(instance)
+
+
+@receiver(post_delete, sender=User)
+def delete_auth_tokens(sender, instance, **kwargs):
+    """
+    Delete the user's tokens.
+
+    Replaces ON DELETE CASCADE, which cannot span databases when the token
+    tables live on a dedicated database (DATABASE_DEDICATED_MODELS).
+    """
+    PasswordResetToken.objects.filter(user_id=instance.pk).delete()
+    EmailVerificationToken.objects.filter(user_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=User)
+def count_user_country(sender, instance, created, update_fields=None, using=None, **kwargs):
+    """Keep the cached country counts in step with new users and country changes."""
+    if update_fields is not None and 'country' not in update_fields:
+        return
+    country = str(instance.country)
+    if created:
+        changes = Counter({country: 1})
+    else:
+        loaded = getattr(instance, '_loaded_country', models.DEFERRED)
+        if loaded is models.DEFERRED or str(loaded) == country:
+            return
+        changes = Counter({country: 1, str(loaded): -1})
+    instance._loaded_country = country
+    transaction.on_commit(lambda: adjust_country_counts(changes), using=using)
+
+
+@receiver(post_delete, sender=User)
+def uncount_user_country(sender, instance, using=None, **kwargs):
+    """Remove a deleted user from the cached country counts."""
+    changes = Counter({str(instance.country): -1})
+    transaction.on_commit(lambda: adjust_country_counts(changes), using=using)
@@ -27,12 +27,12 @@ def send_otp_email_task(email: str, code: str, language: str = 'en') -> bool:
     try:
         success = OTPService.send_otp_email(email, code, language)
         if success:
-            logger.info(f"OTP email sent asynchronously: email={email}")
+            logger.info("OTP email sent asynchronously: email=%s", email)
         else:
-            logger.error(f"Failed to send OTP email asynchronously: email={email}")
+            logger.error("Failed to send OTP email asynchronously: email=%s", email)
         return success
     except Exception as e:
-        logger.error(f"Error sending OTP email asynchronously: email={email}, error={e}")
+        logger.error("Error sending OTP email asynchronously: email=%s, error=%s", email, e)
         return False
 
 
@@ -52,5 +52,46 @@ def cleanup_expired_otp_tokens_task() -> int:
         deleted_count = OTPService.cleanup_expired_tokens()
         return deleted_count
     except Exception as e:
-        logger.error(f"Error cleaning up expired OTP tokens: error={e}")
+        logger.error("Error cleaning up expired OTP tokens: error=%s", e)
         return 0
+
+
+@shared_task(name='accounts.refresh_country_counts')
+def refresh_country_counts_task() -> int:
+    """
+    Recount users per country for the admin country filter.
+
+    Optional: counts are kept current by signals and recounted on read
+    every COUNTRY_COUNTS_REFRESH_SECONDS. Scheduling this via Celery Beat
+    at a shorter interval keeps the recount out of admin requests.
+
+    Returns:
+        Number of countries with users.
+    """
+    from apps.accounts.facets import refresh_country_counts
+
+    try:
+        return len(refresh_country_counts())
+    except Exception as e:
+        logger.error("Error refreshing country counts: error=%s", e)
+        return 0
+
+
+@shared_task(name='accounts.process_profile_picture')
+def process_profile_picture_task(user_id: int) -> bool:
+    """
+    Generate WebP renditions for a newly uploaded profile picture.
+
+    Args:
+        user_id: ID of the user.
+
+    Returns:
+        True if renditions were generated.
+    """
+    from apps.accounts.services import ProfilePictureService
+
+    try:
+        return ProfilePictureService.generate_renditions(user_id)
+    except Exception as e:
+        logger.error("Error processing profile picture: user_id=%s, error=%s", user_id, e)
+        return False
@@ -12,9 +12,10 @@ from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
 from apps.accounts.models import User, EmailVerificationToken
+from apps.core.testing import QueryBudgetTestMixin
 
 
-class RegisterAPIViewTests(APITestCase):
+class RegisterAPIViewTests(QueryBudgetTestMixin, APITestCase):
     """Tests for POST /api/v1/auth/register/"""
 
     def setUp(self):
@@ -252,7 +253,7 @@ class VerifyEmailAPIViewTests(APITestCase):
         self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
 
 
-class ResendVerificationAPIViewTests(APITestCase):
+class ResendVerificationAPIViewTests(QueryBudgetTestMixin, APITestCase):
     """Tests for POST /api/v1/auth/resend-verification/"""
 
     def setUp(self):
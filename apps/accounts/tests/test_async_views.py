@@ -0,0 +1,257 @@
+"""
+Tests for the async authentication views.
+
+Test Structure:
+- AsyncOTPViewTests: OTP request/verify through AsyncOTPRequestAPIView and AsyncOTPVerifyAPIView
+- AsyncForgotPasswordViewTests: Password reset request
+- AsyncMeViewTests: JWT authentication resolved with the async ORM
+- AsyncThrottleTests: Throttles evaluated through the async cache
+- AsyncServiceTests: Async service methods match their sync counterparts
+"""
+
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.api.views import (
+    AsyncForgotPasswordAPIView,
+    AsyncMeAPIView,
+    AsyncOTPRequestAPIView,
+    AsyncOTPVerifyAPIView,
+)
+from apps.accounts.models import OTPToken, PasswordResetToken, User
+from apps.accounts.services import OTPErrorCode, OTPService, PasswordResetService
+
+acreate_user = sync_to_async(User.objects.create_user)
+
+
+class AsyncViewTestCase(TestCase):
+    """Call async views directly with an AsyncRequestFactory."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+
+    async def post(self, view_class, data, **extra):
+        request = self.factory.post('/', data, content_type='application/json', **extra)
+        response = await view_class.as_view()(request)
+        response.render()
+        return response
+
+    async def get(self, view_class, **extra):
+        request = self.factory.get('/', **extra)
+        response = await view_class.as_view()(request)
+        response.render()
+        return response
+
+
+class AsyncOTPViewTests(AsyncViewTestCase):
+    """Tests for the async OTP views."""
+
+    async def test_request_sends_email(self):
+        """OTP request stores a token and sends the code by email."""
+        response = await self.post(AsyncOTPRequestAPIView, {'email': 'user@example.com'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email_masked'], 'u***@e***.com')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['user@example.com'])
+        self.assertTrue(await OTPToken.objects.filter(email='user@example.com').aexists())
+
+    async def test_request_invalid_email(self):
+        """Invalid email returns the standard validation error."""
+        response = await self.post(AsyncOTPRequestAPIView, {'email': 'not-an-email'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['error'])
+        self.assertIn('email', response.data['details'])
+
+    async def test_request_hides_mail_failures(self):
+        """A failing mail server still returns success."""
+        with patch('apps.accounts.services.asend_mail', AsyncMock(side_effect=OSError)):
+            response = await self.post(AsyncOTPRequestAPIView, {'email': 'user@example.com'})
+
+        self.assertEqual(response.status_code, 200)
+
+    async def test_verify_creates_user_and_returns_tokens(self):
+        """A valid code creates the user and returns JWT tokens."""
+        _, code = await OTPToken.acreate_for_email('new@example.com')
+
+        response = await self.post(AsyncOTPVerifyAPIView, {'email': 'new@example.com', 'code': code})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_new_user'])
+        self.assertEqual(response.data['user']['email'], 'new@example.com')
+        self.assertIn('access_token', response.data)
+        user = await User.objects.aget(email='new@example.com')
+        self.assertTrue(user.is_verified)
+
+    async def test_verify_invalid_code(self):
+        """A wrong code counts an attempt and reports the remaining ones."""
+        await OTPToken.acreate_for_email('user@example.com')
+
+        with patch.object(OTPToken, 'verify_code', return_value=False):
+            response = await self.post(AsyncOTPVerifyAPIView, {'email': 'user@example.com', 'code': '000000'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['code'], OTPErrorCode.INVALID_CODE.value)
+        self.assertEqual(response.data['attempts_remaining'], 4)
+
+    async def test_verify_without_token(self):
+        """Verifying without a requested code returns no_otp_found."""
+        response = await self.post(AsyncOTPVerifyAPIView, {'email': 'user@example.com', 'code': '123456'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['code'], OTPErrorCode.NO_OTP_FOUND.value)
+
+
+class AsyncForgotPasswordViewTests(AsyncViewTestCase):
+    """Tests for AsyncForgotPasswordAPIView."""
+
+    async def test_existing_user_receives_email(self):
+        """A reset token is created and the email is sent."""
+        user = await acreate_user(
+            username='reset@example.com', email='reset@example.com', password='TestPass123!'
+        )
+
+        response = await self.post(AsyncForgotPasswordAPIView, {'email': 'reset@example.com'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['error'])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertTrue(await PasswordResetToken.objects.filter(user=user).aexists())
+
+    async def test_unknown_email_same_response(self):
+        """Unknown emails get the same response and no email."""
+        response = await self.post(AsyncForgotPasswordAPIView, {'email': 'nobody@example.com'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class AsyncMeViewTests(AsyncViewTestCase):
+    """Tests for AsyncMeAPIView."""
+
+    async def test_returns_current_user(self):
+        """A valid access token resolves the user."""
+        user = await acreate_user(
+            username='me@example.com', email='me@example.com', password='TestPass123!'
+        )
+        token = RefreshToken.for_user(user).access_token
+
+        response = await self.get(AsyncMeAPIView, headers={'Authorization': f'Bearer {token}'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'me@example.com')
+
+    async def test_unauthenticated(self):
+        """Requests without credentials are rejected with 401."""
+        response = await self.get(AsyncMeAPIView)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(response.has_header('WWW-Authenticate'))
+
+    async def test_invalid_token(self):
+        """Malformed tokens are rejected with 401."""
+        response = await self.get(AsyncMeAPIView, headers={'Authorization': 'Bearer invalid'})
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_inactive_user(self):
+        """Tokens of inactive users are rejected."""
+        user = await acreate_user(
+            username='off@example.com', email='off@example.com', password='TestPass123!', is_active=False
+        )
+        token = RefreshToken.for_user(user).access_token
+
+        response = await self.get(AsyncMeAPIView, headers={'Authorization': f'Bearer {token}'})
+
+        self.assertEqual(response.status_code, 401)
+
+
+class AsyncThrottleTests(AsyncViewTestCase):
+    """Tests for throttling in async views."""
+
+    async def test_otp_request_throttled(self):
+        """The second OTP request within a minute is throttled."""
+        first = await self.post(AsyncOTPRequestAPIView, {'email': 'user@example.com'})
+        second = await self.post(AsyncOTPRequestAPIView, {'email': 'user@example.com'})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 429)
+        self.assertIn('Retry-After', second.headers)
+
+    async def test_history_shared_with_sync_throttle(self):
+        """Sync and async throttles read the same cache entries."""
+        from apps.accounts.api.throttling import OTPRequestThrottle
+
+        await self.post(AsyncOTPRequestAPIView, {'email': 'user@example.com'})
+
+        request = self.factory.post('/')
+        request.user = AnonymousUser()
+        throttle = OTPRequestThrottle()
+        self.assertFalse(throttle.allow_request(request, None))
+
+
+class AsyncServiceTests(TestCase):
+    """Tests for the async service methods."""
+
+    async def test_averify_otp_expired(self):
+        """Expired tokens are reported as otp_expired."""
+        from django.utils import timezone
+
+        token, code = await OTPToken.acreate_for_email('user@example.com')
+        token.expires_at = timezone.now() - timezone.timedelta(minutes=1)
+        await token.asave()
+
+        result = await OTPService.averify_otp('user@example.com', code)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error_code, OTPErrorCode.OTP_EXPIRED)
+
+    async def test_averify_otp_existing_user(self):
+        """Existing users are logged in and marked verified."""
+        await acreate_user(
+            username='old@example.com', email='old@example.com', password='TestPass123!'
+        )
+        _, code = await OTPToken.acreate_for_email('old@example.com')
+
+        result = await OTPService.averify_otp('old@example.com', code)
+
+        self.assertTrue(result.success)
+        self.assertFalse(result.is_new_user)
+        self.assertTrue(result.user.is_verified)
+
+    async def test_acreate_for_email_invalidates_previous(self):
+        """Requesting a new code invalidates the previous one."""
+        first, _ = await OTPToken.acreate_for_email('user@example.com')
+        await OTPToken.acreate_for_email('user@example.com')
+
+        await first.arefresh_from_db()
+        self.assertTrue(first.used)
+
+    async def test_email_matches_sync_rendering(self):
+        """Sync and async paths send the same message."""
+        with patch('apps.accounts.services.asend_mail', AsyncMock()) as mock_mail:
+            await OTPService.asend_otp_email('user@example.com', '123456', 'de')
+
+        subject, plain, html = OTPService.build_otp_email('user@example.com', '123456', 'de')
+        kwargs = mock_mail.call_args.kwargs
+        self.assertEqual(kwargs['subject'], subject)
+        self.assertEqual(kwargs['html_message'], html)
+
+    async def test_arequest_reset_mail_failure(self):
+        """Mail failures are logged and still report success."""
+        await acreate_user(
+            username='reset@example.com', email='reset@example.com', password='TestPass123!'
+        )
+
+        with patch('apps.accounts.services.asend_mail', AsyncMock(side_effect=OSError)):
+            success, _ = await PasswordResetService.arequest_reset('reset@example.com')
+
+        self.assertTrue(success)
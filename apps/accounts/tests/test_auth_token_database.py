@@ -0,0 +1,152 @@
+"""
+Tests for placing auth tokens on a dedicated database.
+
+Test Structure:
+- DedicatedDatabaseRouterTests: Routing of token models to their alias
+- CrossDatabaseBehaviorTests: Token cleanup and admin without joins to users
+- SetupAuthTokenDatabaseCommandTests: setup_auth_token_database command
+"""
+
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.accounts.models import EmailVerificationToken, OTPToken, PasswordResetToken, User
+from apps.core.db.routers import DedicatedDatabaseRouter
+
+DEDICATED = {label: 'auth_tokens' for label in settings.AUTH_TOKEN_MODELS}
+
+
+@override_settings(DATABASE_DEDICATED_MODELS=DEDICATED)
+class DedicatedDatabaseRouterTests(SimpleTestCase):
+    """Tests for DedicatedDatabaseRouter."""
+
+    def setUp(self):
+        self.router = DedicatedDatabaseRouter()
+
+    def test_token_models_routed(self):
+        for model in (OTPToken, PasswordResetToken, EmailVerificationToken):
+            self.assertEqual(self.router.db_for_read(model), 'auth_tokens')
+            self.assertEqual(self.router.db_for_write(model), 'auth_tokens')
+
+    def test_other_models_left_to_next_router(self):
+        self.assertIsNone(self.router.db_for_read(User))
+        self.assertIsNone(self.router.db_for_write(User))
+
+    def test_relation_to_user_allowed(self):
+        self.assertTrue(self.router.allow_relation(PasswordResetToken(), User()))
+
+    def test_no_migrations_on_dedicated_database(self):
+        self.assertFalse(self.router.allow_migrate('auth_tokens', 'accounts', 'otptoken'))
+        self.assertIsNone(self.router.allow_migrate('default', 'accounts', 'user'))
+
+    @override_settings(DATABASE_DEDICATED_MODELS={})
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.router.db_for_read(OTPToken))
+
+
+class CrossDatabaseBehaviorTests(TestCase):
+    """Behavior that no longer relies on database-level relations."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='token@example.com', email='token@example.com', password='TestPass123!', first_name='Tina'
+        )
+
+    def test_user_delete_removes_tokens(self):
+        """Tokens are deleted with their user."""
+        PasswordResetToken.create_for_user(self.user)
+        EmailVerificationToken.create_for_user(self.user)
+
+        self.user.delete()
+
+        self.assertFalse(PasswordResetToken.objects.exists())
+        self.assertFalse(EmailVerificationToken.objects.exists())
+
+    def test_admin_search_by_user_email(self):
+        """Admin search by user fields resolves user ids first."""
+        admin_user = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        EmailVerificationToken.create_for_user(self.user)
+        EmailVerificationToken.create_for_user(admin_user)
+        self.client.force_login(admin_user)
+
+        url = reverse('admin:accounts_emailverificationtoken_changelist')
+        response = self.client.get(url, {'q': 'tina'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_admin_changelist_prefetches_users(self):
+        """The changelist does not query users once per row."""
+        admin_user = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        self.client.force_login(admin_user)
+        url = reverse('admin:accounts_passwordresettoken_changelist')
+
+        def changelist_queries(rows):
+            for _ in range(rows):
+                PasswordResetToken.objects.create(
+                    user=self.user, token=os.urandom(8).hex(), expires_at='2030-01-01T00:00Z'
+                )
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        self.client.get(url)  # warm up session and content type caches
+        self.assertEqual(changelist_queries(2), changelist_queries(8))
+
+
+class SetupAuthTokenDatabaseCommandTests(TestCase):
+    """Tests for setup_auth_token_database on a temporary SQLite database."""
+
+    alias = 'auth_tokens_test'
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        config = {**connections['default'].settings_dict, 'NAME': self.db_path}
+        self.settings_patch = patch.dict(connections.settings, {self.alias: config})
+        self.settings_patch.start()
+
+    def tearDown(self):
+        connections[self.alias].close()
+        del connections[self.alias]
+        self.settings_patch.stop()
+        os.remove(self.db_path)
+
+    def test_creates_tables_and_copies_live_tokens(self):
+        OTPToken.create_for_email('copy@example.com')
+        out = StringIO()
+
+        call_command('setup_auth_token_database', database=self.alias, copy=True, stdout=out)
+
+        tables = connections[self.alias].introspection.table_names()
+        for label in settings.AUTH_TOKEN_MODELS:
+            self.assertIn(label.replace('.', '_'), tables)
+        self.assertEqual(OTPToken.objects.using(self.alias).count(), 1)
+        self.assertIn('accounts_otptoken: created', out.getvalue())
+
+    def test_idempotent(self):
+        call_command('setup_auth_token_database', database=self.alias, stdout=StringIO())
+        out = StringIO()
+
+        call_command('setup_auth_token_database', database=self.alias, stdout=out)
+
+        self.assertIn('already exists', out.getvalue())
+
+    def test_rejects_default_database(self):
+        with self.assertRaises(CommandError):
+            call_command('setup_auth_token_database', database='default')
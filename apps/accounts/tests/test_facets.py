@@ -0,0 +1,140 @@
+"""
+Tests for the cached country counts.
+
+Test Structure:
+- CountryCountsTests: Recounts, signal updates and invalidation
+- CountryFilterTests: The admin filter rendered from the cache
+"""
+
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.accounts.facets import (
+    adjust_country_counts,
+    get_country_counts,
+    invalidate_country_counts,
+    refresh_country_counts,
+)
+from apps.accounts.imports import UserImporter
+from apps.accounts.models import User
+
+
+def create_user(email, country='CH'):
+    return User.objects.create_user(username=email, email=email, country=country)
+
+
+class CountryCountsTests(TestCase):
+    """Tests for apps.accounts.facets."""
+
+    def setUp(self):
+        cache.clear()
+        create_user('a@example.com')
+        create_user('b@example.com')
+        create_user('c@example.com', 'DE')
+
+    def test_counts_on_first_read(self):
+        self.assertEqual(get_country_counts(), {'CH': 2, 'DE': 1})
+
+    def test_cached_reads_run_no_queries(self):
+        get_country_counts()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_country_counts(), {'CH': 2, 'DE': 1})
+
+    def test_signals_adjust_counts(self):
+        get_country_counts()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_user('d@example.com', 'FR')
+        user = User.objects.get(email='a@example.com')
+        user.country = 'DE'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(email='b@example.com').delete()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_country_counts(), {'DE': 2, 'FR': 1})
+
+    def test_save_without_country_change(self):
+        get_country_counts()
+        user = User.objects.get(email='a@example.com')
+        user.first_name = 'Anna'
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            user.save()
+
+        self.assertEqual(callbacks, [])
+
+    def test_rolled_back_user_is_not_counted(self):
+        get_country_counts()
+
+        with self.captureOnCommitCallbacks(execute=False):
+            create_user('d@example.com', 'FR')
+
+        self.assertEqual(get_country_counts(), {'CH': 2, 'DE': 1})
+
+    def test_bulk_import_adjusts_counts(self):
+        get_country_counts()
+        rows = [(2, {'email': 'd@example.com', 'country': 'FR'}), (3, {'email': 'e@example.com'})]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserImporter(invite='none').run(rows)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_country_counts(), {'CH': 3, 'DE': 1, 'FR': 1})
+
+    def test_invalidate_recounts(self):
+        get_country_counts()
+        User.objects.filter(country='DE').update(country='IT')
+
+        invalidate_country_counts()
+
+        self.assertEqual(get_country_counts(), {'CH': 2, 'IT': 1})
+
+    def test_unknown_code_forces_recount(self):
+        refresh_country_counts()
+
+        with self.assertLogs('apps.accounts.facets', 'WARNING'):
+            adjust_country_counts(Counter({'ZZ': 1}))
+
+        with self.assertNumQueries(1):
+            get_country_counts()
+
+
+class CountryFilterTests(TestCase):
+    """Tests for CountryFilter on the user changelist."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        create_user('a@example.com', 'DE')
+        self.client.force_login(self.admin)
+
+    def test_lists_countries_with_counts(self):
+        response = self.client.get(reverse('admin:accounts_user_changelist'))
+
+        self.assertContains(response, 'Germany (1)')
+        self.assertContains(response, 'Switzerland (1)')
+        self.assertNotContains(response, 'France (')
+
+    def test_no_country_scan_per_page_view(self):
+        url = reverse('admin:accounts_user_changelist')
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+
+        self.assertFalse([q['sql'] for q in queries if 'DISTINCT' in q['sql'] or 'GROUP BY' in q['sql']])
+
+    def test_filters_by_country(self):
+        response = self.client.get(reverse('admin:accounts_user_changelist') + '?country=DE')
+
+        self.assertEqual(response.context['cl'].result_count, 1)
@@ -25,6 +25,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
 from apps.accounts.models import User, PasswordResetToken
+from apps.core.testing import QueryBudgetTestMixin
 
 
 class PasswordResetTokenModelTests(TestCase):
@@ -406,7 +407,7 @@ class PasswordResetServiceTests(TestCase):
             mock_send.assert_not_called()
 
 
-class ForgotPasswordAPIViewTests(APITestCase):
+class ForgotPasswordAPIViewTests(QueryBudgetTestMixin, APITestCase):
     """Tests for POST /api/v1/auth/forgot-password/"""
 
     def setUp(self):
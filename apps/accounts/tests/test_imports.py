@@ -0,0 +1,256 @@
+"""
+Tests for bulk user imports.
+
+Test Structure:
+- CleanRowTests: Row validation and normalization
+- UserImporterTests: Batching, existing and duplicate emails, invitations
+- ImportUsersCommandTests: The import_users management command
+- UserImportAdminTests: The admin import page
+"""
+
+import csv
+import tempfile
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from apps.accounts.imports import ImportFileError, UserImporter, clean_row, read_rows
+from apps.accounts.models import EmailVerificationToken, OTPToken, User
+from apps.core.db import routers
+
+
+def csv_file(*lines: str) -> BytesIO:
+    return BytesIO(('\n'.join(lines) + '\n').encode('utf-8-sig'))
+
+
+class CleanRowTests(SimpleTestCase):
+    """Tests for clean_row."""
+
+    def test_normalizes(self):
+        cleaned = clean_row({
+            'email': ' Anna@Example.COM ', 'first_name': 'Anna', 'country': 'de', 'date_of_birth': '1990-04-01',
+        })
+
+        self.assertEqual(cleaned['email'], 'anna@example.com')
+        self.assertEqual(cleaned['country'], 'DE')
+        self.assertEqual(cleaned['date_of_birth'], date(1990, 4, 1))
+        self.assertEqual(cleaned['last_name'], '')
+
+    def test_defaults_country(self):
+        self.assertEqual(clean_row({'email': 'a@example.com'})['country'], 'CH')
+
+    def test_invalid_values(self):
+        for row, column in [
+            ({'email': ''}, 'email'),
+            ({'email': 'not-an-email'}, 'email'),
+            ({'email': 'a@example.com', 'phone': '12'}, 'phone'),
+            ({'email': 'a@example.com', 'country': 'XX'}, 'country'),
+            ({'email': 'a@example.com', 'date_of_birth': '01.04.1990'}, 'date_of_birth'),
+            ({'email': 'a@example.com', 'first_name': 'x' * 151}, 'first_name'),
+        ]:
+            with self.subTest(row=row), self.assertRaises(ValidationError) as raised:
+                clean_row(row)
+            self.assertTrue(raised.exception.messages[0].startswith(f'{column}:'))
+
+
+class UserImporterTests(TestCase):
+    """Tests for UserImporter."""
+
+    def run_import(self, file, **kwargs):
+        errors = []
+        result = UserImporter(on_error=errors.append, **kwargs).run(read_rows(file, 'users.csv'))
+        return result, errors
+
+    def test_creates_users_in_batches(self):
+        progress = []
+        rows = [f'user{n}@example.com,User,{n}' for n in range(7)]
+
+        result = UserImporter(invite='none', batch_size=3, on_progress=lambda r: progress.append(r.rows)).run(
+            read_rows(csv_file('Email,First Name,Last Name', *rows), 'users.csv')
+        )
+
+        self.assertEqual(result.created, 7)
+        self.assertEqual(progress, [3, 6, 7])
+        user = User.objects.get(email='user3@example.com')
+        self.assertEqual(user.username, 'user3@example.com')
+        self.assertEqual(user.last_name, '3')
+        self.assertFalse(user.has_usable_password())
+        self.assertFalse(user.is_verified)
+        self.assertTrue(user.is_active)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_skips_existing_and_duplicate_emails(self):
+        User.objects.create_user(username='taken@example.com', email='taken@example.com')
+
+        result, errors = self.run_import(
+            csv_file('email', 'TAKEN@example.com', 'new@example.com', 'new@example.com', 'later@example.com'),
+            invite='none', batch_size=2,
+        )
+
+        # The repeat is in a later batch, so it is found in the database
+        self.assertEqual((result.rows, result.created, result.existing, result.invalid), (4, 2, 2, 0))
+        self.assertEqual(User.objects.filter(email='new@example.com').count(), 1)
+        self.assertEqual(errors, [])
+
+    def test_existing_email_matched_case_insensitively(self):
+        User.objects.create_user(username='Anna@Clinic.ch', email='Anna@Clinic.ch')
+
+        result, errors = self.run_import(csv_file('email', 'anna@clinic.ch'), invite='none')
+
+        self.assertEqual((result.created, result.existing), (0, 1))
+        self.assertEqual(User.objects.filter(email__iexact='anna@clinic.ch').count(), 1)
+
+    def test_rows_still_conflicting_after_retry_are_reported(self):
+        insert_new = UserImporter.insert_new
+        calls = []
+
+        def conflicting(importer, valid):
+            calls.append(list(valid))
+            # The batch fails twice, then only the racing row conflicts
+            if len(calls) <= 2 or 'race@example.com' in valid:
+                raise IntegrityError('duplicate key')
+            return insert_new(importer, valid)
+
+        with patch.object(UserImporter, 'insert_new', conflicting):
+            result, errors = self.run_import(
+                csv_file('email', 'ok@example.com', 'race@example.com'), invite='none'
+            )
+
+        self.assertEqual((result.created, result.invalid), (1, 1))
+        self.assertEqual([(error.line, error.email) for error in errors], [(3, 'race@example.com')])
+        self.assertTrue(User.objects.filter(email='ok@example.com').exists())
+
+    def test_duplicate_within_batch_is_reported(self):
+        result, errors = self.run_import(csv_file('email', 'a@example.com', 'A@example.com'), invite='none')
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.invalid, 1)
+        self.assertEqual(errors[0].line, 3)
+
+    def test_reports_invalid_rows_with_line_numbers(self):
+        result, errors = self.run_import(
+            csv_file('email,phone', 'ok@example.com,', 'broken,', 'bad-phone@example.com,123'), invite='none'
+        )
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([(error.line, error.email) for error in errors], [(3, 'broken'), (4, 'bad-phone@example.com')])
+
+    def test_verification_invitations(self):
+        result, _ = self.run_import(csv_file('email', 'a@example.com', 'b@example.com'))
+
+        self.assertEqual(result.invited, 2)
+        self.assertEqual(len(mail.outbox), 2)
+        token = EmailVerificationToken.objects.get(user__email='a@example.com')
+        message = next(m for m in mail.outbox if m.to == ['a@example.com'])
+        self.assertIn(f'/api/v1/auth/verify-email/{token.token}/', message.body)
+        self.assertTrue(token.is_valid)
+
+    def test_otp_invitations(self):
+        result, _ = self.run_import(csv_file('email', 'a@example.com'), invite='otp')
+
+        self.assertEqual(result.invited, 1)
+        token = OTPToken.objects.get(email='a@example.com')
+        code = next(word for word in mail.outbox[0].body.split() if word.isdigit() and len(word) == 6)
+        self.assertEqual(token.code_hash, OTPToken.hash_code(code))
+
+    def test_otp_invitations_keep_otp_expiry(self):
+        with self.settings(OTP_EXPIRY_MINUTES=5, USER_IMPORT_INVITE_EXPIRY_HOURS=72):
+            self.run_import(csv_file('email', 'a@example.com'), invite='otp')
+
+        token = OTPToken.objects.get(email='a@example.com')
+        self.assertLessEqual(token.expires_at - token.created_at, timedelta(minutes=5))
+
+    def test_batches_read_from_primary(self):
+        insert_new = UserImporter.insert_new
+        pinned = []
+
+        def recording(importer, valid):
+            pinned.append(routers._use_primary.get())
+            return insert_new(importer, valid)
+
+        with patch.object(UserImporter, 'insert_new', recording):
+            self.run_import(csv_file('email', 'a@example.com'), invite='none')
+
+        self.assertEqual(pinned, [True])
+        self.assertIsNone(routers._use_primary.get())
+
+    def test_file_errors(self):
+        with self.assertRaises(ImportFileError):
+            read_rows(BytesIO(b''), 'users.txt')
+        with self.assertRaises(ImportFileError):
+            list(read_rows(csv_file('name', 'Anna'), 'users.csv'))
+
+
+class ImportUsersCommandTests(TestCase):
+    """Tests for the import_users command."""
+
+    def test_imports_and_writes_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory) / 'users.csv'
+            source.write_text('email\na@example.com\nnope\n')
+            errors = Path(directory) / 'errors.csv'
+            stdout = StringIO()
+
+            call_command('import_users', str(source), invite='none', errors=str(errors), stdout=stdout)
+
+            with errors.open(newline='') as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows, [['line', 'email', 'error'], ['3', 'nope', 'email: "nope" is not a valid address']])
+        self.assertTrue(User.objects.filter(email='a@example.com').exists())
+        self.assertIn('Imported 1 users', stdout.getvalue())
+
+
+class UserImportAdminTests(TestCase):
+    """Tests for the admin import page."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:accounts_user_import')
+
+    def test_changelist_links_to_import(self):
+        response = self.client.get(reverse('admin:accounts_user_changelist'))
+
+        self.assertContains(response, self.url)
+
+    def test_import_redirects_with_summary(self):
+        upload = SimpleUploadedFile('users.csv', b'email\na@example.com\n')
+
+        response = self.client.post(self.url, {'file': upload, 'invite': 'verification'}, follow=True)
+
+        self.assertRedirects(response, reverse('admin:accounts_user_changelist'))
+        self.assertContains(response, '1 user(s) imported')
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_lists_row_errors(self):
+        upload = SimpleUploadedFile('users.csv', b'email\na@example.com\nnope\n')
+
+        response = self.client.post(self.url, {'file': upload, 'invite': 'none'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'is not a valid address')
+
+    def test_rejects_other_file_types(self):
+        upload = SimpleUploadedFile('users.txt', b'email\n')
+
+        response = self.client.post(self.url, {'file': upload, 'invite': 'none'})
+
+        self.assertContains(response, 'Upload a .csv or .xlsx file.')
+        self.assertFalse(User.objects.exclude(pk=self.admin.pk).exists())
+
+    def test_requires_add_permission(self):
+        staff = User.objects.create_user(username='staff@example.com', email='staff@example.com', is_staff=True)
+        self.client.force_login(staff)
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -34,9 +34,10 @@ from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
 from apps.accounts.models import User
+from apps.core.testing import QueryBudgetTestMixin
 
 
-class LoginAPIViewTests(APITestCase):
+class LoginAPIViewTests(QueryBudgetTestMixin, APITestCase):
     """Tests for POST /api/v1/auth/login/"""
 
     def setUp(self):
@@ -25,9 +25,10 @@ from rest_framework.test import APITestCase, APIClient
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 
 from apps.accounts.models import User
+from apps.core.testing import QueryBudgetTestMixin
 
 
-class MeAPIViewTests(APITestCase):
+class MeAPIViewTests(QueryBudgetTestMixin, APITestCase):
     """Tests for GET /api/v1/auth/me/"""
 
     def setUp(self):
@@ -15,6 +15,7 @@ from rest_framework.throttling import AnonRateThrottle
 
 from apps.accounts.models import User, OTPToken
 from apps.accounts.services import OTPService, OTPErrorCode
+from apps.core.testing import QueryBudgetTestMixin
 
 
 # Disable throttling for tests
@@ -352,7 +353,7 @@ class OTPServiceTest(TestCase):
         'DEFAULT_THROTTLE_RATES': {},
     }
 )
-class OTPAPITest(APITestCase):
+class OTPAPITest(QueryBudgetTestMixin, APITestCase):
     """API tests for OTP endpoints."""
 
     def setUp(self):
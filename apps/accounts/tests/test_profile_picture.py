@@ -0,0 +1,240 @@
+"""
+Tests for the profile picture processing pipeline.
+
+Test Structure:
+- ValidateImageUploadTests: Header-only upload validation
+- RenderWebpRenditionsTests: Rendition generation and metadata stripping
+- ProfilePictureServiceTests: Off-request rendition generation for users
+- ProfilePictureAdminTests: Admin changelist preview
+- ProfilePictureAPITests: Rendition URLs in /me response
+"""
+
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.admin.sites import AdminSite
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.admin import UserAdmin
+from apps.accounts.models import User
+from apps.accounts.services import ProfilePictureService
+from apps.core.images import render_webp_renditions, validate_image_upload
+from apps.core.testing import QueryBudgetTestMixin
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(size=(800, 600), fmt='JPEG', with_exif=False):
+    """Create an in-memory image file."""
+    img = Image.new('RGB', size, color='red')
+    output = BytesIO()
+    kwargs = {}
+    if with_exif:
+        exif = Image.Exif()
+        exif[0x010F] = 'TestCamera'  # Make
+        kwargs['exif'] = exif.tobytes()
+    img.save(output, format=fmt, **kwargs)
+    output.seek(0)
+    return output
+
+
+def make_upload(name='avatar.jpg', **kwargs):
+    return SimpleUploadedFile(name, make_image(**kwargs).read(), content_type='image/jpeg')
+
+
+class ValidateImageUploadTests(TestCase):
+    """Tests for validate_image_upload."""
+
+    def test_valid_image_returns_format_and_size(self):
+        result = validate_image_upload(make_image(size=(120, 80)))
+        self.assertEqual(result, ('JPEG', 120, 80))
+
+    def test_rejects_file_over_size_limit(self):
+        upload = make_upload()
+        with self.assertRaises(ValidationError) as ctx:
+            validate_image_upload(upload, max_bytes=10)
+        self.assertEqual(ctx.exception.code, 'image_too_large')
+
+    def test_rejects_non_image(self):
+        with self.assertRaises(ValidationError) as ctx:
+            validate_image_upload(BytesIO(b'not an image at all'))
+        self.assertEqual(ctx.exception.code, 'invalid_image')
+
+    def test_rejects_too_many_pixels(self):
+        with self.assertRaises(ValidationError) as ctx:
+            validate_image_upload(make_image(size=(200, 200)), max_pixels=100)
+        self.assertEqual(ctx.exception.code, 'image_too_many_pixels')
+
+    def test_rejects_unsupported_format(self):
+        with self.assertRaises(ValidationError) as ctx:
+            validate_image_upload(make_image(fmt='BMP'))
+        self.assertEqual(ctx.exception.code, 'invalid_image_format')
+
+    def test_file_position_is_reset(self):
+        image = make_image()
+        validate_image_upload(image)
+        self.assertEqual(image.tell(), 0)
+
+
+class RenderWebpRenditionsTests(TestCase):
+    """Tests for render_webp_renditions."""
+
+    def test_renders_all_sizes_as_webp(self):
+        renditions = render_webp_renditions(make_image(size=(2000, 1000)), {'small': 64, 'large': 1024})
+
+        small = Image.open(BytesIO(renditions['small'].read()))
+        large = Image.open(BytesIO(renditions['large'].read()))
+        self.assertEqual(small.format, 'WEBP')
+        self.assertEqual(small.size, (64, 32))
+        self.assertEqual(large.size, (1024, 512))
+
+    def test_does_not_upscale(self):
+        renditions = render_webp_renditions(make_image(size=(50, 50)), {'large': 1024})
+        large = Image.open(BytesIO(renditions['large'].read()))
+        self.assertEqual(large.size, (50, 50))
+
+    def test_strips_exif_metadata(self):
+        source = make_image(with_exif=True)
+        self.assertIn('exif', Image.open(source).info)
+
+        renditions = render_webp_renditions(source, {'small': 64})
+        small = Image.open(BytesIO(renditions['small'].read()))
+        self.assertNotIn('exif', small.info)
+        self.assertEqual(len(small.getexif()), 0)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, PROFILE_PICTURE_RENDITIONS_ASYNC=False)
+class ProfilePictureServiceTests(TestCase):
+    """Tests for rendition generation on upload."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='pic@example.com',
+            email='pic@example.com',
+            password='SecurePass123!',
+        )
+
+    def test_upload_generates_renditions_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.user.profile_picture = make_upload()
+            self.user.save()
+
+        self.assertEqual(len(callbacks), 1)
+        self.user.refresh_from_db()
+        for field in ('profile_picture_small', 'profile_picture_medium', 'profile_picture_large'):
+            rendition = getattr(self.user, field)
+            self.assertTrue(rendition.name.endswith('.webp'), field)
+
+    def test_save_without_picture_change_does_not_schedule(self):
+        self.user = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.first_name = 'Changed'
+            self.user.save()
+        self.assertEqual(callbacks, [])
+
+    def test_new_picture_clears_previous_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile_picture = make_upload()
+            self.user.save()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.profile_picture_small)
+        old = self.user.profile_picture_small
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            user.profile_picture = make_upload(name='second.jpg')
+            user.save()
+
+        # Rendition generation and deletion of the old rendition files
+        self.assertEqual(len(callbacks), 2)
+        user.refresh_from_db()
+        self.assertFalse(user.profile_picture_small)
+        self.assertFalse(user.profile_picture_large)
+        self.assertTrue(old.storage.exists(old.name))
+
+        callbacks[1]()
+
+        self.assertFalse(old.storage.exists(old.name))
+
+    def test_full_clean_skips_stored_picture(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.user.profile_picture = make_upload()
+            self.user.save()
+        user = User.objects.get(pk=self.user.pk)
+        user.profile_picture.storage.delete(user.profile_picture.name)
+
+        user.full_clean()
+
+    def test_generate_renditions_without_picture_returns_false(self):
+        self.assertFalse(ProfilePictureService.generate_renditions(self.user.pk))
+
+    def test_get_profile_picture_url_falls_back_to_original(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.user.profile_picture = make_upload()
+            self.user.save()
+        self.assertEqual(self.user.get_profile_picture_url('small'), self.user.profile_picture.url)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, PROFILE_PICTURE_RENDITIONS_ASYNC=False)
+class ProfilePictureAdminTests(TestCase):
+    """Tests for the admin changelist preview."""
+
+    def test_preview_uses_small_rendition(self):
+        user = User.objects.create_user(
+            username='admin-pic@example.com',
+            email='admin-pic@example.com',
+            password='SecurePass123!',
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            user.profile_picture = make_upload()
+            user.save()
+        user.refresh_from_db()
+
+        html = UserAdmin(User, AdminSite()).profile_picture_preview(user)
+
+        self.assertIn(user.profile_picture_small.url, html)
+        self.assertNotIn(user.profile_picture.url, html)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, PROFILE_PICTURE_RENDITIONS_ASYNC=False)
+class ProfilePictureAPITests(QueryBudgetTestMixin, APITestCase):
+    """Tests for rendition URLs in the /me response."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='api-pic@example.com',
+            email='api-pic@example.com',
+            password='SecurePass123!',
+            is_verified=True,
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_me_returns_null_without_picture(self):
+        response = self.client.get(reverse('accounts_api:me'))
+        self.assertIsNone(response.data['profile_picture'])
+
+    def test_me_returns_absolute_rendition_urls(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile_picture = make_upload()
+            self.user.save()
+        self.user.refresh_from_db()
+
+        response = self.client.get(reverse('accounts_api:me'))
+
+        urls = response.data['profile_picture']
+        self.assertEqual(set(urls), {'small', 'medium', 'large'})
+        self.assertTrue(urls['small'].startswith('http://testserver/'))
+        self.assertTrue(urls['small'].endswith(self.user.profile_picture_small.url))
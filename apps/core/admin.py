@@ -1,33 +1,44 @@
 """
-Core admin configuration - includes LegalDocument and AppSettings admin.
+Core admin configuration - includes LegalDocument, AppSettings, RequestProfile and SlowQuery admin.
 """
 
 from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
 from django.utils.html import format_html, mark_safe
 
-from apps.core.models import AppSettings, LegalDocument
+from apps.core.exports import ExportMixin
+from apps.core.models import AppSettings, LegalDocument, RequestProfile, SlowQuery
+from apps.core.profiling import get_profile_dir
+from apps.core.search import LegalDocumentSearchMixin
 
 
 @admin.register(LegalDocument)
-class LegalDocumentAdmin(admin.ModelAdmin):
+class LegalDocumentAdmin(LegalDocumentSearchMixin, ExportMixin, admin.ModelAdmin):
     """Admin configuration for LegalDocument model."""
 
     list_display = [
         'title',
         'document_type',
         'version',
+        'language',
         'effective_date',
         'status_badge',
         'created_at',
     ]
-    list_filter = ['document_type', 'is_active', 'effective_date']
-    search_fields = ['title', 'version', 'content']
+    list_filter = ['document_type', 'language', 'is_active', 'effective_date']
+    # Full-text search on PostgreSQL; these are the fallback elsewhere
+    search_fields = ['title', 'version', 'search_text']
     readonly_fields = ['created_at', 'updated_at']
     ordering = ['-effective_date', 'document_type']
+    export_fields = [
+        'id', 'document_type', 'version', 'title', 'language', 'effective_date', 'is_active', 'created_at', 'updated_at', 'content',
+    ]
 
     fieldsets = (
         (None, {
-            'fields': ('document_type', 'version', 'title')
+            'fields': ('document_type', 'version', 'title', 'language')
         }),
         ('Content', {
             'fields': ('content',),
@@ -187,3 +198,121 @@ class AppSettingsAdmin(admin.ModelAdmin):
             obj.primary_color,
             obj.primary_color
         )
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    Profiles captured by ProfilingMiddleware.
+    Read-only; download the JSON and open it in https://www.speedscope.app.
+    """
+    list_display = [
+        'created_at',
+        'method',
+        'path',
+        'status_code',
+        'duration_ms',
+        'sample_count',
+        'user',
+        'download_link',
+    ]
+    list_filter = ['method', 'view_name']
+    search_fields = ['path', 'view_name']
+    list_select_related = ['user']
+    readonly_fields = [
+        'created_at',
+        'method',
+        'path',
+        'view_name',
+        'status_code',
+        'duration_ms',
+        'sample_count',
+        'user',
+        'file_name',
+        'size',
+        'download_link',
+    ]
+    exclude = ['updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='core_requestprofile_download',
+            ),
+            *super().get_urls(),
+        ]
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise Http404
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        try:
+            file = open(get_profile_dir() / profile.file_name, 'rb')
+        except FileNotFoundError:
+            raise Http404('Profile file not found on this server')
+        return FileResponse(file, as_attachment=True, filename=profile.file_name, content_type='application/json')
+
+    @admin.display(description='Profile')
+    def download_link(self, obj):
+        """Link to the speedscope JSON."""
+        return format_html(
+            '<a href="{}">Download</a>',
+            reverse('admin:core_requestprofile_download', args=[obj.pk])
+        )
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Slow statements captured by apps.core.db.slow_queries.
+    Read-only; filter on sequential scans to find missing indexes.
+    """
+    list_display = [
+        'created_at',
+        'duration_ms',
+        'short_sql',
+        'caller',
+        'sequential_scan',
+        'alias',
+    ]
+    list_filter = ['sequential_scan', 'alias']
+    search_fields = ['sql', 'caller', 'fingerprint']
+    fields = [
+        'created_at',
+        'alias',
+        'duration_ms',
+        'sql',
+        'fingerprint',
+        'caller',
+        'stack_display',
+        'plan_display',
+        'sequential_scan',
+    ]
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='SQL')
+    def short_sql(self, obj):
+        """Truncated normalized SQL."""
+        return obj.sql if len(obj.sql) <= 120 else obj.sql[:117] + '...'
+
+    @admin.display(description='App stack')
+    def stack_display(self, obj):
+        return format_html('<pre>{}</pre>', obj.stack)
+
+    @admin.display(description='EXPLAIN plan')
+    def plan_display(self, obj):
+        return format_html('<pre>{}</pre>', obj.plan or 'Not available')
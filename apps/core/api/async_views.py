@@ -0,0 +1,118 @@
+"""
+Async APIView base for DRF.
+
+DRF's APIView dispatch is synchronous. AsyncAPIView runs the same request
+lifecycle (content negotiation, authentication, permissions, throttling,
+exception handling) natively on the event loop, so handlers can be
+``async def`` and use the async ORM, cache and mail helpers. Under ASGI a
+single worker can then hold many in-flight requests that are waiting on
+I/O.
+
+Authentication classes and throttles may provide ``aauthenticate`` and
+``aallow_request``; those without are run through sync_to_async.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+from rest_framework.views import APIView
+
+
+def schema_from(source):
+    """
+    Copy the @extend_schema metadata from a sync handler to an async one.
+
+    Lets async views reuse the OpenAPI documentation of the sync view they
+    replace instead of duplicating the decorator.
+    """
+    def decorator(handler):
+        if hasattr(source, 'kwargs'):
+            handler.kwargs = source.kwargs
+        return handler
+    return decorator
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines.
+
+    All handlers (get, post, ...) must be ``async def``; Django rejects
+    views that mix sync and async handlers.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """Async version of APIView.initial()."""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        await self.acheck_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """Authenticate the request, setting request.user and request.auth."""
+        for authenticator in request.authenticators:
+            aauthenticate = getattr(authenticator, 'aauthenticate', None)
+            try:
+                if aauthenticate is not None:
+                    user_auth_tuple = await aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    async def acheck_throttles(self, request):
+        """Async version of APIView.check_throttles()."""
+        throttle_durations = []
+        for throttle in self.get_throttles():
+            aallow_request = getattr(throttle, 'aallow_request', None)
+            if aallow_request is not None:
+                allowed = await aallow_request(request, self)
+            else:
+                allowed = await sync_to_async(throttle.allow_request)(request, self)
+            if not allowed:
+                throttle_durations.append(throttle.wait())
+
+        if throttle_durations:
+            durations = [duration for duration in throttle_durations if duration is not None]
+            duration = max(durations, default=None)
+            self.throttled(request, duration)
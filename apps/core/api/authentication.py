@@ -0,0 +1,83 @@
+"""
+DRF authentication classes with async support.
+
+Behave exactly like the upstream classes for sync views, and add an
+``aauthenticate`` method used by AsyncAPIView so async views never block
+the event loop on the user lookup.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.authentication import SessionScheme
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework import authentication
+from rest_framework_simplejwt import authentication as jwt_authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class JWTAuthentication(jwt_authentication.JWTAuthentication):
+    """JWT authentication with an async user lookup."""
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """Async version of get_user()."""
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = await self.user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                jwt_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class SessionAuthentication(authentication.SessionAuthentication):
+    """Session authentication that resolves the user via request.auser()."""
+
+    async def aauthenticate(self, request):
+        auser = getattr(request._request, 'auser', None)
+        if auser is None:
+            return None
+
+        user = await auser()
+        if not user or not user.is_active:
+            return None
+
+        self.enforce_csrf(request)
+        return (user, None)
+
+
+# OpenAPI security schemes: same as the upstream classes' (registered on import)
+
+class JWTAuthenticationScheme(SimpleJWTScheme):
+    target_class = 'apps.core.api.authentication.JWTAuthentication'
+
+
+class SessionAuthenticationScheme(SessionScheme):
+    target_class = 'apps.core.api.authentication.SessionAuthentication'
@@ -0,0 +1,242 @@
+"""
+Compiled read paths for hot DRF serializers.
+
+Instantiating a ModelSerializer deep-copies its declared fields, and
+``.data`` dispatches through ``get_attribute``/``to_representation`` for
+every field. For small read-only response shapes that are built on every
+request, that overhead dominates. ``compile_serializer`` inspects a
+serializer once and generates a plain function that builds the same
+output dict directly.
+
+The serializer class stays the source of truth: writes, validation and
+OpenAPI schema generation keep using DRF. Only representation is compiled.
+
+Usage:
+    class LoginUserSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
+        ...
+
+    data = LoginUserSerializer.represent(user, context={'request': request})
+    items = LegalDocumentListSerializer.represent_many(documents)
+"""
+
+import inspect
+import types
+from functools import partialmethod
+from typing import Callable
+
+from django.utils.functional import cached_property
+from rest_framework import fields as drf_fields
+from rest_framework import serializers
+
+# Field classes whose to_representation is str(value)
+STR_FIELDS = (
+    drf_fields.CharField,
+    drf_fields.EmailField,
+    drf_fields.SlugField,
+    drf_fields.URLField,
+    drf_fields.RegexField,
+)
+
+# Field classes whose representation depends on nested serializers or the
+# request; these are not compiled.
+UNSUPPORTED_FIELDS = (
+    serializers.BaseSerializer,
+    serializers.RelatedField,
+    serializers.ManyRelatedField,
+    drf_fields.HiddenField,
+)
+
+
+class SerializerNotCompilable(Exception):
+    """Raised when a serializer has fields the compiler cannot handle."""
+
+
+class _MethodContext:
+    """
+    Stand-in for ``self`` when calling SerializerMethodField methods.
+
+    Provides the per-call ``context`` and resolves other attributes from the
+    template serializer, binding functions to this object so helper
+    methods also see the per-call context.
+    """
+    __slots__ = ('context', '_template')
+
+    def __init__(self, template, context):
+        self.context = context
+        self._template = template
+
+    def __getattr__(self, name):
+        attr = getattr(type(self._template), name, None)
+        if isinstance(attr, types.FunctionType):
+            return types.MethodType(attr, self)
+        return getattr(self._template, name)
+
+
+def _takes_no_arguments(method) -> bool:
+    """Return True if an unbound method can be called with only ``self``."""
+    try:
+        parameters = list(inspect.signature(method).parameters.values())[1:]
+    except (TypeError, ValueError):
+        return False
+    return all(
+        p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+        for p in parameters
+    )
+
+
+def _source_expression(serializer, source_attrs) -> str | None:
+    """
+    Return a Python expression reading the source from ``instance``.
+
+    Resolves model fields, properties and no-argument methods (such as
+    ``get_FOO_display``) once, at compile time, instead of DRF inspecting
+    the attribute on every call. Returns None for anything else.
+    """
+    if len(source_attrs) != 1:
+        return None
+    meta = getattr(serializer, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return None
+
+    name = source_attrs[0]
+    if name in {f.attname for f in model._meta.concrete_fields}:
+        return f'instance.{name}'
+
+    attr = inspect.getattr_static(model, name, None)
+    if isinstance(attr, (property, cached_property)):
+        return f'instance.{name}'
+    if isinstance(attr, (types.FunctionType, partialmethod)):
+        method = getattr(model, name)
+        if _takes_no_arguments(method):
+            return f'instance.{name}()'
+    return None
+
+
+def compile_serializer(serializer_class) -> Callable[[object, dict | None], dict]:
+    """
+    Compile a serializer's representation into a plain function.
+
+    Unlike DRF, a missing attribute on a read-only field raises instead of
+    silently omitting the key.
+
+    Args:
+        serializer_class: A (Model)Serializer class with only flat fields
+            (model fields, properties, callables and SerializerMethodFields).
+
+    Returns:
+        Function ``represent(instance, context=None) -> dict`` producing
+        the same output as ``serializer_class(instance, context=context).data``.
+
+    Raises:
+        SerializerNotCompilable: If the serializer has nested serializers,
+            relations, ``source='*'`` fields or a custom to_representation.
+    """
+    if serializer_class.to_representation is not serializers.Serializer.to_representation:
+        raise SerializerNotCompilable(
+            f'{serializer_class.__name__} overrides to_representation()'
+        )
+
+    template = serializer_class()
+    namespace = {
+        '_MethodContext': _MethodContext,
+        '_template': template,
+        '_get_attribute': drf_fields.get_attribute,
+        '_str': str,
+        '_int': int,
+    }
+    lines = ['def represent(instance, context=None):']
+    uses_methods = False
+
+    for index, field in enumerate(template._readable_fields):
+        name = field.field_name
+
+        if isinstance(field, UNSUPPORTED_FIELDS):
+            raise SerializerNotCompilable(
+                f'{serializer_class.__name__}.{name}: {type(field).__name__} is not supported'
+            )
+
+        if isinstance(field, serializers.SerializerMethodField):
+            method = getattr(serializer_class, field.method_name)
+            namespace[f'_method_{index}'] = method
+            lines.append(f'    value_{index} = _method_{index}(method_self, instance)')
+            uses_methods = True
+            continue
+
+        if field.source == '*':
+            raise SerializerNotCompilable(
+                f"{serializer_class.__name__}.{name}: source='*' is not supported"
+            )
+
+        expression = _source_expression(template, field.source_attrs)
+        if expression:
+            lines.append(f'    attribute = {expression}')
+        else:
+            namespace[f'_source_{index}'] = field.source_attrs
+            lines.append(f'    attribute = _get_attribute(instance, _source_{index})')
+
+        field_class = type(field)
+        if field_class in STR_FIELDS:
+            convert = '_str(attribute)'
+        elif field_class is drf_fields.IntegerField:
+            convert = '_int(attribute)'
+        elif field_class is drf_fields.ReadOnlyField:
+            convert = 'attribute'
+        else:
+            namespace[f'_field_{index}'] = field
+            convert = f'_field_{index}.to_representation(attribute)'
+
+        lines.append(
+            f'    value_{index} = None if attribute is None else {convert}'
+        )
+
+    if uses_methods:
+        lines.insert(1, '    method_self = _MethodContext(_template, {} if context is None else context)')
+
+    items = ', '.join(
+        f'{field.field_name!r}: value_{index}'
+        for index, field in enumerate(template._readable_fields)
+    )
+    lines.append(f'    return {{{items}}}')
+
+    source = '\n'.join(lines)
+    code = compile(source, f'<compiled {serializer_class.__name__}>', 'exec')
+    exec(code, namespace)
+    represent = namespace['represent']
+    represent.__doc__ = f'Compiled representation of {serializer_class.__name__}.'
+    represent.source = source
+    return represent
+
+
+class CompiledSerializerMixin:
+    """
+    Adds ``represent``/``represent_many`` classmethods backed by a compiled
+    read path. Falls back to DRF if the serializer cannot be compiled.
+    """
+
+    @classmethod
+    def get_compiled_representation(cls):
+        # Stored per class so subclasses compile their own fields
+        compiled = cls.__dict__.get('_compiled_representation')
+        if compiled is None:
+            try:
+                compiled = compile_serializer(cls)
+            except SerializerNotCompilable:
+                compiled = cls._drf_representation
+            cls._compiled_representation = compiled
+        return compiled
+
+    @classmethod
+    def _drf_representation(cls, instance, context=None):
+        return cls(instance, context=context or {}).data
+
+    @classmethod
+    def represent(cls, instance, context: dict | None = None) -> dict:
+        """Serialize a single instance for a response."""
+        return cls.get_compiled_representation()(instance, context)
+
+    @classmethod
+    def represent_many(cls, instances, context: dict | None = None) -> list:
+        """Serialize an iterable of instances for a response."""
+        represent = cls.get_compiled_representation()
+        return [represent(instance, context) for instance in instances]
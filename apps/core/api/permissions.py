@@ -0,0 +1,12 @@
+"""
+Custom permission classes for core API.
+"""
+
+from rest_framework.permissions import BasePermission
+
+
+class IsSuperUser(BasePermission):
+    """Allow access only to superusers (e.g. branding configuration)."""
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.is_superuser)
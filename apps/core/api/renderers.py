@@ -0,0 +1,86 @@
+"""
+Fast JSON renderer for DRF API responses, backed by orjson.
+"""
+
+import datetime
+import decimal
+import uuid
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+
+def orjson_default(obj):
+    """
+    Fallback encoder for types orjson does not serialize natively.
+
+    Mirrors rest_framework.utils.encoders.JSONEncoder so switching
+    renderers does not change response payloads.
+    """
+    if isinstance(obj, Promise):
+        # Lazy translation strings (gettext_lazy)
+        return force_str(obj)
+    if isinstance(obj, datetime.datetime):
+        # Serializers format datetimes themselves; raw values keep DRF's
+        # isoformat() output (orjson would format the fraction differently)
+        representation = obj.isoformat()
+        if representation.endswith('+00:00'):
+            representation = representation[:-6] + 'Z'
+        return representation
+    if isinstance(obj, datetime.date):
+        return obj.isoformat()
+    if isinstance(obj, datetime.time):
+        if timezone.is_aware(obj):
+            raise ValueError("JSON can't represent timezone-aware times.")
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        # Serializers coerce decimals to strings unless configured otherwise
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, uuid.UUID):
+        # UUID subclasses are not handled natively
+        return str(obj)
+    if isinstance(obj, QuerySet):
+        return tuple(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        # Numpy arrays and array scalars
+        return obj.tolist()
+    if hasattr(obj, '__getitem__') and hasattr(obj, 'keys'):
+        return dict(obj)
+    if hasattr(obj, '__iter__'):
+        return tuple(item for item in obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renderer which serializes to JSON using orjson.
+
+    Output matches DRF's JSONRenderer: compact UTF-8, dates and times
+    formatted by orjson_default as DRF's encoder does, and U+2028/U+2029
+    escaped. Indented output (the browsable API) uses two spaces, and
+    ErrorDetail and other str subclasses are serialized as plain strings.
+    """
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            # orjson only supports two-space indentation
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=orjson_default, option=options)
+        # Like DRF, keep the output a strict JavaScript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
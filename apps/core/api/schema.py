@@ -0,0 +1,216 @@
+"""
+Precomputed OpenAPI schema artifacts.
+
+Generating the schema introspects every view and serializer, which costs
+hundreds of milliseconds of CPU. Schemas are generated once per code
+version (at deploy via ``manage.py generate_api_schema`` or lazily on the
+first request), kept in memory, persisted to ``API_SCHEMA_CACHE_DIR`` and
+served as static blobs with an ETag.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import translation
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FORMATS = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+
+# Marks the per-version directories created here; only those are ever removed
+VERSION_DIR_MARKER = '.openapi-schema-version'
+
+# In-memory artifacts are keyed by (code version, API version, format,
+# language); all parts come from settings, so this is only a safety net
+MAX_ARTIFACTS = 64
+
+_artifacts = {}
+_lock = threading.RLock()
+
+
+@dataclass(frozen=True)
+class SchemaArtifact:
+    """A rendered schema ready to be served."""
+    content: bytes
+    etag: str
+    version: str
+    format: str
+
+
+@lru_cache(maxsize=1)
+def _source_fingerprint() -> str:
+    """Fingerprint the project's Python sources (path, size and mtime)."""
+    digest = hashlib.sha1()
+    base_dir = Path(settings.BASE_DIR)
+    for root in ('apps', 'config'):
+        for path in sorted((base_dir / root).rglob('*.py')):
+            stat = path.stat()
+            digest.update(f'{path.relative_to(base_dir)}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return f'src-{digest.hexdigest()[:12]}'
+
+
+def get_code_version() -> str:
+    """
+    Return the deployed code version.
+
+    Uses the CODE_VERSION setting (e.g. the git SHA set at build time),
+    falling back to a fingerprint of the source tree.
+    """
+    return getattr(settings, 'CODE_VERSION', '') or _source_fingerprint()
+
+
+def schema_language(language: str | None = None) -> str:
+    """
+    Return the language to serve the schema in.
+
+    Only LANGUAGE_CODE and the codes in LANGUAGES are accepted; anything
+    else (e.g. an unknown ?lang=) falls back to LANGUAGE_CODE.
+    """
+    if language is None:
+        language = translation.get_language()
+    if language == settings.LANGUAGE_CODE or language in dict(settings.LANGUAGES):
+        return language
+    return settings.LANGUAGE_CODE
+
+
+def schema_api_version(api_version: str | None) -> str | None:
+    """Return api_version if it is one of ALLOWED_VERSIONS, else None (default schema)."""
+    if api_version and api_version in (api_settings.ALLOWED_VERSIONS or ()):
+        return api_version
+    return None
+
+
+def _safe_name(value: str) -> str:
+    # Defence in depth: callers only pass settings-derived values
+    return ''.join(c for c in value if c.isalnum() or c in '-_.').lstrip('.') or '_'
+
+
+def _cache_path(version: str, api_version: str | None, fmt: str, language: str) -> Path | None:
+    cache_dir = getattr(settings, 'API_SCHEMA_CACHE_DIR', None)
+    if not cache_dir:
+        return None
+    name = f'openapi-{_safe_name(language)}'
+    if api_version:
+        name = f'openapi-{_safe_name(api_version)}-{_safe_name(language)}'
+    return Path(cache_dir) / _safe_name(version) / f'{name}.{fmt}'
+
+
+def _make_artifact(content: bytes, version: str, fmt: str) -> SchemaArtifact:
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    return SchemaArtifact(content=content, etag=etag, version=version, format=fmt)
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    (path.parent / VERSION_DIR_MARKER).touch()
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.openapi-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # Drop artifacts from previous code versions, leaving anything else in
+    # the cache directory alone
+    for stale in path.parent.parent.iterdir():
+        if stale != path.parent and (stale / VERSION_DIR_MARKER).is_file():
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def _remember(key: tuple, artifact: SchemaArtifact) -> None:
+    # Artifacts of previous code versions are never served again
+    for stale in [k for k in _artifacts if k[0] != key[0]]:
+        del _artifacts[stale]
+    while len(_artifacts) >= MAX_ARTIFACTS:
+        del _artifacts[next(iter(_artifacts))]
+    _artifacts[key] = artifact
+
+
+def render_schema(fmt: str, api_version: str | None = None) -> bytes:
+    """Generate and render the public schema (no request-specific content)."""
+    generator_class = spectacular_settings.DEFAULT_GENERATOR_CLASS
+    generator = generator_class(urlconf=spectacular_settings.SERVE_URLCONF, api_version=api_version)
+    schema = generator.get_schema(request=None, public=True)
+    return SCHEMA_FORMATS[fmt]().render(schema, renderer_context={})
+
+
+def build_schema_artifact(fmt: str, persist: bool = True, api_version: str | None = None) -> SchemaArtifact:
+    """
+    Generate a schema artifact for the current code version and language.
+
+    Args:
+        fmt: 'yaml' or 'json'.
+        persist: Write the artifact to API_SCHEMA_CACHE_DIR.
+        api_version: One of ALLOWED_VERSIONS, or None for the default schema.
+    """
+    version = get_code_version()
+    api_version = schema_api_version(api_version)
+    language = schema_language()
+    artifact = _make_artifact(render_schema(fmt, api_version), version, fmt)
+
+    path = _cache_path(version, api_version, fmt, language)
+    if persist and path is not None:
+        try:
+            _write_atomic(path, artifact.content)
+        except OSError as e:
+            logger.warning("Failed to persist API schema: path=%s, error=%s", path, e)
+
+    with _lock:
+        _remember((version, api_version, fmt, language), artifact)
+    logger.info(
+        "API schema generated: version=%s, api_version=%s, format=%s, language=%s",
+        version, api_version, fmt, language
+    )
+    return artifact
+
+
+def get_schema_artifact(fmt: str, api_version: str | None = None) -> SchemaArtifact:
+    """
+    Return the schema artifact for the current code version.
+
+    Looks in memory, then on disk, and generates the schema only if
+    neither has it. Concurrent first requests generate it once. Unknown
+    API versions and languages get the default schema.
+    """
+    version = get_code_version()
+    api_version = schema_api_version(api_version)
+    language = schema_language()
+    key = (version, api_version, fmt, language)
+
+    artifact = _artifacts.get(key)
+    if artifact is not None:
+        return artifact
+
+    with _lock:
+        artifact = _artifacts.get(key)
+        if artifact is not None:
+            return artifact
+
+        path = _cache_path(version, api_version, fmt, language)
+        if path is not None and path.exists():
+            artifact = _make_artifact(path.read_bytes(), version, fmt)
+            _remember(key, artifact)
+            return artifact
+
+        return build_schema_artifact(fmt, api_version=api_version)
+
+
+def clear_schema_cache() -> None:
+    """Drop in-memory artifacts (disk artifacts are kept)."""
+    _artifacts.clear()
@@ -4,10 +4,12 @@ Core API serializers - includes legal document and app settings serializers.
 
 from rest_framework import serializers
 
+from apps.core.api.compiled import CompiledSerializerMixin
+from apps.core.direct_uploads import ALLOWED_UPLOAD_CONTENT_TYPES
 from apps.core.models import AppSettings, LegalDocument
 
 
-class AppSettingsSerializer(serializers.ModelSerializer):
+class AppSettingsSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for AppSettings model.
     Returns public branding configuration for mobile clients.
@@ -73,7 +75,7 @@ class LegalDocumentSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class LegalDocumentListSerializer(serializers.ModelSerializer):
+class LegalDocumentListSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing legal documents (without content)."""
 
     document_type_display = serializers.CharField(
@@ -94,6 +96,46 @@ class LegalDocumentListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class LegalDocumentSearchQuerySerializer(serializers.Serializer):
+    """Query parameters for searching legal documents."""
+
+    q = serializers.CharField(
+        min_length=2,
+        max_length=200,
+        help_text='Search terms; supports "quoted phrases", OR and -excluded words'
+    )
+    language = serializers.ChoiceField(
+        choices=LegalDocument.LANGUAGES,
+        required=False,
+        help_text='Only search documents in this language'
+    )
+    type = serializers.ChoiceField(
+        choices=LegalDocument.DOCUMENT_TYPES,
+        required=False,
+        help_text='Only search documents of this type'
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=10,
+        help_text='Maximum number of results'
+    )
+
+
+class LegalDocumentSearchResultSerializer(serializers.Serializer):
+    """A legal document search result (apps.core.search.LegalSearchResult)."""
+
+    id = serializers.IntegerField(source='document.id')
+    document_type = serializers.CharField(source='document.document_type')
+    document_type_display = serializers.CharField(source='document.get_document_type_display')
+    version = serializers.CharField(source='document.version')
+    title = serializers.CharField(source='document.title')
+    language = serializers.CharField(source='document.language')
+    effective_date = serializers.DateField(source='document.effective_date')
+    rank = serializers.FloatField(help_text='Relevance; 0 when ranking is unavailable')
+    snippet = serializers.CharField(help_text='HTML excerpt with matches wrapped in <mark>')
+
+
 class AcceptLegalDocumentsSerializer(serializers.Serializer):
     """Serializer for accepting legal documents."""
 
@@ -143,3 +185,39 @@ class AcceptLegalDocumentsSerializer(serializers.Serializer):
                     f'Privacy Policy version "{value}" not found or not active.'
                 )
         return value
+
+
+class DirectUploadRequestSerializer(serializers.Serializer):
+    """Serializer for requesting a presigned upload URL."""
+
+    filename = serializers.CharField(
+        max_length=255,
+        help_text='Original file name on the client'
+    )
+    content_type = serializers.ChoiceField(
+        choices=ALLOWED_UPLOAD_CONTENT_TYPES,
+        help_text='MIME type of the file to upload'
+    )
+
+
+class DirectUploadResponseSerializer(serializers.Serializer):
+    """
+    Response serializer for presigned upload URLs (OpenAPI documentation).
+    """
+
+    method = serializers.CharField(help_text='HTTP method to use (POST, multipart form)')
+    url = serializers.URLField(help_text='Object storage URL to upload to')
+    fields = serializers.DictField(
+        child=serializers.CharField(),
+        help_text='Form fields to send along with the file'
+    )
+    key = serializers.CharField(help_text='Object key of the upload')
+    upload_token = serializers.CharField(help_text='Token to pass to the completion endpoint')
+    expires_in = serializers.IntegerField(help_text='Seconds until the upload URL expires')
+    max_size = serializers.IntegerField(help_text='Maximum accepted file size in bytes')
+
+
+class DirectUploadCompleteSerializer(serializers.Serializer):
+    """Serializer for completing a direct upload."""
+
+    upload_token = serializers.CharField(help_text='Token returned when the upload URL was issued')
@@ -0,0 +1,55 @@
+"""
+Throttling helpers shared across API apps.
+"""
+
+from rest_framework import throttling
+
+from apps.core.async_cache import get_async_cache
+from apps.core.metrics import THROTTLE_REJECTIONS
+
+
+class AsyncThrottleMixin:
+    """
+    Adds ``aallow_request`` to a SimpleRateThrottle subclass.
+
+    Same algorithm and cache entries as allow_request(), but the history is
+    read and written through the async cache so async views do not block.
+    """
+
+    async def aallow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        cache = get_async_cache()
+        self.history = await cache.aget(self.key, [])
+        self.now = self.timer()
+
+        # Drop any requests from the history which have now passed the throttle duration
+        while self.history and self.history[-1] <= self.now - self.duration:
+            self.history.pop()
+        if len(self.history) >= self.num_requests:
+            return self.throttle_failure()
+
+        self.history.insert(0, self.now)
+        await cache.aset(self.key, self.history, self.duration)
+        return True
+
+
+class RejectionMetricsMixin:
+    """Counts rejected requests per throttle scope (throttle_rejections_total)."""
+
+    def throttle_failure(self):
+        THROTTLE_REJECTIONS.labels(scope=self.scope or type(self).__name__).inc()
+        return super().throttle_failure()
+
+
+class AnonRateThrottle(RejectionMetricsMixin, AsyncThrottleMixin, throttling.AnonRateThrottle):
+    """AnonRateThrottle usable from async views."""
+
+
+class UserRateThrottle(RejectionMetricsMixin, AsyncThrottleMixin, throttling.UserRateThrottle):
+    """UserRateThrottle usable from async views."""
@@ -6,11 +6,16 @@ from django.urls import path
 
 from apps.core.api.views import (
     AppSettingsAPIView,
+    AppSettingsLogoUploadURLAPIView,
+    AppSettingsLogoUploadCompleteAPIView,
     LegalDocumentListAPIView,
+    LegalDocumentSearchAPIView,
     TermsOfServiceAPIView,
     PrivacyPolicyAPIView,
     AcceptLegalDocumentsAPIView,
     CheckLegalUpdatesAPIView,
+    DatabaseConnectionStatsAPIView,
+    ServerTimingTokenAPIView,
 )
 
 app_name = 'core-api'
@@ -18,11 +23,18 @@ app_name = 'core-api'
 urlpatterns = [
     # App configuration
     path('config/app-settings/', AppSettingsAPIView.as_view(), name='app-settings'),
+    path('config/app-settings/logo/upload-url/', AppSettingsLogoUploadURLAPIView.as_view(), name='app-settings-logo-upload-url'),
+    path('config/app-settings/logo/complete/', AppSettingsLogoUploadCompleteAPIView.as_view(), name='app-settings-logo-upload-complete'),
 
     # Legal documents
     path('legal/', LegalDocumentListAPIView.as_view(), name='legal-list'),
+    path('legal/search/', LegalDocumentSearchAPIView.as_view(), name='legal-search'),
     path('legal/terms/', TermsOfServiceAPIView.as_view(), name='legal-terms'),
     path('legal/privacy/', PrivacyPolicyAPIView.as_view(), name='legal-privacy'),
     path('legal/accept/', AcceptLegalDocumentsAPIView.as_view(), name='legal-accept'),
     path('legal/check-updates/', CheckLegalUpdatesAPIView.as_view(), name='legal-check-updates'),
+
+    # Operations
+    path('system/db-connections/', DatabaseConnectionStatsAPIView.as_view(), name='system-db-connections'),
+    path('system/server-timing-token/', ServerTimingTokenAPIView.as_view(), name='system-server-timing-token'),
 ]
@@ -2,22 +2,49 @@
 Core API views - includes legal document and app settings endpoints.
 """
 
+from dataclasses import asdict
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils import translation
+from django.utils.http import parse_etags
 from rest_framework import status
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, OpenApiResponse
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
 
+from apps.core import server_timing
+from apps.core.db.metrics import get_connection_stats
+from apps.core.direct_uploads import DirectUploadError, DirectUploadService, is_enabled
 from apps.core.models import AppSettings, LegalDocument
+from apps.core.search import search_legal_documents
+from apps.core.api.permissions import IsSuperUser
+from apps.core.api.schema import get_schema_artifact, schema_api_version, schema_language
 from apps.core.api.serializers import (
     AppSettingsSerializer,
+    DirectUploadCompleteSerializer,
+    DirectUploadRequestSerializer,
+    DirectUploadResponseSerializer,
     LegalDocumentSerializer,
     LegalDocumentListSerializer,
+    LegalDocumentSearchQuerySerializer,
+    LegalDocumentSearchResultSerializer,
     AcceptLegalDocumentsSerializer,
 )
 
 
+def direct_upload_unavailable_response():
+    """Response returned when object storage is not configured."""
+    return Response(
+        {'error': True, 'message': 'Direct uploads are not configured'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
 class AppSettingsAPIView(APIView):
     """
     Get application branding and configuration settings.
@@ -38,8 +65,111 @@ class AppSettingsAPIView(APIView):
     )
     def get(self, request):
         settings = AppSettings.get_settings()
-        serializer = AppSettingsSerializer(settings, context={'request': request})
-        return Response(serializer.data)
+        return Response(AppSettingsSerializer.represent(settings, context={'request': request}))
+
+
+class AppSettingsLogoUploadURLAPIView(APIView):
+    """
+    Issue a presigned URL to upload a new logo directly to object storage.
+    Superusers only.
+    """
+    permission_classes = [IsSuperUser]
+
+    @extend_schema(
+        summary='Get logo upload URL',
+        description='Returns a presigned POST policy for uploading the app logo '
+                    'directly to object storage. Call the completion endpoint '
+                    'with the returned upload_token once the upload succeeded.',
+        request=DirectUploadRequestSerializer,
+        responses={
+            200: DirectUploadResponseSerializer,
+            400: OpenApiResponse(description='Validation error'),
+            403: OpenApiResponse(description='Superuser required'),
+            503: OpenApiResponse(description='Object storage not configured'),
+        },
+        tags=['Config'],
+    )
+    def post(self, request):
+        if not is_enabled():
+            return direct_upload_unavailable_response()
+
+        serializer = DirectUploadRequestSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': True,
+                    'message': 'Validation failed',
+                    'details': serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        upload = DirectUploadService.create_upload(
+            prefix='branding',
+            filename=serializer.validated_data['filename'],
+            content_type=serializer.validated_data['content_type'],
+            purpose='logo',
+            owner_id=AppSettings.SINGLETON_PK,
+            max_size=DirectUploadService.get_max_size('logo'),
+        )
+        return Response(asdict(upload))
+
+
+class AppSettingsLogoUploadCompleteAPIView(APIView):
+    """
+    Attach a directly uploaded logo to AppSettings.
+    Regenerates the small logo and invalidates the settings cache.
+    Superusers only.
+    """
+    permission_classes = [IsSuperUser]
+
+    @extend_schema(
+        summary='Complete logo upload',
+        description='Validates the uploaded logo and makes it the active app logo.',
+        request=DirectUploadCompleteSerializer,
+        responses={
+            200: AppSettingsSerializer,
+            400: OpenApiResponse(description='Invalid upload token or image'),
+            403: OpenApiResponse(description='Superuser required'),
+            503: OpenApiResponse(description='Object storage not configured'),
+        },
+        tags=['Config'],
+    )
+    def post(self, request):
+        if not is_enabled():
+            return direct_upload_unavailable_response()
+
+        serializer = DirectUploadCompleteSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': True,
+                    'message': 'Validation failed',
+                    'details': serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            name = DirectUploadService.complete_upload(
+                serializer.validated_data['upload_token'],
+                purpose='logo',
+                owner_id=AppSettings.SINGLETON_PK,
+                max_size=DirectUploadService.get_max_size('logo'),
+            )
+        except DirectUploadError as e:
+            return Response(
+                {'error': True, 'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        app_settings = AppSettings.load()
+        app_settings.logo.name = name
+        app_settings.save()
+
+        return Response(AppSettingsSerializer.represent(app_settings, context={'request': request}))
 
 
 class LegalDocumentListAPIView(APIView):
@@ -58,9 +188,45 @@ class LegalDocumentListAPIView(APIView):
         tags=['Legal'],
     )
     def get(self, request):
+        documents = LegalDocument.objects.filter(is_active=True).defer(*LegalDocument.SEARCH_INDEX_FIELDS)
+        return Response(LegalDocumentListSerializer.represent_many(documents))
+
+
+class LegalDocumentSearchAPIView(APIView):
+    """
+    Full-text search over the active legal documents.
+    """
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary='Search legal documents',
+        description='Searches the active legal documents and returns the best matches, '
+                    'ranked by relevance, with highlighted snippets.',
+        parameters=[LegalDocumentSearchQuerySerializer],
+        responses={
+            200: OpenApiResponse(
+                response=LegalDocumentSearchResultSerializer(many=True),
+                description='Search results as {"query": ..., "results": [...]}'
+            ),
+            400: OpenApiResponse(description='Validation error'),
+        },
+        tags=['Legal'],
+    )
+    def get(self, request):
+        params = LegalDocumentSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
         documents = LegalDocument.objects.filter(is_active=True)
-        serializer = LegalDocumentListSerializer(documents, many=True)
-        return Response(serializer.data)
+        if query.get('type'):
+            documents = documents.filter(document_type=query['type'])
+        results = search_legal_documents(
+            documents, query['q'], language=query.get('language'), limit=query['limit']
+        )
+        return Response({
+            'query': query['q'],
+            'results': LegalDocumentSearchResultSerializer(results, many=True).data,
+        })
 
 
 class TermsOfServiceAPIView(APIView):
@@ -219,3 +385,93 @@ class CheckLegalUpdatesAPIView(APIView):
             'user_terms_version': user.terms_version_accepted or None,
             'user_privacy_version': user.privacy_version_accepted or None,
         })
+
+
+class DatabaseConnectionStatsAPIView(APIView):
+    """
+    Database connection pool metrics for the serving process.
+
+    Counters are per worker process; see apps.core.db.metrics.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(description="Connection metrics keyed by database alias"),
+            403: OpenApiResponse(description="Staff only"),
+        },
+        summary="Database connection metrics",
+        description="Open connections, reuse ratio, connect time and failures for this worker process.",
+        tags=["System"],
+    )
+    def get(self, request):
+        return Response({'databases': get_connection_stats()})
+
+
+class ServerTimingTokenAPIView(APIView):
+    """
+    Issue a token enabling the Server-Timing header, and on-demand profiling
+    (X-Profile: 1), on the caller's requests.
+
+    Staff signed in to the admin get both with their session; clients
+    authenticating with JWTs send this token instead.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        request=None,
+        responses={
+            200: OpenApiResponse(description="Header name, token and lifetime in seconds"),
+            403: OpenApiResponse(description="Staff only"),
+        },
+        summary="Server-Timing debug token",
+        description="Send the token in the returned header to receive a Server-Timing breakdown "
+                    "(database, cache, rendering, email, password hashing) on each response.",
+        tags=["System"],
+    )
+    def post(self, request):
+        return Response({
+            'header': server_timing.HEADER,
+            'token': server_timing.make_token(request.user),
+            'expires_in': settings.SERVER_TIMING_TOKEN_MAX_AGE,
+        })
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    OpenAPI schema served from a precomputed artifact.
+
+    The schema is generated once per code version (see apps.core.api.schema)
+    instead of on every request, and supports conditional GETs via ETag.
+    Format is selected via content negotiation, as in SpectacularAPIView.
+    ?lang= and ?version= only select among LANGUAGES and ALLOWED_VERSIONS;
+    unknown values get the default schema.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        # Unlike SpectacularAPIView, never activate ?lang= as given: it ends up
+        # in the artifact cache key and file name
+        with translation.override(schema_language(request.GET.get('lang') or None)):
+            return self._get_schema_response(request)
+
+    def _get_schema_response(self, request):
+        api_version = schema_api_version(
+            self.api_version or request.version or request.GET.get('version')
+        )
+
+        renderer, _ = self.perform_content_negotiation(request)
+        fmt = 'json' if 'json' in renderer.format else 'yaml'
+        artifact = get_schema_artifact(fmt, api_version)
+
+        if artifact.etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(artifact.content, content_type=renderer.media_type)
+            response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, api_version)}"'
+
+        response['ETag'] = artifact.etag
+        patch_cache_control(response, public=True, max_age=settings.API_SCHEMA_MAX_AGE)
+        return response
@@ -4,4 +4,17 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
-    verbose_name = 'Core'
\ No newline at end of file
+    verbose_name = 'Core'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import server_timing, signals, tracing  # noqa: F401
+        from .db import slow_queries
+
+        if tracing.is_enabled():
+            tracing.install()
+        if settings.SERVER_TIMING_ENABLED:
+            server_timing.install()
+        if settings.SLOW_QUERY_THRESHOLD_MS:
+            slow_queries.install()
@@ -0,0 +1,120 @@
+"""
+Async access to the Django cache for async views.
+
+When the cache is django-redis, reads and writes go through a native
+``redis.asyncio`` client, using the backend's own keys (KEY_PREFIX,
+VERSION, KEY_FUNCTION) and value encoding so both clients see the same
+entries. The client is configured from the alias' LOCATION and OPTIONS
+(PASSWORD, socket timeouts, CONNECTION_POOL_KWARGS, REDIS_CLIENT_KWARGS),
+like django-redis' own connections. Other backends use Django's async cache
+API (``aget``/``aset``), which runs the sync backend in a thread.
+"""
+
+import asyncio
+import weakref
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from apps.core.server_timing import timed
+
+# redis.asyncio clients are bound to the event loop that created them
+_redis_clients = weakref.WeakKeyDictionary()
+
+
+class DjangoAsyncCache:
+    """Async cache wrapper using Django's built-in async API."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def aget(self, key, default=None, version=None):
+        return await self.backend.aget(key, default, version=version)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        await self.backend.aset(key, value, timeout, version=version)
+
+    async def adelete(self, key, version=None):
+        await self.backend.adelete(key, version=version)
+
+
+class RedisAsyncCache(DjangoAsyncCache):
+    """Async cache wrapper using a native redis.asyncio client."""
+
+    def __init__(self, backend, alias):
+        super().__init__(backend)
+        self.alias = alias
+
+    def _make_client(self):
+        import redis.asyncio as aioredis
+
+        config = settings.CACHES[self.alias]
+        options = config.get('OPTIONS', {})
+        kwargs = {}
+        if options.get('PASSWORD'):
+            kwargs['password'] = options['PASSWORD']
+        if options.get('SOCKET_TIMEOUT'):
+            kwargs['socket_timeout'] = options['SOCKET_TIMEOUT']
+        if options.get('SOCKET_CONNECT_TIMEOUT'):
+            kwargs['socket_connect_timeout'] = options['SOCKET_CONNECT_TIMEOUT']
+        # Pool options such as max_connections or ssl_cert_reqs (rediss:// URLs)
+        kwargs.update(options.get('CONNECTION_POOL_KWARGS', {}))
+        pool = aioredis.ConnectionPool.from_url(_redis_url(config), **kwargs)
+        return aioredis.Redis(connection_pool=pool, **options.get('REDIS_CLIENT_KWARGS', {}))
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        clients = _redis_clients.setdefault(loop, {})
+        client = clients.get(self.alias)
+        if client is None:
+            client = clients[self.alias] = self._make_client()
+        return client
+
+    def _key(self, key, version):
+        # Django's make_key: KEY_PREFIX, VERSION and KEY_FUNCTION, as in django-redis
+        return self.backend.make_key(key, version=version)
+
+    async def aget(self, key, default=None, version=None):
+        with timed('cache'):
+            value = await self._client().get(self._key(key, version))
+        if value is None:
+            return default
+        return self.backend.client.decode(value)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.backend.get_backend_timeout(timeout)
+        nkey = self._key(key, version)
+        if timeout is not None and timeout <= 0:
+            # Matches django-redis: a non-positive timeout deletes the key
+            with timed('cache'):
+                await self._client().delete(nkey)
+            return
+        px = int(timeout * 1000) if timeout is not None else None
+        with timed('cache'):
+            await self._client().set(nkey, self.backend.client.encode(value), px=px)
+
+    async def adelete(self, key, version=None):
+        with timed('cache'):
+            await self._client().delete(self._key(key, version))
+
+
+def _redis_url(config):
+    location = config.get('LOCATION', '')
+    if isinstance(location, (list, tuple)):
+        location = location[0]
+    return location.split(',')[0].strip()
+
+
+def get_async_cache(alias: str = DEFAULT_CACHE_ALIAS) -> DjangoAsyncCache:
+    """Return an async wrapper for the given cache alias."""
+    backend = caches[alias]
+    try:
+        from django_redis.cache import RedisCache
+        from django_redis.client import DefaultClient
+    except ImportError:
+        return DjangoAsyncCache(backend)
+
+    if isinstance(backend, RedisCache) and type(backend.client) is DefaultClient:
+        return RedisAsyncCache(backend, alias)
+    return DjangoAsyncCache(backend)
@@ -0,0 +1,128 @@
+"""
+Async email sending for async views and batch jobs (asend_messages).
+
+With the SMTP backend, messages are delivered with aiosmtplib so the event
+loop is not blocked while waiting on the mail server. Any other backend
+(console, locmem, file) is called through sync_to_async, which keeps tests
+and development behavior identical to django.core.mail.send_mail.
+"""
+
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
+
+from apps.core.server_timing import timed
+from apps.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+
+def build_message(subject, message, from_email, recipient_list, html_message=None) -> EmailMultiAlternatives:
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        to=recipient_list,
+    )
+    if html_message:
+        email.attach_alternative(html_message, 'text/html')
+    return email
+
+
+async def _send_smtp(email: EmailMultiAlternatives) -> None:
+    import aiosmtplib
+
+    use_ssl = getattr(settings, 'EMAIL_USE_SSL', False)
+    await aiosmtplib.send(
+        email.message(),
+        sender=email.from_email,
+        recipients=email.recipients(),
+        hostname=settings.EMAIL_HOST,
+        port=int(settings.EMAIL_PORT),
+        username=settings.EMAIL_HOST_USER or None,
+        password=settings.EMAIL_HOST_PASSWORD or None,
+        use_tls=use_ssl,
+        start_tls=bool(settings.EMAIL_USE_TLS) and not use_ssl,
+        timeout=getattr(settings, 'EMAIL_TIMEOUT', None) or 30,
+    )
+
+
+async def asend_mail(
+    subject: str,
+    message: str,
+    from_email: str,
+    recipient_list: list[str],
+    html_message: str | None = None,
+) -> None:
+    """
+    Async counterpart of django.core.mail.send_mail.
+
+    Raises the underlying exception on failure (like fail_silently=False).
+    """
+    if settings.EMAIL_BACKEND == SMTP_BACKEND:
+        try:
+            import aiosmtplib  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            with span('email.send_messages', kind='client', attributes={'code.class': 'aiosmtplib'}), timed('email'):
+                await _send_smtp(build_message(subject, message, from_email, recipient_list, html_message))
+            return
+
+    await sync_to_async(send_mail)(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipient_list=recipient_list,
+        html_message=html_message,
+        fail_silently=False,
+    )
+
+
+async def asend_messages(messages: list[EmailMultiAlternatives], concurrency: int = 10) -> int:
+    """
+    Send a batch of messages, e.g. invitations, without failing the batch.
+
+    With the SMTP backend and aiosmtplib, up to `concurrency` messages are
+    delivered at once. Any other backend gets the whole batch in one
+    send_messages() call, which the Django SMTP backend sends over a single
+    connection.
+
+    Returns:
+        Number of messages sent; failures are logged.
+    """
+    if not messages:
+        return 0
+
+    if settings.EMAIL_BACKEND == SMTP_BACKEND:
+        try:
+            import aiosmtplib  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def send(email):
+                async with semaphore:
+                    try:
+                        await _send_smtp(email)
+                        return True
+                    except Exception as e:
+                        logger.error("Failed to send email: recipients=%s, error=%s", len(email.to), e)
+                        return False
+
+            with span('email.send_messages', kind='client', attributes={'code.class': 'aiosmtplib'}), timed('email'):
+                results = await asyncio.gather(*(send(email) for email in messages))
+            return sum(results)
+
+    def send_batch():
+        # fail_silently: one bad address must not drop the rest of the batch
+        connection = get_connection(fail_silently=True)
+        return connection.send_messages(messages) or 0
+
+    return await sync_to_async(send_batch)()
@@ -0,0 +1,70 @@
+"""
+Background worker threads for request instrumentation.
+
+Tracing and slow query capture hand work from request code to a daemon
+thread through a bounded queue, so requests never wait for exporters or
+extra database writes.
+"""
+
+import os
+import queue
+import threading
+
+
+class BackgroundWorker:
+    """
+    Process submitted items in a daemon thread.
+
+    The thread starts on the first submit(), and again in a forked worker
+    process. When the queue is full (processing slower than traffic), items
+    are dropped and counted rather than slowing down requests.
+
+    Subclasses implement process(items). It runs in the worker thread, one
+    item at a time, and from flush() in the calling thread.
+    """
+
+    thread_name = 'background-worker'
+    max_queued = 1000
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=self.max_queued)
+        self.lock = threading.Lock()
+        self.pid = None
+        self.dropped = 0
+
+    def submit(self, item) -> None:
+        if self.pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        # Also after a fork: the parent's worker thread does not exist in the child
+        with self.lock:
+            if self.pid != os.getpid():
+                self.queue = queue.Queue(maxsize=self.max_queued)
+                threading.Thread(target=self._run, name=self.thread_name, daemon=True).start()
+                self.pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self.process([self.queue.get()])
+            self.after_process()
+
+    def flush(self) -> None:
+        """Process queued items now (tests, shutdown)."""
+        items = []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        self.process(items)
+
+    def process(self, items: list) -> None:
+        raise NotImplementedError
+
+    def after_process(self) -> None:
+        """Called in the worker thread after each item."""
@@ -0,0 +1,238 @@
+"""
+Lightweight benchmarking helpers used by the benchmark management commands.
+
+Timings are wall-clock (time.perf_counter) per call, so results include
+Python overhead and are only comparable on the same machine. Query counts
+and memory are comparable anywhere.
+"""
+
+import gc
+import math
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-call timings for one benchmarked callable."""
+    name: str
+    samples: list[float] = field(default_factory=list)  # seconds per call
+    payload_bytes: int | None = None
+    queries: list[int] = field(default_factory=list)  # database queries per call, when counted
+    peak_memory: int | None = None  # bytes allocated at peak during a call (median), when traced
+
+    @property
+    def iterations(self) -> int:
+        return len(self.samples)
+
+    @property
+    def total(self) -> float:
+        return sum(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples) if self.samples else 0.0
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.iterations / self.total if self.total else 0.0
+
+    @property
+    def queries_per_call(self) -> float | None:
+        return statistics.fmean(self.queries) if self.queries else None
+
+    def percentile(self, percent: float) -> float:
+        """Return the given percentile (nearest-rank) in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+        return ordered[rank]
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'iterations': self.iterations,
+            'mean_us': round(self.mean * 1e6, 2),
+            'p50_us': round(self.percentile(50) * 1e6, 2),
+            'p95_us': round(self.percentile(95) * 1e6, 2),
+            'p99_us': round(self.percentile(99) * 1e6, 2),
+            'ops_per_second': round(self.ops_per_second, 1),
+            'payload_bytes': self.payload_bytes,
+            'queries_per_call': self.queries_per_call,
+            'peak_memory_kib': round(self.peak_memory / 1024, 1) if self.peak_memory is not None else None,
+        }
+
+
+def measure(name: str, func: Callable, iterations: int = 1000, warmup: int = 10) -> BenchmarkResult:
+    """
+    Call func repeatedly and record per-call timings.
+
+    Garbage collection is disabled while sampling to reduce noise.
+
+    Args:
+        name: Label for the result.
+        func: Zero-argument callable to benchmark.
+        iterations: Number of timed calls.
+        warmup: Number of untimed calls made first.
+
+    Returns:
+        BenchmarkResult with one sample per call. If func returns bytes or
+        str, the size of the last return value is recorded.
+    """
+    for _ in range(warmup):
+        func()
+
+    result = BenchmarkResult(name=name)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        clock = time.perf_counter
+        value = None
+        for _ in range(iterations):
+            start = clock()
+            value = func()
+            result.samples.append(clock() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    if isinstance(value, (bytes, str)):
+        result.payload_bytes = len(value)
+    return result
+
+
+def measure_calls(
+    name: str,
+    func: Callable,
+    setup: Callable | None = None,
+    iterations: int = 100,
+    warmup: int = 5,
+    memory_iterations: int = 5,
+) -> BenchmarkResult:
+    """
+    Benchmark a call that may hit the database, such as a request made with
+    the Django test client.
+
+    Records per-call timings and query counts, then traces memory over
+    memory_iterations separate calls (tracemalloc slows every allocation,
+    so those calls are not timed).
+
+    Args:
+        name: Label for the result.
+        func: Callable taking the value returned by setup (or no argument).
+        setup: Optional untimed callable run before each call, e.g. to
+            create a one-time code the call consumes.
+        iterations: Number of timed calls.
+        warmup: Number of untimed calls made first.
+        memory_iterations: Number of calls traced for memory.
+    """
+    from apps.core.db.queries import count_queries
+
+    def call():
+        return func(setup()) if setup else func()
+
+    for _ in range(warmup):
+        call()
+
+    result = BenchmarkResult(name=name)
+    clock = time.perf_counter
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            argument = setup() if setup else None
+            with count_queries() as stats:
+                start = clock()
+                func(argument) if setup else func()
+                result.samples.append(clock() - start)
+            result.queries.append(stats.count)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    peaks = []
+    for _ in range(memory_iterations):
+        argument = setup() if setup else None
+        tracemalloc.start()
+        try:
+            func(argument) if setup else func()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    if peaks:
+        result.peak_memory = int(statistics.median(peaks))
+    return result
+
+
+def compare_to_baseline(
+    results: list[BenchmarkResult],
+    baseline: dict,
+    latency_tolerance: float = 0.5,
+    memory_tolerance: float = 0.25,
+) -> list[str]:
+    """
+    Compare results with a baseline produced by as_dict(), keyed by name.
+
+    A result regresses when it makes more queries per call than the
+    baseline, or when its p95 latency or peak memory exceed the baseline by
+    more than the given fraction. Results missing from the baseline are
+    not compared.
+
+    Returns:
+        One message per regression.
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            continue
+        current = result.as_dict()
+        if current['queries_per_call'] is not None and reference.get('queries_per_call') is not None:
+            if current['queries_per_call'] > reference['queries_per_call']:
+                regressions.append(
+                    f"{result.name}: {current['queries_per_call']:g} queries per call, "
+                    f"baseline {reference['queries_per_call']:g}"
+                )
+        checks = [('p95_us', 'p95 latency', 'us', latency_tolerance), ('peak_memory_kib', 'peak memory', 'KiB', memory_tolerance)]
+        for key, label, unit, tolerance in checks:
+            value, limit = current.get(key), reference.get(key)
+            if value is None or limit is None:
+                continue
+            if value > limit * (1 + tolerance):
+                regressions.append(
+                    f"{result.name}: {label} {value:g} {unit}, baseline {limit:g} {unit} "
+                    f"(+{(value / limit - 1) * 100:.0f}%, tolerance {tolerance * 100:.0f}%)"
+                )
+    return regressions
+
+
+def format_results(results: list[BenchmarkResult], baseline: str | None = None) -> str:
+    """
+    Format results as a plain-text table.
+
+    Args:
+        results: Results to format.
+        baseline: Optional result name; adds a speedup column relative to it.
+    """
+    reference = next((r for r in results if r.name == baseline), None)
+    header = f"{'benchmark':<44} {'mean us':>10} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'ops/s':>12}"
+    if reference:
+        header += f" {'speedup':>8}"
+    lines = [header, '-' * len(header)]
+
+    for result in results:
+        row = (
+            f"{result.name:<44} {result.mean * 1e6:>10.1f} {result.percentile(50) * 1e6:>10.1f} "
+            f"{result.percentile(95) * 1e6:>10.1f} {result.percentile(99) * 1e6:>10.1f} "
+            f"{result.ops_per_second:>12.0f}"
+        )
+        if reference:
+            speedup = reference.mean / result.mean if result.mean else 0.0
+            row += f" {speedup:>7.2f}x"
+        lines.append(row)
+
+    return '\n'.join(lines)
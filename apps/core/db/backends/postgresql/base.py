@@ -0,0 +1,13 @@
+"""
+PostgreSQL backend that records connection metrics.
+
+Identical to django.db.backends.postgresql; see apps.core.db.metrics.
+"""
+
+from django.db.backends.postgresql import base
+
+from apps.core.db.metrics import ConnectionMetricsMixin
+
+
+class DatabaseWrapper(ConnectionMetricsMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,88 @@
+"""
+Row counts from PostgreSQL planner estimates.
+
+An exact COUNT(*) reads every matching row; on tables with tens of
+millions of rows that takes seconds. estimate_count() instead asks the
+planner:
+
+- an unfiltered queryset is estimated from pg_class.reltuples, kept up to
+  date by ANALYZE/autovacuum;
+- a filtered one from the row estimate of EXPLAIN for its query.
+
+EstimatedCountPaginator uses the estimate when it is at or above
+ADMIN_EXACT_COUNT_THRESHOLD and counts exactly below it, so small
+filtered results stay exact. Other databases always count exactly.
+Admins using it set show_full_result_count = False, which drops the
+second, unfiltered count; the changelist shows "about N" for estimates
+(templates/admin/pagination.html).
+"""
+
+import json
+import logging
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, transaction
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+def _table_estimate(cursor, table: str) -> int | None:
+    cursor.execute('SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)', [table])
+    row = cursor.fetchone()
+    # -1: never vacuumed or analyzed (PostgreSQL 14+); 0 may mean the same before 14
+    if row is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+def _explain_estimate(cursor, sql: str, params) -> int:
+    cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_count(queryset) -> int | None:
+    """
+    Planner estimate of queryset.count(), or None when the database is not
+    PostgreSQL or the planner cannot tell.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    query = queryset.query
+    try:
+        # A savepoint when called inside a transaction: a failed EXPLAIN must not abort it
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            if not query.where and not query.distinct and not query.combinator and not query.is_sliced:
+                estimate = _table_estimate(cursor, queryset.model._meta.db_table)
+                if estimate is not None:
+                    return estimate
+            sql, params = queryset.order_by().query.sql_with_params()
+            return _explain_estimate(cursor, sql, params)
+    except DatabaseError as e:
+        logger.warning("Count estimate failed: model=%s, error=%s", queryset.model._meta.label, e)
+        return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator counting large results from planner estimates.
+
+    `estimated` tells whether count is an estimate. Pages past the real
+    end are empty; results beyond an underestimated count are not paged to.
+    """
+    estimated = False
+
+    @cached_property
+    def count(self):
+        threshold = getattr(settings, 'ADMIN_EXACT_COUNT_THRESHOLD', 10_000)
+        if hasattr(self.object_list, 'query'):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= threshold:
+                self.estimated = True
+                return estimate
+        return super().count
@@ -0,0 +1,140 @@
+"""
+Database connection metrics.
+
+With persistent connections (CONN_MAX_AGE > 0) each worker thread keeps its
+connection open between requests, so most requests skip the TCP/TLS/auth
+handshake. ConnectionMetricsMixin records how well that works, per database
+alias and per process:
+
+- open_connections: connections currently open (the "pool size")
+- checkouts / reused: requests that needed a connection, and how many of
+  them got an already open one
+- connect_seconds_total / connect_seconds_max: time spent opening new
+  connections (what a request waits for on a pool miss)
+- connect_failures: connection attempts that raised
+- health_check_failures: persistent connections found dead by
+  CONN_HEALTH_CHECKS and replaced
+- closed_obsolete: connections closed for exceeding CONN_MAX_AGE or after
+  unrecoverable errors
+
+The counters are also exported to Prometheus (apps.core.metrics), which
+aggregates them across worker processes.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+
+from apps.core.metrics import record_db_connect, record_db_update
+
+_lock = threading.Lock()
+
+
+@dataclass
+class ConnectionStats:
+    """Connection counters for one database alias."""
+    open_connections: int = 0
+    connections_opened: int = 0
+    checkouts: int = 0
+    reused: int = 0
+    connect_seconds_total: float = 0.0
+    connect_seconds_max: float = 0.0
+    connect_failures: int = 0
+    health_check_failures: int = 0
+    closed_obsolete: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.checkouts if self.checkouts else 0.0
+
+    @property
+    def connect_seconds_mean(self) -> float:
+        return self.connect_seconds_total / self.connections_opened if self.connections_opened else 0.0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data['reuse_ratio'] = round(self.reuse_ratio, 4)
+        data['connect_seconds_mean'] = round(self.connect_seconds_mean, 6)
+        return data
+
+
+_stats = defaultdict(ConnectionStats)
+
+
+def _update(alias: str, **increments) -> None:
+    with _lock:
+        stats = _stats[alias]
+        for name, value in increments.items():
+            setattr(stats, name, getattr(stats, name) + value)
+    record_db_update(alias, increments)
+
+
+def record_connect(alias: str, seconds: float) -> None:
+    with _lock:
+        stats = _stats[alias]
+        stats.open_connections += 1
+        stats.connections_opened += 1
+        stats.connect_seconds_total += seconds
+        stats.connect_seconds_max = max(stats.connect_seconds_max, seconds)
+    record_db_connect(alias, seconds)
+
+
+def get_connection_stats() -> dict[str, dict]:
+    """Return a snapshot of the counters, keyed by database alias."""
+    with _lock:
+        return {alias: stats.as_dict() for alias, stats in _stats.items()}
+
+
+def reset_connection_stats() -> None:
+    """Clear all counters (used by tests)."""
+    with _lock:
+        _stats.clear()
+
+
+class ConnectionMetricsMixin:
+    """
+    DatabaseWrapper mixin recording connection metrics.
+
+    A "checkout" is the first time a request (or task) needs the database:
+    Django calls close_if_unusable_or_obsolete() at the start and end of
+    every request, which is where the checkout is reset.
+    """
+
+    _checked_out = False
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        except Exception:
+            _update(self.alias, connect_failures=1)
+            raise
+        record_connect(self.alias, time.perf_counter() - start)
+
+    def ensure_connection(self):
+        if not self._checked_out:
+            self._checked_out = True
+            _update(self.alias, checkouts=1, reused=int(self.connection is not None))
+        super().ensure_connection()
+
+    def close(self):
+        was_open = self.connection is not None and not self.closed_in_transaction
+        try:
+            super().close()
+        finally:
+            if was_open and (self.connection is None or self.closed_in_transaction):
+                _update(self.alias, open_connections=-1)
+
+    def close_if_health_check_failed(self):
+        was_open = self.connection is not None
+        super().close_if_health_check_failed()
+        if was_open and self.connection is None:
+            _update(self.alias, health_check_failures=1)
+
+    def close_if_unusable_or_obsolete(self):
+        self._checked_out = False
+        was_open = self.connection is not None
+        super().close_if_unusable_or_obsolete()
+        if was_open and self.connection is None:
+            _update(self.alias, closed_obsolete=1)
@@ -0,0 +1,47 @@
+"""
+Migration operations for PostgreSQL-only schema features.
+
+PostgresOnly wraps an operation (extensions, GIN/trigram indexes,
+CREATE INDEX CONCURRENTLY) so that it changes the migration state
+everywhere but only touches the database on PostgreSQL. Development and
+test databases on SQLite migrate without the feature; queries work the
+same, just without the index.
+"""
+
+from django.db import migrations
+
+
+class PostgresOnly(migrations.operations.base.Operation):
+    """Apply `operation` to the database only when it is PostgreSQL."""
+
+    def __init__(self, operation):
+        self.operation = operation
+
+    def deconstruct(self):
+        return self.__class__.__name__, [self.operation], {}
+
+    @property
+    def reversible(self):
+        return self.operation.reversible
+
+    @property
+    def reduces_to_sql(self):
+        return self.operation.reduces_to_sql
+
+    def state_forwards(self, app_label, state):
+        self.operation.state_forwards(app_label, state)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            self.operation.database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            self.operation.database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f'{self.operation.describe()} (PostgreSQL only)'
+
+    @property
+    def migration_name_fragment(self):
+        return self.operation.migration_name_fragment
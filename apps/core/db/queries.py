@@ -0,0 +1,96 @@
+"""
+Per-request database query accounting.
+
+count_queries() records every statement executed on any database alias
+while it is active: the number of queries, the time spent in the database
+and how many statements repeated an earlier one (same SQL, any parameters),
+which is the usual signature of an N+1 loop.
+
+Statements are recorded through a connection execute wrapper that reads
+the active QueryStats from a context variable, so queries made by async
+views through sync_to_async are counted against the request that made them.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_active_stats: ContextVar[tuple] = ContextVar('query_stats', default=())
+
+
+@dataclass
+class QueryStats:
+    """Queries executed during one request or block."""
+    count: int = 0
+    duration: float = 0.0  # seconds
+    statements: Counter = field(default_factory=Counter)
+
+    @property
+    def duplicates(self) -> int:
+        """Number of statements that repeated an earlier statement."""
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def most_repeated(self, limit: int = 3) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.statements.most_common(limit) if n > 1]
+
+    def record(self, sql: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[sql] += 1
+
+
+def _record_query(execute, sql, params, many, context):
+    active = _active_stats.get()
+    if not active:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        for stats in active:
+            stats.record(sql, duration)
+
+
+def _install(connection) -> None:
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _install_on_new_connection(sender, connection, **kwargs):
+    _install(connection)
+
+
+def install_query_recorder() -> None:
+    """
+    Record queries on this thread's connections and on every connection
+    opened from now on. Recording is a no-op outside count_queries().
+    """
+    connection_created.connect(_install_on_new_connection, dispatch_uid='apps.core.db.queries')
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
+
+
+@contextmanager
+def count_queries():
+    """
+    Count queries executed inside the block. Blocks may be nested; each
+    counts everything executed inside it.
+
+    Usage:
+        with count_queries() as stats:
+            ...
+        stats.count, stats.duration, stats.duplicates
+    """
+    install_query_recorder()
+    stats = QueryStats()
+    token = _active_stats.set((*_active_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
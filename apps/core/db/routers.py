@@ -0,0 +1,217 @@
+"""
+Read-replica database routing.
+
+Reads go to a replica from settings.DATABASE_REPLICAS and writes go to
+the primary ('default'). Reads stay on the primary when:
+
+- no replica is configured, or every replica is lagging by more than
+  DATABASE_REPLICA_MAX_LAG seconds;
+- the current request writes (any non-safe HTTP method), or the code runs
+  inside a transaction on the primary;
+- the user wrote within the last DATABASE_PRIMARY_PIN_SECONDS
+  (read-your-writes). ReplicaRoutingMiddleware pins users after
+  successful writes. Services that log a user in by writing, such as OTP
+  verify or email verification, call pin_to_primary() themselves;
+- the model is in DATABASE_PRIMARY_ONLY_MODELS. Short-lived auth state,
+  such as sessions and OTP tokens, is read right after being written by
+  anonymous clients.
+
+Routing state is held in a context variable, so it follows the request
+through sync and async code. ReplicaRoutingMiddleware sets it for each
+request and restores it afterwards; outside a request (Celery tasks,
+management commands) pin_to_primary() only records the user's pin and
+leaves the context alone, so it cannot stay pinned for the rest of the
+thread.
+"""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.core.async_cache import get_async_cache
+
+logger = logging.getLogger(__name__)
+
+PIN_CACHE_KEY = 'db:primary_pin:{}'
+
+# Seconds a measured replica lag is reused before measuring again
+LAG_CHECK_INTERVAL = 5
+
+# None outside ReplicaRoutingMiddleware, otherwise whether reads use the primary
+_use_primary = contextvars.ContextVar('db_use_primary', default=None)
+
+_lag_lock = threading.Lock()
+_lag_checked = {}  # alias -> (monotonic timestamp, lag seconds or None)
+
+LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def get_replicas() -> list[str]:
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def use_primary(value: bool = True) -> contextvars.Token:
+    """Force reads in the current context to the primary. Returns a reset token."""
+    return _use_primary.set(value)
+
+
+def reset_use_primary(token: contextvars.Token) -> None:
+    _use_primary.reset(token)
+
+
+def _pin_timeout() -> int:
+    return getattr(settings, 'DATABASE_PRIMARY_PIN_SECONDS', 10)
+
+
+def _pin_current_request() -> None:
+    if _use_primary.get() is not None:
+        # Reset by ReplicaRoutingMiddleware at the end of the request
+        use_primary()
+
+
+def pin_to_primary(user_id) -> None:
+    """Read from the primary for this user's requests for the pin window, the current one included."""
+    _pin_current_request()
+    if user_id is not None and get_replicas():
+        cache.set(PIN_CACHE_KEY.format(user_id), 1, _pin_timeout())
+
+
+async def apin_to_primary(user_id) -> None:
+    """Async version of pin_to_primary()."""
+    _pin_current_request()
+    if user_id is not None and get_replicas():
+        await get_async_cache().aset(PIN_CACHE_KEY.format(user_id), 1, _pin_timeout())
+
+
+def is_pinned(user_id) -> bool:
+    return user_id is not None and bool(cache.get(PIN_CACHE_KEY.format(user_id)))
+
+
+async def ais_pinned(user_id) -> bool:
+    return user_id is not None and bool(await get_async_cache().aget(PIN_CACHE_KEY.format(user_id)))
+
+
+def measure_replica_lag(alias: str) -> float:
+    """Return the replica's replay lag in seconds (0 when fully caught up)."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        row = cursor.fetchone()
+    return float(row[0]) if row and row[0] is not None else 0.0
+
+
+def replica_lag(alias: str) -> float | None:
+    """
+    Replica lag in seconds, measured at most every LAG_CHECK_INTERVAL seconds.
+
+    Returns None when the replica cannot be reached.
+    """
+    now = time.monotonic()
+    with _lag_lock:
+        checked = _lag_checked.get(alias)
+    if checked and now - checked[0] < LAG_CHECK_INTERVAL:
+        return checked[1]
+
+    try:
+        lag = measure_replica_lag(alias)
+    except Exception as e:
+        logger.warning("Replica lag check failed: alias=%s, error=%s", alias, e)
+        lag = None
+
+    with _lag_lock:
+        _lag_checked[alias] = (now, lag)
+    return lag
+
+
+def reset_replica_lag() -> None:
+    """Forget measured lags (used by tests)."""
+    with _lag_lock:
+        _lag_checked.clear()
+
+
+def healthy_replicas() -> list[str]:
+    """Replicas whose lag is known and below DATABASE_REPLICA_MAX_LAG."""
+    max_lag = getattr(settings, 'DATABASE_REPLICA_MAX_LAG', 5)
+    healthy = []
+    for alias in get_replicas():
+        lag = replica_lag(alias)
+        if lag is not None and lag <= max_lag:
+            healthy.append(alias)
+    return healthy
+
+
+class DedicatedDatabaseRouter:
+    """
+    Place selected models on their own database.
+
+    settings.DATABASE_DEDICATED_MODELS maps model labels ('app.model') to a
+    database alias. Reads and writes of those models go to that alias; all
+    other models are left to the next router. Schema on dedicated databases
+    is not managed by migrate (their models keep cross-database foreign
+    keys to the primary); see the setup_auth_token_database command.
+    """
+
+    def _alias(self, model):
+        return getattr(settings, 'DATABASE_DEDICATED_MODELS', {}).get(model._meta.label_lower)
+
+    def db_for_read(self, model, **hints):
+        return self._alias(model)
+
+    def db_for_write(self, model, **hints):
+        return self._alias(model)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if self._alias(obj1) or self._alias(obj2):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in set(getattr(settings, 'DATABASE_DEDICATED_MODELS', {}).values()):
+            return False
+        return None
+
+
+class ReplicaRouter:
+    """Send reads to a healthy replica and everything else to the primary."""
+
+    def _primary_only(self, model) -> bool:
+        primary_only = getattr(settings, 'DATABASE_PRIMARY_ONLY_MODELS', ())
+        return model._meta.label_lower in primary_only
+
+    def db_for_read(self, model, **hints):
+        if (
+            _use_primary.get()
+            or self._primary_only(model)
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+
+        replicas = healthy_replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replicas():
+            return False
+        return None
@@ -0,0 +1,209 @@
+"""
+Slow query capture.
+
+Every statement slower than SLOW_QUERY_THRESHOLD_MS is recorded as a
+SlowQuery (shown in the admin) with:
+
+- its normalized SQL: literals and IN lists collapsed, so repeats of the
+  same statement share a fingerprint
+- the project code that ran it: the innermost app frame as `caller`, and
+  the chain of app frames (view, service, ...) as `stack`
+- its EXPLAIN plan (PostgreSQL `EXPLAIN (ANALYZE off)`, SQLite
+  `EXPLAIN QUERY PLAN`), flagged when it contains a sequential scan
+
+The request only measures the statement and, when it was slow, queues it.
+EXPLAIN and the insert run in a background thread on its own database
+connection. Only the newest SLOW_QUERY_BUFFER_SIZE captures are kept.
+Parameters are used for EXPLAIN but never stored.
+
+Disabled when SLOW_QUERY_THRESHOLD_MS is 0.
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+
+from apps.core.background import BackgroundWorker
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUED_QUERIES = 100
+MAX_STACK_FRAMES = 8
+EXPLAIN_PREFIXES = {
+    'postgresql': 'EXPLAIN (ANALYZE off) ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'mysql': 'EXPLAIN ',
+}
+EXPLAINABLE_RE = re.compile(r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+SEQUENTIAL_SCAN_RE = re.compile(r'\bSeq Scan\b|^\s*(?:\|--)?\s*SCAN\b', re.MULTILINE)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Set while recording, so EXPLAIN and the SlowQuery insert are not captured themselves
+_recording: ContextVar[bool] = ContextVar('slow_query_recording', default=False)
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL with parameters, literals and IN lists replaced by placeholders."""
+    sql = sql.replace('%s', '?')
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('(...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+# Instrumentation wrappers between the project code and the database
+_CORE_DIR = Path(__file__).resolve().parent.parent
+_SKIPPED_FILES = (
+    str(_CORE_DIR / 'db') + os.sep,
+    *(str(_CORE_DIR / name) for name in ('middleware.py', 'tracing.py', 'server_timing.py', 'profiling.py')),
+)
+
+
+def _app_frames():
+    """Frames of project code calling the database, innermost first."""
+    apps_dir = str(_CORE_DIR.parent) + os.sep
+    frames = []
+    frame = sys._getframe(2)
+    while frame is not None and len(frames) < MAX_STACK_FRAMES:
+        filename = frame.f_code.co_filename
+        if filename.startswith(apps_dir) and not filename.startswith(_SKIPPED_FILES):
+            path = os.path.relpath(filename, settings.BASE_DIR)
+            frames.append(f'{frame.f_code.co_qualname} ({path}:{frame.f_lineno})')
+        frame = frame.f_back
+    return frames
+
+
+@dataclass
+class CapturedQuery:
+    alias: str
+    vendor: str
+    sql: str
+    params: object
+    many: bool
+    duration: float  # seconds
+    frames: list
+
+
+def _capture_slow_query(execute, sql, params, many, context):
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold <= 0 or _recording.get():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        if duration * 1000 >= threshold:
+            connection = context['connection']
+            _recorder.submit(CapturedQuery(
+                connection.alias, connection.vendor, sql, params, many, duration, _app_frames()
+            ))
+
+
+def explain(alias: str, vendor: str, sql: str, params, many: bool = False) -> str:
+    """EXPLAIN plan of a statement, or '' when the database or statement is not supported."""
+    prefix = EXPLAIN_PREFIXES.get(vendor)
+    if prefix is None or not EXPLAINABLE_RE.match(sql):
+        return ''
+    if many:
+        params = next(iter(params), None)
+    # A savepoint when called inside a transaction: a failed EXPLAIN must not abort it
+    with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+
+class SlowQueryRecorder(BackgroundWorker):
+    """Explain and store captured queries from a background thread."""
+
+    thread_name = 'slow-query-recorder'
+    max_queued = MAX_QUEUED_QUERIES
+
+    def process(self, captures: list[CapturedQuery]) -> None:
+        for captured in captures:
+            self.record(captured)
+
+    def after_process(self) -> None:
+        # The worker thread's own connections, as the request cycle would
+        for connection in connections.all(initialized_only=True):
+            connection.close_if_unusable_or_obsolete()
+
+    def record(self, captured: CapturedQuery):
+        from apps.core.models import SlowQuery
+
+        token = _recording.set(True)
+        try:
+            with self.lock:
+                try:
+                    plan = explain(captured.alias, captured.vendor, captured.sql, captured.params, captured.many)
+                except Exception as e:
+                    plan = ''
+                    logger.warning("EXPLAIN failed: alias=%s, error=%s", captured.alias, e)
+                normalized = normalize_sql(captured.sql)
+                slow_query = SlowQuery.objects.create(
+                    alias=captured.alias,
+                    duration_ms=captured.duration * 1000,
+                    sql=normalized,
+                    fingerprint=fingerprint(normalized),
+                    caller=captured.frames[0] if captured.frames else '',
+                    stack='\n'.join(captured.frames),
+                    plan=plan,
+                    sequential_scan=bool(SEQUENTIAL_SCAN_RE.search(plan)),
+                )
+                _trim(SlowQuery, settings.SLOW_QUERY_BUFFER_SIZE)
+                return slow_query
+        except Exception as e:
+            logger.warning("Failed to record slow query: alias=%s, error=%s", captured.alias, e)
+        finally:
+            _recording.reset(token)
+
+
+def _trim(model, size: int) -> None:
+    """Keep the newest `size` rows."""
+    oldest_kept = list(model.objects.order_by('-pk').values_list('pk', flat=True)[size - 1:size])
+    if oldest_kept:
+        model.objects.filter(pk__lt=oldest_kept[0]).delete()
+
+
+_recorder = SlowQueryRecorder()
+flush = _recorder.flush
+atexit.register(flush)
+
+
+def _install(connection) -> None:
+    if _capture_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_capture_slow_query)
+
+
+def _install_on_new_connection(sender, connection, **kwargs):
+    _install(connection)
+
+
+def install() -> None:
+    """
+    Capture slow queries on this thread's connections and on every
+    connection opened from now on. Called from CoreConfig.ready() when
+    SLOW_QUERY_THRESHOLD_MS is set.
+    """
+    connection_created.connect(_install_on_new_connection, dispatch_uid='apps.core.db.slow_queries')
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
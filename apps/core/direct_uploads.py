@@ -0,0 +1,245 @@
+"""
+Direct-to-object-storage uploads.
+
+Clients upload files straight to the S3-compatible bucket using a presigned
+POST policy, so Django workers never stream the file body. The flow is:
+
+1. Client asks for an upload URL (``DirectUploadService.create_upload``).
+2. Client POSTs the file to the bucket with the returned form fields.
+3. Client calls the completion endpoint with the signed ``upload_token``;
+   the object is validated (``DirectUploadService.complete_upload``) and
+   attached to the model field, which triggers rendition processing.
+
+boto3 is imported lazily because it is a production-only dependency.
+"""
+
+import logging
+import mimetypes
+import uuid
+from dataclasses import dataclass
+from io import BytesIO
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from apps.core.images import validate_image_upload
+
+logger = logging.getLogger(__name__)
+
+# Content types accepted for direct image uploads
+ALLOWED_UPLOAD_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/webp')
+
+UPLOAD_TOKEN_SALT = 'apps.core.direct_uploads'
+
+# Bytes fetched from the bucket to validate the image header
+HEADER_RANGE_BYTES = 256 * 1024
+
+_client = None
+
+
+class DirectUploadError(Exception):
+    """Raised when a direct upload cannot be issued or completed."""
+
+
+@dataclass
+class DirectUpload:
+    """Presigned upload instructions returned to the client."""
+    method: str
+    url: str
+    fields: dict
+    key: str
+    upload_token: str
+    expires_in: int
+    max_size: int
+
+
+def is_enabled() -> bool:
+    """Return True when an object storage bucket is configured."""
+    return bool(getattr(settings, 'AWS_STORAGE_BUCKET_NAME', ''))
+
+
+def get_client():
+    """Return a (process-wide) boto3 S3 client for the configured bucket."""
+    global _client
+    if _client is None:
+        import boto3
+        from botocore.config import Config
+
+        _client = boto3.client(
+            's3',
+            endpoint_url=getattr(settings, 'AWS_S3_ENDPOINT_URL', None) or None,
+            region_name=getattr(settings, 'AWS_S3_REGION_NAME', None) or None,
+            aws_access_key_id=getattr(settings, 'AWS_ACCESS_KEY_ID', None) or None,
+            aws_secret_access_key=getattr(settings, 'AWS_SECRET_ACCESS_KEY', None) or None,
+            config=Config(signature_version='s3v4'),
+        )
+    return _client
+
+
+def object_key(name: str) -> str:
+    """Map a storage-relative file name to the bucket object key."""
+    location = getattr(settings, 'AWS_LOCATION', '').strip('/')
+    return f"{location}/{name}" if location else name
+
+
+def reset_client() -> None:
+    """Drop the cached client (used when storage settings change)."""
+    global _client
+    _client = None
+
+
+class DirectUploadService:
+    """
+    Service for issuing and completing presigned uploads.
+    """
+
+    @staticmethod
+    def build_key(prefix: str, content_type: str) -> str:
+        """
+        Build a unique storage-relative file name under the given prefix.
+
+        Names are never reused, so each upload is a distinct object version.
+        """
+        extension = mimetypes.guess_extension(content_type) or ''
+        if extension == '.jpe':
+            extension = '.jpg'
+        date_path = timezone.now().strftime('%Y/%m')
+        return f"{prefix.strip('/')}/{date_path}/{uuid.uuid4().hex}{extension}"
+
+    @staticmethod
+    def create_upload(
+        prefix: str,
+        filename: str,
+        content_type: str,
+        purpose: str,
+        owner_id,
+        max_size: int,
+    ) -> DirectUpload:
+        """
+        Issue a presigned POST for a new object.
+
+        A POST policy (rather than a presigned PUT) lets the bucket enforce
+        the content type and maximum size before accepting the body.
+
+        Args:
+            prefix: Key prefix (e.g. 'profile_pictures').
+            filename: Client-side filename (used for logging only).
+            content_type: MIME type the client will upload.
+            purpose: Upload purpose, bound into the upload token.
+            owner_id: ID of the object the upload will be attached to.
+            max_size: Maximum accepted size in bytes.
+
+        Returns:
+            DirectUpload instructions for the client.
+
+        Raises:
+            DirectUploadError: If uploads are not configured or the
+                content type is not allowed.
+        """
+        if not is_enabled():
+            raise DirectUploadError('Direct uploads are not configured.')
+
+        if content_type not in ALLOWED_UPLOAD_CONTENT_TYPES:
+            raise DirectUploadError(f'Unsupported content type: {content_type}')
+
+        expires_in = getattr(settings, 'DIRECT_UPLOAD_EXPIRY_SECONDS', 900)
+        key = DirectUploadService.build_key(prefix, content_type)
+
+        presigned = get_client().generate_presigned_post(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=object_key(key),
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_size],
+            ],
+            ExpiresIn=expires_in,
+        )
+
+        upload_token = signing.dumps(
+            {'key': key, 'purpose': purpose, 'owner': owner_id, 'content_type': content_type},
+            salt=UPLOAD_TOKEN_SALT,
+        )
+
+        logger.info(
+            "Direct upload issued: purpose=%s, owner=%s, filename=%s, key=%s",
+            purpose, owner_id, filename, key,
+        )
+        return DirectUpload(
+            method='POST',
+            url=presigned['url'],
+            fields=presigned['fields'],
+            key=key,
+            upload_token=upload_token,
+            expires_in=expires_in,
+            max_size=max_size,
+        )
+
+    @staticmethod
+    def complete_upload(upload_token: str, purpose: str, owner_id, max_size: int) -> str:
+        """
+        Validate an uploaded object and return its storage-relative name.
+
+        Only the object metadata and the first bytes of the image are read.
+        Objects that fail validation are deleted from the bucket.
+
+        Args:
+            upload_token: Signed token returned by create_upload.
+            purpose: Expected upload purpose.
+            owner_id: Expected owner ID.
+            max_size: Maximum accepted size in bytes.
+
+        Returns:
+            File name to store in the model field.
+
+        Raises:
+            DirectUploadError: If the token is invalid or the object is
+                missing or not a valid image.
+        """
+        if not is_enabled():
+            raise DirectUploadError('Direct uploads are not configured.')
+
+        # Token must be redeemed within the upload window (+ upload time)
+        max_age = getattr(settings, 'DIRECT_UPLOAD_EXPIRY_SECONDS', 900) * 2
+        try:
+            payload = signing.loads(upload_token, salt=UPLOAD_TOKEN_SALT, max_age=max_age)
+        except signing.BadSignature:
+            raise DirectUploadError('Invalid or expired upload token.')
+
+        if payload.get('purpose') != purpose or payload.get('owner') != owner_id:
+            raise DirectUploadError('Invalid or expired upload token.')
+
+        key = payload['key']
+        full_key = object_key(key)
+        bucket = settings.AWS_STORAGE_BUCKET_NAME
+        client = get_client()
+
+        try:
+            head = client.head_object(Bucket=bucket, Key=full_key)
+        except Exception:
+            raise DirectUploadError('Uploaded file not found.')
+
+        try:
+            if head['ContentLength'] > max_size:
+                raise ValidationError('File too large.')
+            prefix = client.get_object(
+                Bucket=bucket,
+                Key=full_key,
+                Range=f'bytes=0-{HEADER_RANGE_BYTES - 1}',
+            )['Body'].read()
+            validate_image_upload(BytesIO(prefix), max_bytes=max_size, verify=False)
+        except ValidationError:
+            client.delete_object(Bucket=bucket, Key=full_key)
+            logger.warning("Direct upload rejected: purpose=%s, owner=%s, key=%s", purpose, owner_id, key)
+            raise DirectUploadError('Uploaded file is not a valid image.')
+
+        logger.info("Direct upload completed: purpose=%s, owner=%s, key=%s", purpose, owner_id, key)
+        return key
+
+    @staticmethod
+    def get_max_size(purpose: str) -> int:
+        """Return the maximum upload size for a purpose."""
+        limits = getattr(settings, 'DIRECT_UPLOAD_MAX_SIZES', {})
+        return limits.get(purpose, 5 * 1024 * 1024)
@@ -0,0 +1,140 @@
+"""
+Image processing helpers shared by user uploads and branding assets.
+
+Validation only reads the image header (Pillow opens files lazily), so
+oversized or malformed uploads are rejected before any pixel data is decoded.
+Renditions are re-encoded as WebP without EXIF/XMP/ICC metadata.
+"""
+
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Formats accepted for user uploads
+ALLOWED_IMAGE_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+
+# Default limits (overridable per call)
+DEFAULT_MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5 MB
+DEFAULT_MAX_PIXELS = 40_000_000  # ~40 megapixels, guards against decompression bombs
+
+
+def validate_image_upload(
+    file,
+    max_bytes: int = DEFAULT_MAX_UPLOAD_SIZE,
+    max_pixels: int = DEFAULT_MAX_PIXELS,
+    allowed_formats: tuple = ALLOWED_IMAGE_FORMATS,
+    verify: bool = True,
+) -> tuple[str, int, int]:
+    """
+    Validate an uploaded image without decoding its pixel data.
+
+    Args:
+        file: File-like object (UploadedFile, FieldFile or BytesIO).
+        max_bytes: Maximum allowed file size in bytes.
+        max_pixels: Maximum allowed width * height.
+        allowed_formats: Pillow format names that are accepted.
+        verify: Walk the whole file structure. Disable when only a
+            prefix of the file is available (e.g. a ranged read).
+
+    Returns:
+        Tuple of (format, width, height).
+
+    Raises:
+        ValidationError: If the file is too large, not an image,
+            in an unsupported format or has too many pixels.
+    """
+    size = getattr(file, 'size', None)
+    if size is not None and size > max_bytes:
+        raise ValidationError(
+            _('Image file too large (%(size)d bytes). Maximum is %(max)d bytes.'),
+            code='image_too_large',
+            params={'size': size, 'max': max_bytes},
+        )
+
+    try:
+        file.seek(0)
+        # Image.open only parses the header; pixel data is not loaded here
+        with Image.open(file) as img:
+            image_format = img.format
+            width, height = img.size
+            if verify:
+                # verify() walks the file structure without decoding into memory
+                img.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError, Image.DecompressionBombError):
+        raise ValidationError(_('Upload a valid image.'), code='invalid_image')
+    finally:
+        file.seek(0)
+
+    if image_format not in allowed_formats:
+        raise ValidationError(
+            _('Unsupported image format: %(format)s.'),
+            code='invalid_image_format',
+            params={'format': image_format},
+        )
+
+    if width * height > max_pixels:
+        raise ValidationError(
+            _('Image dimensions too large (%(width)dx%(height)d).'),
+            code='image_too_many_pixels',
+            params={'width': width, 'height': height},
+        )
+
+    return image_format, width, height
+
+
+def strip_metadata(img: Image.Image) -> Image.Image:
+    """
+    Return a copy of the image with orientation applied and metadata removed.
+
+    EXIF orientation is baked into the pixels first so that dropping the
+    EXIF block doesn't rotate photos taken in portrait mode.
+    """
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ('RGB', 'RGBA'):
+        has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+    clean = img.copy()
+    clean.info = {}
+    return clean
+
+
+def render_webp_renditions(
+    file,
+    sizes: dict[str, int],
+    quality: int = 82,
+) -> dict[str, ContentFile]:
+    """
+    Render square-bounded WebP renditions of an image.
+
+    Args:
+        file: File-like object containing the source image.
+        sizes: Mapping of rendition name to bounding box edge in pixels
+            (e.g. {'small': 64, 'medium': 256}).
+        quality: WebP quality (0-100).
+
+    Returns:
+        Mapping of rendition name to ContentFile with WebP data.
+        Images are never upscaled.
+    """
+    file.seek(0)
+    renditions = {}
+
+    with Image.open(file) as source:
+        # For JPEG, let the decoder downscale while decoding (much cheaper
+        # than decoding full resolution and resizing afterwards).
+        largest = max(sizes.values())
+        source.draft('RGB', (largest, largest))
+        base = strip_metadata(source)
+
+    # Largest first so each smaller rendition resizes from an already
+    # reduced image instead of from the full-size original.
+    for name, edge in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        base.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        output = BytesIO()
+        base.save(output, format='WEBP', quality=quality, method=4)
+        renditions[name] = ContentFile(output.getvalue())
+
+    return renditions
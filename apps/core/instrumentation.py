@@ -0,0 +1,19 @@
+"""
+Helpers for instrumenting library classes in place.
+"""
+
+
+def wrap_methods(cls, names, wrap, marker: str) -> None:
+    """
+    Replace the named methods of cls with wrap(name, method).
+
+    Missing methods are skipped. Each marker is applied once: methods
+    already wrapped for it (directly or on a base class) are left alone.
+    """
+    for name in names:
+        method = getattr(cls, name, None)
+        if method is None or getattr(method, marker, False):
+            continue
+        wrapper = wrap(name, method)
+        setattr(wrapper, marker, True)
+        setattr(cls, name, wrapper)
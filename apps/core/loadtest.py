@@ -0,0 +1,272 @@
+"""
+Minimal HTTP load generator used by the load test management commands.
+
+Runs a fixed number of flows against a server from ``concurrency`` asyncio
+workers, each holding one keep-alive HTTP/1.1 connection, and records
+per-request latency. A flow is one simulated client: a coroutine sending
+one or more requests (run_scenario); run_load repeats a single request.
+Dependency-free on purpose so it can run from any container that has the
+project installed.
+
+Each flow sends a unique X-Forwarded-For address by default, so per-IP
+throttles do not cap the measured throughput; flows may send their own to
+simulate traffic from few addresses. Only point it at local or staging
+servers.
+"""
+
+import asyncio
+import ssl
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+from apps.core.benchmarking import BenchmarkResult
+
+# Builds (body, extra headers) for the n-th request
+RequestBuilder = Callable[[int], tuple[bytes, dict]]
+
+
+@dataclass
+class LoadTestResult:
+    """Outcome of one load test run."""
+    name: str
+    latency: BenchmarkResult
+    elapsed: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    # Seconds from a request to the arrival of the email it triggered (apps.core.smtp_sink)
+    delivery: BenchmarkResult | None = None
+    undelivered: int = 0
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.latency.iterations / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Share of requests that failed: connection errors and 5xx responses."""
+        failed = self.errors + sum(count for status, count in self.statuses.items() if status >= 500)
+        total = self.errors + self.latency.iterations
+        return failed / total if total else 0.0
+
+    @property
+    def throttled_rate(self) -> float:
+        """Share of responses that were 429 Too Many Requests."""
+        return self.statuses[429] / self.latency.iterations if self.latency.iterations else 0.0
+
+
+class _Connection:
+    """A single keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int, use_ssl: bool):
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if use_ssl else None
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, target: str, headers: dict, body: bytes) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+        lines = [f'{method} {target} HTTP/1.1', f'Host: {self.host}', f'Content-Length: {len(body)}']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by server')
+        status = int(status_line.split()[1])
+
+        length = 0
+        chunked = False
+        keep_alive = True
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding' and 'chunked' in value:
+                chunked = True
+            elif name == 'connection' and value == 'close':
+                keep_alive = False
+
+        if chunked:
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length:
+            await self.reader.readexactly(length)
+
+        if not keep_alive:
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+def forwarded_for(index: int) -> str:
+    """A distinct private address per index."""
+    return f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}'
+
+
+class Session:
+    """Requests of one flow, sent on the worker's connection."""
+
+    def __init__(self, connection: _Connection, result: LoadTestResult, index: int):
+        self.connection = connection
+        self.result = result
+        self.index = index
+        self.forwarded_for = forwarded_for(index)
+
+    async def request(self, method: str, target: str, body: bytes = b'', headers: dict | None = None) -> int | None:
+        """
+        Send a request and record its latency and status.
+
+        Returns:
+            The status code, or None when the connection failed (counted
+            as an error).
+        """
+        headers = {'X-Forwarded-For': self.forwarded_for, **(headers or {})}
+        clock = time.perf_counter
+        start = clock()
+        try:
+            status = await self.connection.request(method, target, headers, body)
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            self.result.errors += 1
+            await self.connection.close()
+            return None
+        self.result.latency.samples.append(clock() - start)
+        self.result.statuses[status] += 1
+        return status
+
+
+# Simulates the n-th client: sends its requests through the session
+Flow = Callable[[Session, int], Awaitable[None]]
+
+
+async def run_scenario(
+    name: str,
+    base_url: str,
+    flow: Flow,
+    flows: int = 1000,
+    concurrency: int = 50,
+) -> LoadTestResult:
+    """
+    Run ``flows`` flows against base_url from ``concurrency`` concurrent workers.
+
+    Args:
+        name: Label for the result.
+        base_url: Absolute http(s) URL of the server; flows send paths.
+        flow: Coroutine function called with (session, n) for each flow.
+        flows: Total number of flows.
+        concurrency: Number of concurrent connections.
+
+    Returns:
+        LoadTestResult with one latency sample per completed request.
+    """
+    parts = urlsplit(base_url)
+    use_ssl = parts.scheme == 'https'
+    port = parts.port or (443 if use_ssl else 80)
+
+    result = LoadTestResult(name=name, latency=BenchmarkResult(name=name))
+    counter = iter(range(flows))
+    clock = time.perf_counter
+
+    async def worker():
+        connection = _Connection(parts.hostname, port, use_ssl)
+        try:
+            for index in counter:
+                await flow(Session(connection, result, index), index)
+        finally:
+            await connection.close()
+
+    started = clock()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = clock() - started
+    return result
+
+
+async def run_load(
+    name: str,
+    url: str,
+    build_request: RequestBuilder,
+    method: str = 'POST',
+    requests: int = 1000,
+    concurrency: int = 50,
+) -> LoadTestResult:
+    """
+    Send ``requests`` requests to url from ``concurrency`` concurrent workers.
+
+    Args:
+        name: Label for the result.
+        url: Absolute http(s) URL.
+        build_request: Returns (body, headers) for the n-th request.
+        method: HTTP method.
+        requests: Total number of requests.
+        concurrency: Number of concurrent connections.
+
+    Returns:
+        LoadTestResult with one latency sample per completed request.
+    """
+    parts = urlsplit(url)
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+
+    async def flow(session, index):
+        body, headers = build_request(index)
+        await session.request(method, target, body, headers)
+
+    return await run_scenario(name, url, flow, flows=requests, concurrency=concurrency)
+
+
+def format_load_results(results: list[LoadTestResult]) -> str:
+    """Format load test results as a plain-text table."""
+    header = (
+        f"{'target':<24} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>6} {'429 %':>6}  statuses"
+    )
+    lines = [header, '-' * len(header)]
+    for result in results:
+        latency = result.latency
+        statuses = ' '.join(f'{code}:{count}' for code, count in sorted(result.statuses.items()))
+        lines.append(
+            f"{result.name:<24} {latency.iterations:>9} {result.errors:>7} "
+            f"{result.requests_per_second:>9.1f} {latency.percentile(50) * 1e3:>9.1f} "
+            f"{latency.percentile(95) * 1e3:>9.1f} {latency.percentile(99) * 1e3:>9.1f} "
+            f"{result.error_rate * 100:>6.1f} {result.throttled_rate * 100:>6.1f}  {statuses}"
+        )
+    return '\n'.join(lines)
+
+
+def format_delivery_results(results: list[LoadTestResult]) -> str:
+    """Format email delivery latency of the results that measured it."""
+    header = f"{'scenario':<24} {'delivered':>9} {'missing':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        delivery = result.delivery
+        if delivery is None:
+            continue
+        lines.append(
+            f"{result.name:<24} {delivery.iterations:>9} {result.undelivered:>8} "
+            f"{delivery.percentile(50) * 1e3:>9.1f} {delivery.percentile(95) * 1e3:>9.1f} "
+            f"{delivery.percentile(99) * 1e3:>9.1f}"
+        )
+    return '\n'.join(lines)
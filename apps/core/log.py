@@ -0,0 +1,163 @@
+"""
+Non-blocking structured logging.
+
+QueueHandler puts records on an in-memory queue and returns; a listener
+thread formats them and writes them to the real handlers (files, streams).
+Request threads never wait on disk I/O, and message formatting ("%s" args,
+tracebacks) happens on the listener thread, so log calls should pass
+arguments instead of pre-formatting with f-strings:
+
+    logger.info("Login successful: user_id=%s", user.id)
+
+JSONFormatter writes one JSON object per line, including `extra` fields
+and the trace id of the active span (apps.core.tracing).
+
+SamplingFilter keeps only a fraction of INFO and DEBUG records from chosen
+loggers (LOG_SAMPLE_RATES); warnings and errors are always kept.
+
+See LOGGING in config/settings/production.py.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+
+# Attributes of every LogRecord; anything else was passed in `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of INFO and lower records per logger.
+
+    rates maps logger names to the fraction kept; a logger uses the rate of
+    its closest configured ancestor, and loggers without one keep everything.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._resolved = {}
+
+    def rate(self, name: str) -> float:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        rate = 1.0
+        candidate = name
+        while candidate:
+            if candidate in self.rates:
+                rate = float(self.rates[candidate])
+                break
+            candidate = candidate.rpartition('.')[0]
+        self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    Hand records to a listener thread that writes them to `handlers`.
+
+    handlers are names of handlers defined in the same LOGGING config;
+    dictConfig creates handlers in name order, so they must sort before this
+    handler's name. The listener starts on the first record, and again in
+    forked worker processes. When the queue is full, records are dropped
+    and counted instead of blocking the caller.
+    """
+
+    def __init__(self, handlers, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        # logging has no public lookup by name before Python 3.12
+        try:
+            self.targets = [logging._handlers[name] for name in handlers]
+        except KeyError as e:
+            raise ValueError(f"Handler {e} must be configured before the queue handler") from None
+        self.queue_size = queue_size
+        self.listener = None
+        self.dropped = 0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked: the parent's listener thread does not exist here
+                self.queue = queue.Queue(self.queue_size)
+            else:
+                atexit.register(self.stop)
+            self.listener = logging.handlers.QueueListener(self.queue, *self.targets, respect_handler_level=True)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        """Write out queued records and stop the listener."""
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self._pid = None
+
+    def prepare(self, record):
+        # Unlike the stdlib handler, leave msg % args and the traceback to
+        # the listener thread. The copy keeps other handlers' view intact.
+        record = copy.copy(record)
+        if 'trace_id' not in record.__dict__:
+            from apps.core.tracing import current_span
+
+            span = current_span()
+            if span is not None:
+                record.trace_id = span.trace_id
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start()
+        super().emit(record)
+
+    def close(self):
+        self.stop()
+        super().close()
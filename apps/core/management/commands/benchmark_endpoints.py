@@ -0,0 +1,247 @@
+"""
+Management command to benchmark the auth, config and legal API endpoints.
+
+Each endpoint is called in-process through the Django test client against a
+fresh test database, with the locmem email backend and a local memory cache
+standing in for SMTP and Redis. Reports p50/p95/p99 latency, database
+queries per call and peak memory per call.
+
+Results are compared with a stored baseline (benchmarks/endpoints.json):
+the command fails when an endpoint makes more queries than the baseline,
+or when its p95 latency or peak memory grow beyond the tolerances. Query
+counts are exact everywhere; latency depends on the machine, so refresh the
+baseline with --update-baseline when benchmarking on new hardware.
+
+Usage:
+    python manage.py benchmark_endpoints
+    python manage.py benchmark_endpoints --endpoint login --endpoint me
+    python manage.py benchmark_endpoints --update-baseline
+"""
+
+import itertools
+import json
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import OTPToken, User
+from apps.core.benchmarking import compare_to_baseline, measure_calls
+
+PASSWORD = 'BenchmarkPass123!'
+USER_POOL_SIZE = 20
+
+ENDPOINTS = {
+    # name: (method, url name, authenticated)
+    'login': ('POST', 'accounts_api:login', False),
+    'otp_request': ('POST', 'accounts_api:otp_request', False),
+    'otp_verify': ('POST', 'accounts_api:otp_verify', False),
+    'me': ('GET', 'accounts_api:me', True),
+    'app_settings': ('GET', 'core-api:app-settings', False),
+    'legal_list': ('GET', 'core-api:legal-list', False),
+    'legal_terms': ('GET', 'core-api:legal-terms', False),
+    'legal_privacy': ('GET', 'core-api:legal-privacy', False),
+    'legal_check_updates': ('GET', 'core-api:legal-check-updates', True),
+}
+
+BENCHMARK_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'KEY_PREFIX': 'benchmark'}},
+    'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+}
+
+
+def get_default_baseline() -> Path:
+    return Path(settings.BASE_DIR) / 'benchmarks' / 'endpoints.json'
+
+
+class EndpointBenchmark:
+    """
+    Call the endpoints the way a client would.
+
+    Every call comes from a new client IP, so the per-IP throttles on the
+    auth endpoints measure their cache lookups without rejecting requests.
+    Authenticated calls rotate through a pool of users to stay under the
+    per-user rate.
+    """
+
+    def __init__(self):
+        self.client = Client()
+        self.addresses = (f'10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}' for n in itertools.count(1))
+        # Hash once: the password hasher is deliberately slow
+        password = make_password(PASSWORD)
+        self.users = User.objects.bulk_create([
+            User(
+                username=f'benchmark{n}@example.com',
+                email=f'benchmark{n}@example.com',
+                password=password,
+                is_verified=True,
+            )
+            for n in range(USER_POOL_SIZE)
+        ])
+        self.tokens = itertools.cycle([str(AccessToken.for_user(user)) for user in self.users])
+        call_command('seed_legal_documents', stdout=StringIO())
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        if method == 'POST':
+            return self.client.post(
+                path, data, content_type='application/json', REMOTE_ADDR=next(self.addresses), headers=headers
+            )
+        return self.client.get(path, REMOTE_ADDR=next(self.addresses), headers=headers)
+
+    def payload(self, name: str):
+        """(setup, data) for an endpoint: data is built from setup's result, if any."""
+        user = self.users[0]
+        if name == 'login':
+            return None, lambda _: {'email': user.email, 'password': PASSWORD}
+        if name == 'otp_request':
+            return None, lambda _: {'email': user.email}
+        if name == 'otp_verify':
+            # A fresh code per call: verifying consumes it
+            return (
+                lambda: OTPToken.create_for_email(user.email)[1],
+                lambda code: {'email': user.email, 'code': code},
+            )
+        return None, lambda _: None
+
+    def run(self, name: str, iterations: int, warmup: int):
+        method, url_name, authenticated = ENDPOINTS[name]
+        path = reverse(url_name)
+        setup, data = self.payload(name)
+
+        def call(argument=None):
+            token = next(self.tokens) if authenticated else None
+            response = self.request(method, path, data(argument), token)
+            if response.status_code != 200:
+                raise CommandError(
+                    f'{method} {path} returned {response.status_code}: {response.content[:200]!r}'
+                )
+            return response
+
+        result = measure_calls(name, call, setup=setup, iterations=iterations, warmup=warmup)
+        result.payload_bytes = len(call(setup() if setup else None).content)
+        return result
+
+
+def run_endpoint_benchmarks(names, iterations: int, warmup: int):
+    """Benchmark the named endpoints; requires a (test) database."""
+    with override_settings(**BENCHMARK_SETTINGS):
+        benchmark = EndpointBenchmark()
+        return [benchmark.run(name, iterations, warmup) for name in names]
+
+
+def format_endpoint_results(results) -> str:
+    header = f"{'endpoint':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KiB':>9} {'bytes':>8}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.name:<22} {result.percentile(50) * 1e3:>9.2f} {result.percentile(95) * 1e3:>9.2f} "
+            f"{result.percentile(99) * 1e3:>9.2f} {result.queries_per_call:>8.1f} "
+            f"{result.peak_memory / 1024:>9.1f} {result.payload_bytes:>8}"
+        )
+    return '\n'.join(lines)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the auth, config and legal API endpoints against a stored baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            choices=sorted(ENDPOINTS),
+            help='Endpoint to benchmark (repeatable, default: all)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Timed calls per endpoint'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Untimed calls per endpoint before timing'
+        )
+        parser.add_argument(
+            '--baseline',
+            type=Path,
+            default=None,
+            help='Baseline JSON file (default: benchmarks/endpoints.json)'
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Write the results to the baseline file instead of comparing'
+        )
+        parser.add_argument(
+            '--latency-tolerance',
+            type=float,
+            default=0.5,
+            help='Allowed p95 latency growth over the baseline, as a fraction'
+        )
+        parser.add_argument(
+            '--memory-tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed peak memory growth over the baseline, as a fraction'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Output results as JSON'
+        )
+
+    def handle(self, *args, **options):
+        names = options['endpoint'] or list(ENDPOINTS)
+        baseline_path = options['baseline'] or get_default_baseline()
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = run_endpoint_benchmarks(names, options['iterations'], options['warmup'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['json']:
+            self.stdout.write(json.dumps([r.as_dict() for r in results], indent=2))
+        else:
+            self.stdout.write(format_endpoint_results(results))
+
+        if options['update_baseline']:
+            baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+            baseline.update({r.name: r.as_dict() for r in results})
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'\nBaseline written to {baseline_path}'))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(
+                f'\nNo baseline at {baseline_path}; run with --update-baseline to create one.'
+            ))
+            return
+
+        regressions = compare_to_baseline(
+            results,
+            json.loads(baseline_path.read_text()),
+            latency_tolerance=options['latency_tolerance'],
+            memory_tolerance=options['memory_tolerance'],
+        )
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('\nNo regressions against the baseline.'))
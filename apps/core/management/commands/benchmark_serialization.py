@@ -0,0 +1,158 @@
+"""
+Management command to benchmark API serialization throughput.
+
+Compares DRF serializers with their compiled representations, and DRF's
+stdlib JSON renderer/parser with the orjson-based ones, for the payloads
+produced by the existing API serializers. Uses unsaved model instances, so
+no database access is needed.
+
+Usage:
+    python manage.py benchmark_serialization
+    python manage.py benchmark_serialization --iterations 5000 --documents 50
+"""
+
+import json
+from datetime import date
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.accounts.api.serializers import LoginUserSerializer
+from apps.accounts.models import User
+from apps.core.api.parsers import ORJSONParser
+from apps.core.api.renderers import ORJSONRenderer
+from apps.core.api.serializers import (
+    AppSettingsSerializer,
+    LegalDocumentListSerializer,
+    LegalDocumentSerializer,
+)
+from apps.core.benchmarking import format_results, measure
+from apps.core.models import AppSettings, LegalDocument
+
+# Roughly the size of a real Terms of Service document
+LEGAL_PARAGRAPH = (
+    '<h2>Section</h2><p>Die Nutzung der App unterliegt den folgenden Bedingungen. '
+    'Les données personnelles sont traitées conformément à la LPD suisse. '
+    'Users must read &amp; accept these terms before continuing.</p>\n'
+)
+
+
+def build_instances(documents: int) -> dict:
+    """
+    Build representative unsaved instances for each API serializer.
+
+    Returns:
+        Mapping of payload name to (serializer class, instance, many).
+    """
+    user = User(
+        id=1,
+        email='benchmark@example.com',
+        username='benchmark@example.com',
+        first_name='Bench',
+        last_name='Mark',
+    )
+    app_settings = AppSettings(pk=1, app_name='Altea', updated_at=timezone.now())
+    legal_documents = [
+        LegalDocument(
+            id=index,
+            document_type='terms' if index % 2 else 'privacy',
+            version=f'1.{index}',
+            title='Terms of Service',
+            content=LEGAL_PARAGRAPH * 200,
+            effective_date=date(2025, 1, 1),
+        )
+        for index in range(1, documents + 1)
+    ]
+
+    return {
+        'login_user': (LoginUserSerializer, user, False),
+        'app_settings': (AppSettingsSerializer, app_settings, False),
+        'legal_document': (LegalDocumentSerializer, legal_documents[0], False),
+        'legal_document_list': (LegalDocumentListSerializer, legal_documents, True),
+    }
+
+
+def benchmark_serializer(name, serializer_class, instance, many, iterations):
+    """Benchmark DRF serialization against the compiled representation."""
+    results = [measure(
+        f'{name} serialize [drf]',
+        lambda: serializer_class(instance, many=many).data,
+        iterations=iterations,
+    )]
+    if hasattr(serializer_class, 'represent'):
+        represent = serializer_class.represent_many if many else serializer_class.represent
+        results.append(measure(
+            f'{name} serialize [compiled]',
+            lambda: represent(instance),
+            iterations=iterations,
+        ))
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Benchmark serialization, JSON rendering and parsing of API payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=2000,
+            help='Timed iterations per benchmark'
+        )
+        parser.add_argument(
+            '--documents',
+            type=int,
+            default=20,
+            help='Number of documents in the list payload'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Output results as JSON'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        instances = build_instances(options['documents'])
+
+        candidates = [
+            ('stdlib', JSONRenderer(), JSONParser()),
+            ('orjson', ORJSONRenderer(), ORJSONParser()),
+        ]
+
+        report = {}
+        for payload_name, (serializer_class, instance, many) in instances.items():
+            results = benchmark_serializer(payload_name, serializer_class, instance, many, iterations)
+            data = serializer_class(instance, many=many).data
+            for label, renderer, parser in candidates:
+                results.append(measure(
+                    f'{payload_name} render [{label}]',
+                    lambda: renderer.render(data),
+                    iterations=iterations,
+                ))
+            body = JSONRenderer().render(data)
+            for label, renderer, parser in candidates:
+                results.append(measure(
+                    f'{payload_name} parse [{label}]',
+                    lambda: parser.parse(BytesIO(body)),
+                    iterations=iterations,
+                ))
+            report[payload_name] = results
+
+        if options['json']:
+            output = {name: [r.as_dict() for r in results] for name, results in report.items()}
+            self.stdout.write(json.dumps(output, indent=2))
+            return
+
+        for payload_name, results in report.items():
+            serializes = [r for r in results if ' serialize ' in r.name]
+            renders = [r for r in results if ' render ' in r.name]
+            parses = [r for r in results if ' parse ' in r.name]
+            size = renders[0].payload_bytes
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{payload_name} ({size} bytes)'))
+            self.stdout.write(format_results(serializes, baseline=serializes[0].name))
+            self.stdout.write(format_results(renders, baseline=renders[0].name))
+            self.stdout.write(format_results(parses, baseline=parses[0].name))
@@ -0,0 +1,51 @@
+"""
+Management command to precompute the OpenAPI schema.
+
+Run at deploy (after collectstatic) so the first request to /api/schema/
+is served from disk instead of introspecting every view.
+
+Usage:
+    CODE_VERSION=$(git rev-parse --short HEAD) python manage.py generate_api_schema
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import translation
+
+from apps.core.api.schema import SCHEMA_FORMATS, build_schema_artifact, get_code_version, schema_language
+
+
+class Command(BaseCommand):
+    help = 'Generate and cache the OpenAPI schema for the current code version'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=sorted(SCHEMA_FORMATS),
+            action='append',
+            help='Schema format to generate (default: all)'
+        )
+        parser.add_argument(
+            '--language',
+            action='append',
+            help='Language to generate the schema for (default: LANGUAGE_CODE)'
+        )
+
+    def handle(self, *args, **options):
+        formats = options['format'] or sorted(SCHEMA_FORMATS)
+        languages = options['language'] or [settings.LANGUAGE_CODE]
+        for language in languages:
+            if schema_language(language) != language:
+                raise CommandError(f'Unsupported language: {language} (see LANGUAGES)')
+
+        self.stdout.write(f'Code version: {get_code_version()}')
+        for language in languages:
+            with translation.override(language):
+                for fmt in formats:
+                    artifact = build_schema_artifact(fmt)
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f'Generated {fmt} schema ({language}): '
+                            f'{len(artifact.content)} bytes, ETag {artifact.etag}'
+                        )
+                    )
@@ -0,0 +1,325 @@
+"""
+Management command to fill a database with synthetic data for performance testing.
+
+Generates users with realistic name, email domain and country
+distributions, and for them the token history real traffic leaves behind:
+email verification tokens (password sign-ups), password reset tokens and
+OTP tokens. Also adds older, inactive versions of the legal documents.
+
+Rows are written with apps.core.db.bulk.bulk_insert (COPY on PostgreSQL)
+in batches of --batch-size users, so memory stays flat and millions of rows
+take minutes. The output depends only on --seed and --end-date: the same
+options on an empty database produce the same rows. Running it again adds
+more users after the existing ones.
+
+Generated users have unusable passwords, and their email domains end in
+the reserved .invalid suffix (gmail.com.invalid), so no address can
+receive mail. The command refuses to run unless DEBUG is on or
+--i-know-this-is-not-production is passed (e.g. on a staging database).
+
+Usage:
+    python manage.py generate_synthetic_data --users 100000
+    python manage.py generate_synthetic_data --users 3000000 --seed 7 --end-date 2025-06-30 \
+        --i-know-this-is-not-production
+"""
+
+import base64
+import hashlib
+import random
+import time
+import unicodedata
+import uuid
+from datetime import date, datetime, time as datetime_time, timedelta, timezone as dt_timezone
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+
+from apps.accounts.facets import invalidate_country_counts
+from apps.accounts.models import EmailVerificationToken, OTPToken, PasswordResetToken, User
+from apps.core.db.bulk import bulk_insert, reset_sequences
+from apps.core.models import LegalDocument, html_to_text
+
+# RFC 2606: never resolves, so generated addresses cannot belong to anyone
+EMAIL_DOMAIN_SUFFIX = '.invalid'
+NAME_POOL_SIZE = 5000
+SIGNUP_YEARS = 3
+
+NAME_LOCALES = {'de_CH': 6.0, 'fr_CH': 2.5, 'it_CH': 1.0, 'en_US': 0.5}
+
+# (value, weight)
+COUNTRIES = [
+    ('CH', 74), ('DE', 7), ('FR', 5), ('IT', 4), ('AT', 3), ('LI', 1), ('GB', 1),
+    ('US', 1), ('ES', 1), ('PT', 1), ('NL', 1), ('BE', 1),
+]
+EMAIL_DOMAINS = [
+    ('gmail.com', 30), ('bluewin.ch', 18), ('icloud.com', 10), ('outlook.com', 9),
+    ('gmx.ch', 8), ('hotmail.com', 7), ('yahoo.com', 4), ('sunrise.ch', 4),
+    ('protonmail.com', 3), ('hin.ch', 2), ('students.unibe.ch', 2), ('swissonline.ch', 2),
+]
+EMAIL_FORMATS = [
+    ('{first}.{last}{n}', 50), ('{first}{last}{n}', 20), ('{f}.{last}{n}', 15),
+    ('{first}_{last}{n}', 10), ('{last}.{first}{n}', 5),
+]
+
+USER_FIELDS = [
+    'id', 'password', 'last_login', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+    'is_staff', 'is_active', 'date_joined', 'is_verified', 'terms_accepted_at', 'terms_version_accepted',
+    'privacy_version_accepted', 'phone', 'country', 'date_of_birth', 'profile_picture',
+    'profile_picture_small', 'profile_picture_medium', 'profile_picture_large',
+]
+USER_TOKEN_FIELDS = ['created_at', 'updated_at', 'user_id', 'token', 'expires_at', 'used_at']
+OTP_FIELDS = ['id', 'created_at', 'updated_at', 'email', 'code_hash', 'expires_at', 'attempts', 'used', 'ip_address']
+
+
+class WeightedChoice:
+    """Fast repeated weighted choice from (value, weight) pairs."""
+
+    def __init__(self, pairs):
+        self.values = [value for value, _ in pairs]
+        self.cum_weights = list(accumulate(weight for _, weight in pairs))
+
+    def __call__(self, rng: random.Random):
+        return rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+
+def ascii_slug(name: str) -> str:
+    """'Zoë-Léa' -> 'zoelea', for email local parts."""
+    folded = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return ''.join(character for character in folded.lower() if character.isalnum())
+
+
+def build_name_pools(seed: int) -> tuple[list[str], list[str]]:
+    """
+    First and last names, each locale's share of the pool matching its
+    weight. Faker is far too slow to call per row.
+    """
+    from faker import Faker
+
+    first_names, last_names = [], []
+    total = sum(NAME_LOCALES.values())
+    for locale, weight in NAME_LOCALES.items():
+        # One instance per locale: a multi-locale Faker picks locales with the global random
+        fake = Faker(locale)
+        fake.seed_instance(seed)
+        size = round(NAME_POOL_SIZE * weight / total)
+        first_names.extend(fake.first_name() for _ in range(size))
+        last_names.extend(fake.last_name() for _ in range(size))
+    return first_names, last_names
+
+
+def random_token(rng: random.Random) -> str:
+    """Same shape as secrets.token_urlsafe(32)."""
+    return base64.urlsafe_b64encode(rng.randbytes(32)).rstrip(b'=').decode()
+
+
+class SyntheticData:
+    """
+    Generates one batch of users and their tokens at a time.
+
+    Each kind of row draws from its own random stream, so changing how
+    many tokens are generated does not change the users.
+    """
+
+    def __init__(self, seed: int, end: datetime, first_id: int):
+        # Later runs continue after existing users with different streams
+        self.users_rng = random.Random(f'{seed}:users:{first_id}')
+        self.tokens_rng = random.Random(f'{seed}:tokens:{first_id}')
+        self.otp_rng = random.Random(f'{seed}:otp:{first_id}')
+        self.end = end
+        self.start = end - timedelta(days=365 * SIGNUP_YEARS)
+        self.signup_seconds = int((end - self.start).total_seconds())
+        self.first_names, self.last_names = build_name_pools(seed)
+        # Unusable, like users created without a password
+        self.password = make_password(None)
+        self.country = WeightedChoice(COUNTRIES)
+        self.domain = WeightedChoice(EMAIL_DOMAINS)
+        self.email_format = WeightedChoice(EMAIL_FORMATS)
+
+    def user(self, user_id: int) -> tuple:
+        rng = self.users_rng
+        first = rng.choice(self.first_names)
+        last = rng.choice(self.last_names)
+        first_slug, last_slug = ascii_slug(first) or 'user', ascii_slug(last) or 'user'
+        local = self.email_format(rng).format(first=first_slug, last=last_slug, f=first_slug[0], n=user_id)
+        email = f'{local}@{self.domain(rng)}{EMAIL_DOMAIN_SUFFIX}'
+
+        # Sign-ups grow over time: more recent dates are more likely
+        date_joined = self.start + timedelta(seconds=int(self.signup_seconds * rng.random() ** 0.6))
+        is_verified = rng.random() < 0.88
+        terms_accepted_at = date_joined + timedelta(seconds=rng.randint(5, 600)) if is_verified else None
+        last_login = None
+        if is_verified and rng.random() < 0.9:
+            last_login = date_joined + (self.end - date_joined) * rng.random()
+        phone = ''
+        if rng.random() < 0.35:
+            phone = f'+41 7{rng.choice("56789")} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}'
+        date_of_birth = None
+        if rng.random() < 0.6:
+            date_of_birth = date(1940, 1, 1) + timedelta(days=rng.randint(0, 365 * 65))
+
+        return (
+            user_id, self.password, last_login, False, email, first, last, email,
+            False, rng.random() < 0.995, date_joined, is_verified, terms_accepted_at,
+            '1.0' if is_verified else '', '1.0' if is_verified else '', phone,
+            self.country(rng), date_of_birth, None, None, None, None,
+        )
+
+    def email_verification_tokens(self, users):
+        """One per password sign-up; used once verified."""
+        rng = self.tokens_rng
+        for user in users:
+            if rng.random() < 0.6:
+                created_at, is_verified = user[10], user[11]
+                used_at = created_at + timedelta(minutes=rng.randint(1, 600)) if is_verified else None
+                yield (
+                    created_at, used_at or created_at, user[0], random_token(rng),
+                    created_at + timedelta(hours=24), used_at,
+                )
+
+    def password_reset_tokens(self, users):
+        rng = self.tokens_rng
+        for user in users:
+            if rng.random() < 0.1:
+                for _ in range(rng.randint(1, 3)):
+                    created_at = user[10] + (self.end - user[10]) * rng.random()
+                    used_at = created_at + timedelta(minutes=rng.randint(1, 50)) if rng.random() < 0.7 else None
+                    yield (
+                        created_at, used_at or created_at, user[0], random_token(rng),
+                        created_at + timedelta(hours=1), used_at,
+                    )
+
+    def otp_tokens(self, users):
+        """Passwordless sign-ins: most codes are used, some run out of attempts."""
+        rng = self.otp_rng
+        for user in users:
+            if rng.random() >= 0.4:
+                continue
+            for _ in range(min(int(rng.expovariate(0.5)) + 1, 12)):
+                created_at = user[10] + (self.end - user[10]) * rng.random()
+                code = f'{rng.randint(100000, 999999)}'
+                outcome = rng.random()
+                used = outcome < 0.8
+                attempts = rng.randint(0, 1) if used else (5 if outcome < 0.85 else rng.randint(0, 4))
+                yield (
+                    uuid.UUID(int=rng.getrandbits(128), version=4), created_at,
+                    created_at + timedelta(seconds=rng.randint(5, 55)) if used else created_at,
+                    user[7], hashlib.sha256(code.encode()).hexdigest(), created_at + timedelta(minutes=1),
+                    attempts, used, f'{rng.randint(31, 213)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+                )
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, token histories and legal document versions for performance testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100_000,
+            help='Number of users to add (token rows come to roughly 1.5x this)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Random seed'
+        )
+        parser.add_argument(
+            '--end-date',
+            type=date.fromisoformat,
+            default=None,
+            help='Last day of the generated history, YYYY-MM-DD (default: today)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50_000,
+            help='Users generated and written per batch'
+        )
+        parser.add_argument(
+            '--legal-versions',
+            type=int,
+            default=5,
+            help='Older versions of each legal document to add'
+        )
+        parser.add_argument(
+            '--i-know-this-is-not-production',
+            action='store_true',
+            help='Run although DEBUG is off'
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options['i_know_this_is_not_production']):
+            raise CommandError(
+                'Refusing to add synthetic users with DEBUG off. '
+                'Pass --i-know-this-is-not-production if this is not a production database.'
+            )
+        if options['users'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--users must be positive and --batch-size at least 1')
+        end_date = options['end_date'] or date.today()
+        end = datetime.combine(end_date + timedelta(days=1), datetime_time.min, tzinfo=dt_timezone.utc)
+
+        started = time.perf_counter()
+        documents = self.generate_legal_documents(options['legal_versions'], options['seed'], end_date)
+
+        first_id = (User.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+        data = SyntheticData(options['seed'], end, first_id)
+        counts = {'users': 0, 'email verification tokens': 0, 'password reset tokens': 0, 'OTP tokens': 0}
+        batch_size = options['batch_size']
+        for batch_start in range(first_id, first_id + options['users'], batch_size):
+            batch_end = min(batch_start + batch_size, first_id + options['users'])
+            users = [data.user(user_id) for user_id in range(batch_start, batch_end)]
+            counts['users'] += bulk_insert(User, USER_FIELDS, users, batch_size=len(users))
+            counts['email verification tokens'] += bulk_insert(
+                EmailVerificationToken, USER_TOKEN_FIELDS, data.email_verification_tokens(users)
+            )
+            counts['password reset tokens'] += bulk_insert(
+                PasswordResetToken, USER_TOKEN_FIELDS, data.password_reset_tokens(users)
+            )
+            counts['OTP tokens'] += bulk_insert(OTPToken, OTP_FIELDS, data.otp_tokens(users))
+
+            rows = sum(counts.values())
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'{counts["users"]} users, {rows} rows ({rows / elapsed:.0f} rows/s)')
+        reset_sequences(User)
+        invalidate_country_counts()
+
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {summary} and {documents} legal document version(s) in {elapsed:.1f}s'
+        ))
+
+    def generate_legal_documents(self, versions: int, seed: int, end_date: date) -> int:
+        """Older, inactive versions 0.1, 0.2, ... preceding the seeded 1.0 documents."""
+        from faker import Faker
+
+        fake = Faker('en_US')
+        fake.seed_instance(seed)
+        titles = dict(LegalDocument.DOCUMENT_TYPES)
+        documents = [
+            LegalDocument(
+                document_type=document_type,
+                version=f'0.{number}',
+                title=str(titles[document_type]),
+                content=''.join(
+                    f'<h2>{fake.sentence(nb_words=4)}</h2><p>{fake.paragraph(nb_sentences=12)}</p>\n'
+                    for _ in range(40)
+                ),
+                effective_date=end_date - timedelta(days=365 * SIGNUP_YEARS) + timedelta(days=90 * number),
+                is_active=False,
+            )
+            for document_type in titles
+            for number in range(1, versions + 1)
+        ]
+        existing = set(LegalDocument.objects.values_list('document_type', 'version'))
+        new = [document for document in documents if (document.document_type, document.version) not in existing]
+        for document in new:
+            # bulk_create() skips save(), which maintains the search index
+            document.search_text = html_to_text(document.content)
+        LegalDocument.objects.bulk_create(new)
+        LegalDocument.update_search_vectors(LegalDocument.objects.filter(pk__in=[document.pk for document in new]))
+        return len(new)
@@ -0,0 +1,129 @@
+"""
+Management command to load test the authentication endpoints.
+
+Runs the same scenario against one or more running servers, e.g. the
+gunicorn (WSGI) deployment and a uvicorn (ASGI) deployment with
+ASYNC_AUTH_VIEWS=True, and prints latency percentiles and throughput side
+by side.
+
+Use a mail backend that does not deliver (console, locmem or a local SMTP
+sink) on the servers under test: otp_request and forgot_password send an
+email per request.
+
+Usage:
+    gunicorn config.wsgi -w 4 -b :8001
+    ASYNC_AUTH_VIEWS=True uvicorn config.asgi:application --workers 4 --port 8002
+
+    python manage.py loadtest_auth --scenario otp_request \\
+        --target wsgi=http://localhost:8001 --target asgi=http://localhost:8002
+    python manage.py loadtest_auth --scenario me --email demo@example.com \\
+        --target wsgi=http://localhost:8001 --target asgi=http://localhost:8002
+"""
+
+import asyncio
+
+import orjson
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.loadtest import format_load_results, run_load
+
+SCENARIOS = {
+    # name: (method, path)
+    'otp_request': ('POST', '/api/v1/auth/otp/request/'),
+    'otp_verify': ('POST', '/api/v1/auth/otp/verify/'),
+    'forgot_password': ('POST', '/api/v1/auth/forgot-password/'),
+    'me': ('GET', '/api/v1/auth/me/'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Load test the authentication endpoints on one or more running servers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            action='append',
+            required=True,
+            metavar='NAME=URL',
+            help='Server to test, e.g. asgi=http://localhost:8002 (repeatable)',
+        )
+        parser.add_argument(
+            '--scenario',
+            choices=sorted(SCENARIOS),
+            default='otp_request',
+            help='Endpoint to exercise',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Requests per target',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Concurrent connections per target',
+        )
+        parser.add_argument(
+            '--email',
+            default='loadtest@example.com',
+            help='Existing user to authenticate as for the "me" scenario',
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            name, sep, url = target.partition('=')
+            if not sep or not url.startswith(('http://', 'https://')):
+                raise CommandError(f'Invalid --target "{target}", expected NAME=http(s)://host:port')
+            targets.append((name, url.rstrip('/')))
+
+        method, path = SCENARIOS[options['scenario']]
+        build_request = self.get_request_builder(options['scenario'], options['email'])
+
+        results = []
+        for name, url in targets:
+            self.stdout.write(f'{name}: {method} {url}{path} ...')
+            results.append(asyncio.run(run_load(
+                name,
+                url + path,
+                build_request,
+                method=method,
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+            )))
+
+        self.stdout.write('')
+        self.stdout.write(format_load_results(results))
+
+        if any(result.errors for result in results):
+            self.stdout.write(self.style.WARNING('Some requests failed; check the servers are reachable.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Load test finished.'))
+
+    def get_request_builder(self, scenario, email):
+        json_headers = {'Content-Type': 'application/json'}
+
+        if scenario == 'me':
+            from rest_framework_simplejwt.tokens import RefreshToken
+            from apps.accounts.models import User
+
+            user = User.objects.filter(email__iexact=email).first()
+            if user is None:
+                raise CommandError(f'User "{email}" does not exist; pass --email of an existing user.')
+            auth_headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+            return lambda index: (b'', auth_headers)
+
+        if scenario == 'otp_verify':
+            # No code has been requested, so this measures the lookup path
+            # (400 no_otp_found) without creating users.
+            return lambda index: (
+                orjson.dumps({'email': f'loadtest+{index}@example.com', 'code': '000000'}),
+                json_headers,
+            )
+
+        return lambda index: (
+            orjson.dumps({'email': f'loadtest+{index}@example.com'}),
+            json_headers,
+        )
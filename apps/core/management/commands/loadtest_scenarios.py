@@ -0,0 +1,240 @@
+"""
+Management command to replay realistic traffic mixes against a running server.
+
+Scenarios:
+    startup_burst         App launches: app settings, legal update check and
+                          profile, as signed-in users
+    otp_login_wave        OTP sign-ins: request a code, read it from the
+                          email, verify it
+    password_reset_spike  Forgot-password requests for existing accounts
+    credential_stuffing   Wrong-password logins from a handful of addresses
+
+Each scenario reports throughput, latency percentiles, error and 429 rates.
+The command runs an SMTP sink (apps.core.smtp_sink) that receives the
+server's emails, so the OTP and password reset scenarios also report
+delivery latency: the time from the request to the email arriving.
+
+The command creates loadtest+N@example.com users in the database the
+server uses, so run it with the same settings as the server:
+
+    docker compose up -d db redis
+    EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend EMAIL_HOST=localhost \\
+        EMAIL_PORT=1025 EMAIL_USE_TLS=False gunicorn config.wsgi -w 4 -b :8000
+
+    python manage.py loadtest_scenarios --target http://localhost:8000
+    python manage.py loadtest_scenarios --target http://localhost:8000 \\
+        --scenario otp_login_wave --flows 1000 --concurrency 100
+
+Only point it at local or staging servers.
+"""
+
+import asyncio
+import re
+import time
+
+import orjson
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from apps.core.benchmarking import BenchmarkResult
+from apps.core.loadtest import format_delivery_results, format_load_results, run_scenario
+from apps.core.smtp_sink import SMTPSink
+
+SCENARIOS = ('startup_burst', 'otp_login_wave', 'password_reset_spike', 'credential_stuffing')
+PASSWORD = 'LoadTestPass123!'
+JSON_HEADERS = {'Content-Type': 'application/json'}
+CODE_RE = re.compile(r'\b(\d{6})\b')
+
+
+def loadtest_email(index: int) -> str:
+    return f'loadtest+{index}@example.com'
+
+
+def ensure_users(count: int):
+    """Create the loadtest users that do not exist yet; returns all of them in order."""
+    from apps.accounts.models import User
+
+    emails = [loadtest_email(index) for index in range(count)]
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        [User(username=address, email=address, password=password, is_verified=True) for address in emails],
+        ignore_conflicts=True,
+    )
+    users = User.objects.in_bulk(emails, field_name='email')
+    return [users[address] for address in emails]
+
+
+class Scenarios:
+    """Flows of each scenario; see run_scenario."""
+
+    def __init__(self, sink: SMTPSink, tokens: list[str], users: int, stuffing_ips: int, email_timeout: float):
+        self.sink = sink
+        self.tokens = tokens
+        self.users = users
+        self.stuffing_ips = stuffing_ips
+        self.email_timeout = email_timeout
+        self.delivery: BenchmarkResult | None = None
+        self.undelivered = 0
+
+    async def wait_for_email(self, address: str, sent_at: float):
+        message = await self.sink.wait_for(address, timeout=self.email_timeout, after=sent_at)
+        if message is None:
+            self.undelivered += 1
+        else:
+            self.delivery.samples.append(message.received_at - sent_at)
+        return message
+
+    async def startup_burst(self, session, index):
+        headers = {'Authorization': f'Bearer {self.tokens[index % len(self.tokens)]}'}
+        await session.request('GET', reverse('core-api:app-settings'))
+        await session.request('GET', reverse('core-api:legal-check-updates'), headers=headers)
+        await session.request('GET', reverse('accounts_api:me'), headers=headers)
+
+    async def otp_login_wave(self, session, index):
+        # Beyond --users, the wave also signs up new accounts
+        address = loadtest_email(index)
+        sent_at = time.perf_counter()
+        status = await session.request(
+            'POST', reverse('accounts_api:otp_request'), orjson.dumps({'email': address}), JSON_HEADERS
+        )
+        if status != 200:
+            return
+        message = await self.wait_for_email(address, sent_at)
+        match = CODE_RE.search(message.text()) if message else None
+        if match:
+            await session.request(
+                'POST',
+                reverse('accounts_api:otp_verify'),
+                orjson.dumps({'email': address, 'code': match.group(1)}),
+                JSON_HEADERS,
+            )
+
+    async def password_reset_spike(self, session, index):
+        address = loadtest_email(index % self.users)
+        sent_at = time.perf_counter()
+        status = await session.request(
+            'POST', reverse('accounts_api:forgot_password'), orjson.dumps({'email': address}), JSON_HEADERS
+        )
+        if status == 200:
+            await self.wait_for_email(address, sent_at)
+
+    async def credential_stuffing(self, session, index):
+        # TEST-NET-2 addresses, disjoint from the per-flow 10.x addresses
+        session.forwarded_for = f'198.51.100.{index % self.stuffing_ips + 1}'
+        body = orjson.dumps({'email': loadtest_email(index % self.users), 'password': f'guess-{index}'})
+        await session.request('POST', reverse('accounts_api:login'), body, JSON_HEADERS)
+
+
+class Command(BaseCommand):
+    help = 'Replay realistic traffic mixes against a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            required=True,
+            help='Server to test, e.g. http://localhost:8000'
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=SCENARIOS,
+            help='Scenario to run (repeatable, default: all)'
+        )
+        parser.add_argument(
+            '--flows',
+            type=int,
+            default=500,
+            help='Simulated clients per scenario'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Concurrent connections'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=200,
+            help='Number of loadtest+N@example.com users to create and use'
+        )
+        parser.add_argument(
+            '--stuffing-ips',
+            type=int,
+            default=3,
+            help='Client addresses used by credential_stuffing'
+        )
+        parser.add_argument(
+            '--smtp-host',
+            default='127.0.0.1',
+            help='Address the SMTP sink listens on'
+        )
+        parser.add_argument(
+            '--smtp-port',
+            type=int,
+            default=1025,
+            help='Port the SMTP sink listens on (the server\'s EMAIL_PORT)'
+        )
+        parser.add_argument(
+            '--email-timeout',
+            type=float,
+            default=10.0,
+            help='Seconds to wait for an email before counting it as missing'
+        )
+
+    def handle(self, *args, **options):
+        target = options['target'].rstrip('/')
+        if not target.startswith(('http://', 'https://')):
+            raise CommandError(f'Invalid --target "{target}", expected http(s)://host:port')
+        if options['users'] < 1 or options['stuffing_ips'] < 1:
+            raise CommandError('--users and --stuffing-ips must be at least 1')
+        scenarios = options['scenario'] or list(SCENARIOS)
+
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        users = ensure_users(options['users'])
+        tokens = [str(AccessToken.for_user(user)) for user in users]
+
+        results = asyncio.run(self.run(target, scenarios, tokens, options))
+
+        self.stdout.write('')
+        self.stdout.write(format_load_results(results))
+        if any(result.delivery is not None for result in results):
+            self.stdout.write('')
+            self.stdout.write(format_delivery_results(results))
+
+        if any(result.undelivered for result in results):
+            self.stdout.write(self.style.WARNING(
+                f'Some emails did not arrive; check the server sends to '
+                f'{options["smtp_host"]}:{options["smtp_port"]} without TLS.'
+            ))
+        if any(result.errors for result in results):
+            self.stdout.write(self.style.WARNING('Some requests failed; check the server is reachable.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Load test finished.'))
+
+    async def run(self, target, scenarios, tokens, options):
+        sink = SMTPSink()
+        try:
+            await sink.start(options['smtp_host'], options['smtp_port'])
+        except OSError as e:
+            raise CommandError(f'Cannot start the SMTP sink: {e}')
+
+        flows = Scenarios(sink, tokens, options['users'], options['stuffing_ips'], options['email_timeout'])
+        results = []
+        try:
+            for name in scenarios:
+                self.stdout.write(f'{name}: {options["flows"]} clients against {target} ...')
+                flows.delivery = BenchmarkResult(name=name)
+                flows.undelivered = 0
+                result = await run_scenario(
+                    name, target, getattr(flows, name), flows=options['flows'], concurrency=options['concurrency']
+                )
+                if name in ('otp_login_wave', 'password_reset_spike'):
+                    result.delivery = flows.delivery
+                    result.undelivered = flows.undelivered
+                results.append(result)
+        finally:
+            await sink.stop()
+        return results
@@ -0,0 +1,129 @@
+"""
+Prometheus metrics.
+
+Metrics are updated in-process on the hot path (a dictionary lookup and an
+addition per observation) and exported by the /metrics view.
+
+Under gunicorn each worker is a separate process. Set
+PROMETHEUS_MULTIPROC_DIR to an empty directory before the workers start:
+every process then writes its samples to memory-mapped files in that
+directory and /metrics aggregates all of them (see config/gunicorn.py).
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import REGISTRY, multiprocess
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by view',
+    ['view', 'method', 'status'],
+)
+LOGIN_ATTEMPTS = Counter(
+    'auth_login_total',
+    'Password login attempts by outcome (success or AuthErrorCode)',
+    ['outcome'],
+)
+OTP_REQUESTS = Counter(
+    'auth_otp_requests_total',
+    'OTP requests by outcome (sent, send_failed or error)',
+    ['outcome'],
+)
+OTP_VERIFICATIONS = Counter(
+    'auth_otp_verifications_total',
+    'OTP verifications by outcome (success or OTPErrorCode)',
+    ['outcome'],
+)
+EMAIL_SEND_LATENCY = Histogram(
+    'email_send_duration_seconds',
+    'Time spent sending transactional email',
+    ['kind'],
+)
+EMAIL_SEND_FAILURES = Counter(
+    'email_send_failures_total',
+    'Transactional emails that failed to send',
+    ['kind'],
+)
+THROTTLE_REJECTIONS = Counter(
+    'throttle_rejections_total',
+    'Requests rejected by a throttle',
+    ['scope'],
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total',
+    'Application cache lookups by result (hit or miss)',
+    ['cache', 'result'],
+)
+DB_OPEN_CONNECTIONS = Gauge(
+    'db_open_connections',
+    'Open database connections',
+    ['alias'],
+    multiprocess_mode='livesum',
+)
+DB_CONNECTION_EVENTS = Counter(
+    'db_connection_events_total',
+    'Database connection events (see apps.core.db.metrics)',
+    ['alias', 'event'],
+)
+DB_CONNECT_LATENCY = Histogram(
+    'db_connect_duration_seconds',
+    'Time spent opening database connections',
+    ['alias'],
+)
+
+
+def _outcome(error_code) -> str:
+    return error_code.value if error_code is not None else 'success'
+
+
+def record_login(error_code=None) -> None:
+    LOGIN_ATTEMPTS.labels(outcome=_outcome(error_code)).inc()
+
+
+def record_otp_verification(error_code=None) -> None:
+    OTP_VERIFICATIONS.labels(outcome=_outcome(error_code)).inc()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+@contextmanager
+def track_email(kind: str):
+    """Record the duration of sending an email, and failures (exceptions)."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EMAIL_SEND_FAILURES.labels(kind=kind).inc()
+        raise
+    finally:
+        EMAIL_SEND_LATENCY.labels(kind=kind).observe(time.perf_counter() - start)
+
+
+def record_db_update(alias: str, increments: dict) -> None:
+    """Mirror apps.core.db.metrics counter updates."""
+    for event, value in increments.items():
+        if event == 'open_connections':
+            DB_OPEN_CONNECTIONS.labels(alias=alias).inc(value)
+        elif value:
+            DB_CONNECTION_EVENTS.labels(alias=alias, event=event).inc(value)
+
+
+def record_db_connect(alias: str, seconds: float) -> None:
+    DB_OPEN_CONNECTIONS.labels(alias=alias).inc()
+    DB_CONNECTION_EVENTS.labels(alias=alias, event='connections_opened').inc()
+    DB_CONNECT_LATENCY.labels(alias=alias).observe(seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return (body, content type) of the Prometheus text exposition."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
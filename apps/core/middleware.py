@@ -0,0 +1,446 @@
+"""
+Project middleware.
+"""
+
+import base64
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.exceptions import MiddlewareNotUsed
+
+from apps.core import profiling, server_timing, tracing
+from apps.core.db import routers
+from apps.core.db.queries import count_queries
+from apps.core.metrics import REQUEST_LATENCY
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def _bearer_user_id(request):
+    """
+    User id claim of the request's JWT, without verifying the signature.
+
+    Only used to pick a database for reads; authentication still verifies
+    the token. A forged token can at most route reads to the primary.
+    """
+    from rest_framework_simplejwt.settings import api_settings
+
+    header = request.headers.get('Authorization', '')
+    parts = header.split()
+    if len(parts) != 2 or parts[0] not in api_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        payload = parts[1].split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return claims.get(api_settings.USER_ID_CLAIM)
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+def _request_user_id(request):
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        user_id = session.get(SESSION_KEY)
+        if user_id is not None:
+            return user_id
+    return _bearer_user_id(request)
+
+
+def _written_user_id(request, response):
+    """User to pin after a successful write, if any."""
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return None
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Decide per request whether reads may go to a read replica.
+
+    Requests that write, and requests from users who wrote recently, read
+    from the primary (see apps.core.db.routers). Does nothing unless
+    DATABASE_REPLICAS is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not routers.get_replicas():
+            return self.get_response(request)
+
+        primary = request.method not in SAFE_METHODS or routers.is_pinned(_request_user_id(request))
+        token = routers.use_primary(primary)
+        try:
+            response = self.get_response(request)
+            user_id = _written_user_id(request, response)
+            if user_id is not None:
+                routers.pin_to_primary(user_id)
+            return response
+        finally:
+            routers.reset_use_primary(token)
+
+    async def __acall__(self, request):
+        if not routers.get_replicas():
+            return await self.get_response(request)
+
+        primary = request.method not in SAFE_METHODS or await routers.ais_pinned(_request_user_id(request))
+        token = routers.use_primary(primary)
+        try:
+            response = await self.get_response(request)
+            user_id = _written_user_id(request, response)
+            if user_id is not None:
+                await routers.apin_to_primary(user_id)
+            return response
+        finally:
+            routers.reset_use_primary(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its query_budget."""
+
+
+def _view_query_budget(view_func):
+    """query_budget of a view function, DRF view or class-based view."""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    return getattr(view_func, 'query_budget', getattr(view_class, 'query_budget', None))
+
+
+class QueryCountMiddleware:
+    """
+    Count the database queries of each request.
+
+    With QUERY_COUNT_HEADERS the response carries the query count, the time
+    spent in the database and the number of repeated statements:
+
+        X-DB-Query-Count: 4
+        X-DB-Query-Time-Ms: 1.87
+        X-DB-Duplicate-Queries: 0
+
+    Views may declare the most queries they should need:
+
+        class MeAPIView(APIView):
+            query_budget = 1
+
+    A request over budget is logged, or raises QueryBudgetExceeded when
+    QUERY_BUDGET_STRICT is set (see apps.core.testing.QueryBudgetTestMixin).
+    Disabled unless one of the two settings is on.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not (settings.QUERY_COUNT_HEADERS or settings.QUERY_BUDGET_STRICT):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with count_queries() as stats:
+            response = self.get_response(request)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        with count_queries() as stats:
+            response = await self.get_response(request)
+        return self.finish(request, response, stats)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = _view_query_budget(view_func)
+
+    def finish(self, request, response, stats):
+        budget = getattr(request, 'query_budget', None)
+
+        if settings.QUERY_COUNT_HEADERS:
+            response['X-DB-Query-Count'] = str(stats.count)
+            response['X-DB-Query-Time-Ms'] = f'{stats.duration * 1000:.2f}'
+            response['X-DB-Duplicate-Queries'] = str(stats.duplicates)
+            if budget is not None:
+                response['X-DB-Query-Budget'] = str(budget)
+
+        if budget is not None and stats.count > budget:
+            message = (
+                f"Query budget exceeded: {request.method} {request.path} "
+                f"ran {stats.count} queries, budget {budget}, duplicates {stats.duplicates}"
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                repeated = ''.join(f'\n  {n}x {sql}' for sql, n in stats.most_repeated())
+                raise QueryBudgetExceeded(message + repeated)
+            logger.warning(message)
+
+        return response
+
+
+def _observe_latency(request, response, start):
+    match = getattr(request, 'resolver_match', None)
+    REQUEST_LATENCY.labels(
+        view=match.view_name if match else 'unmatched',
+        method=request.method,
+        status=f'{response.status_code // 100}xx',
+    ).observe(time.perf_counter() - start)
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per view (http_request_duration_seconds).
+
+    Views are labelled by URL name, so the number of series stays bounded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        _observe_latency(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        _observe_latency(request, response, start)
+        return response
+
+
+def _finish_request_span(span, request, response):
+    match = getattr(request, 'resolver_match', None)
+    if match:
+        span.name = f'{request.method} {match.view_name}'
+        span.set_attribute('http.route', match.route)
+    span.set_attribute('http.status_code', response.status_code)
+    if response.status_code >= 500:
+        span.error = f'HTTP {response.status_code}'
+
+
+class TracingMiddleware:
+    """
+    Trace each request as the root span of a trace (see apps.core.tracing).
+
+    The span is named after the view; an incoming traceparent header
+    continues the caller's trace. Removed at startup unless TRACING_ENABLED.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not tracing.is_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _span(self, request):
+        return tracing.span(
+            request.method,
+            kind='server',
+            attributes={'http.method': request.method, 'http.target': request.path},
+            root=True,
+            traceparent=request.headers.get('traceparent'),
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self._span(request) as span:
+            response = self.get_response(request)
+            if span is not None:
+                _finish_request_span(span, request, response)
+        return response
+
+    async def __acall__(self, request):
+        with self._span(request) as span:
+            response = await self.get_response(request)
+            if span is not None:
+                _finish_request_span(span, request, response)
+        return response
+
+
+def _debug_token_valid(request):
+    token = server_timing.request_token(request)
+    return token is not None and server_timing.check_token(token)
+
+
+async def _adebug_token_valid(request):
+    token = server_timing.request_token(request)
+    return token is not None and await server_timing.acheck_token(token)
+
+
+def _has_session(request):
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def _is_staff(user):
+    return user.is_authenticated and user.is_staff
+
+
+def _debug_allowed(request):
+    """Staff signed in with a session, or a valid server-timing token."""
+    return _debug_token_valid(request) or (_has_session(request) and _is_staff(request.user))
+
+
+async def _adebug_allowed(request):
+    return await _adebug_token_valid(request) or (_has_session(request) and _is_staff(await request.auser()))
+
+
+class ServerTimingMiddleware:
+    """
+    Add a Server-Timing header breaking each request down into database,
+    cache, rendering, email and password hashing time (see
+    apps.core.server_timing).
+
+    Only for requests carrying a valid X-Server-Timing-Token header (issued
+    to staff by the system/server-timing-token/ endpoint, for clients using
+    JWTs) or the cookie set when staff sign in with a session. Other
+    requests are passed through without loading the session or user.
+    Removed at startup unless SERVER_TIMING_ENABLED (off by default).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not _debug_token_valid(request):
+            response = self.get_response(request)
+            server_timing.update_cookie(request, response)
+            return response
+
+        start = time.perf_counter()
+        with server_timing.collect() as timings, count_queries() as stats:
+            response = self.get_response(request)
+        return self.finish(request, response, timings, stats, start)
+
+    async def __acall__(self, request):
+        if not await _adebug_token_valid(request):
+            response = await self.get_response(request)
+            server_timing.update_cookie(request, response)
+            return response
+
+        start = time.perf_counter()
+        with server_timing.collect() as timings, count_queries() as stats:
+            response = await self.get_response(request)
+        return self.finish(request, response, timings, stats, start)
+
+    def finish(self, request, response, timings, stats, start):
+        timings.durations['db'] = stats.duration
+        response['Server-Timing'] = server_timing.header_value(timings, stats.count, time.perf_counter() - start)
+        server_timing.update_cookie(request, response)
+        return response
+
+
+def _profile_requested(request):
+    return request.headers.get('X-Profile') == '1' or request.GET.get('_profile') == '1'
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests on demand (see apps.core.profiling).
+
+    Staff request a profile with an `X-Profile: 1` header or a `_profile=1`
+    query parameter (removed before the view sees it), with a session or a
+    Server-Timing token (the session is only loaded for such requests). The response carries X-Profile-Id, the
+    RequestProfile listed in the admin. Under ASGI both the event loop
+    thread and the request's sync_to_async thread (which runs sync views
+    and sync middleware) are sampled, as separate profiles; the loop
+    profile also shows concurrent requests on the same worker.
+    Removed at startup unless PROFILING_ENABLED.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _strip_query_parameter(self, request):
+        if '_profile' in request.GET:
+            request.GET = request.GET.copy()
+            del request.GET['_profile']
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not (_profile_requested(request) and _debug_allowed(request)):
+            return self.get_response(request)
+
+        self._strip_query_parameter(request)
+        start = time.perf_counter()
+        with profiling.sample() as sampler:
+            response = self.get_response(request)
+        return self.finish(request, response, sampler, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not (_profile_requested(request) and await _adebug_allowed(request)):
+            return await self.get_response(request)
+
+        self._strip_query_parameter(request)
+        start = time.perf_counter()
+        with profiling.sample() as sampler:
+            # Thread-sensitive sync code of this request (sync views included)
+            # runs in one thread; sample it as well as the event loop
+            await sync_to_async(sampler.add_current_thread)()
+            response = await self.get_response(request)
+        return await sync_to_async(self.finish)(request, response, sampler, time.perf_counter() - start)
+
+    def finish(self, request, response, sampler, duration):
+        match = getattr(request, 'resolver_match', None)
+        user = getattr(request, 'user', None)
+        try:
+            profile = profiling.save_profile(
+                sampler,
+                f'{request.method} {request.path}',
+                method=request.method,
+                path=request.path[:500],
+                view_name=match.view_name if match else '',
+                status_code=response.status_code,
+                duration_ms=duration * 1000,
+                user=user if user is not None and user.is_authenticated else None,
+            )
+        except Exception as e:
+            logger.error("Failed to save request profile: path=%s, error=%s", request.path, e)
+            return response
+        response['X-Profile-Id'] = str(profile.pk)
+        # Storing the profile ran queries the view's budget doesn't cover
+        request.query_budget = None
+        return response
@@ -0,0 +1,82 @@
+# Generated by Django 5.0.10 on 2026-10-19 01:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_add_app_settings"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Date and time when the record was created",
+                        verbose_name="created at",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Date and time when the record was last updated",
+                        verbose_name="updated at",
+                    ),
+                ),
+                ("method", models.CharField(max_length=10, verbose_name="method")),
+                ("path", models.CharField(max_length=500, verbose_name="path")),
+                (
+                    "view_name",
+                    models.CharField(blank=True, max_length=200, verbose_name="view"),
+                ),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(
+                        blank=True, null=True, verbose_name="status code"
+                    ),
+                ),
+                ("duration_ms", models.FloatField(verbose_name="duration (ms)")),
+                ("sample_count", models.PositiveIntegerField(verbose_name="samples")),
+                (
+                    "file_name",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="file name"
+                    ),
+                ),
+                ("size", models.PositiveIntegerField(verbose_name="size (bytes)")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="requested by",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "request profile",
+                "verbose_name_plural": "request profiles",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
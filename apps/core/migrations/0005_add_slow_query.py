@@ -0,0 +1,69 @@
+# Generated by Django 5.0.10 on 2026-10-19 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_add_request_profile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Date and time when the record was created",
+                        verbose_name="created at",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Date and time when the record was last updated",
+                        verbose_name="updated at",
+                    ),
+                ),
+                ("alias", models.CharField(max_length=50, verbose_name="database")),
+                ("duration_ms", models.FloatField(verbose_name="duration (ms)")),
+                ("sql", models.TextField(verbose_name="normalized SQL")),
+                (
+                    "fingerprint",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Same value for the same statement with different parameters",
+                        max_length=16,
+                        verbose_name="fingerprint",
+                    ),
+                ),
+                (
+                    "caller",
+                    models.CharField(blank=True, max_length=300, verbose_name="caller"),
+                ),
+                ("stack", models.TextField(blank=True, verbose_name="app stack")),
+                ("plan", models.TextField(blank=True, verbose_name="EXPLAIN plan")),
+                (
+                    "sequential_scan",
+                    models.BooleanField(default=False, verbose_name="sequential scan"),
+                ),
+            ],
+            options={
+                "verbose_name": "slow query",
+                "verbose_name_plural": "slow queries",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.0.10 on 2026-10-19 02:29
+
+import html
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+from apps.core.db.operations import PostgresOnly
+
+# Copies of LegalDocument.SEARCH_CONFIGS and html_to_text at this migration
+SEARCH_CONFIGS = {'en': 'english', 'de': 'german', 'fr': 'french', 'it': 'italian'}
+
+
+def backfill_search_index(apps, schema_editor):
+    LegalDocument = apps.get_model('core', 'LegalDocument')
+    db = schema_editor.connection.alias
+    for document in LegalDocument.objects.using(db).only('pk', 'content').iterator():
+        text = ' '.join(html.unescape(strip_tags(document.content.replace('>', '> '))).split())
+        LegalDocument.objects.using(db).filter(pk=document.pk).update(search_text=text)
+    if schema_editor.connection.vendor == 'postgresql':
+        for language, config in SEARCH_CONFIGS.items():
+            LegalDocument.objects.using(db).filter(language=language).update(
+                search_vector=SearchVector('title', weight='A', config=config)
+                + SearchVector('search_text', weight='B', config=config)
+            )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("core", "0005_add_slow_query"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legaldocument",
+            name="language",
+            field=models.CharField(
+                choices=[
+                    ("en", "English"),
+                    ("de", "German"),
+                    ("fr", "French"),
+                    ("it", "Italian"),
+                ],
+                db_default="en",
+                default="en",
+                help_text="Language of the content, used for full-text search",
+                max_length=5,
+                verbose_name="language",
+            ),
+        ),
+        migrations.AddField(
+            model_name="legaldocument",
+            name="search_text",
+            field=models.TextField(
+                blank=True,
+                db_default="",
+                editable=False,
+                help_text="Content without HTML, maintained on save",
+                verbose_name="search text",
+            ),
+        ),
+        migrations.AddField(
+            model_name="legaldocument",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="search vector"
+            ),
+        ),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+        # Kept out of Meta.indexes so SQLite table rebuilds do not try to recreate it
+        PostgresOnly(migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS core_legaldocument_search_vector '
+            'ON core_legaldocument USING gin (search_vector)',
+            'DROP INDEX CONCURRENTLY IF EXISTS core_legaldocument_search_vector',
+        )),
+    ]
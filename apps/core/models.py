@@ -2,17 +2,22 @@
 Core models - base models used across the application.
 """
 
+import html
 import re
 from io import BytesIO
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
-from django.db import models
+from django.db import connections, models
+from django.utils.html import strip_tags
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 
+from apps.core.metrics import record_cache_lookup
+
 
 class TimeStampedModel(models.Model):
     """
@@ -84,16 +89,43 @@ class SoftDeleteModel(TimeStampedModel):
         self.save()
 
 
+def html_to_text(value: str) -> str:
+    """Plain text of an HTML fragment, with tags separating words."""
+    return ' '.join(html.unescape(strip_tags(value.replace('>', '> '))).split())
+
+
 class LegalDocument(TimeStampedModel):
     """
     Model to store versioned legal documents (Terms of Service, Privacy Policy).
     Only one document of each type can be active at a time.
+
+    search_text (the content without HTML) and search_vector are kept up to
+    date on save for full-text search (apps.core.search); search_vector is
+    only filled on PostgreSQL, where it has a GIN index.
     """
     DOCUMENT_TYPES = [
         ('terms', _('Terms of Service')),
         ('privacy', _('Privacy Policy')),
     ]
 
+    LANGUAGES = [
+        ('en', _('English')),
+        ('de', _('German')),
+        ('fr', _('French')),
+        ('it', _('Italian')),
+    ]
+
+    # PostgreSQL text search configuration (stemming, stop words) per language
+    SEARCH_CONFIGS = {
+        'en': 'english',
+        'de': 'german',
+        'fr': 'french',
+        'it': 'italian',
+    }
+
+    # Only read by search queries; deferred when documents are displayed
+    SEARCH_INDEX_FIELDS = ('search_text', 'search_vector')
+
     document_type = models.CharField(
         _('document type'),
         max_length=20,
@@ -131,6 +163,29 @@ class LegalDocument(TimeStampedModel):
                     'Activating this will deactivate others of the same type.')
     )
 
+    language = models.CharField(
+        _('language'),
+        max_length=5,
+        choices=LANGUAGES,
+        default='en',
+        db_default='en',
+        help_text=_('Language of the content, used for full-text search')
+    )
+
+    search_text = models.TextField(
+        _('search text'),
+        blank=True,
+        db_default='',
+        editable=False,
+        help_text=_('Content without HTML, maintained on save')
+    )
+
+    search_vector = SearchVectorField(
+        _('search vector'),
+        null=True,
+        editable=False
+    )
+
     class Meta:
         verbose_name = _('legal document')
         verbose_name_plural = _('legal documents')
@@ -141,14 +196,43 @@ class LegalDocument(TimeStampedModel):
         return f"{self.get_document_type_display()} v{self.version}"
 
     def save(self, *args, **kwargs):
-        """Ensure only one active document per type."""
+        """Ensure only one active document per type and keep the search index current."""
         if self.is_active:
             # Deactivate other documents of the same type
             LegalDocument.objects.filter(
                 document_type=self.document_type,
                 is_active=True
             ).exclude(pk=self.pk).update(is_active=False)
+
+        update_fields = kwargs.get('update_fields')
+        indexed = update_fields is None or bool({'title', 'content', 'language'} & set(update_fields))
+        if indexed:
+            self.search_text = html_to_text(self.content)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'search_text'}
         super().save(*args, **kwargs)
+        if indexed:
+            self.update_search_vectors(LegalDocument.objects.filter(pk=self.pk), languages=[self.language])
+
+    @property
+    def search_config(self) -> str:
+        return self.SEARCH_CONFIGS.get(self.language, 'simple')
+
+    @classmethod
+    def update_search_vectors(cls, queryset, languages=None) -> None:
+        """
+        Recompute search_vector from title and search_text, e.g. after
+        bulk_create(). One UPDATE per language, limited to `languages` when
+        given. No-op on databases other than PostgreSQL.
+        """
+        if connections[queryset.db].vendor != 'postgresql':
+            return
+        for language in languages or cls.SEARCH_CONFIGS:
+            config = cls.SEARCH_CONFIGS.get(language, 'simple')
+            queryset.filter(language=language).update(
+                search_vector=SearchVector('title', weight='A', config=config)
+                + SearchVector('search_text', weight='B', config=config)
+            )
 
     @classmethod
     def get_active(cls, document_type):
@@ -156,7 +240,7 @@ class LegalDocument(TimeStampedModel):
         return cls.objects.filter(
             document_type=document_type,
             is_active=True
-        ).first()
+        ).defer(*cls.SEARCH_INDEX_FIELDS).first()
 
 
 def validate_hex_color(value):
@@ -171,8 +255,10 @@ def validate_hex_color(value):
 class AppSettings(TimeStampedModel):
     """
     Singleton model for application branding and configuration.
-    Only one instance should exist (pk=1).
+    Only one instance should exist (pk=SINGLETON_PK).
     """
+    SINGLETON_PK = 1
+
     # Branding
     app_name = models.CharField(
         _('application name'),
@@ -244,13 +330,13 @@ class AppSettings(TimeStampedModel):
         """
         Enforce singleton pattern and generate thumbnail.
         """
-        # Singleton: always use pk=1
-        self.pk = 1
+        # Singleton: always use SINGLETON_PK
+        self.pk = self.SINGLETON_PK
 
         # Check if logo changed and we need to regenerate thumbnail
         if self.pk:
             try:
-                old_instance = AppSettings.objects.get(pk=1)
+                old_instance = AppSettings.objects.get(pk=self.SINGLETON_PK)
                 if self.logo and self.logo != old_instance.logo:
                     # Logo changed, clear old small logo to regenerate
                     self.logo_small = None
@@ -322,14 +408,23 @@ class AppSettings(TimeStampedModel):
         cache_timeout = getattr(settings, 'APP_SETTINGS_CACHE_TIMEOUT', 3600)
 
         cached = cache.get(cache_key)
+        record_cache_lookup('app_settings', cached is not None)
         if cached is not None:
             return cached
 
-        # Get or create settings
-        obj, _ = cls.objects.get_or_create(pk=1)
+        obj = cls.load()
         cache.set(cache_key, obj, timeout=cache_timeout)
         return obj
 
+    @classmethod
+    def load(cls):
+        """
+        Load the settings from the database, creating defaults if none exist.
+        Use this rather than get_settings() before modifying them.
+        """
+        obj, _ = cls.objects.get_or_create(pk=cls.SINGLETON_PK)
+        return obj
+
     @property
     def logo_initial(self):
         """Return first letter of app_name for fallback logo."""
@@ -349,4 +444,63 @@ class AppSettings(TimeStampedModel):
         """Return small logo URL or None."""
         if self.logo_small:
             return self.logo_small.url
-        return None
\ No newline at end of file
+        return None
+
+
+class RequestProfile(TimeStampedModel):
+    """
+    A sampling profile of one request (see apps.core.profiling).
+    The speedscope JSON is stored in PROFILING_DIR.
+    """
+    method = models.CharField(_('method'), max_length=10)
+    path = models.CharField(_('path'), max_length=500)
+    view_name = models.CharField(_('view'), max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField(_('status code'), null=True, blank=True)
+    duration_ms = models.FloatField(_('duration (ms)'))
+    sample_count = models.PositiveIntegerField(_('samples'))
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('requested by'),
+    )
+    file_name = models.CharField(_('file name'), max_length=100, unique=True)
+    size = models.PositiveIntegerField(_('size (bytes)'))
+
+    class Meta:
+        verbose_name = _('request profile')
+        verbose_name_plural = _('request profiles')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class SlowQuery(TimeStampedModel):
+    """
+    A statement slower than SLOW_QUERY_THRESHOLD_MS (see apps.core.db.slow_queries).
+    Only the newest SLOW_QUERY_BUFFER_SIZE are kept.
+    """
+    alias = models.CharField(_('database'), max_length=50)
+    duration_ms = models.FloatField(_('duration (ms)'))
+    sql = models.TextField(_('normalized SQL'))
+    fingerprint = models.CharField(
+        _('fingerprint'),
+        max_length=16,
+        db_index=True,
+        help_text=_('Same value for the same statement with different parameters')
+    )
+    caller = models.CharField(_('caller'), max_length=300, blank=True)
+    stack = models.TextField(_('app stack'), blank=True)
+    plan = models.TextField(_('EXPLAIN plan'), blank=True)
+    sequential_scan = models.BooleanField(_('sequential scan'), default=False)
+
+    class Meta:
+        verbose_name = _('slow query')
+        verbose_name_plural = _('slow queries')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.duration_ms:.0f} ms: {self.sql[:80]}"
@@ -0,0 +1,195 @@
+"""
+On-demand sampling profiler.
+
+A background thread samples the stacks of the profiled threads every
+PROFILING_INTERVAL_MS. The profiled code itself is not instrumented, so
+slow paths keep their real shape (PBKDF2 in a login, Pillow in
+AppSettings.save). Profiles are written as speedscope JSON
+(https://www.speedscope.app) to PROFILING_DIR, which is kept under
+PROFILING_MAX_BYTES by deleting the oldest profiles, and listed in the
+admin as RequestProfile objects.
+
+ProfilingMiddleware profiles requests sending `X-Profile: 1` or `?_profile=1`
+from staff (see apps.core.middleware).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Sum
+
+
+class Sampler:
+    """
+    Collect stack samples of one or more threads from a background thread.
+
+    Each sampled thread becomes a separate profile in the speedscope file;
+    the last thread added (e.g. the one running a sync view under ASGI, see
+    add_current_thread()) is the one speedscope opens.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.interval = interval
+        self.frames = []  # speedscope frame dicts
+        # thread id -> (stacks of frame indexes outermost first, seconds covered by each)
+        self.threads = {}
+        self._frame_index = {}
+        self._threads_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self.add_thread(thread_id)
+
+    def add_thread(self, thread_id: int):
+        with self._threads_lock:
+            self.threads.setdefault(thread_id, ([], []))
+
+    def add_current_thread(self):
+        self.add_thread(threading.get_ident())
+
+    @property
+    def sample_count(self) -> int:
+        return sum(len(samples) for samples, _ in self.threads.values())
+
+    def start(self):
+        self._last = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            current = sys._current_frames()
+            now = time.perf_counter()
+            sampled = False
+            with self._threads_lock:
+                threads = list(self.threads.items())
+            for thread_id, (samples, weights) in threads:
+                frame = current.get(thread_id)
+                if frame is None:
+                    continue
+                samples.append(self._stack(frame))
+                weights.append(now - self._last)
+                sampled = True
+            if not sampled:
+                break
+            self._last = now
+
+    def _stack(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_qualname, code.co_filename, code.co_firstlineno)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = self._frame_index[key] = len(self.frames)
+                self.frames.append({'name': key[0], 'file': key[1], 'line': key[2]})
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def speedscope(self, name: str) -> dict:
+        profiles = []
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, (samples, weights) in self.threads.items():
+            weights = [round(weight * 1000, 3) for weight in weights]
+            profiles.append({
+                'type': 'sampled',
+                'name': name if len(self.threads) == 1 else f'{name} ({names.get(thread_id, thread_id)})',
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'apps.core.profiling',
+            'activeProfileIndex': len(profiles) - 1,
+            'shared': {'frames': self.frames},
+            'profiles': profiles,
+        }
+
+
+@contextmanager
+def sample(interval: float | None = None):
+    """
+    Sample the current thread while the block runs.
+
+    Usage:
+        with sample() as sampler:
+            ...
+        sampler.speedscope('name')
+    """
+    if interval is None:
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+    sampler = Sampler(threading.get_ident(), interval)
+    sampler.start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+
+
+def get_profile_dir() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+def save_profile(sampler: Sampler, name: str, **fields):
+    """
+    Write a profile to PROFILING_DIR and record it as a RequestProfile.
+    Older profiles are deleted to stay under PROFILING_MAX_BYTES.
+    """
+    from apps.core.models import RequestProfile
+
+    directory = get_profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    file_name = f'{time.strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:8]}.speedscope.json'
+    content = json.dumps(sampler.speedscope(name), separators=(',', ':')).encode()
+    (directory / file_name).write_bytes(content)
+
+    profile = RequestProfile.objects.create(
+        file_name=file_name, size=len(content), sample_count=sampler.sample_count, **fields
+    )
+    prune_profiles(keep=profile)
+    return profile
+
+
+def prune_profiles(max_bytes: int | None = None, keep=None) -> int:
+    """
+    Delete the oldest profiles, except keep, until all fit in max_bytes.
+    Returns the number deleted.
+    """
+    from apps.core.models import RequestProfile
+
+    if max_bytes is None:
+        max_bytes = settings.PROFILING_MAX_BYTES
+    total = RequestProfile.objects.aggregate(total=Sum('size'))['total'] or 0
+    deleted = 0
+    candidates = RequestProfile.objects.order_by('created_at', 'pk')
+    if keep is not None:
+        candidates = candidates.exclude(pk=keep.pk)
+    for profile in candidates:
+        if total <= max_bytes:
+            break
+        total -= profile.size
+        profile.delete()
+        deleted += 1
+    return deleted
+
+
+def delete_profile_file(file_name: str) -> None:
+    try:
+        os.remove(get_profile_dir() / file_name)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,240 @@
+"""
+Index-backed admin search on PostgreSQL.
+
+Django's admin search ORs `UPPER(column) LIKE '%term%'` over every
+search field. Without suitable indexes each of those is a sequential scan.
+TrigramSearchMixin uses the same predicates, but only on fields that have
+a pg_trgm GIN index on UPPER(column) (see the accounts migration 0008),
+and ranks the matches by trigram similarity:
+
+- terms that start with a local part and contain '@' are treated as
+  emails and matched as prefixes of `prefix_search_fields`, using a
+  text_pattern_ops btree index;
+- words shorter than three characters have too few trigrams for a
+  substring match to use the index, so they are matched as prefixes of
+  `trigram_search_fields` (LIKE 'AB%' still uses the trigram index);
+- anything else, including domains such as '@gmail.com', is matched as a
+  substring of `trigram_search_fields`, word by word as in Django's search.
+
+Results are ordered by rank unless the user sorts by a column. On other
+databases the admin's regular search_fields search is used.
+
+Legal documents are searched by full text instead (search_legal_documents,
+LegalDocumentSearchMixin): a websearch_to_tsquery() match against the
+GIN-indexed LegalDocument.search_vector, in the text search configuration
+of each document's language, ranked by ts_rank() with ts_headline()
+snippets. On other databases words are matched as substrings of the title
+and the stripped text.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.contrib.admin.views.main import ORDER_VAR, SEARCH_VAR
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connections, router
+from django.db.models import Case, F, FloatField, Q, TextField, When
+from django.db.models.functions import Greatest
+from django.utils.html import escape
+from django.utils.text import smart_split, unescape_string_literal
+
+TRIGRAM_MIN_LENGTH = 3
+
+SNIPPET_WORDS = 30
+# Control characters mark matches in snippets, so the text can be escaped
+# before they are replaced by <mark> tags
+_MATCH_START, _MATCH_STOP = '\x02', '\x03'
+
+
+def search_words(term: str) -> list[str]:
+    """Words of a search term; quoted phrases stay together, as in the admin."""
+    words = []
+    for word in smart_split(term):
+        if word.startswith(('"', "'")) and word[0] == word[-1]:
+            word = unescape_string_literal(word)
+        words.append(word)
+    return words
+
+
+def search_filter(term: str, trigram_fields, prefix_fields) -> Q:
+    """Filter for a search term: email or short-word prefixes, otherwise substrings."""
+    term = term.strip()
+    if prefix_fields and '@' in term and not term.startswith('@') and ' ' not in term:
+        return _any(prefix_fields, 'istartswith', term)
+    query = Q()
+    for word in search_words(term):
+        if len(word) < TRIGRAM_MIN_LENGTH:
+            query &= _any(trigram_fields, 'istartswith', word)
+        else:
+            query &= _any(trigram_fields, 'icontains', word)
+    return query
+
+
+def _any(fields, lookup: str, value: str) -> Q:
+    query = Q()
+    for field in fields:
+        query |= Q(**{f'{field}__{lookup}': value})
+    return query
+
+
+def search_rank(term: str, fields):
+    """Best trigram similarity of the term to any of the fields."""
+    similarities = [TrigramSimilarity(field, term) for field in fields]
+    return Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+
+class TrigramSearchMixin:
+    """
+    Ranked, trigram-indexed search for a ModelAdmin.
+
+    Every field in trigram_search_fields needs a GIN index on
+    UPPER(column) gin_trgm_ops; prefix_search_fields a btree index on
+    UPPER(column) text_pattern_ops.
+    """
+    trigram_search_fields = ()
+    prefix_search_fields = ()
+
+    def trigram_search_enabled(self) -> bool:
+        return connections[router.db_for_read(self.model)].vendor == 'postgresql'
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term or not self.trigram_search_enabled():
+            return super().get_search_results(request, queryset, search_term)
+        queryset = queryset.filter(
+            search_filter(term, self.trigram_search_fields, self.prefix_search_fields)
+        ).annotate(search_rank=search_rank(term, self.trigram_search_fields))
+        return queryset, False
+
+    def get_ordering(self, request):
+        ordering = super().get_ordering(request)
+        searching = request.GET.get(SEARCH_VAR, '').strip() and ORDER_VAR not in request.GET
+        if searching and self.trigram_search_enabled():
+            return ['-search_rank', *ordering]
+        return ordering
+
+
+@dataclass
+class LegalSearchResult:
+    document: object
+    rank: float
+    # HTML: the escaped text with matches wrapped in <mark>
+    snippet: str
+
+
+def full_text_search_enabled(model) -> bool:
+    return connections[router.db_for_read(model)].vendor == 'postgresql'
+
+
+def _search_queries(queryset, term: str, language=None) -> dict:
+    model = queryset.model
+    languages = [language] if language else list(model.SEARCH_CONFIGS)
+    return {
+        code: SearchQuery(term, search_type='websearch', config=model.SEARCH_CONFIGS[code])
+        for code in languages
+    }
+
+
+def _per_language(queries: dict, expression, output_field):
+    return Case(
+        *(When(language=code, then=expression(query)) for code, query in queries.items()),
+        output_field=output_field,
+    )
+
+
+def full_text_match(queryset, term: str, language=None):
+    """Filter and rank expression for a websearch-syntax term (quoted phrases, OR, -word)."""
+    queries = _search_queries(queryset, term, language)
+    match = Q()
+    for code, query in queries.items():
+        match |= Q(language=code, search_vector=query)
+    rank = _per_language(queries, lambda query: SearchRank(F('search_vector'), query), FloatField())
+    return match, rank
+
+
+def full_text_filter(queryset, term: str, language=None):
+    """Legal documents matching a search term, annotated with search_rank. PostgreSQL only."""
+    match, rank = full_text_match(queryset, term, language)
+    return queryset.filter(match).annotate(search_rank=rank)
+
+
+def search_legal_documents(queryset, term: str, language=None, limit: int = 10) -> list[LegalSearchResult]:
+    """The best `limit` legal documents for a search term, with snippets."""
+    # The HTML content is not needed for results; search_text is only read for snippets
+    queryset = queryset.defer('content', 'search_vector')
+    if full_text_search_enabled(queryset.model):
+        queries = _search_queries(queryset, term, language)
+        documents = full_text_filter(queryset, term, language).annotate(
+            search_snippet=_per_language(
+                queries,
+                lambda query: SearchHeadline(
+                    'search_text', query, config=query.config,
+                    start_sel=_MATCH_START, stop_sel=_MATCH_STOP,
+                    max_words=SNIPPET_WORDS, min_words=SNIPPET_WORDS // 2, max_fragments=2,
+                ),
+                TextField(),
+            ),
+        ).defer('search_text').order_by('-search_rank', '-effective_date')[:limit]
+        return [
+            LegalSearchResult(document, document.search_rank, _mark(document.search_snippet or ''))
+            for document in documents
+        ]
+
+    words = search_words(term)
+    if language:
+        queryset = queryset.filter(language=language)
+    for word in words:
+        queryset = queryset.filter(Q(title__icontains=word) | Q(search_text__icontains=word))
+    return [
+        LegalSearchResult(document, 0.0, _mark(_snippet(document.search_text, words)))
+        for document in queryset.order_by('-effective_date')[:limit]
+    ]
+
+
+def _mark(snippet: str) -> str:
+    return escape(snippet).replace(_MATCH_START, '<mark>').replace(_MATCH_STOP, '</mark>')
+
+
+def _snippet(text: str, words: list[str]) -> str:
+    """About SNIPPET_WORDS words of text from just before the first match, matches marked."""
+    tokens = text.split()
+    firsts = [word.split()[0].lower() for word in words if word.strip()]
+    first = next((i for i, token in enumerate(tokens) if any(word in token.lower() for word in firsts)), 0)
+    start = max(first - SNIPPET_WORDS // 3, 0)
+    snippet = ' '.join(tokens[start:start + SNIPPET_WORDS])
+    if not firsts:
+        return snippet
+    pattern = '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True) if word.strip())
+    return re.sub(pattern, lambda match: f'{_MATCH_START}{match[0]}{_MATCH_STOP}', snippet, flags=re.IGNORECASE)
+
+
+class LegalDocumentSearchMixin:
+    """
+    Full-text search for the LegalDocument admin, ranked unless sorted by a column.
+
+    search_fields outside full_text_search_fields (e.g. version) are still
+    matched as substrings, word by word.
+    """
+    full_text_search_fields = ('title', 'search_text')
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term or not full_text_search_enabled(self.model):
+            return super().get_search_results(request, queryset, search_term)
+        match, rank = full_text_match(queryset, term)
+        other_fields = [
+            field for field in self.get_search_fields(request) if field not in self.full_text_search_fields
+        ]
+        if other_fields:
+            other = Q()
+            for word in search_words(term):
+                other &= _any(other_fields, 'icontains', word)
+            match |= other
+        return queryset.filter(match).annotate(search_rank=rank), False
+
+    def get_ordering(self, request):
+        ordering = super().get_ordering(request)
+        searching = request.GET.get(SEARCH_VAR, '').strip() and ORDER_VAR not in request.GET
+        if searching and full_text_search_enabled(self.model):
+            return ['-search_rank', *ordering]
+        return ordering
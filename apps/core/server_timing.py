@@ -0,0 +1,206 @@
+"""
+Server-Timing breakdown of a request.
+
+For requests selected by ServerTimingMiddleware the response carries a
+Server-Timing header (shown in the browser devtools network panel):
+
+    Server-Timing: db;dur=4.10;desc="3 queries", cache;dur=0.52,
+        render;dur=1.37, email;dur=0.00, hash;dur=212.80, total;dur=221.06
+
+Durations are in milliseconds. They are collected in a context variable,
+so concurrent requests (threads or async tasks) don't mix, and calls made
+while another call of the same category is running are counted once (a
+BrowsableAPIRenderer rendering JSON, a cache get_many calling get).
+
+Only requests carrying a signed token get the header: in the
+X-Server-Timing-Token header (clients using JWTs), or in a cookie set
+when staff sign in with a session. The token is checked before anything
+else, so other requests never load the session or the user for it.
+
+install() wraps the cache backends, the email backend, the password
+hashers and the template/DRF renderers. Outside a timed request each
+wrapper costs one context variable lookup.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, user_logged_in, user_logged_out
+from django.core import signing
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from apps.core.instrumentation import wrap_methods
+from apps.core.tracing import CACHE_METHODS
+
+CATEGORIES = ('db', 'cache', 'render', 'email', 'hash')
+HEADER = 'X-Server-Timing-Token'
+COOKIE = 'server_timing'
+TOKEN_SALT = 'apps.core.server_timing'
+# Tokens stop working at most this long after the user loses staff status
+STAFF_CACHE_KEY = 'server_timing:staff:{}'
+STAFF_CACHE_SECONDS = 60
+
+_timings: ContextVar['RequestTimings | None'] = ContextVar('server_timings', default=None)
+
+
+class RequestTimings:
+    """Time spent per category during one request, in seconds."""
+
+    def __init__(self):
+        self.durations = dict.fromkeys(CATEGORIES, 0.0)
+        self.active = set()
+
+
+@contextmanager
+def timed(category: str):
+    """Add the duration of the block to category of the current request."""
+    timings = _timings.get()
+    if timings is None or category in timings.active:
+        yield
+        return
+    timings.active.add(category)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[category] += time.perf_counter() - start
+        timings.active.discard(category)
+
+
+@contextmanager
+def collect():
+    """Collect timings for the block (one request)."""
+    timings = RequestTimings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def header_value(timings: RequestTimings, queries: int, total: float) -> str:
+    metrics = []
+    for category in CATEGORIES:
+        metric = f'{category};dur={timings.durations[category] * 1000:.2f}'
+        if category == 'db':
+            metric += f';desc="{queries} queries"'
+        metrics.append(metric)
+    metrics.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(metrics)
+
+
+def make_token(user) -> str:
+    """Signed token enabling Server-Timing for requests sending it in HEADER."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def request_token(request) -> str | None:
+    """The token sent in HEADER, or else in COOKIE."""
+    return request.headers.get(HEADER) or request.COOKIES.get(COOKIE)
+
+
+def _issue_cookie(sender, request, user, **kwargs):
+    if request is not None and user.is_active and user.is_staff:
+        request.server_timing_cookie = make_token(user)
+
+
+def _drop_cookie(sender, request, **kwargs):
+    if request is not None and COOKIE in request.COOKIES:
+        request.server_timing_cookie = ''
+
+
+def update_cookie(request, response) -> None:
+    """Set COOKIE after a staff login in this request, delete it after a logout."""
+    token = getattr(request, 'server_timing_cookie', None)
+    if token:
+        response.set_cookie(
+            COOKIE, token,
+            max_age=settings.SERVER_TIMING_TOKEN_MAX_AGE,
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite=settings.SESSION_COOKIE_SAMESITE,
+        )
+    elif token == '':
+        response.delete_cookie(COOKIE, samesite=settings.SESSION_COOKIE_SAMESITE)
+
+
+def _token_user_pk(token: str) -> str | None:
+    try:
+        return signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=settings.SERVER_TIMING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+
+
+def _staff_users(pk: str):
+    return get_user_model().objects.filter(pk=pk, is_active=True, is_staff=True)
+
+
+def check_token(token: str) -> bool:
+    """Whether the token is valid and its user is still active staff (cached for STAFF_CACHE_SECONDS)."""
+    pk = _token_user_pk(token)
+    if pk is None:
+        return False
+    key = STAFF_CACHE_KEY.format(pk)
+    staff = cache.get(key)
+    if staff is None:
+        staff = _staff_users(pk).exists()
+        cache.set(key, staff, STAFF_CACHE_SECONDS)
+    return staff
+
+
+async def acheck_token(token: str) -> bool:
+    pk = _token_user_pk(token)
+    if pk is None:
+        return False
+    key = STAFF_CACHE_KEY.format(pk)
+    staff = await cache.aget(key)
+    if staff is None:
+        staff = await _staff_users(pk).aexists()
+        await cache.aset(key, staff, STAFF_CACHE_SECONDS)
+    return staff
+
+
+def _timed_method(category):
+    def wrap(name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if _timings.get() is None:
+                return method(*args, **kwargs)
+            with timed(category):
+                return method(*args, **kwargs)
+        return wrapper
+    return wrap
+
+
+_installed = False
+
+
+def install() -> None:
+    """
+    Time cache backends, the email backend, password hashers and renderers,
+    and issue COOKIE at staff logins. Called from CoreConfig.ready() when
+    SERVER_TIMING_ENABLED is set. Database time comes from apps.core.db.queries.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    user_logged_in.connect(_issue_cookie, dispatch_uid='apps.core.server_timing')
+    user_logged_out.connect(_drop_cookie, dispatch_uid='apps.core.server_timing')
+
+    for config in settings.CACHES.values():
+        wrap_methods(import_string(config['BACKEND']), CACHE_METHODS, _timed_method('cache'), '_server_timed')
+    wrap_methods(import_string(settings.EMAIL_BACKEND), ('send_messages',), _timed_method('email'), '_server_timed')
+    for path in settings.PASSWORD_HASHERS:
+        wrap_methods(import_string(path), ('encode', 'verify'), _timed_method('hash'), '_server_timed')
+
+    from django.template.backends.django import Template
+    from rest_framework.settings import api_settings
+
+    for renderer in (Template, *api_settings.DEFAULT_RENDERER_CLASSES):
+        wrap_methods(renderer, ('render',), _timed_method('render'), '_server_timed')
@@ -0,0 +1,15 @@
+"""
+Signal handlers for core app.
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import RequestProfile
+from .profiling import delete_profile_file
+
+
+@receiver(post_delete, sender=RequestProfile)
+def delete_request_profile_file(sender, instance, **kwargs):
+    """Remove the profile's file from PROFILING_DIR."""
+    delete_profile_file(instance.file_name)
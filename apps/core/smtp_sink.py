@@ -0,0 +1,147 @@
+"""
+SMTP sink for load tests.
+
+Accepts every message over plain SMTP and keeps it in memory, recording
+when it arrived, so a load test can measure how long the server under
+test takes to deliver the emails a request triggers (OTP codes, password
+reset links) and read codes back out of them. Nothing is delivered.
+
+Point the server under test at it:
+
+    EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend
+    EMAIL_HOST=localhost EMAIL_PORT=1025 EMAIL_USE_TLS=False
+
+Dependency-free on purpose, like apps.core.loadtest.
+"""
+
+import asyncio
+import email
+import email.policy
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class ReceivedMessage:
+    sender: str
+    recipients: list[str]
+    data: bytes
+    received_at: float  # time.perf_counter()
+
+    def text(self) -> str:
+        """The text/plain body, or the HTML body when there is none."""
+        message = email.message_from_bytes(self.data.replace(b'\r\n', b'\n'), policy=email.policy.default)
+        part = message.get_body(preferencelist=('plain', 'html'))
+        return part.get_content() if part is not None else ''
+
+
+class SMTPSink:
+    """
+    In-memory SMTP server.
+
+    Usage:
+        sink = SMTPSink()
+        await sink.start('127.0.0.1', 1025)
+        message = await sink.wait_for('user@example.com', timeout=10)
+        await sink.stop()
+    """
+
+    def __init__(self):
+        self.messages: list[ReceivedMessage] = []
+        self.server = None
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+
+    @property
+    def port(self) -> int | None:
+        return self.server.sockets[0].getsockname()[1] if self.server else None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 1025):
+        self.server = await asyncio.start_server(self._handle, host, port)
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def wait_for(self, recipient: str, timeout: float = 10.0, after: float = 0.0) -> ReceivedMessage | None:
+        """
+        The first message to recipient received after `after` (a
+        time.perf_counter() value), waiting up to timeout seconds for it
+        to arrive. Returns None on timeout.
+        """
+        recipient = recipient.lower()
+        for message in self.messages:
+            if recipient in message.recipients and message.received_at >= after:
+                return message
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(recipient, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(recipient, [])
+            if future in waiters:
+                waiters.remove(future)
+
+    def _deliver(self, message: ReceivedMessage):
+        self.messages.append(message)
+        for recipient in message.recipients:
+            for future in self._waiters.pop(recipient, []):
+                if not future.done():
+                    future.set_result(message)
+
+    async def _handle(self, reader, writer):
+        async def reply(line: str):
+            writer.write(line.encode() + b'\r\n')
+            await writer.drain()
+
+        sender, recipients = '', []
+        try:
+            await reply('220 smtp-sink ready')
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, argument = line.decode('latin-1').strip().partition(' ')
+                command = command.upper()
+                if command in ('EHLO', 'HELO'):
+                    await reply('250 smtp-sink')
+                elif command == 'MAIL':
+                    sender, recipients = _address(argument), []
+                    await reply('250 OK')
+                elif command == 'RCPT':
+                    recipients.append(_address(argument).lower())
+                    await reply('250 OK')
+                elif command == 'DATA':
+                    await reply('354 End data with <CR><LF>.<CR><LF>')
+                    lines = []
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'.\r\n', b'.\n', b''):
+                            break
+                        lines.append(line[1:] if line.startswith(b'..') else line)
+                    self._deliver(ReceivedMessage(sender, recipients, b''.join(lines), time.perf_counter()))
+                    sender, recipients = '', []
+                    await reply('250 OK')
+                elif command == 'RSET':
+                    sender, recipients = '', []
+                    await reply('250 OK')
+                elif command == 'NOOP':
+                    await reply('250 OK')
+                elif command == 'QUIT':
+                    await reply('221 Bye')
+                    break
+                else:
+                    await reply('502 Command not implemented')
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _address(argument: str) -> str:
+    """The address of a MAIL FROM:<a> or RCPT TO:<a> argument."""
+    _, _, value = argument.partition(':')
+    return value.strip().split(' ')[0].strip('<>')
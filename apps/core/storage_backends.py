@@ -0,0 +1,53 @@
+"""
+Storage backends for object storage (S3-compatible).
+
+Requires django-storages and boto3 (production dependencies).
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from storages.backends.s3 import S3Storage
+
+from apps.core.metrics import record_cache_lookup
+
+
+class CachedPresignedS3Storage(S3Storage):
+    """
+    S3 storage that caches presigned read URLs.
+
+    Uploaded objects get unique keys (a new upload is a new object version),
+    so a signed URL stays valid for the key until it expires. Caching it
+    avoids re-signing on every serialization of the same object.
+    """
+
+    # Re-sign this many seconds before the cached URL would expire
+    URL_EXPIRY_MARGIN = 60
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if parameters or http_method or not self.querystring_auth:
+            return super().url(name, parameters=parameters, expire=expire, http_method=http_method)
+
+        if expire is None:
+            expire = self.querystring_expire
+        timeout = expire - self.URL_EXPIRY_MARGIN
+        if timeout <= 0:
+            return super().url(name, expire=expire)
+
+        cache_key = self._url_cache_key(name, expire)
+        url = cache.get(cache_key)
+        record_cache_lookup('storage_url', url is not None)
+        if url is None:
+            url = super().url(name, expire=expire)
+            cache.set(cache_key, url, timeout=timeout)
+        return url
+
+    def delete(self, name):
+        super().delete(name)
+        cache.delete(self._url_cache_key(name, self.querystring_expire))
+
+    def _url_cache_key(self, name, expire):
+        prefix = getattr(settings, 'STORAGE_URL_CACHE_PREFIX', 'storage_url')
+        digest = hashlib.sha1(f"{self.bucket_name}:{name}:{expire}".encode()).hexdigest()
+        return f"{prefix}:{digest}"
@@ -0,0 +1,38 @@
+"""
+Test helpers.
+"""
+
+from contextlib import contextmanager
+
+from django.test import override_settings
+
+from apps.core.db.queries import count_queries
+
+
+class QueryBudgetTestMixin:
+    """
+    Enforce view query budgets in tests.
+
+    Requests to views that declare query_budget fail the test with
+    QueryBudgetExceeded when they run more queries. assertMaxQueries checks
+    an upper bound for arbitrary code, e.g. services.
+
+    Usage:
+        class LoginAPITests(QueryBudgetTestMixin, APITestCase):
+            def test_login(self):
+                with self.assertMaxQueries(3):
+                    AuthService.login(...)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(QUERY_BUDGET_STRICT=True))
+
+    @contextmanager
+    def assertMaxQueries(self, limit):
+        with count_queries() as stats:
+            yield stats
+        if stats.count > limit:
+            repeated = ''.join(f'\n  {n}x {sql}' for sql, n in stats.most_repeated())
+            self.fail(f'{stats.count} queries executed, expected at most {limit}{repeated}')
@@ -0,0 +1,191 @@
+"""
+Tests for the precomputed OpenAPI schema.
+
+Test Structure:
+- SchemaArtifactTests: Generation, disk persistence and versioning
+- CachedSchemaAPITests: /api/schema/ serving with ETag
+- GenerateAPISchemaCommandTests: generate_api_schema management command
+"""
+
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.core.api import schema
+from apps.core.api.schema import get_schema_artifact
+
+
+class SchemaCacheMixin:
+    """Isolate the schema cache directory and in-memory artifacts."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            API_SCHEMA_CACHE_DIR=self.cache_dir,
+            CODE_VERSION='abc123',
+        )
+        self.settings_override.enable()
+        schema.clear_schema_cache()
+
+    def tearDown(self):
+        schema.clear_schema_cache()
+        self.settings_override.disable()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super().tearDown()
+
+    def count_generations(self):
+        return patch.object(schema, 'render_schema', wraps=schema.render_schema)
+
+
+class SchemaArtifactTests(SchemaCacheMixin, TestCase):
+    """Tests for schema artifact caching."""
+
+    def test_generated_once_per_version(self):
+        with self.count_generations() as render:
+            first = get_schema_artifact('yaml')
+            second = get_schema_artifact('yaml')
+
+        self.assertIs(first, second)
+        self.assertEqual(render.call_count, 1)
+        self.assertIn(b'openapi:', first.content)
+
+    def test_persisted_artifact_is_reused_after_restart(self):
+        first = get_schema_artifact('json')
+        self.assertTrue((Path(self.cache_dir) / 'abc123' / 'openapi-en-us.json').exists())
+
+        schema.clear_schema_cache()  # simulate a new worker process
+        with self.count_generations() as render:
+            second = get_schema_artifact('json')
+
+        self.assertEqual(render.call_count, 0)
+        self.assertEqual(first.etag, second.etag)
+
+    def test_new_code_version_regenerates_and_prunes_old(self):
+        get_schema_artifact('yaml')
+
+        with override_settings(CODE_VERSION='def456'), self.count_generations() as render:
+            artifact = get_schema_artifact('yaml')
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(artifact.version, 'def456')
+        self.assertEqual(sorted(p.name for p in Path(self.cache_dir).iterdir()), ['def456'])
+
+    def test_prune_keeps_unrelated_directories(self):
+        unrelated = Path(self.cache_dir) / 'uploads'
+        unrelated.mkdir()
+        (unrelated / 'data.bin').write_bytes(b'keep')
+
+        get_schema_artifact('yaml')
+
+        self.assertTrue((unrelated / 'data.bin').exists())
+
+    def test_memory_cache_is_bounded(self):
+        with patch.object(schema, 'MAX_ARTIFACTS', 2):
+            get_schema_artifact('yaml')
+            get_schema_artifact('json')
+            with override_settings(CODE_VERSION='def456'):
+                get_schema_artifact('yaml')
+
+        self.assertEqual(list(schema._artifacts), [('def456', None, 'yaml', 'en-us')])
+
+    def test_unknown_api_version_uses_default_schema(self):
+        with self.count_generations() as render:
+            first = get_schema_artifact('yaml')
+            second = get_schema_artifact('yaml', api_version='v9')
+
+        self.assertIs(first, second)
+        self.assertEqual(render.call_count, 1)
+
+    @override_settings(CODE_VERSION='')
+    def test_falls_back_to_source_fingerprint(self):
+        self.assertTrue(schema.get_code_version().startswith('src-'))
+
+
+class CachedSchemaAPITests(SchemaCacheMixin, TestCase):
+    """Tests for GET /api/schema/."""
+
+    def test_returns_yaml_with_etag(self):
+        response = self.client.get(reverse('schema'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/vnd.oai.openapi'))
+        self.assertIn(b'openapi:', response.content)
+        self.assertEqual(response['ETag'], get_schema_artifact('yaml').etag)
+        self.assertIn('max-age', response['Cache-Control'])
+
+    def test_json_format(self):
+        response = self.client.get(reverse('schema'), {'format': 'json'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['info']['title'], 'Altea API')
+        self.assertEqual(response['ETag'], get_schema_artifact('json').etag)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(reverse('schema'))['ETag']
+
+        response = self.client.get(reverse('schema'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_unknown_language_is_not_used(self):
+        with self.count_generations() as render:
+            for lang in ['/../../escaped', 'xx', 'de']:
+                response = self.client.get(reverse('schema'), {'lang': lang})
+                self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(
+            sorted(p.name for p in Path(self.cache_dir).rglob('*') if p.is_file()),
+            ['.openapi-schema-version', 'openapi-de.yaml', 'openapi-en-us.yaml'],
+        )
+
+    def test_unknown_version_is_served_from_cache(self):
+        with self.count_generations() as render:
+            self.client.get(reverse('schema'))
+            response = self.client.get(reverse('schema'), {'version': 'v2'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(render.call_count, 1)
+
+    def test_repeated_requests_do_not_regenerate(self):
+        with self.count_generations() as render:
+            for _ in range(3):
+                self.client.get(reverse('schema'))
+
+        self.assertEqual(render.call_count, 1)
+
+
+class GenerateAPISchemaCommandTests(SchemaCacheMixin, TestCase):
+    """Tests for the generate_api_schema management command."""
+
+    def test_writes_all_formats(self):
+        out = StringIO()
+        call_command('generate_api_schema', stdout=out)
+
+        version_dir = Path(self.cache_dir) / 'abc123'
+        self.assertTrue((version_dir / 'openapi-en-us.yaml').exists())
+        self.assertTrue((version_dir / 'openapi-en-us.json').exists())
+        self.assertIn('Code version: abc123', out.getvalue())
+
+    def test_rejects_unsupported_language(self):
+        with self.assertRaises(CommandError):
+            call_command('generate_api_schema', language=['../x'], stdout=StringIO())
+
+    def test_served_schema_uses_precomputed_artifact(self):
+        call_command('generate_api_schema', format=['yaml'], stdout=StringIO())
+        schema.clear_schema_cache()
+
+        with self.count_generations() as render:
+            response = self.client.get(reverse('schema'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(render.call_count, 0)
@@ -0,0 +1,64 @@
+"""
+Tests for the async cache wrappers.
+
+Test Structure:
+- RedisAsyncCacheTests: Client options and keys shared with django-redis
+"""
+
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.async_cache import RedisAsyncCache, get_async_cache
+
+REDIS_CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://cache.internal:6380/2',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'PASSWORD': 'secret',
+            'SOCKET_TIMEOUT': 3,
+            'SOCKET_CONNECT_TIMEOUT': 2,
+            'CONNECTION_POOL_KWARGS': {'max_connections': 7},
+        },
+        'KEY_PREFIX': 'altea',
+        'VERSION': 2,
+    }
+}
+
+
+@override_settings(CACHES=REDIS_CACHES)
+class RedisAsyncCacheTests(SimpleTestCase):
+    """Tests for RedisAsyncCache (no Redis server needed)."""
+
+    def test_client_uses_cache_options(self):
+        cache = get_async_cache()
+        self.assertIsInstance(cache, RedisAsyncCache)
+
+        async def client():
+            return cache._client()
+
+        pool = async_to_sync(client)().connection_pool
+        self.assertEqual(pool.connection_kwargs['host'], 'cache.internal')
+        self.assertEqual(pool.connection_kwargs['db'], 2)
+        self.assertEqual(pool.connection_kwargs['password'], 'secret')
+        self.assertEqual(pool.connection_kwargs['socket_timeout'], 3)
+        self.assertEqual(pool.connection_kwargs['socket_connect_timeout'], 2)
+        self.assertEqual(pool.max_connections, 7)
+
+    def test_keys_match_sync_backend(self):
+        cache = get_async_cache()
+        client = AsyncMock()
+        client.get.return_value = None
+
+        with patch.object(RedisAsyncCache, '_client', return_value=client):
+            async_to_sync(cache.aget)('pin', version=3)
+            async_to_sync(cache.adelete)('pin')
+
+        backend = caches['default']
+        client.get.assert_awaited_once_with(backend.client.make_key('pin', version=3))
+        client.delete.assert_awaited_once_with(backend.client.make_key('pin'))
+        self.assertEqual(str(backend.client.make_key('pin')), 'altea:2:pin')
@@ -0,0 +1,90 @@
+"""
+Tests for the benchmarking helpers and the endpoint benchmark suite.
+
+Test Structure:
+- MeasureCallsTests: Timings, query counts and memory per call
+- CompareToBaselineTests: Regression detection
+- EndpointBenchmarkTests: Endpoints called through the test client
+"""
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.accounts.models import User
+from apps.core.benchmarking import BenchmarkResult, compare_to_baseline, measure_calls
+from apps.core.management.commands.benchmark_endpoints import ENDPOINTS, run_endpoint_benchmarks
+
+
+class MeasureCallsTests(TestCase):
+    """Tests for measure_calls."""
+
+    def test_queries_and_memory(self):
+        result = measure_calls(
+            'users', lambda: [bytearray(64 * 1024), User.objects.exists()], iterations=4, warmup=1
+        )
+
+        self.assertEqual(result.iterations, 4)
+        self.assertEqual(result.queries, [1, 1, 1, 1])
+        self.assertGreaterEqual(result.peak_memory, 64 * 1024)
+        self.assertEqual(result.as_dict()['queries_per_call'], 1)
+
+    def test_setup_untimed_and_passed(self):
+        created = []
+
+        def setup():
+            created.append(User.objects.create(username=f'u{len(created)}', email=f'u{len(created)}@example.com'))
+            return created[-1].pk
+
+        result = measure_calls(
+            'lookup', lambda pk: User.objects.get(pk=pk), setup=setup, iterations=3, warmup=1, memory_iterations=2
+        )
+
+        self.assertEqual(len(created), 6)
+        self.assertEqual(result.queries, [1, 1, 1])
+
+
+class CompareToBaselineTests(SimpleTestCase):
+    """Tests for compare_to_baseline."""
+
+    def make_result(self, latency=0.001, queries=2, peak_memory=100 * 1024):
+        return BenchmarkResult('me', samples=[latency] * 10, queries=[queries] * 10, peak_memory=peak_memory)
+
+    def test_within_tolerance(self):
+        baseline = {'me': self.make_result().as_dict()}
+
+        regressions = compare_to_baseline([self.make_result(latency=0.0014, peak_memory=120 * 1024)], baseline)
+
+        self.assertEqual(regressions, [])
+
+    def test_extra_query_regresses(self):
+        baseline = {'me': self.make_result().as_dict()}
+
+        regressions = compare_to_baseline([self.make_result(queries=3)], baseline)
+
+        self.assertEqual(regressions, ['me: 3 queries per call, baseline 2'])
+
+    def test_latency_and_memory_regress(self):
+        baseline = {'me': self.make_result().as_dict()}
+
+        regressions = compare_to_baseline(
+            [self.make_result(latency=0.002, peak_memory=200 * 1024)], baseline, latency_tolerance=0.5
+        )
+
+        self.assertEqual(len(regressions), 2)
+        self.assertIn('p95 latency 2000 us, baseline 1000 us (+100%, tolerance 50%)', regressions[0])
+        self.assertIn('peak memory', regressions[1])
+
+    def test_new_endpoint_ignored(self):
+        self.assertEqual(compare_to_baseline([self.make_result()], {}), [])
+
+
+class EndpointBenchmarkTests(TestCase):
+    """Tests for run_endpoint_benchmarks."""
+
+    def test_all_endpoints(self):
+        results = run_endpoint_benchmarks(list(ENDPOINTS), iterations=2, warmup=1)
+
+        self.assertEqual([r.name for r in results], list(ENDPOINTS))
+        for result in results:
+            self.assertEqual(result.iterations, 2)
+            self.assertGreater(result.payload_bytes, 0)
+            self.assertIsNotNone(result.peak_memory)
@@ -0,0 +1,182 @@
+"""
+Tests for compiled serializer representations.
+
+Each compiled serializer must produce exactly the same output as the DRF
+serializer it was compiled from.
+
+Test Structure:
+- CompileSerializerTests: Compiler behavior and fallbacks
+- LoginUserSerializerParityTests: LoginUserSerializer parity
+- AppSettingsSerializerParityTests: AppSettingsSerializer parity
+- LegalDocumentListSerializerParityTests: LegalDocumentListSerializer parity
+"""
+
+import shutil
+import tempfile
+from datetime import date
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+from rest_framework import serializers
+
+from apps.accounts.api.serializers import LoginUserSerializer
+from apps.accounts.models import User
+from apps.core.api.compiled import (
+    CompiledSerializerMixin,
+    SerializerNotCompilable,
+    compile_serializer,
+)
+from apps.core.api.serializers import AppSettingsSerializer, LegalDocumentListSerializer
+from apps.core.models import AppSettings, LegalDocument
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_upload(name='image.png'):
+    output = BytesIO()
+    Image.new('RGB', (300, 300), color='green').save(output, format='PNG')
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/png')
+
+
+class ParityMixin:
+    """Assert compiled output equals DRF output."""
+
+    def assert_parity(self, serializer_class, instance, context=None):
+        expected = serializer_class(instance, context=context or {}).data
+        actual = compile_serializer(serializer_class)(instance, context)
+        self.assertEqual(actual, dict(expected))
+        self.assertEqual(list(actual), list(expected))
+
+
+class CompileSerializerTests(TestCase):
+    """Tests for compile_serializer and CompiledSerializerMixin."""
+
+    def test_nested_serializer_is_not_compilable(self):
+        class NestedSerializer(serializers.Serializer):
+            user = LoginUserSerializer()
+
+        with self.assertRaises(SerializerNotCompilable):
+            compile_serializer(NestedSerializer)
+
+    def test_custom_to_representation_is_not_compilable(self):
+        class CustomSerializer(serializers.Serializer):
+            name = serializers.CharField()
+
+            def to_representation(self, instance):
+                return {'custom': True}
+
+        with self.assertRaises(SerializerNotCompilable):
+            compile_serializer(CustomSerializer)
+
+    def test_mixin_falls_back_to_drf(self):
+        class FallbackSerializer(CompiledSerializerMixin, serializers.Serializer):
+            name = serializers.CharField(source='*')
+
+        self.assertEqual(FallbackSerializer.represent('value'), {'name': 'value'})
+
+    def test_method_helpers_see_call_context(self):
+        class HelperSerializer(CompiledSerializerMixin, serializers.Serializer):
+            greeting = serializers.SerializerMethodField()
+
+            def get_greeting(self, obj):
+                return self.build(obj)
+
+            def build(self, obj):
+                return f"{self.context['prefix']} {obj}"
+
+        self.assertEqual(HelperSerializer.represent('world', {'prefix': 'hello'}), {'greeting': 'hello world'})
+        self.assertEqual(HelperSerializer.represent('there', {'prefix': 'hi'}), {'greeting': 'hi there'})
+
+    def test_compiled_function_is_cached_per_class(self):
+        first = LoginUserSerializer.get_compiled_representation()
+        self.assertIs(LoginUserSerializer.get_compiled_representation(), first)
+
+    def test_schema_still_uses_serializer_fields(self):
+        self.assertIn('profile_picture', LoginUserSerializer().fields)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, PROFILE_PICTURE_RENDITIONS_ASYNC=False)
+class LoginUserSerializerParityTests(ParityMixin, TestCase):
+    """Parity tests for LoginUserSerializer."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='compiled@example.com',
+            email='compiled@example.com',
+            password='SecurePass123!',
+            first_name='Anna',
+            last_name='Müller',
+        )
+        self.request = RequestFactory().get('/api/v1/auth/me/')
+
+    def test_parity_without_picture(self):
+        self.assert_parity(LoginUserSerializer, self.user)
+
+    def test_parity_with_blank_names(self):
+        self.user.first_name = ''
+        self.user.last_name = ''
+        self.assert_parity(LoginUserSerializer, self.user, {'request': self.request})
+
+    def test_parity_with_picture_and_request(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile_picture = make_upload()
+            self.user.save()
+        self.user.refresh_from_db()
+
+        self.assert_parity(LoginUserSerializer, self.user, {'request': self.request})
+        self.assert_parity(LoginUserSerializer, self.user)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class AppSettingsSerializerParityTests(ParityMixin, TestCase):
+    """Parity tests for AppSettingsSerializer."""
+
+    def setUp(self):
+        self.app_settings = AppSettings.get_settings()
+        self.request = RequestFactory().get('/api/v1/config/app-settings/')
+
+    def test_parity_defaults(self):
+        self.assert_parity(AppSettingsSerializer, self.app_settings)
+
+    def test_parity_with_logo_and_request(self):
+        self.app_settings.logo = make_upload('logo.png')
+        self.app_settings.save()
+
+        self.assert_parity(AppSettingsSerializer, self.app_settings, {'request': self.request})
+        self.assert_parity(AppSettingsSerializer, self.app_settings)
+
+    def test_parity_with_null_support_url(self):
+        self.app_settings.support_url = None
+        self.assert_parity(AppSettingsSerializer, self.app_settings)
+
+
+class LegalDocumentListSerializerParityTests(ParityMixin, TestCase):
+    """Parity tests for LegalDocumentListSerializer."""
+
+    def setUp(self):
+        self.documents = [
+            LegalDocument.objects.create(
+                document_type=document_type,
+                version='1.0',
+                title=title,
+                content='<p>Content</p>',
+                effective_date=date(2025, 1, 1),
+            )
+            for document_type, title in (('terms', 'Terms'), ('privacy', 'Datenschutz'))
+        ]
+
+    def test_parity_per_document(self):
+        for document in self.documents:
+            self.assert_parity(LegalDocumentListSerializer, document)
+
+    def test_represent_many_matches_list_serializer(self):
+        documents = LegalDocument.objects.all()
+        expected = LegalDocumentListSerializer(documents, many=True).data
+        self.assertEqual(LegalDocumentListSerializer.represent_many(documents), expected)
@@ -0,0 +1,112 @@
+"""
+Tests for planner count estimates.
+
+Test Structure:
+- PlannerQueryTests: Reading reltuples and EXPLAIN row estimates
+- EstimatedCountPaginatorTests: Estimates above the threshold, exact counts below
+- AdminCountTests: Changelists on large tables
+"""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.core.db.counts import EstimatedCountPaginator, _explain_estimate, _table_estimate, estimate_count
+
+
+class FakeCursor:
+    def __init__(self, row):
+        self.row = row
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return self.row
+
+
+class PlannerQueryTests(SimpleTestCase):
+    """Tests for the PostgreSQL estimate queries."""
+
+    def test_table_estimate(self):
+        self.assertEqual(_table_estimate(FakeCursor((12_345_678.0,)), 'accounts_user'), 12_345_678)
+
+    def test_table_never_analyzed(self):
+        self.assertIsNone(_table_estimate(FakeCursor((-1.0,)), 'accounts_user'))
+        self.assertIsNone(_table_estimate(FakeCursor(None), 'missing'))
+
+    def test_explain_estimate(self):
+        cursor = FakeCursor(([{'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': 4200}}],))
+
+        self.assertEqual(_explain_estimate(cursor, 'SELECT 1 WHERE %s', [True]), 4200)
+        self.assertEqual(cursor.executed[0], ('EXPLAIN (FORMAT JSON) SELECT 1 WHERE %s', [True]))
+
+    def test_explain_estimate_from_text(self):
+        self.assertEqual(_explain_estimate(FakeCursor(('[{"Plan": {"Plan Rows": 7}}]',)), 'SELECT 1', []), 7)
+
+
+@override_settings(ADMIN_EXACT_COUNT_THRESHOLD=100)
+class EstimatedCountPaginatorTests(TestCase):
+    """Tests for EstimatedCountPaginator."""
+
+    def setUp(self):
+        for n in range(3):
+            User.objects.create_user(username=f'user{n}@example.com', email=f'user{n}@example.com')
+
+    def test_exact_count_without_postgres(self):
+        self.assertIsNone(estimate_count(User.objects.all()))
+        paginator = EstimatedCountPaginator(User.objects.order_by('id'), 2)
+
+        self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.estimated)
+
+    def test_uses_large_estimates(self):
+        with patch('apps.core.db.counts.estimate_count', return_value=5_000_000):
+            paginator = EstimatedCountPaginator(User.objects.order_by('id'), 100)
+
+            self.assertEqual(paginator.count, 5_000_000)
+        self.assertTrue(paginator.estimated)
+        self.assertEqual(paginator.num_pages, 50_000)
+
+    def test_counts_small_results_exactly(self):
+        with patch('apps.core.db.counts.estimate_count', return_value=40):
+            paginator = EstimatedCountPaginator(User.objects.order_by('id'), 2)
+
+            self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.estimated)
+
+    def test_lists(self):
+        self.assertEqual(EstimatedCountPaginator([1, 2, 3], 2).count, 3)
+
+
+class AdminCountTests(TestCase):
+    """Tests for the accounts admins on large tables."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        self.client.force_login(self.admin)
+
+    def test_changelists_show_estimates_without_full_count(self):
+        for url_name in [
+            'admin:accounts_user_changelist',
+            'admin:accounts_otptoken_changelist',
+            'admin:accounts_emailverificationtoken_changelist',
+            'admin:accounts_passwordresettoken_changelist',
+        ]:
+            with self.subTest(url_name), patch('apps.core.db.counts.estimate_count', return_value=20_000_000):
+                response = self.client.get(reverse(url_name))
+
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'about 20000000')
+                self.assertFalse(response.context['cl'].show_full_result_count)
+
+    def test_small_changelist_is_exact(self):
+        response = self.client.get(reverse('admin:accounts_user_changelist'))
+
+        self.assertNotContains(response, 'about ')
+        self.assertEqual(response.context['cl'].result_count, 1)
@@ -0,0 +1,155 @@
+"""
+Tests for database connection metrics.
+
+Test Structure:
+- ConnectionMetricsTests: Counters recorded by ConnectionMetricsMixin
+- DatabaseConnectionStatsAPITests: /api/v1/system/db-connections/
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.db import OperationalError, connections
+from django.db.backends.sqlite3 import base as sqlite_base
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.core.db.metrics import (
+    ConnectionMetricsMixin,
+    get_connection_stats,
+    reset_connection_stats,
+)
+
+
+class MetricsDatabaseWrapper(ConnectionMetricsMixin, sqlite_base.DatabaseWrapper):
+    pass
+
+
+class ConnectionMetricsTests(SimpleTestCase):
+    """Tests for ConnectionMetricsMixin on a standalone SQLite connection."""
+
+    alias = 'metrics_test'
+
+    def setUp(self):
+        reset_connection_stats()
+        fd, self.db_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        settings_dict = {
+            **connections['default'].settings_dict,
+            'NAME': self.db_path,
+            'CONN_MAX_AGE': 60,
+            'CONN_HEALTH_CHECKS': True,
+        }
+        self.wrapper = MetricsDatabaseWrapper(settings_dict, alias=self.alias)
+
+    def tearDown(self):
+        self.wrapper.close()
+        os.remove(self.db_path)
+        reset_connection_stats()
+
+    def stats(self):
+        return get_connection_stats()[self.alias]
+
+    def new_request(self):
+        """Simulate Django's request_started/finished handling."""
+        self.wrapper.close_if_unusable_or_obsolete()
+
+    def test_first_checkout_opens_connection(self):
+        """The first request opens and times a new connection."""
+        self.wrapper.ensure_connection()
+
+        stats = self.stats()
+        self.assertEqual(stats['checkouts'], 1)
+        self.assertEqual(stats['reused'], 0)
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['open_connections'], 1)
+        self.assertGreater(stats['connect_seconds_total'], 0)
+
+    def test_persistent_connection_reused(self):
+        """Later requests reuse the open connection."""
+        self.wrapper.ensure_connection()
+        for _ in range(3):
+            self.new_request()
+            self.wrapper.ensure_connection()
+            self.wrapper.ensure_connection()  # same request, not a new checkout
+
+        stats = self.stats()
+        self.assertEqual(stats['checkouts'], 4)
+        self.assertEqual(stats['reused'], 3)
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['reuse_ratio'], 0.75)
+
+    def test_close_decrements_open_connections(self):
+        """Closing a connection updates the open connection gauge."""
+        self.wrapper.ensure_connection()
+        self.wrapper.close()
+        self.wrapper.close()
+
+        self.assertEqual(self.stats()['open_connections'], 0)
+
+    def test_obsolete_connection_closed(self):
+        """Connections past CONN_MAX_AGE are closed at the request boundary."""
+        self.wrapper.ensure_connection()
+        self.wrapper.close_at = 0
+
+        self.new_request()
+
+        stats = self.stats()
+        self.assertEqual(stats['closed_obsolete'], 1)
+        self.assertEqual(stats['open_connections'], 0)
+
+    def test_connect_failure_counted(self):
+        """Failed connection attempts are counted and re-raised."""
+        with patch.object(self.wrapper, 'get_new_connection', side_effect=OperationalError('down')):
+            with self.assertRaises(OperationalError):
+                self.wrapper.ensure_connection()
+
+        stats = self.stats()
+        self.assertEqual(stats['connect_failures'], 1)
+        self.assertEqual(stats['open_connections'], 0)
+
+    def test_health_check_failure_counted(self):
+        """Dead persistent connections are replaced and counted."""
+        self.wrapper.ensure_connection()
+        self.new_request()
+
+        with patch.object(self.wrapper, 'is_usable', return_value=False):
+            self.wrapper.close_if_health_check_failed()
+
+        stats = self.stats()
+        self.assertEqual(stats['health_check_failures'], 1)
+        self.assertEqual(stats['open_connections'], 0)
+
+
+class DatabaseConnectionStatsAPITests(TestCase):
+    """Tests for the connection metrics endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('core-api:system-db-connections')
+
+    def test_staff_only(self):
+        """Non-staff users are rejected."""
+        user = User.objects.create_user(username='user@example.com', email='user@example.com', password='x')
+        self.client.force_authenticate(user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_returns_stats(self):
+        """Staff users get the per-alias counters."""
+        staff = User.objects.create_user(
+            username='staff@example.com', email='staff@example.com', password='x', is_staff=True
+        )
+        self.client.force_authenticate(staff)
+
+        with patch('apps.core.api.views.get_connection_stats', return_value={'default': {'checkouts': 3}}):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['databases']['default']['checkouts'], 3)
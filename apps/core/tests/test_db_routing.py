@@ -0,0 +1,261 @@
+"""
+Tests for read-replica routing.
+
+Test Structure:
+- ReplicaRouterTests: Read/write routing, lag fallback and primary-only models
+- PrimaryPinTests: Read-your-writes pinning
+- ReplicaRoutingMiddlewareTests: Per-request routing decisions (sync and async)
+- ServicePinTests: Services that log users in pin them to the primary
+"""
+
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import EmailVerificationToken, OTPToken, User
+from apps.accounts.services import EmailVerificationService, OTPService
+from apps.core.db import routers
+from apps.core.db.routers import ReplicaRouter
+from apps.core.middleware import ReplicaRoutingMiddleware
+from apps.core.models import AppSettings
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+class RoutingTestMixin:
+    """Reset lag measurements and pins between tests."""
+
+    def setUp(self):
+        super().setUp()
+        routers.reset_replica_lag()
+        cache.clear()
+        self.token = routers.use_primary(False)
+
+    def tearDown(self):
+        routers.reset_use_primary(self.token)
+        routers.reset_replica_lag()
+        super().tearDown()
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, DATABASE_REPLICA_MAX_LAG=5)
+class ReplicaRouterTests(RoutingTestMixin, SimpleTestCase):
+    """Tests for ReplicaRouter."""
+
+    def setUp(self):
+        super().setUp()
+        self.router = ReplicaRouter()
+
+    @patch('apps.core.db.routers.measure_replica_lag', return_value=0.2)
+    def test_reads_go_to_replicas(self, mock_lag):
+        """Reads are spread over the replicas."""
+        chosen = {self.router.db_for_read(AppSettings) for _ in range(50)}
+
+        self.assertEqual(chosen, set(REPLICAS))
+
+    @patch('apps.core.db.routers.measure_replica_lag', return_value=0.2)
+    def test_writes_go_to_primary(self, mock_lag):
+        self.assertEqual(self.router.db_for_write(AppSettings), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        self.assertEqual(self.router.db_for_read(AppSettings), 'default')
+
+    def test_lagging_replica_skipped(self):
+        """Replicas lagging more than the threshold are not used."""
+        lags = {'replica_1': 30.0, 'replica_2': 1.0}
+        with patch('apps.core.db.routers.measure_replica_lag', side_effect=lags.get):
+            chosen = {self.router.db_for_read(AppSettings) for _ in range(20)}
+
+        self.assertEqual(chosen, {'replica_2'})
+
+    @patch('apps.core.db.routers.measure_replica_lag', return_value=60.0)
+    def test_all_lagging_falls_back_to_primary(self, mock_lag):
+        self.assertEqual(self.router.db_for_read(AppSettings), 'default')
+
+    @patch('apps.core.db.routers.measure_replica_lag', side_effect=OSError('unreachable'))
+    def test_unreachable_replica_falls_back_to_primary(self, mock_lag):
+        self.assertEqual(self.router.db_for_read(AppSettings), 'default')
+
+    @patch('apps.core.db.routers.measure_replica_lag', return_value=0.0)
+    def test_lag_measured_periodically(self, mock_lag):
+        """Lag is measured once per interval, not on every query."""
+        for _ in range(10):
+            self.router.db_for_read(AppSettings)
+
+        self.assertEqual(mock_lag.call_count, len(REPLICAS))
+
+    @patch('apps.core.db.routers.measure_replica_lag', return_value=0.0)
+    def test_primary_only_models(self, mock_lag):
+        """Short-lived auth state is always read from the primary."""
+        self.assertEqual(self.router.db_for_read(OTPToken), 'default')
+        self.assertEqual(self.router.db_for_read(EmailVerificationToken), 'default')
+
+    @patch('apps.core.db.routers.measure_replica_lag', return_value=0.0)
+    def test_use_primary(self, mock_lag):
+        routers.use_primary()
+
+        self.assertEqual(self.router.db_for_read(AppSettings), 'default')
+
+    def test_no_migrations_on_replicas(self):
+        self.assertFalse(self.router.allow_migrate('replica_1', 'core'))
+        self.assertIsNone(self.router.allow_migrate('default', 'core'))
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, DATABASE_PRIMARY_PIN_SECONDS=10)
+class PrimaryPinTests(RoutingTestMixin, SimpleTestCase):
+    """Tests for pin_to_primary."""
+
+    def test_pin(self):
+        routers.pin_to_primary(42)
+
+        self.assertTrue(routers.is_pinned(42))
+        self.assertFalse(routers.is_pinned(43))
+        self.assertFalse(routers.is_pinned(None))
+
+    def test_async_pin(self):
+        async_to_sync(routers.apin_to_primary)(7)
+
+        self.assertTrue(async_to_sync(routers.ais_pinned)(7))
+
+    def test_pin_within_request_until_it_ends(self):
+        token = routers.use_primary(False)
+        routers.pin_to_primary(42)
+        self.assertTrue(routers._use_primary.get())
+
+        routers.reset_use_primary(token)
+
+        self.assertFalse(routers._use_primary.get())
+
+    def test_outside_request_context_not_pinned(self):
+        """Celery tasks and management commands don't stay on the primary."""
+        reset = routers._use_primary.set(None)
+        self.addCleanup(routers._use_primary.reset, reset)
+
+        routers.pin_to_primary(42)
+        async_to_sync(routers.apin_to_primary)(42)
+
+        self.assertIsNone(routers._use_primary.get())
+        self.assertTrue(routers.is_pinned(42))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_pin_without_replicas(self):
+        routers.pin_to_primary(42)
+
+        self.assertFalse(routers.is_pinned(42))
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRoutingMiddlewareTests(RoutingTestMixin, SimpleTestCase):
+    """Tests for ReplicaRoutingMiddleware."""
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.seen = []
+
+    def get_response(self, request):
+        self.seen.append(routers._use_primary.get())
+        return HttpResponse(status=getattr(request, 'status', 200))
+
+    def call(self, request, user=None):
+        request.user = user or AnonymousUser()
+        return ReplicaRoutingMiddleware(self.get_response)(request)
+
+    def bearer(self, user_id):
+        return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(User(id=user_id))}'}
+
+    def test_safe_request_may_use_replica(self):
+        self.call(self.factory.get('/'))
+
+        self.assertEqual(self.seen, [False])
+
+    def test_write_request_uses_primary(self):
+        self.call(self.factory.post('/'))
+
+        self.assertEqual(self.seen, [True])
+        self.assertFalse(routers._use_primary.get())
+
+    def test_write_pins_authenticated_user(self):
+        """After a successful write, the user's next reads use the primary."""
+        self.call(self.factory.post('/'), user=User(id=5))
+        self.call(self.factory.get('/', **self.bearer(5)))
+        self.call(self.factory.get('/', **self.bearer(6)))
+
+        self.assertEqual(self.seen, [True, True, False])
+
+    def test_failed_write_not_pinned(self):
+        request = self.factory.post('/')
+        request.status = 400
+        self.call(request, user=User(id=5))
+
+        self.assertFalse(routers.is_pinned(5))
+
+    def test_malformed_token_ignored(self):
+        self.call(self.factory.get('/', HTTP_AUTHORIZATION='Bearer not.a-token'))
+
+        self.assertEqual(self.seen, [False])
+
+    def test_async(self):
+        """The middleware keeps async views async."""
+        async def get_response(request):
+            self.seen.append(routers._use_primary.get())
+            return HttpResponse()
+
+        routers.pin_to_primary(9)
+        routers.use_primary(False)
+        middleware = ReplicaRoutingMiddleware(get_response)
+        request = self.factory.get('/', **self.bearer(9))
+        request.user = AnonymousUser()
+
+        async_to_sync(middleware)(request)
+
+        self.assertEqual(self.seen, [True])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_noop_without_replicas(self):
+        self.call(self.factory.post('/'))
+
+        self.assertEqual(self.seen, [False])
+
+    def test_runs_before_middleware_reading_the_database(self):
+        """Staff lookups by Server-Timing and profiling are pinned too."""
+        middleware = [path.rsplit('.', 1)[1] for path in settings.MIDDLEWARE]
+        position = middleware.index('ReplicaRoutingMiddleware')
+
+        self.assertGreater(position, middleware.index('SessionMiddleware'))
+        for name in ('AuthenticationMiddleware', 'ProfilingMiddleware', 'ServerTimingMiddleware'):
+            self.assertLess(position, middleware.index(name))
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ServicePinTests(RoutingTestMixin, TestCase):
+    """Tests that login-by-write flows pin the user."""
+
+    def test_verify_otp_pins_user(self):
+        _, code = OTPToken.create_for_email('new@example.com')
+
+        result = OTPService.verify_otp('new@example.com', code)
+
+        self.assertTrue(routers.is_pinned(result.user.id))
+
+    def test_averify_otp_pins_user(self):
+        _, code = OTPToken.create_for_email('new@example.com')
+
+        result = async_to_sync(OTPService.averify_otp)('new@example.com', code)
+
+        self.assertTrue(routers.is_pinned(result.user.id))
+
+    def test_email_verification_pins_user(self):
+        user = User.objects.create_user(username='v@example.com', email='v@example.com', password='x')
+        token = EmailVerificationService.create_token(user)
+
+        success, _, _ = EmailVerificationService.verify_token(token.token)
+
+        self.assertTrue(success)
+        self.assertTrue(routers.is_pinned(user.id))
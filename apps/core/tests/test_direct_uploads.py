@@ -0,0 +1,303 @@
+"""
+Tests for direct-to-object-storage uploads.
+
+Uses moto as an in-process S3 stand-in.
+
+Test Structure:
+- DirectUploadServiceTests: Presigned POST issuing and completion validation
+- ProfilePictureDirectUploadAPITests: /api/v1/auth/me/profile-picture/*
+- LogoDirectUploadAPITests: /api/v1/config/app-settings/logo/*
+- CachedPresignedS3StorageTests: Presigned read URL caching
+"""
+
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+import boto3
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from moto import mock_s3
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User
+from apps.core import direct_uploads
+from apps.core.direct_uploads import DirectUploadError, DirectUploadService
+from apps.core.models import AppSettings
+
+BUCKET = 'altea-test-bucket'
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+S3_SETTINGS = {
+    'AWS_STORAGE_BUCKET_NAME': BUCKET,
+    'AWS_S3_REGION_NAME': 'us-east-1',
+    'AWS_S3_ENDPOINT_URL': None,
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_LOCATION': '',
+    'MEDIA_ROOT': TEMP_MEDIA_ROOT,
+}
+
+
+def image_bytes(fmt='PNG', size=(100, 100)):
+    output = BytesIO()
+    Image.new('RGB', size, color='blue').save(output, format=fmt)
+    return output.getvalue()
+
+
+class S3TestMixin:
+    """Start moto and create the test bucket."""
+
+    def setUp(self):
+        super().setUp()
+        self.s3_mock = mock_s3()
+        self.s3_mock.start()
+        direct_uploads.reset_client()
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.s3.create_bucket(Bucket=BUCKET)
+
+    def tearDown(self):
+        direct_uploads.reset_client()
+        self.s3_mock.stop()
+        super().tearDown()
+
+    def upload_object(self, key, body):
+        """Simulate the client uploading to the presigned URL."""
+        self.s3.put_object(Bucket=BUCKET, Key=key, Body=body)
+
+
+@override_settings(**S3_SETTINGS)
+class DirectUploadServiceTests(S3TestMixin, TestCase):
+    """Tests for DirectUploadService."""
+
+    def create(self, owner_id=1, content_type='image/png'):
+        return DirectUploadService.create_upload(
+            prefix='profile_pictures',
+            filename='me.png',
+            content_type=content_type,
+            purpose='profile_picture',
+            owner_id=owner_id,
+            max_size=1024 * 1024,
+        )
+
+    def test_create_upload_returns_presigned_post(self):
+        upload = self.create()
+
+        self.assertEqual(upload.method, 'POST')
+        self.assertIn(BUCKET, upload.url)
+        self.assertEqual(upload.fields['key'], upload.key)
+        self.assertEqual(upload.fields['Content-Type'], 'image/png')
+        self.assertIn('policy', upload.fields)
+        self.assertTrue(upload.key.startswith('profile_pictures/'))
+        self.assertTrue(upload.key.endswith('.png'))
+
+    def test_keys_are_unique_per_upload(self):
+        self.assertNotEqual(self.create().key, self.create().key)
+
+    def test_create_upload_rejects_unsupported_content_type(self):
+        with self.assertRaises(DirectUploadError):
+            self.create(content_type='application/pdf')
+
+    @override_settings(AWS_STORAGE_BUCKET_NAME='')
+    def test_create_upload_requires_bucket(self):
+        with self.assertRaises(DirectUploadError):
+            self.create()
+
+    def test_complete_upload_returns_key(self):
+        upload = self.create()
+        self.upload_object(upload.key, image_bytes())
+
+        key = DirectUploadService.complete_upload(
+            upload.upload_token, purpose='profile_picture', owner_id=1, max_size=1024 * 1024
+        )
+
+        self.assertEqual(key, upload.key)
+
+    def test_complete_upload_rejects_other_owner(self):
+        upload = self.create(owner_id=1)
+        self.upload_object(upload.key, image_bytes())
+
+        with self.assertRaises(DirectUploadError):
+            DirectUploadService.complete_upload(
+                upload.upload_token, purpose='profile_picture', owner_id=2, max_size=1024 * 1024
+            )
+
+    def test_complete_upload_rejects_tampered_token(self):
+        with self.assertRaises(DirectUploadError):
+            DirectUploadService.complete_upload(
+                'not-a-token', purpose='profile_picture', owner_id=1, max_size=1024 * 1024
+            )
+
+    def test_complete_upload_requires_object(self):
+        upload = self.create()
+
+        with self.assertRaises(DirectUploadError):
+            DirectUploadService.complete_upload(
+                upload.upload_token, purpose='profile_picture', owner_id=1, max_size=1024 * 1024
+            )
+
+    def test_complete_upload_deletes_invalid_image(self):
+        upload = self.create()
+        self.upload_object(upload.key, b'definitely not an image')
+
+        with self.assertRaises(DirectUploadError):
+            DirectUploadService.complete_upload(
+                upload.upload_token, purpose='profile_picture', owner_id=1, max_size=1024 * 1024
+            )
+
+        listing = self.s3.list_objects_v2(Bucket=BUCKET)
+        self.assertEqual(listing.get('KeyCount', 0), 0)
+
+    def test_complete_upload_rejects_oversized_object(self):
+        upload = self.create()
+        self.upload_object(upload.key, image_bytes())
+
+        with self.assertRaises(DirectUploadError):
+            DirectUploadService.complete_upload(
+                upload.upload_token, purpose='profile_picture', owner_id=1, max_size=10
+            )
+
+
+@override_settings(**S3_SETTINGS)
+class ProfilePictureDirectUploadAPITests(S3TestMixin, APITestCase):
+    """Tests for profile picture direct upload endpoints."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username='upload@example.com',
+            email='upload@example.com',
+            password='SecurePass123!',
+            is_verified=True,
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.url = reverse('accounts_api:profile_picture_upload_url')
+        self.complete_url = reverse('accounts_api:profile_picture_upload_complete')
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.post(self.url, {'filename': 'a.png', 'content_type': 'image/png'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_upload_url_validates_content_type(self):
+        response = self.client.post(self.url, {'filename': 'a.gif', 'content_type': 'text/html'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(AWS_STORAGE_BUCKET_NAME='')
+    def test_returns_503_when_not_configured(self):
+        response = self.client.post(self.url, {'filename': 'a.png', 'content_type': 'image/png'})
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_full_upload_flow_sets_picture_and_schedules_renditions(self):
+        response = self.client.post(self.url, {'filename': 'a.png', 'content_type': 'image/png'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.upload_object(response.data['key'], image_bytes())
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                self.complete_url, {'upload_token': response.data['upload_token']}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.profile_picture.name.startswith('profile_pictures/'))
+        self.assertEqual(len(callbacks), 1)
+        self.assertIsNotNone(response.data['profile_picture'])
+
+    def test_complete_with_invalid_token_returns_400(self):
+        response = self.client.post(self.complete_url, {'upload_token': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['error'])
+
+
+@override_settings(**S3_SETTINGS)
+class LogoDirectUploadAPITests(S3TestMixin, APITestCase):
+    """Tests for logo direct upload endpoints."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com',
+            email='admin@example.com',
+            password='SecurePass123!',
+        )
+        self.url = reverse('core-api:app-settings-logo-upload-url')
+        self.complete_url = reverse('core-api:app-settings-logo-upload-complete')
+
+    def test_regular_user_is_forbidden(self):
+        user = User.objects.create_user(
+            username='user@example.com', email='user@example.com', password='SecurePass123!'
+        )
+        self.client.force_authenticate(user)
+        response = self.client.post(self.url, {'filename': 'logo.png', 'content_type': 'image/png'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_complete_sets_logo_and_invalidates_cache(self):
+        self.client.force_authenticate(self.admin)
+        AppSettings.get_settings()  # prime cache
+
+        response = self.client.post(self.url, {'filename': 'logo.png', 'content_type': 'image/png'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        key = response.data['key']
+        self.upload_object(key, image_bytes())
+
+        # Small logo generation reads from default storage; not under test here
+        with patch.object(AppSettings, '_generate_small_logo'):
+            response = self.client.post(
+                self.complete_url, {'upload_token': response.data['upload_token']}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AppSettings.objects.get(pk=1).logo.name, key)
+        self.assertEqual(AppSettings.get_settings().logo.name, key)
+
+    def test_validation_errors_use_error_envelope(self):
+        self.client.force_authenticate(self.admin)
+
+        for url, data in [(self.url, {'filename': 'logo.png'}), (self.complete_url, {})]:
+            with self.subTest(url=url):
+                response = self.client.post(url, data)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data['message'], 'Validation failed')
+                self.assertIn('details', response.data)
+
+
+@override_settings(**S3_SETTINGS, AWS_QUERYSTRING_EXPIRE=3600)
+class CachedPresignedS3StorageTests(S3TestMixin, TestCase):
+    """Tests for CachedPresignedS3Storage."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        from apps.core.storage_backends import CachedPresignedS3Storage
+        self.storage = CachedPresignedS3Storage()
+
+    def test_url_is_signed_once_per_object(self):
+        with patch.object(
+            self.storage.bucket.meta.client,
+            'generate_presigned_url',
+            wraps=self.storage.bucket.meta.client.generate_presigned_url,
+        ) as signer:
+            first = self.storage.url('profile_pictures/a.webp')
+            second = self.storage.url('profile_pictures/a.webp')
+
+        self.assertEqual(first, second)
+        self.assertEqual(signer.call_count, 1)
+
+    def test_different_objects_get_different_urls(self):
+        self.assertNotEqual(
+            self.storage.url('profile_pictures/a.webp'),
+            self.storage.url('profile_pictures/b.webp'),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
@@ -0,0 +1,142 @@
+"""
+Tests for streaming admin exports.
+
+Test Structure:
+- CsvChunksTests: CSV encoding and formula escaping
+- ExportViewTests: Changelist exports honoring filters, actions, token exports
+"""
+
+import csv
+import io
+import sys
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.admin import helpers
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from apps.accounts.models import EmailVerificationToken, User
+from apps.core.exports import csv_chunks
+from apps.core.models import LegalDocument
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+def read_csv(content: bytes) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+
+
+class CsvChunksTests(SimpleTestCase):
+    """Tests for csv_chunks."""
+
+    def test_chunks_with_header_and_bom(self):
+        parts = list(csv_chunks(['a', 'b'], [(n, f'row {n}') for n in range(5)], chunk_size=2))
+
+        self.assertTrue(parts[0].startswith(b'\xef\xbb\xbf'))
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(read_csv(b''.join(parts))[-1], ['4', 'row 4'])
+
+    def test_escapes_formulas(self):
+        rows = read_csv(b''.join(csv_chunks(['name'], [('=HYPERLINK("x")',), ('-1',), ('Anna',)])))
+
+        self.assertEqual([row[0] for row in rows[1:]], ['\'=HYPERLINK("x")', "'-1", 'Anna'])
+
+
+class ExportViewTests(TestCase):
+    """Tests for ExportMixin on the accounts and core admins."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        self.client.force_login(self.admin)
+        for n, country in enumerate(['CH', 'CH', 'DE']):
+            User.objects.create_user(username=f'user{n}@example.com', email=f'user{n}@example.com', country=country)
+
+    def export(self, url_name, file_format='csv', query=''):
+        response = self.client.get(reverse(url_name, args=[file_format]) + query)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_changelist_links_to_exports(self):
+        response = self.client.get(reverse('admin:accounts_user_changelist') + '?country=DE')
+
+        self.assertContains(response, reverse('admin:accounts_user_export', args=['csv']) + '?country=DE')
+
+    def test_export_honors_filters(self):
+        response = self.export('admin:accounts_user_export', query='?country=CH&o=1')
+
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="user-', response['Content-Disposition'])
+        rows = read_csv(b''.join(response.streaming_content))
+        self.assertEqual(rows[0][:3], ['id', 'email', 'first_name'])
+        self.assertEqual({row[1] for row in rows[1:]}, {'user0@example.com', 'user1@example.com', 'admin@example.com'})
+
+    def test_export_selected_action(self):
+        document = LegalDocument.objects.create(
+            document_type='terms', version='9.0', title='Terms', content='<p>Terms</p>', effective_date=date(2025, 1, 1)
+        )
+
+        response = self.client.post(reverse('admin:core_legaldocument_changelist'), {
+            'action': 'export_as_csv',
+            helpers.ACTION_CHECKBOX_NAME: [document.pk],
+        })
+
+        rows = read_csv(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][2], '9.0')
+
+    async def test_export_streams_under_asgi(self):
+        await self.async_client.aforce_login(self.admin)
+
+        response = await self.async_client.get(reverse('admin:accounts_user_export', args=['csv']))
+
+        self.assertTrue(response.is_async)
+        content = b''.join([part async for part in response.streaming_content])
+        self.assertEqual(len(read_csv(content)), 5)
+
+    def test_token_export_adds_email_without_secret(self):
+        user = User.objects.get(email='user2@example.com')
+        token = EmailVerificationToken.create_for_user(user)
+
+        response = self.export('admin:accounts_emailverificationtoken_export')
+
+        content = b''.join(response.streaming_content)
+        rows = read_csv(content)
+        self.assertEqual(rows[0][-1], 'user_email')
+        self.assertEqual(rows[1][-1], 'user2@example.com')
+        self.assertNotIn(token.token.encode(), content)
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('admin:accounts_user_export', args=['pdf']))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_requires_view_permission(self):
+        staff = User.objects.create_user(username='staff@example.com', email='staff@example.com', is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.get(reverse('admin:accounts_user_export', args=['csv']))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_xlsx_without_openpyxl(self):
+        with patch.dict(sys.modules, {'openpyxl': None}):
+            response = self.client.get(reverse('admin:accounts_user_export', args=['xlsx']), follow=True)
+
+        self.assertRedirects(response, reverse('admin:accounts_user_changelist'))
+        self.assertContains(response, 'XLSX export needs openpyxl')
+
+    @unittest.skipIf(openpyxl is None, 'openpyxl is not installed')
+    def test_xlsx(self):
+        response = self.export('admin:accounts_user_export', 'xlsx', '?country=DE')
+
+        workbook = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.worksheets[0].iter_rows(values_only=True))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], 'user2@example.com')
@@ -0,0 +1,169 @@
+"""
+Tests for legal document full-text search.
+
+Test Structure:
+- SearchIndexTests: Stripped search text and vectors maintained on save
+- SearchLegalDocumentsTests: Substring fallback, snippets and the PostgreSQL query
+- LegalDocumentSearchAPITests: /api/v1/legal/search/ validation and results
+- LegalDocumentAdminSearchTests: Admin search without HTML and ranked on PostgreSQL
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.admin.sites import site
+from django.db.models import QuerySet
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.core.models import LegalDocument, html_to_text
+from apps.core.search import full_text_filter, search_legal_documents
+
+
+def create_document(document_type='terms', version='1.0', content='', **kwargs):
+    kwargs.setdefault('title', 'Terms of Service')
+    kwargs.setdefault('effective_date', date(2024, 1, 1))
+    return LegalDocument.objects.create(
+        document_type=document_type, version=version, content=content, **kwargs
+    )
+
+
+class SearchIndexTests(TestCase):
+    """Tests for the search fields maintained by LegalDocument.save()."""
+
+    def test_html_to_text(self):
+        self.assertEqual(
+            html_to_text('<h2>Data</h2><p>We &amp; our <b>partners</b>\n store   data.</p>'),
+            'Data We & our partners store data.',
+        )
+
+    def test_search_text_on_save(self):
+        document = create_document(content='<p>Cookies</p>')
+        document.content = '<p>Retention</p>'
+        document.save(update_fields=['content'])
+
+        document.refresh_from_db()
+        self.assertEqual(document.search_text, 'Retention')
+
+    def test_save_updates_vector_for_its_language_only(self):
+        document = create_document()
+
+        with patch('apps.core.models.connections') as connections, patch.object(QuerySet, 'update') as update:
+            connections.__getitem__.return_value.vendor = 'postgresql'
+            document.save()
+
+        update.assert_called_once()
+
+    def test_search_config_per_language(self):
+        self.assertEqual(LegalDocument(language='de').search_config, 'german')
+        self.assertEqual(LegalDocument(language='xx').search_config, 'simple')
+
+
+class SearchLegalDocumentsTests(TestCase):
+    """Tests for search_legal_documents."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_document(content='<h2>Cookies</h2><p>We store cookies &lt;securely&gt; for 30 days.</p>')
+        create_document(
+            'privacy', content='<p>Wir speichern Ihre Daten.</p>', title='Datenschutz', language='de'
+        )
+
+    def test_matches_stripped_text(self):
+        results = search_legal_documents(LegalDocument.objects.all(), 'store cookies')
+
+        self.assertEqual([result.document.title for result in results], ['Terms of Service'])
+        self.assertEqual(results[0].rank, 0.0)
+
+    def test_tags_are_not_searched(self):
+        self.assertEqual(search_legal_documents(LegalDocument.objects.all(), 'h2'), [])
+
+    def test_snippet_is_escaped_and_marked(self):
+        [result] = search_legal_documents(LegalDocument.objects.all(), 'securely')
+
+        self.assertIn('<mark>securely</mark>', result.snippet)
+        self.assertIn('&lt;', result.snippet)
+
+    def test_language_filter(self):
+        results = search_legal_documents(LegalDocument.objects.all(), 'daten', language='en')
+
+        self.assertEqual(results, [])
+
+    def test_full_text_query_on_postgres(self):
+        sql = str(full_text_filter(LegalDocument.objects.all(), 'cookies', language='de').query)
+
+        self.assertIn('websearch_to_tsquery', sql)
+        self.assertIn('german', sql)
+        self.assertIn('ts_rank', sql)
+
+
+class LegalDocumentSearchAPITests(TestCase):
+    """Tests for LegalDocumentSearchAPIView."""
+
+    def setUp(self):
+        self.url = reverse('core-api:legal-search')
+        create_document(content='<p>Old cookie policy</p>', version='0.9')
+        create_document(content='<p>Cookies are stored for 30 days.</p>', is_active=True)
+
+    def test_returns_active_documents_with_snippets(self):
+        response = self.client.get(self.url, {'q': 'cookies'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['query'], 'cookies')
+        [result] = response.data['results']
+        self.assertEqual(result['version'], '1.0')
+        self.assertEqual(result['document_type_display'], 'Terms of Service')
+        self.assertIn('<mark>Cookies</mark>', result['snippet'])
+
+    def test_type_filter(self):
+        response = self.client.get(self.url, {'q': 'cookies', 'type': 'privacy'})
+
+        self.assertEqual(response.data['results'], [])
+
+    def test_rejects_short_and_invalid_queries(self):
+        for params in [{}, {'q': 'a'}, {'q': 'cookies', 'limit': 500}, {'q': 'cookies', 'language': 'xx'}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+
+class LegalDocumentAdminSearchTests(TestCase):
+    """Tests for LegalDocumentAdmin search."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        create_document(content='<p class="intro">Cookies</p>')
+        self.model_admin = site._registry[LegalDocument]
+
+    def test_searches_text_without_markup(self):
+        self.client.force_login(self.admin)
+        url = reverse('admin:core_legaldocument_changelist')
+
+        self.assertEqual(self.client.get(url, {'q': 'cookies'}).context['cl'].result_count, 1)
+        self.assertEqual(self.client.get(url, {'q': 'intro'}).context['cl'].result_count, 0)
+
+    def test_ranked_on_postgres(self):
+        request = RequestFactory().get('/', {'q': 'cookies'})
+
+        with patch('apps.core.search.full_text_search_enabled', return_value=True):
+            queryset, may_have_duplicates = self.model_admin.get_search_results(
+                request, LegalDocument.objects.all(), 'cookies'
+            )
+            ordering = self.model_admin.get_ordering(request)
+
+        self.assertFalse(may_have_duplicates)
+        self.assertIn('websearch_to_tsquery', str(queryset.order_by(*ordering).query))
+        self.assertEqual(ordering[0], '-search_rank')
+
+    def test_version_still_searched_on_postgres(self):
+        request = RequestFactory().get('/', {'q': '2.1'})
+
+        with patch('apps.core.search.full_text_search_enabled', return_value=True):
+            queryset, _ = self.model_admin.get_search_results(request, LegalDocument.objects.all(), '2.1')
+
+        sql = str(queryset.query)
+        self.assertIn('websearch_to_tsquery', sql)
+        self.assertIn('"core_legaldocument"."version"', sql)
+        self.assertNotIn('"core_legaldocument"."search_text" LIKE', sql)
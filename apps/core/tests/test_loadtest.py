@@ -0,0 +1,198 @@
+"""
+Tests for the load test client.
+
+Test Structure:
+- RunLoadTests: run_load against a local asyncio HTTP server
+- RunScenarioTests: Multi-request flows, addresses and rates
+- SMTPSinkTests: Emails sent by Django's SMTP backend
+- LoadtestAuthCommandTests: loadtest_auth argument validation
+- LoadtestScenariosCommandTests: loadtest_scenarios argument validation
+"""
+
+import asyncio
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from apps.core.loadtest import format_delivery_results, format_load_results, run_load, run_scenario
+from apps.core.smtp_sink import SMTPSink
+
+
+async def _serve(handler_status, chunked=False):
+    """Start a keep-alive HTTP server; returns (server, port, seen headers)."""
+    seen = []
+
+    async def handle(reader, writer):
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line == b'\r\n':
+                    break
+                name, _, value = line.decode().partition(':')
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers.get('content-length', 0)))
+            seen.append(headers)
+            if chunked:
+                writer.write(
+                    f'HTTP/1.1 {handler_status} OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                    '2\r\n{}\r\n0\r\n\r\n'.encode()
+                )
+            else:
+                writer.write(f'HTTP/1.1 {handler_status} OK\r\nContent-Length: 2\r\n\r\n{{}}'.encode())
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    return server, server.sockets[0].getsockname()[1], seen
+
+
+class RunLoadTests(SimpleTestCase):
+    """Tests for run_load."""
+
+    def run_against(self, status=200, chunked=False, requests=20, concurrency=4):
+        async def main():
+            server, port, seen = await _serve(status, chunked)
+            async with server:
+                result = await run_load(
+                    'local',
+                    f'http://127.0.0.1:{port}/api/',
+                    lambda index: (b'{"n": %d}' % index, {'Content-Type': 'application/json'}),
+                    requests=requests,
+                    concurrency=concurrency,
+                )
+            return result, seen
+
+        return asyncio.run(main())
+
+    def test_records_every_request(self):
+        """Each request produces one latency sample and status count."""
+        result, seen = self.run_against(requests=20)
+
+        self.assertEqual(result.latency.iterations, 20)
+        self.assertEqual(result.statuses[200], 20)
+        self.assertEqual(result.errors, 0)
+        self.assertGreater(result.requests_per_second, 0)
+
+    def test_unique_forwarded_for(self):
+        """Requests carry distinct X-Forwarded-For addresses."""
+        _, seen = self.run_against(requests=20)
+
+        self.assertEqual(len({headers['x-forwarded-for'] for headers in seen}), 20)
+        self.assertEqual(seen[0]['content-type'], 'application/json')
+
+    def test_chunked_responses(self):
+        """Chunked responses are read fully so the connection can be reused."""
+        result, _ = self.run_against(status=429, chunked=True, requests=10, concurrency=2)
+
+        self.assertEqual(result.statuses[429], 10)
+
+    def test_connection_errors_counted(self):
+        """Unreachable servers are reported as errors, not raised."""
+        result = asyncio.run(run_load('down', 'http://127.0.0.1:9/', lambda index: (b'', {}), requests=3, concurrency=1))
+
+        self.assertEqual(result.errors, 3)
+        self.assertIn('down', format_load_results([result]))
+
+
+class RunScenarioTests(SimpleTestCase):
+    """Tests for run_scenario."""
+
+    def run_flows(self, flow, flows=6, status=200):
+        async def main():
+            server, port, seen = await _serve(status)
+            async with server:
+                result = await run_scenario('scenario', f'http://127.0.0.1:{port}', flow, flows=flows, concurrency=2)
+            return result, seen
+
+        return asyncio.run(main())
+
+    def test_flow_requests_share_address(self):
+        async def flow(session, index):
+            await session.request('GET', '/api/v1/config/app-settings/')
+            await session.request('GET', '/api/v1/auth/me/', headers={'Authorization': 'Bearer token'})
+
+        result, seen = self.run_flows(flow)
+
+        self.assertEqual(result.latency.iterations, 12)
+        self.assertEqual(len({headers['x-forwarded-for'] for headers in seen}), 6)
+        self.assertEqual(sum('authorization' in headers for headers in seen), 6)
+
+    def test_fixed_addresses_and_throttled_rate(self):
+        async def flow(session, index):
+            session.forwarded_for = f'198.51.100.{index % 2}'
+            await session.request('POST', '/api/v1/auth/login/', b'{}')
+
+        result, seen = self.run_flows(flow, status=429)
+
+        self.assertEqual({headers['x-forwarded-for'] for headers in seen}, {'198.51.100.0', '198.51.100.1'})
+        self.assertEqual(result.throttled_rate, 1.0)
+        self.assertEqual(result.error_rate, 0.0)
+        self.assertIn('100.0', format_load_results([result]))
+
+    def test_server_errors_in_error_rate(self):
+        async def flow(session, index):
+            await session.request('GET', '/')
+
+        result, _ = self.run_flows(flow, flows=4, status=503)
+
+        self.assertEqual(result.error_rate, 1.0)
+
+
+class SMTPSinkTests(SimpleTestCase):
+    """Tests for SMTPSink."""
+
+    def test_receives_django_email(self):
+        async def main():
+            sink = SMTPSink()
+            await sink.start('127.0.0.1', 0)
+            connection = get_connection(
+                'django.core.mail.backends.smtp.EmailBackend', host='127.0.0.1', port=sink.port, use_tls=False
+            )
+            message = EmailMultiAlternatives(
+                'Your code', 'Your code is 123456.\n.leading dot', 'noreply@example.com',
+                ['User@Example.com'], connection=connection,
+            )
+            message.attach_alternative('<p>Your code is <b>123456</b></p>', 'text/html')
+            waiter = asyncio.create_task(sink.wait_for('user@example.com', timeout=5))
+            await asyncio.to_thread(message.send)
+            received = await waiter
+            missing = await sink.wait_for('other@example.com', timeout=0.01)
+            await sink.stop()
+            return received, missing
+
+        received, missing = asyncio.run(main())
+
+        self.assertEqual(received.recipients, ['user@example.com'])
+        self.assertEqual(received.text(), 'Your code is 123456.\n.leading dot')
+        self.assertIsNone(missing)
+
+
+class LoadtestAuthCommandTests(SimpleTestCase):
+    """Tests for the loadtest_auth command."""
+
+    def test_invalid_target(self):
+        """Targets must be NAME=URL."""
+        with self.assertRaises(CommandError):
+            call_command('loadtest_auth', target=['localhost:8000'])
+
+
+class LoadtestScenariosCommandTests(SimpleTestCase):
+    """Tests for the loadtest_scenarios command."""
+
+    def test_invalid_target(self):
+        with self.assertRaises(CommandError):
+            call_command('loadtest_scenarios', target='localhost:8000')
+
+    def test_delivery_table_skips_scenarios_without_email(self):
+        async def flow(session, index):
+            pass
+
+        result = asyncio.run(run_scenario('startup_burst', 'http://127.0.0.1:9', flow, flows=1, concurrency=1))
+
+        self.assertNotIn('startup_burst', format_delivery_results([result]))
@@ -0,0 +1,152 @@
+"""
+Tests for queued JSON logging.
+
+Test Structure:
+- JSONFormatterTests: Output fields, extras and exceptions
+- SamplingFilterTests: Per-logger sampling of low-level records
+- QueueHandlerTests: Off-thread formatting and writing, overflow, LOGGING config
+"""
+
+import json
+import logging
+import logging.config
+import os
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.core.log import JSONFormatter, QueueHandler, SamplingFilter
+
+
+def make_record(msg='hello %s', args=('world',), level=logging.INFO, name='apps.test', **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class ThreadRecordingHandler(logging.Handler):
+    """Collects formatted records and the threads that formatted them."""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = []
+        self.setFormatter(JSONFormatter())
+
+    def emit(self, record):
+        self.threads.append(threading.current_thread())
+        self.lines.append(json.loads(self.format(record)))
+
+
+class JSONFormatterTests(SimpleTestCase):
+    """Tests for JSONFormatter."""
+
+    def test_fields_and_extras(self):
+        entry = json.loads(JSONFormatter().format(make_record(user_id=7)))
+
+        self.assertEqual(entry['message'], 'hello world')
+        self.assertEqual((entry['level'], entry['logger']), ('INFO', 'apps.test'))
+        self.assertEqual(entry['user_id'], 7)
+        self.assertNotIn('args', entry)
+
+    def test_exception(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = logging.LogRecord('apps.test', logging.ERROR, __file__, 1, 'failed', (), sys.exc_info())
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        self.assertIn('ValueError: boom', entry['exception'])
+
+
+class SamplingFilterTests(SimpleTestCase):
+    """Tests for SamplingFilter."""
+
+    def test_rates_by_closest_logger(self):
+        sampling = SamplingFilter({'apps.accounts': 0.0, 'apps.accounts.tasks': 1.0})
+
+        self.assertFalse(sampling.filter(make_record(name='apps.accounts.services')))
+        self.assertTrue(sampling.filter(make_record(name='apps.accounts.tasks')))
+        self.assertTrue(sampling.filter(make_record(name='apps.core.middleware')))
+
+    def test_warnings_always_kept(self):
+        sampling = SamplingFilter({'apps': 0.0})
+
+        self.assertTrue(sampling.filter(make_record(level=logging.WARNING)))
+
+    def test_fraction_kept(self):
+        sampling = SamplingFilter({'apps': 0.25})
+
+        with patch('apps.core.log.random.random', side_effect=[0.1, 0.5, 0.2, 0.9]):
+            kept = [sampling.filter(make_record()) for _ in range(4)]
+
+        self.assertEqual(kept, [True, False, True, False])
+
+
+class QueueHandlerTests(SimpleTestCase):
+    """Tests for QueueHandler."""
+
+    def setUp(self):
+        self.target = ThreadRecordingHandler()
+        self.target.name = 'test_target'
+        logging._handlers['test_target'] = self.target
+        self.addCleanup(logging._handlers.pop, 'test_target')
+        self.handler = QueueHandler(['test_target'])
+        self.addCleanup(self.handler.close)
+        self.logger = logging.getLogger('apps.test.queued')
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_formatted_and_written_on_listener_thread(self):
+        class Lazy:
+            formatted_in = None
+
+            def __str__(self):
+                Lazy.formatted_in = threading.current_thread()
+                return 'lazy'
+
+        self.logger.info('value=%s', Lazy(), extra={'user_id': 3})
+        self.handler.stop()
+
+        self.assertEqual(self.target.lines[0]['message'], 'value=lazy')
+        self.assertEqual(self.target.lines[0]['user_id'], 3)
+        self.assertIsNot(self.target.threads[0], threading.current_thread())
+        self.assertIsNot(Lazy.formatted_in, threading.current_thread())
+
+    def test_trace_id_attached(self):
+        with patch('apps.core.tracing.current_span', return_value=SimpleNamespace(trace_id='a' * 32)):
+            self.logger.info('inside')
+        self.handler.stop()
+
+        self.assertEqual(self.target.lines[0]['trace_id'], 'a' * 32)
+
+    def test_full_queue_drops(self):
+        handler = QueueHandler(['test_target'], queue_size=1)
+        handler._pid = os.getpid()  # don't start the listener
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        self.assertEqual(handler.dropped, 1)
+
+    def test_configured_from_logging_dict(self):
+        """Configured the way config/settings/production.py does."""
+        configurator = logging.config.DictConfigurator({'filters': {'sampling': SamplingFilter({'apps.test': 0.0})}})
+        handler = configurator.configure_handler({
+            '()': 'apps.core.log.QueueHandler',
+            'handlers': ['test_target'],
+            'filters': ['sampling'],
+        })
+        self.addCleanup(handler.close)
+
+        handler.handle(make_record('sampled out', ()))
+        handler.handle(make_record('kept', (), level=logging.WARNING))
+        handler.stop()
+
+        self.assertEqual([line['message'] for line in self.target.lines], ['kept'])
@@ -0,0 +1,174 @@
+"""
+Tests for Prometheus metrics.
+
+Test Structure:
+- MetricsViewTests: /metrics exposition and token protection
+- RequestLatencyTests: Per-view latency histogram
+- AuthMetricsTests: Login and OTP outcomes, email sends
+- CacheAndThrottleMetricsTests: Cache lookups and throttle rejections
+- MultiprocessTests: Aggregation across worker processes
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from apps.accounts.models import OTPToken, User
+from apps.accounts.services import AuthenticationService, OTPService
+from apps.core.api.throttling import AnonRateThrottle
+from apps.core.db.metrics import record_connect
+from apps.core.models import AppSettings
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsViewTests(TestCase):
+    """Tests for MetricsView."""
+
+    def test_exposition(self):
+        record_connect('default', 0.01)
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'db_connect_duration_seconds_count{alias="default"}', response.content)
+
+    @override_settings(METRICS_AUTH_TOKEN='scrape-secret')
+    def test_token_required(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_AUTH_TOKEN='', METRICS_REQUIRE_TOKEN=True)
+    def test_not_served_without_required_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+
+class RequestLatencyTests(TestCase):
+    """Tests for MetricsMiddleware."""
+
+    def test_latency_labelled_by_view(self):
+        labels = {'view': 'accounts_api:me', 'method': 'GET', 'status': '4xx'}
+        before = sample('http_request_duration_seconds_count', **labels)
+
+        self.client.get(reverse('accounts_api:me'))
+
+        self.assertEqual(sample('http_request_duration_seconds_count', **labels), before + 1)
+
+    def test_unmatched_path(self):
+        labels = {'view': 'unmatched', 'method': 'GET', 'status': '4xx'}
+        before = sample('http_request_duration_seconds_count', **labels)
+
+        self.client.get('/no-such-page/')
+
+        self.assertEqual(sample('http_request_duration_seconds_count', **labels), before + 1)
+
+
+class AuthMetricsTests(TestCase):
+    """Tests for authentication flow metrics."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='metrics@example.com', email='metrics@example.com', password='TestPass123!', is_verified=True
+        )
+
+    def test_login_outcomes(self):
+        success = sample('auth_login_total', outcome='success')
+        invalid = sample('auth_login_total', outcome='invalid_credentials')
+
+        AuthenticationService.authenticate_user('metrics@example.com', 'TestPass123!')
+        AuthenticationService.authenticate_user('metrics@example.com', 'wrong')
+
+        self.assertEqual(sample('auth_login_total', outcome='success'), success + 1)
+        self.assertEqual(sample('auth_login_total', outcome='invalid_credentials'), invalid + 1)
+
+    def test_otp_outcomes(self):
+        sent = sample('auth_otp_requests_total', outcome='sent')
+        invalid = sample('auth_otp_verifications_total', outcome='invalid_code')
+        missing = sample('auth_otp_verifications_total', outcome='no_otp_found')
+
+        OTPService.create_and_send_otp('otp@example.com')
+        _, code = OTPToken.create_for_email('otp@example.com')
+        OTPService.verify_otp('otp@example.com', '000000' if code != '000000' else '111111')
+        OTPService.verify_otp('nobody@example.com', '123456')
+
+        self.assertEqual(sample('auth_otp_requests_total', outcome='sent'), sent + 1)
+        self.assertEqual(sample('auth_otp_verifications_total', outcome='invalid_code'), invalid + 1)
+        self.assertEqual(sample('auth_otp_verifications_total', outcome='no_otp_found'), missing + 1)
+
+    def test_email_send_latency_and_failures(self):
+        sends = sample('email_send_duration_seconds_count', kind='otp')
+        failures = sample('email_send_failures_total', kind='otp')
+
+        OTPService.send_otp_email('otp@example.com', '123456')
+        with patch('apps.accounts.services.send_mail', side_effect=OSError('smtp down')):
+            OTPService.send_otp_email('otp@example.com', '123456')
+
+        self.assertEqual(sample('email_send_duration_seconds_count', kind='otp'), sends + 2)
+        self.assertEqual(sample('email_send_failures_total', kind='otp'), failures + 1)
+
+
+class CacheAndThrottleMetricsTests(TestCase):
+    """Tests for cache lookup and throttle metrics."""
+
+    def test_app_settings_cache_lookups(self):
+        cache.clear()
+        hits = sample('cache_lookups_total', cache='app_settings', result='hit')
+        misses = sample('cache_lookups_total', cache='app_settings', result='miss')
+
+        AppSettings.get_settings()
+        AppSettings.get_settings()
+
+        self.assertEqual(sample('cache_lookups_total', cache='app_settings', result='miss'), misses + 1)
+        self.assertEqual(sample('cache_lookups_total', cache='app_settings', result='hit'), hits + 1)
+
+    def test_throttle_rejections(self):
+        class Throttle(AnonRateThrottle):
+            scope = 'metrics_test'
+            rate = '1/min'
+
+        cache.clear()
+        before = sample('throttle_rejections_total', scope='metrics_test')
+        request = type('Request', (), {'META': {'REMOTE_ADDR': '10.0.0.1'}, 'user': None})()
+
+        results = [Throttle().allow_request(request, None) for _ in range(3)]
+
+        self.assertEqual(results, [True, False, False])
+        self.assertEqual(sample('throttle_rejections_total', scope='metrics_test'), before + 2)
+
+
+class MultiprocessTests(SimpleTestCase):
+    """Samples from several processes are summed by /metrics."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def run_python(self, code):
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': self.directory}
+        return subprocess.run(
+            [sys.executable, '-c', code], env=env, cwd=settings.BASE_DIR, check=True, capture_output=True, text=True
+        ).stdout
+
+    def test_counters_aggregated(self):
+        record = 'from apps.core.metrics import record_login; record_login()'
+        self.run_python(record)
+        self.run_python(record)
+
+        output = self.run_python('from apps.core.metrics import render_metrics; print(render_metrics()[0].decode())')
+
+        self.assertIn('auth_login_total{outcome="success"} 2.0', output)
@@ -0,0 +1,210 @@
+"""
+Tests for on-demand request profiling.
+
+Test Structure:
+- SamplerTests: Stack sampling and speedscope output
+- ProfileStorageTests: Bounded profile directory
+- ProfilingMiddlewareTests: Who can profile, what is stored
+- RequestProfileAdminTests: Admin listing and download
+"""
+
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.core import profiling, server_timing
+from apps.core.middleware import ProfilingMiddleware
+from apps.core.models import RequestProfile
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class ProfileDirMixin:
+    """Write profiles to a temporary directory."""
+
+    def setUp(self):
+        super().setUp()
+        self.profile_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        self.enterContext(override_settings(PROFILING_DIR=str(self.profile_dir)))
+
+
+class SamplerTests(SimpleTestCase):
+    """Tests for Sampler."""
+
+    def test_speedscope_output(self):
+        with profiling.sample(interval=0.001) as sampler:
+            busy_wait(0.05)
+
+        document = sampler.speedscope('busy')
+        profile = document['profiles'][0]
+        frames = document['shared']['frames']
+        self.assertEqual(profile['type'], 'sampled')
+        self.assertGreater(len(profile['samples']), 5)
+        self.assertEqual(len(profile['samples']), len(profile['weights']))
+        leaf_names = {frames[stack[-1]]['name'] for stack in profile['samples']}
+        self.assertIn('busy_wait', leaf_names)
+        json.dumps(document)
+
+
+class ProfileStorageTests(ProfileDirMixin, TestCase):
+    """Tests for save_profile and prune_profiles."""
+
+    def make_profile(self):
+        with profiling.sample(interval=0.001) as sampler:
+            busy_wait(0.01)
+        return profiling.save_profile(sampler, 'GET /', method='GET', path='/', duration_ms=10)
+
+    def test_saved_to_directory(self):
+        profile = self.make_profile()
+
+        content = (self.profile_dir / profile.file_name).read_bytes()
+        self.assertEqual(profile.size, len(content))
+        self.assertEqual(json.loads(content)['name'], 'GET /')
+
+    def test_oldest_deleted_over_limit(self):
+        first = self.make_profile()
+        second = self.make_profile()
+
+        with override_settings(PROFILING_MAX_BYTES=first.size + second.size):
+            third = self.make_profile()
+        with override_settings(PROFILING_MAX_BYTES=1):
+            fourth = self.make_profile()
+
+        self.assertFalse(RequestProfile.objects.filter(pk=first.pk).exists())
+        self.assertFalse((self.profile_dir / first.file_name).exists())
+        self.assertEqual(list(RequestProfile.objects.values_list('pk', flat=True)), [fourth.pk])
+        self.assertEqual([p.name for p in self.profile_dir.iterdir()], [fourth.file_name])
+        self.assertNotEqual(third.pk, fourth.pk)
+
+
+class ProfilingMiddlewareTests(ProfileDirMixin, TestCase):
+    """Tests for ProfilingMiddleware."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.staff = User.objects.create_user(
+            username='staff@example.com', email='staff@example.com', password='TestPass123!', is_staff=True
+        )
+        self.user = User.objects.create_user(
+            username='user@example.com', email='user@example.com', password='TestPass123!', is_verified=True
+        )
+
+    def test_staff_session_query_parameter(self):
+        self.client.force_login(self.staff)
+
+        response = self.client.get(reverse('admin:index'), {'_profile': '1'})
+
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual((profile.method, profile.path, profile.view_name), ('GET', '/admin/', 'admin:index'))
+        self.assertEqual(profile.user, self.staff)
+        self.assertEqual(profile.status_code, 200)
+
+    def test_query_parameter_hidden_from_view(self):
+        """The admin changelist would reject _profile as an unknown filter."""
+        self.staff.is_superuser = True
+        self.staff.save()
+        self.client.force_login(self.staff)
+
+        response = self.client.get(reverse('admin:accounts_user_changelist'), {'_profile': '1'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('X-Profile-Id', response)
+
+    def test_login_with_signed_token(self):
+        """A JWT client profiles a password login."""
+        response = self.client.post(
+            reverse('accounts_api:login'),
+            {'email': 'user@example.com', 'password': 'TestPass123!'},
+            content_type='application/json',
+            headers={'X-Profile': '1', server_timing.HEADER: server_timing.make_token(self.staff)},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual(profile.view_name, 'accounts_api:login')
+        self.assertTrue((self.profile_dir / profile.file_name).exists())
+
+    def test_asgi_samples_sync_view_thread(self):
+        """Under ASGI a sync view runs in a sync_to_async thread, not the event loop."""
+        def view(request):
+            busy_wait(0.05)
+            return HttpResponse()
+
+        async def get_response(request):
+            return await sync_to_async(view)(request)
+
+        request = RequestFactory().get(
+            '/', headers={'X-Profile': '1', server_timing.HEADER: server_timing.make_token(self.staff)}
+        )
+        response = async_to_sync(ProfilingMiddleware(get_response))(request)
+
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        document = json.loads((self.profile_dir / profile.file_name).read_bytes())
+        self.assertEqual(len(document['profiles']), 2)
+        active = document['profiles'][document['activeProfileIndex']]
+        frames = document['shared']['frames']
+        self.assertIn('busy_wait', {frames[stack[-1]]['name'] for stack in active['samples']})
+
+    def test_not_for_other_users(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('admin:login'), {'_profile': '1'})
+
+        headers = {'X-Profile': '1', 'Authorization': f'Bearer {AccessToken.for_user(self.staff)}'}
+        self.client.get(reverse('accounts_api:me'), headers=headers)
+
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_only_when_requested(self):
+        self.client.force_login(self.staff)
+
+        response = self.client.get(reverse('admin:index'))
+
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+
+class RequestProfileAdminTests(ProfileDirMixin, TestCase):
+    """Tests for RequestProfileAdmin."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        self.client.force_login(self.admin)
+        with profiling.sample(interval=0.001) as sampler:
+            busy_wait(0.01)
+        self.profile = profiling.save_profile(sampler, 'POST /login', method='POST', path='/login', duration_ms=10)
+
+    def test_changelist(self):
+        response = self.client.get(reverse('admin:core_requestprofile_changelist'))
+
+        self.assertContains(response, '/login')
+        self.assertContains(response, reverse('admin:core_requestprofile_download', args=[self.profile.pk]))
+
+    def test_download(self):
+        response = self.client.get(reverse('admin:core_requestprofile_download', args=[self.profile.pk]))
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(b''.join(response.streaming_content))['name'], 'POST /login')
+
+    def test_delete_removes_file(self):
+        self.profile.delete()
+
+        self.assertFalse((self.profile_dir / self.profile.file_name).exists())
@@ -0,0 +1,130 @@
+"""
+Tests for per-request query counting and view query budgets.
+
+Test Structure:
+- CountQueriesTests: count_queries statistics
+- QueryCountMiddlewareTests: Response headers and budget enforcement
+- QueryBudgetTestMixinTests: Test helper assertions
+"""
+
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.api.views import MeAPIView
+from apps.accounts.models import User
+from apps.core.db.queries import count_queries
+from apps.core.middleware import QueryBudgetExceeded, QueryCountMiddleware
+from apps.core.models import AppSettings
+from apps.core.testing import QueryBudgetTestMixin
+
+
+class CountQueriesTests(TestCase):
+    """Tests for count_queries."""
+
+    def test_counts_queries_and_duplicates(self):
+        with count_queries() as stats:
+            for _ in range(3):
+                list(AppSettings.objects.filter(pk=1))
+            User.objects.exists()
+
+        self.assertEqual(stats.count, 4)
+        self.assertEqual(stats.duplicates, 2)
+        self.assertGreater(stats.duration, 0)
+        self.assertEqual(len(stats.most_repeated()), 1)
+
+    def test_nested_blocks(self):
+        """Outer blocks include queries of inner blocks."""
+        with count_queries() as outer:
+            User.objects.exists()
+            with count_queries() as inner:
+                User.objects.exists()
+
+        self.assertEqual((outer.count, inner.count), (2, 1))
+
+    def test_nothing_recorded_outside_block(self):
+        with count_queries() as stats:
+            pass
+        User.objects.exists()
+
+        self.assertEqual(stats.count, 0)
+
+
+@override_settings(QUERY_COUNT_HEADERS=True, QUERY_BUDGET_STRICT=False)
+class QueryCountMiddlewareTests(APITestCase):
+    """Tests for QueryCountMiddleware."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='budget@example.com', email='budget@example.com', password='TestPass123!', is_verified=True
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.url = reverse('accounts_api:me')
+
+    def test_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['X-DB-Query-Count'], '1')
+        self.assertEqual(response['X-DB-Duplicate-Queries'], '0')
+        self.assertEqual(response['X-DB-Query-Budget'], str(MeAPIView.query_budget))
+        self.assertIn('X-DB-Query-Time-Ms', response)
+
+    @override_settings(QUERY_COUNT_HEADERS=False, QUERY_BUDGET_STRICT=True)
+    def test_no_headers_when_disabled(self):
+        response = self.client.get(self.url)
+
+        self.assertNotIn('X-DB-Query-Count', response)
+
+    @patch.object(MeAPIView, 'query_budget', 0)
+    def test_over_budget_logged(self):
+        with self.assertLogs('apps.core.middleware', level='WARNING') as logs:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ran 1 queries, budget 0', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    @patch.object(MeAPIView, 'query_budget', 0)
+    def test_over_budget_raises_when_strict(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.url)
+
+    def test_async(self):
+        """Queries made through sync_to_async are counted."""
+        async def get_response(request):
+            await User.objects.acount()
+            await User.objects.acount()
+            return HttpResponse()
+
+        middleware = QueryCountMiddleware(get_response)
+        response = async_to_sync(middleware)(RequestFactory().get('/'))
+
+        self.assertEqual(response['X-DB-Query-Count'], '2')
+        self.assertEqual(response['X-DB-Duplicate-Queries'], '1')
+
+    @override_settings(QUERY_COUNT_HEADERS=False, QUERY_BUDGET_STRICT=False)
+    def test_not_used_when_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryCountMiddleware(lambda request: HttpResponse())
+
+
+class QueryBudgetTestMixinTests(QueryBudgetTestMixin, TestCase):
+    """Tests for QueryBudgetTestMixin."""
+
+    def test_assert_max_queries(self):
+        with self.assertMaxQueries(1) as stats:
+            User.objects.exists()
+
+        self.assertEqual(stats.count, 1)
+
+    def test_assert_max_queries_fails(self):
+        with self.assertRaisesMessage(AssertionError, '2 queries executed, expected at most 1'):
+            with self.assertMaxQueries(1):
+                User.objects.exists()
+                User.objects.exists()
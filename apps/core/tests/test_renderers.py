@@ -0,0 +1,139 @@
+"""
+Tests for the orjson-based renderer and parser.
+
+Test Structure:
+- ORJSONRendererTests: Type handling and parity with DRF's JSONRenderer
+- ORJSONParserTests: Request body parsing
+- ORJSONAPITests: End-to-end responses and error payloads
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+from io import BytesIO
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from apps.core.api.parsers import ORJSONParser
+from apps.core.api.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(TestCase):
+    """Tests for ORJSONRenderer."""
+
+    def setUp(self):
+        self.renderer = ORJSONRenderer()
+
+    def render(self, data):
+        return json.loads(self.renderer.render(data))
+
+    def test_renders_uuid(self):
+        value = uuid.uuid4()
+        self.assertEqual(self.render({'id': value}), {'id': str(value)})
+
+    def test_renders_datetimes_like_drf(self):
+        zurich = datetime.timezone(datetime.timedelta(hours=1))
+        data = {
+            'utc': datetime.datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'offset': datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=zurich),
+            'naive': datetime.datetime(2025, 1, 2, 3, 4, 5, 120000),
+            'time': datetime.time(3, 4, 5, 500),
+        }
+        self.assertEqual(self.renderer.render(data), JSONRenderer().render(data))
+        self.assertTrue(self.render(data)['utc'].endswith('Z'))
+
+    def test_escapes_line_separators_like_drf(self):
+        data = {'text': 'a\u2028b\u2029c'}
+        self.assertEqual(self.renderer.render(data), JSONRenderer().render(data))
+        self.assertEqual(self.render(data), data)
+
+    def test_renders_date(self):
+        self.assertEqual(self.render({'on': datetime.date(2025, 1, 2)}), {'on': '2025-01-02'})
+
+    def test_renders_lazy_translation_string(self):
+        self.assertEqual(self.render({'message': _('Invalid value')}), {'message': 'Invalid value'})
+
+    def test_renders_error_detail_as_string(self):
+        data = {'details': {'email': ErrorDetail('Enter a valid email.', code='invalid')}}
+        self.assertEqual(self.render(data), {'details': {'email': 'Enter a valid email.'}})
+
+    def test_renders_decimal_and_timedelta_like_drf(self):
+        data = {'amount': decimal.Decimal('1.50'), 'duration': datetime.timedelta(minutes=2)}
+        self.assertEqual(self.render(data), json.loads(JSONRenderer().render(data)))
+
+    def test_output_matches_drf_renderer(self):
+        data = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'title': 'Datenschutzerklärung <b>&amp;</b>',
+            'items': [1, 2.5, None, True],
+            'nested': {'created_at': datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)},
+        }
+        self.assertEqual(self.renderer.render(data), JSONRenderer().render(data))
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(self.renderer.render(None), b'')
+
+    def test_indent_from_media_type(self):
+        output = self.renderer.render({'a': 1}, 'application/json; indent=4')
+        self.assertIn(b'\n', output)
+
+    def test_unsupported_type_raises(self):
+        with self.assertRaises(TypeError):
+            self.renderer.render({'value': object()})
+
+
+class ORJSONParserTests(TestCase):
+    """Tests for ORJSONParser."""
+
+    def setUp(self):
+        self.parser = ORJSONParser()
+
+    def test_parses_json(self):
+        data = self.parser.parse(BytesIO('{"name": "Zürich"}'.encode()))
+        self.assertEqual(data, {'name': 'Zürich'})
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parser.parse(BytesIO(b'{"name": '))
+
+    def test_rejects_nan(self):
+        with self.assertRaises(ParseError):
+            self.parser.parse(BytesIO(b'{"value": NaN}'))
+
+    def test_parses_non_utf8_encoding(self):
+        body = '{"name": "Zürich"}'.encode('latin-1')
+        data = self.parser.parse(BytesIO(body), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(data, {'name': 'Zürich'})
+
+
+class ORJSONAPITests(APITestCase):
+    """End-to-end tests through the configured renderer and parser."""
+
+    def test_validation_error_response(self):
+        response = self.client.post(
+            reverse('accounts_api:register'),
+            {'email': 'not-an-email'},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        body = json.loads(response.content)
+        self.assertTrue(body['error'])
+        self.assertEqual(body, json.loads(JSONRenderer().render(response.data)))
+
+    def test_malformed_json_returns_400(self):
+        response = self.client.post(
+            reverse('accounts_api:register'),
+            data='{"email": ',
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(json.loads(response.content)['error'])
@@ -0,0 +1,92 @@
+"""
+Tests for trigram admin search.
+
+Test Structure:
+- SearchFilterTests: Email prefixes, short-word prefixes and substrings
+- TrigramSearchMixinTests: Ranked search on PostgreSQL, fallback elsewhere
+"""
+
+from unittest.mock import patch
+
+from django.contrib.admin.sites import site
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.core.search import search_filter, search_words
+
+FIELDS = ('email', 'first_name', 'last_name', 'username')
+
+
+class SearchFilterTests(TestCase):
+    """Tests for search_filter."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for email, first_name, last_name in [
+            ('anna.muster@example.com', 'Anna', 'Muster'),
+            ('hans@beispiel.ch', 'Hans', 'Annaheim'),
+            ('marie@example.com', 'Marie', 'Curie'),
+        ]:
+            User.objects.create_user(username=email, email=email, first_name=first_name, last_name=last_name)
+
+    def search(self, term):
+        users = User.objects.filter(search_filter(term, FIELDS, ('email',)))
+        return sorted(users.values_list('first_name', flat=True))
+
+    def test_substring_of_any_field(self):
+        self.assertEqual(self.search('anna'), ['Anna', 'Hans'])
+
+    def test_words_must_all_match(self):
+        self.assertEqual(self.search('anna muster'), ['Anna'])
+
+    def test_email_terms_match_prefixes(self):
+        self.assertEqual(self.search('MARIE@ex'), ['Marie'])
+        self.assertEqual(self.search('arie@example.com'), [])
+
+    def test_domain_terms_match_substrings(self):
+        self.assertEqual(self.search('@example.com'), ['Anna', 'Marie'])
+
+    def test_short_words_match_prefixes_of_any_field(self):
+        self.assertEqual(self.search('ha'), ['Hans'])
+        self.assertEqual(self.search('Cu'), ['Marie'])
+        self.assertEqual(self.search('ri'), [])
+
+    def test_quoted_phrases(self):
+        self.assertEqual(search_words('"anna muster" ch'), ['anna muster', 'ch'])
+
+
+class TrigramSearchMixinTests(TestCase):
+    """Tests for TrigramSearchMixin on UserAdmin."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin@example.com', email='admin@example.com', password='TestPass123!'
+        )
+        User.objects.create_user(username='anna@example.com', email='anna@example.com', first_name='Anna')
+        self.model_admin = site._registry[User]
+
+    def test_regular_search_without_postgres(self):
+        self.client.force_login(self.admin)
+
+        response = self.client.get(reverse('admin:accounts_user_changelist'), {'q': 'ann'})
+
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_ranked_on_postgres(self):
+        request = RequestFactory().get('/', {'q': 'anna'})
+
+        with patch.object(type(self.model_admin), 'trigram_search_enabled', return_value=True):
+            queryset, may_have_duplicates = self.model_admin.get_search_results(request, User.objects.all(), 'anna')
+            ordering = self.model_admin.get_ordering(request)
+
+        self.assertFalse(may_have_duplicates)
+        sql = str(queryset.order_by(*ordering).query)
+        self.assertIn('SIMILARITY', sql)
+        self.assertEqual(ordering[0], '-search_rank')
+
+    def test_column_sort_overrides_rank(self):
+        request = RequestFactory().get('/', {'q': 'anna', 'o': '1'})
+
+        with patch.object(type(self.model_admin), 'trigram_search_enabled', return_value=True):
+            self.assertNotIn('-search_rank', self.model_admin.get_ordering(request))
@@ -0,0 +1,184 @@
+"""
+Tests for the Server-Timing breakdown.
+
+Test Structure:
+- TimedTests: Per-category accumulation
+- ServerTimingMiddlewareTests: Who gets the header and what it contains
+- ServerTimingTokenAPITests: Token endpoint
+"""
+
+import re
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.core import server_timing
+from apps.core.middleware import ServerTimingMiddleware
+
+
+def parse(header):
+    return {
+        metric.split(';')[0]: float(re.search(r'dur=([\d.]+)', metric).group(1))
+        for metric in header.split(', ')
+    }
+
+
+class TimedTests(SimpleTestCase):
+    """Tests for timed() and collect()."""
+
+    def test_nested_same_category_counted_once(self):
+        with server_timing.collect() as timings:
+            with server_timing.timed('render'):
+                with server_timing.timed('render'):
+                    pass
+                inner = timings.durations['render']
+
+        self.assertEqual(inner, 0.0)
+        self.assertGreater(timings.durations['render'], 0.0)
+
+    def test_noop_outside_request(self):
+        with server_timing.timed('cache'):
+            pass
+
+        self.assertIsNone(server_timing._timings.get())
+
+
+class ServerTimingMiddlewareTests(TestCase):
+    """Tests for ServerTimingMiddleware."""
+
+    def setUp(self):
+        self.enterContext(override_settings(SERVER_TIMING_ENABLED=True))
+        server_timing.install()
+        cache.clear()
+        self.staff = User.objects.create_user(
+            username='staff@example.com', email='staff@example.com', password='TestPass123!', is_staff=True
+        )
+        self.user = User.objects.create_user(
+            username='user@example.com', email='user@example.com', password='TestPass123!'
+        )
+        self.url = reverse('accounts_api:me')
+
+    def login(self, email):
+        self.client.post(reverse('admin:login'), {'username': email, 'password': 'TestPass123!'})
+
+    def test_staff_session(self):
+        self.login('staff@example.com')
+        self.assertIn(server_timing.COOKIE, self.client.cookies)
+
+        response = self.client.get(reverse('admin:index'))
+
+        metrics = parse(response['Server-Timing'])
+        self.assertEqual(list(metrics), [*server_timing.CATEGORIES, 'total'])
+        self.assertGreater(metrics['db'], 0)
+        self.assertGreater(metrics['render'], 0)
+        self.assertIn('queries"', response['Server-Timing'])
+
+    def test_cookie_deleted_at_logout(self):
+        self.login('staff@example.com')
+
+        self.client.post(reverse('admin:logout'))
+
+        self.assertEqual(self.client.cookies[server_timing.COOKIE].value, '')
+        self.assertNotIn('Server-Timing', self.client.get(reverse('admin:login')))
+
+    def test_session_not_loaded_without_token(self):
+        self.client.force_login(self.staff)
+        request = RequestFactory().get('/', headers={'Cookie': f'sessionid={self.client.session.session_key}'})
+        request.user = SimpleLazyObject(lambda: self.fail('user loaded'))
+
+        response = ServerTimingMiddleware(lambda request: HttpResponse())(request)
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_not_for_other_users(self):
+        self.login('user@example.com')
+        self.assertNotIn(server_timing.COOKIE, self.client.cookies)
+        self.assertNotIn('Server-Timing', self.client.get(reverse('admin:login')))
+
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.staff)}'}
+        self.assertNotIn('Server-Timing', self.client.get(self.url, headers=headers))
+
+    def test_signed_token(self):
+        headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}',
+            server_timing.HEADER: server_timing.make_token(self.staff),
+        }
+
+        response = self.client.get(self.url, headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(parse(response['Server-Timing'])['render'], 0)
+
+    def test_forged_or_expired_token(self):
+        token = server_timing.make_token(self.staff)
+
+        response = self.client.get(self.url, headers={server_timing.HEADER: token[:-1] + 'x'})
+        self.assertNotIn('Server-Timing', response)
+
+        with override_settings(SERVER_TIMING_TOKEN_MAX_AGE=-1):
+            response = self.client.get(self.url, headers={server_timing.HEADER: token})
+        self.assertNotIn('Server-Timing', response)
+
+    def test_token_of_user_no_longer_staff(self):
+        token = server_timing.make_token(self.staff)
+        self.assertTrue(server_timing.check_token(token))
+
+        self.staff.is_staff = False
+        self.staff.save(update_fields=['is_staff'])
+        cache.clear()  # the staff check is cached for STAFF_CACHE_SECONDS
+
+        response = self.client.get(self.url, headers={server_timing.HEADER: token})
+        self.assertNotIn('Server-Timing', response)
+        self.assertFalse(server_timing.check_token(server_timing.make_token(self.user)))
+
+    def test_password_hashing_timed(self):
+        response = self.client.post(
+            reverse('accounts_api:login'),
+            {'email': 'user@example.com', 'password': 'TestPass123!'},
+            content_type='application/json',
+            headers={server_timing.HEADER: server_timing.make_token(self.staff)},
+        )
+
+        self.assertGreater(parse(response['Server-Timing'])['hash'], 0)
+
+    def test_async(self):
+        async def get_response(request):
+            await User.objects.acount()
+            return HttpResponse()
+
+        request = RequestFactory().get('/', headers={server_timing.HEADER: server_timing.make_token(self.staff)})
+        response = async_to_sync(ServerTimingMiddleware(get_response))(request)
+
+        self.assertIn('queries"', response['Server-Timing'])
+        self.assertIn('db;', response['Server-Timing'])
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_not_used_when_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ServerTimingMiddleware(lambda request: HttpResponse())
+
+
+class ServerTimingTokenAPITests(TestCase):
+    """Tests for ServerTimingTokenAPIView."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_staff_only(self):
+        url = reverse('core-api:system-server-timing-token')
+        user = User.objects.create_user(username='u@example.com', email='u@example.com', password='x')
+        staff = User.objects.create_user(username='s@example.com', email='s@example.com', password='x', is_staff=True)
+
+        denied = self.client.post(url, headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'})
+        response = self.client.post(url, headers={'Authorization': f'Bearer {AccessToken.for_user(staff)}'})
+
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(response.json()['header'], server_timing.HEADER)
+        self.assertTrue(server_timing.check_token(response.json()['token']))
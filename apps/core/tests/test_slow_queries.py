@@ -0,0 +1,120 @@
+"""
+Tests for slow query capture.
+
+Test Structure:
+- NormalizeSQLTests: Normalized SQL and fingerprints
+- SlowQueryCaptureTests: Capture, EXPLAIN plans, callers and the ring buffer
+- SlowQueryAdminTests: Admin listing
+"""
+
+import os
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.core.db import slow_queries
+from apps.core.models import SlowQuery
+
+
+class NormalizeSQLTests(SimpleTestCase):
+    """Tests for normalize_sql."""
+
+    def test_literals_and_in_lists(self):
+        self.assertEqual(
+            slow_queries.normalize_sql(
+                "SELECT *  FROM t1 WHERE a = %s AND b IN (%s, %s, %s)\n AND c = 'x''y' LIMIT 21"
+            ),
+            "SELECT * FROM t1 WHERE a = ? AND b IN (...) AND c = ? LIMIT ?",
+        )
+
+    def test_same_fingerprint_for_different_parameters(self):
+        first = slow_queries.normalize_sql('SELECT * FROM t WHERE id IN (%s, %s)')
+        second = slow_queries.normalize_sql('SELECT * FROM t WHERE id IN (%s)')
+
+        self.assertEqual(slow_queries.fingerprint(first), slow_queries.fingerprint(second))
+
+
+class SlowQueryCaptureTests(TestCase):
+    """Tests for the execute wrapper and SlowQueryRecorder."""
+
+    def setUp(self):
+        slow_queries.install()
+        # Record on this thread with flush() instead of the background thread
+        self.enterContext(patch.object(slow_queries._recorder, 'pid', os.getpid()))
+        self.enterContext(override_settings(SLOW_QUERY_THRESHOLD_MS=0.000001))
+        self.addCleanup(slow_queries.flush)
+
+    def lookup_user(self):
+        return User.objects.filter(email__iexact='slow@example.com').exists()
+
+    def test_captured_with_plan_and_caller(self):
+        self.lookup_user()
+        slow_queries.flush()
+
+        captured = SlowQuery.objects.get(sql__contains='FROM "accounts_user"')
+        self.assertIn('WHERE', captured.sql)
+        self.assertNotIn('slow@example.com', captured.sql)
+        self.assertIn('SlowQueryCaptureTests.lookup_user', captured.caller)
+        self.assertIn('test_captured_with_plan_and_caller', captured.stack)
+        self.assertIn('SCAN', captured.plan)
+        self.assertTrue(captured.sequential_scan)
+
+    def test_index_lookup_not_flagged(self):
+        User.objects.filter(pk=1).exists()
+        slow_queries.flush()
+
+        captured = SlowQuery.objects.get(sql__contains='FROM "accounts_user"')
+        self.assertIn('SEARCH', captured.plan)
+        self.assertFalse(captured.sequential_scan)
+
+    def test_recording_not_captured(self):
+        self.lookup_user()
+        slow_queries.flush()
+        slow_queries.flush()
+
+        self.assertEqual(SlowQuery.objects.count(), 1)
+
+    def test_below_threshold_ignored(self):
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=60_000):
+            self.lookup_user()
+        slow_queries.flush()
+
+        self.assertFalse(SlowQuery.objects.exists())
+
+    @override_settings(SLOW_QUERY_BUFFER_SIZE=2)
+    def test_ring_buffer(self):
+        for pk in range(4):
+            User.objects.filter(pk=pk).exists()
+            slow_queries.flush()
+
+        self.assertEqual(SlowQuery.objects.count(), 2)
+
+    def test_queue_full_drops(self):
+        recorder = slow_queries.SlowQueryRecorder()
+        recorder.pid = os.getpid()
+        captured = slow_queries.CapturedQuery('default', 'sqlite', 'SELECT 1', None, False, 1.0, [])
+
+        for _ in range(slow_queries.MAX_QUEUED_QUERIES + 1):
+            recorder.submit(captured)
+
+        self.assertEqual(recorder.dropped, 1)
+
+
+class SlowQueryAdminTests(TestCase):
+    """Tests for SlowQueryAdmin."""
+
+    def test_changelist_and_detail(self):
+        admin = User.objects.create_superuser(username='admin@example.com', email='admin@example.com', password='x')
+        self.client.force_login(admin)
+        slow_query = SlowQuery.objects.create(
+            alias='default', duration_ms=250, sql='SELECT * FROM "core_legaldocument" WHERE content LIKE ?',
+            fingerprint='0' * 16, plan='Seq Scan on core_legaldocument', sequential_scan=True,
+        )
+
+        changelist = self.client.get(reverse('admin:core_slowquery_changelist'), {'sequential_scan__exact': '1'})
+        detail = self.client.get(reverse('admin:core_slowquery_change', args=[slow_query.pk]))
+
+        self.assertContains(changelist, 'core_legaldocument')
+        self.assertContains(detail, '<pre>Seq Scan on core_legaldocument</pre>', html=True)
@@ -0,0 +1,123 @@
+"""
+Tests for bulk inserts and the synthetic data generator.
+
+Test Structure:
+- CopyValueTests: COPY text format
+- BulkInsertTests: Batched inserts with explicit values
+- GenerateSyntheticDataTests: Distributions, token histories and determinism
+"""
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from apps.accounts.models import EmailVerificationToken, OTPToken, PasswordResetToken, User
+from apps.core.db.bulk import _copy_value, bulk_insert, reset_sequences
+from apps.core.models import LegalDocument
+
+
+class CopyValueTests(SimpleTestCase):
+    """Tests for _copy_value."""
+
+    def test_values(self):
+        self.assertEqual(_copy_value(None), '\\N')
+        self.assertEqual(_copy_value(True), 't')
+        self.assertEqual(_copy_value(0), '0')
+        self.assertEqual(_copy_value(date(2025, 1, 2)), '2025-01-02')
+        self.assertEqual(
+            _copy_value(datetime(2025, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)), '2025-01-02T03:04:05+00:00'
+        )
+        self.assertEqual(_copy_value('a\tb\\c\nd'), 'a\\tb\\\\c\\nd')
+
+
+class BulkInsertTests(TestCase):
+    """Tests for bulk_insert."""
+
+    def test_explicit_values_in_batches(self):
+        user = User.objects.create_user(username='bulk@example.com', email='bulk@example.com')
+        created_at = datetime(2024, 5, 1, tzinfo=dt_timezone.utc)
+        rows = (
+            (created_at, created_at, user.id, f'token-{n}', created_at + timedelta(hours=1), None)
+            for n in range(5)
+        )
+
+        inserted = bulk_insert(
+            PasswordResetToken, ['created_at', 'updated_at', 'user_id', 'token', 'expires_at', 'used_at'],
+            rows, batch_size=2,
+        )
+
+        self.assertEqual(inserted, 5)
+        tokens = PasswordResetToken.objects.filter(user=user)
+        self.assertEqual(tokens.count(), 5)
+        self.assertEqual({token.created_at for token in tokens}, {created_at})
+
+    def test_explicit_ids_then_sequence_reset(self):
+        now = datetime.now(dt_timezone.utc)
+        bulk_insert(
+            LegalDocument,
+            ['id', 'created_at', 'updated_at', 'document_type', 'version', 'title', 'content', 'effective_date', 'is_active'],
+            [(500, now, now, 'terms', '0.9', 'Terms', '<p>Terms</p>', date(2024, 1, 1), False)],
+        )
+        reset_sequences(LegalDocument)
+
+        document = LegalDocument.objects.create(
+            document_type='terms', version='0.10', title='Terms', content='', effective_date=date(2024, 2, 1)
+        )
+
+        self.assertGreater(document.id, 500)
+
+
+class GenerateSyntheticDataTests(TestCase):
+    """Tests for the generate_synthetic_data command."""
+
+    def generate(self, **options):
+        call_command(
+            'generate_synthetic_data', users=300, batch_size=120, end_date=date(2025, 6, 30),
+            legal_versions=2, i_know_this_is_not_production=True, stdout=StringIO(), **options
+        )
+
+    def test_refuses_without_debug(self):
+        with self.assertRaises(CommandError):
+            call_command('generate_synthetic_data', users=1, stdout=StringIO())
+
+        self.assertFalse(User.objects.exists())
+
+    def test_users_and_histories(self):
+        self.generate()
+
+        self.assertEqual(User.objects.count(), 300)
+        self.assertEqual(User.objects.values('email').distinct().count(), 300)
+        swiss = User.objects.filter(country='CH').count()
+        self.assertGreater(swiss, 150)
+        self.assertGreater(User.objects.exclude(country='CH').count(), 20)
+        user = User.objects.first()
+        self.assertFalse(user.has_usable_password())
+        self.assertFalse(User.objects.exclude(email__endswith='.invalid').exists())
+        self.assertFalse(User.objects.filter(date_joined__gte=datetime(2025, 7, 1, tzinfo=dt_timezone.utc)).exists())
+        self.assertGreater(EmailVerificationToken.objects.count(), 100)
+        self.assertGreater(PasswordResetToken.objects.count(), 0)
+        self.assertGreater(OTPToken.objects.count(), 50)
+        otp = OTPToken.objects.first()
+        self.assertTrue(User.objects.filter(email=otp.email).exists())
+        self.assertEqual(LegalDocument.objects.filter(version__in=['0.1', '0.2'], is_active=False).count(), 4)
+
+    def test_deterministic_from_seed(self):
+        self.generate(seed=3)
+        first = list(User.objects.order_by('id').values_list('email', 'date_joined', 'country'))
+        first_tokens = sorted(OTPToken.objects.values_list('code_hash', flat=True))
+        User.objects.all().delete()
+        OTPToken.objects.all().delete()
+
+        self.generate(seed=3)
+
+        self.assertEqual(list(User.objects.order_by('id').values_list('email', 'date_joined', 'country')), first)
+        self.assertEqual(sorted(OTPToken.objects.values_list('code_hash', flat=True)), first_tokens)
+
+    def test_second_run_appends(self):
+        self.generate()
+        self.generate()
+
+        self.assertEqual(User.objects.count(), 600)
+        self.assertEqual(LegalDocument.objects.filter(version='0.1').count(), 2)
@@ -0,0 +1,197 @@
+"""
+Tests for request tracing.
+
+Test Structure:
+- TraceContextTests: traceparent parsing and span nesting
+- UnsampledTests: Sampling decisions
+- RequestTracingTests: Request, service, database, cache and email spans
+- CeleryPropagationTests: Trace context carried into tasks
+- ExporterTests: OTLP payload and exporter failures
+"""
+
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.core import tracing
+
+TRACEPARENT = '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01'
+
+
+class TracingTestMixin:
+    """Enable tracing with a file exporter writing to a temporary file."""
+
+    sample_rate = 1.0
+
+    def setUp(self):
+        super().setUp()
+        fd, self.trace_file = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.addCleanup(os.remove, self.trace_file)
+        self.enterContext(override_settings(
+            TRACING_ENABLED=True,
+            TRACING_SAMPLE_RATE=self.sample_rate,
+            TRACING_EXPORTERS=['file'],
+            TRACING_FILE_PATH=self.trace_file,
+        ))
+        tracing.install()
+        tracing.flush()
+
+    def exported(self):
+        tracing.flush()
+        with open(self.trace_file) as f:
+            return [json.loads(line) for line in f]
+
+
+class TraceContextTests(TracingTestMixin, SimpleTestCase):
+    """Tests for trace context handling."""
+
+    def test_parse_traceparent(self):
+        self.assertEqual(
+            tracing.parse_traceparent(TRACEPARENT),
+            ('0af7651916cd43dd8448eb211c80319c', 'b7ad6b7169203331', True),
+        )
+        self.assertIsNone(tracing.parse_traceparent('00-' + '0' * 32 + '-b7ad6b7169203331-01'))
+        self.assertIsNone(tracing.parse_traceparent('garbage'))
+        self.assertIsNone(tracing.parse_traceparent(None))
+
+    def test_nested_spans_exported_with_root(self):
+        with tracing.span('outer', root=True) as outer:
+            with tracing.span('inner') as inner:
+                pass
+            self.assertEqual(self.exported(), [])
+
+        spans = {s['name']: s for s in self.exported()}
+        self.assertEqual(spans['inner']['parent_id'], outer.span_id)
+        self.assertEqual(spans['inner']['trace_id'], outer.trace_id)
+        self.assertEqual(inner.local_root, outer)
+
+    def test_no_trace_without_root(self):
+        """Operations outside a request or task are not traced on their own."""
+        with tracing.span('orphan') as current:
+            self.assertIsNone(current)
+
+        self.assertEqual(self.exported(), [])
+
+    def test_error_recorded(self):
+        with self.assertRaises(ValueError):
+            with tracing.span('failing', root=True):
+                raise ValueError('boom')
+
+        self.assertEqual(self.exported()[0]['error'], 'ValueError: boom')
+
+    @override_settings(TRACING_ENABLED=False)
+    def test_disabled(self):
+        with tracing.span('request', root=True) as current:
+            self.assertIsNone(current)
+
+
+class UnsampledTests(TracingTestMixin, SimpleTestCase):
+    """Traces not selected by the sample rate record nothing."""
+
+    sample_rate = 0.0
+
+    def test_not_sampled(self):
+        with tracing.span('request', root=True) as root:
+            with tracing.span('child') as child:
+                pass
+
+        self.assertFalse(root.sampled)
+        self.assertIsNone(child)
+        self.assertEqual(self.exported(), [])
+
+    def test_sampled_parent_overrides_rate(self):
+        with tracing.span('request', root=True, traceparent=TRACEPARENT):
+            pass
+
+        self.assertEqual(len(self.exported()), 1)
+
+
+class RequestTracingTests(TracingTestMixin, TestCase):
+    """Tests for TracingMiddleware and the instrumentation."""
+
+    def test_view_span_with_queries(self):
+        user = User.objects.create_user(username='t@example.com', email='t@example.com', password='x')
+
+        self.client.get(reverse('accounts_api:me'), headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'})
+
+        spans = self.exported()
+        root = spans[-1]
+        self.assertEqual(root['name'], 'GET accounts_api:me')
+        self.assertEqual(root['kind'], 'server')
+        self.assertEqual(root['attributes']['http.status_code'], 200)
+        queries = [s for s in spans if s['name'] == 'db.query']
+        self.assertTrue(queries)
+        self.assertTrue(all(s['trace_id'] == root['trace_id'] for s in spans))
+
+    def test_incoming_traceparent_continued(self):
+        self.client.get(reverse('accounts_api:me'), headers={'traceparent': TRACEPARENT})
+
+        root = self.exported()[-1]
+        self.assertEqual(root['trace_id'], '0af7651916cd43dd8448eb211c80319c')
+        self.assertEqual(root['parent_id'], 'b7ad6b7169203331')
+
+    def test_service_cache_and_email_spans(self):
+        """An OTP request shows where its time went."""
+        self.client.post(reverse('accounts_api:otp_request'), {'email': 'otp@example.com'}, content_type='application/json')
+
+        spans = {s['name']: s for s in self.exported()}
+        service = spans['OTPService.create_and_send_otp']
+        self.assertEqual(spans['OTPService.send_otp_email']['parent_id'], service['span_id'])
+        self.assertEqual(spans['email.send_messages']['parent_id'], spans['OTPService.send_otp_email']['span_id'])
+        self.assertIn('cache.get', spans)
+        self.assertIn('db.query', spans)
+
+
+class CeleryPropagationTests(TracingTestMixin, SimpleTestCase):
+    """Tests for the Celery signal handlers."""
+
+    def test_task_continues_publishing_trace(self):
+        headers = {}
+        with tracing.span('request', root=True) as request_span:
+            tracing._inject_task_headers(headers=headers)
+
+        task = SimpleNamespace(name='accounts.process_profile_picture', request=SimpleNamespace(id='t-1', **headers))
+        tracing._start_task_span(task=task)
+        with tracing.span('ProfilePictureService.generate_renditions'):
+            pass
+        tracing._end_task_span(task=task, state='SUCCESS')
+
+        spans = {s['name']: s for s in self.exported()}
+        task_span = spans['task accounts.process_profile_picture']
+        self.assertEqual(task_span['trace_id'], request_span.trace_id)
+        self.assertEqual(task_span['parent_id'], request_span.span_id)
+        self.assertEqual(task_span['kind'], 'consumer')
+        self.assertEqual(spans['ProfilePictureService.generate_renditions']['parent_id'], task_span['span_id'])
+
+
+class ExporterTests(SimpleTestCase):
+    """Tests for exporters."""
+
+    def make_span(self, **kwargs):
+        return tracing.Span('GET me', 'a' * 32, 'b' * 16, start_ns=1, end_ns=2, **kwargs)
+
+    def test_otlp_payload(self):
+        exporter = tracing.OTLPExporter('http://collector/v1/traces', 'altea')
+
+        payload = exporter.payload([self.make_span(kind='server', attributes={'http.status_code': 200})])
+
+        resource_spans = payload['resourceSpans'][0]
+        self.assertEqual(resource_spans['resource']['attributes'][0]['value']['stringValue'], 'altea')
+        span = resource_spans['scopeSpans'][0]['spans'][0]
+        self.assertEqual((span['traceId'], span['spanId'], span['kind']), ('a' * 32, 'b' * 16, 2))
+        self.assertEqual(span['status'], {'code': 1})
+        self.assertNotIn('parentSpanId', span)
+
+    @override_settings(TRACING_EXPORTERS=['otlp'], TRACING_OTLP_ENDPOINT='http://127.0.0.1:9/v1/traces')
+    def test_export_failure_logged(self):
+        with patch('apps.core.tracing.urllib.request.urlopen', side_effect=OSError('refused')):
+            with self.assertLogs('apps.core.tracing', level='WARNING'):
+                tracing._processor.process([[self.make_span()]])
@@ -0,0 +1,444 @@
+"""
+Request tracing.
+
+A trace is a tree of timed spans. Spans are recorded for:
+
+- each request, named after the view (TracingMiddleware)
+- service methods (@trace_methods on the *Service classes)
+- database queries, cache calls and outgoing email (install())
+- Celery tasks, which continue the trace of the request that queued them
+
+Trace context follows W3C Trace Context: incoming `traceparent` headers
+are continued, and Celery messages carry the header of the span that sent
+them.
+
+Only TRACING_SAMPLE_RATE of new traces are recorded; the decision is made
+once per trace and inherited by its spans and tasks. Recorded traces are
+exported in a background thread, so requests never wait on an exporter.
+TRACING_EXPORTERS selects the sinks:
+
+- 'file': one JSON object per span in TRACING_FILE_PATH
+- 'otlp': OTLP/HTTP JSON to TRACING_OTLP_ENDPOINT (e.g. a local
+  OpenTelemetry Collector, Jaeger or Tempo)
+- 'sentry': Sentry performance transactions (requires sentry-sdk to be
+  initialized, see SENTRY_DSN)
+
+Everything is a no-op unless TRACING_ENABLED is set.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import random
+import re
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.module_loading import import_string
+
+from apps.core.background import BackgroundWorker
+from apps.core.instrumentation import wrap_methods
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+MAX_QUEUED_TRACES = 1000
+CACHE_METHODS = (
+    'get', 'set', 'add', 'delete', 'touch', 'has_key', 'incr', 'decr',
+    'get_many', 'set_many', 'delete_many', 'get_or_set',
+)
+
+_current: ContextVar['Span | None'] = ContextVar('trace_span', default=None)
+
+
+@dataclass(eq=False)
+class Span:
+    """One timed operation within a trace."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    kind: str = 'internal'  # server, client, consumer or internal
+    sampled: bool = True
+    attributes: dict = field(default_factory=dict)
+    start_ns: int = 0
+    end_ns: int = 0
+    error: str | None = None
+    local_root: 'Span | None' = field(default=None, repr=False)
+    # On the local root: spans of this trace finished in this process
+    finished: list = field(default_factory=list, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    @property
+    def traceparent(self) -> str:
+        return f'00-{self.trace_id}-{self.span_id}-{"01" if self.sampled else "00"}'
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'kind': self.kind,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round(self.duration * 1000, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+def _new_id(bits: int) -> str:
+    return f'{random.getrandbits(bits):0{bits // 4}x}'
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """Return (trace_id, parent_span_id, sampled) from a traceparent header."""
+    match = TRACEPARENT_RE.match(header or '')
+    if not match or set(match[1]) == {'0'} or set(match[2]) == {'0'}:
+        return None
+    return match[1], match[2], bool(int(match[3], 16) & 1)
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'TRACING_ENABLED', False)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def start_span(name, kind='internal', attributes=None, root=False, traceparent=None):
+    """
+    Start a span as a child of the current span and make it current.
+
+    Without a current span, a new trace is started only if root is True
+    (requests and tasks); other operations are not traced on their own.
+    Returns None when nothing is recorded. Must be ended with end_span().
+    """
+    if not is_enabled():
+        return None
+
+    parent = _current.get()
+    if parent is not None:
+        if not parent.sampled:
+            return None
+        span = Span(name, parent.trace_id, _new_id(64), parent.span_id, kind, local_root=parent.local_root)
+    elif root:
+        remote = parse_traceparent(traceparent)
+        if remote:
+            trace_id, parent_id, sampled = remote
+        else:
+            trace_id, parent_id = _new_id(128), None
+            sampled = random.random() < getattr(settings, 'TRACING_SAMPLE_RATE', 0.0)
+        span = Span(name, trace_id, _new_id(64), parent_id, kind, sampled=sampled)
+        span.local_root = span
+    else:
+        return None
+
+    if attributes:
+        span.attributes.update(attributes)
+    span.start_ns = time.time_ns()
+    span._token = _current.set(span)
+    return span
+
+
+def end_span(span: Span, error: BaseException | None = None) -> None:
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f'{type(error).__name__}: {error}'
+    _current.reset(span._token)
+
+    if span.sampled:
+        root = span.local_root
+        root.finished.append(span)
+        if span is root:
+            _processor.submit(root.finished)
+
+
+@contextmanager
+def span(name, kind='internal', attributes=None, root=False, traceparent=None):
+    """
+    Trace the block as a span.
+
+    Usage:
+        with span('render_email', attributes={'template': name}) as current:
+            ...
+    """
+    current = start_span(name, kind, attributes, root, traceparent)
+    if current is None:
+        yield None
+        return
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, error=e)
+        raise
+    end_span(current)
+
+
+def traced(func=None, *, name=None):
+    """Decorator tracing each call of a sync or async function as a span."""
+    if func is None:
+        return functools.partial(traced, name=name)
+    span_name = name or func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return await func(*args, **kwargs)
+            with span(span_name):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current.get() is None:
+            return func(*args, **kwargs)
+        with span(span_name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def trace_methods(cls):
+    """Class decorator tracing the public static methods of a service class."""
+    for attr, value in list(vars(cls).items()):
+        if isinstance(value, staticmethod) and not attr.startswith('_'):
+            setattr(cls, attr, staticmethod(traced(value.__func__, name=f'{cls.__name__}.{attr}')))
+    return cls
+
+
+# Instrumentation
+
+def _trace_query(execute, sql, params, many, context):
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return execute(sql, params, many, context)
+    connection = context['connection']
+    attributes = {'db.system': connection.vendor, 'db.name': connection.alias, 'db.statement': sql}
+    with span('db.query', kind='client', attributes=attributes):
+        return execute(sql, params, many, context)
+
+
+def _install_query_tracing(sender=None, connection=None, **kwargs):
+    if _trace_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_trace_query)
+
+
+def _traced_method(prefix, kind='client'):
+    def wrap(name, method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if _current.get() is None:
+                return method(self, *args, **kwargs)
+            with span(f'{prefix}.{name}', kind=kind, attributes={'code.class': type(self).__name__}):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return wrap
+
+
+_installed = False
+
+
+def install() -> None:
+    """
+    Instrument database queries, cache backends, the email backend and
+    Celery. Called from CoreConfig.ready() when TRACING_ENABLED is set.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    connection_created.connect(_install_query_tracing, dispatch_uid='apps.core.tracing')
+    for connection in connections.all(initialized_only=True):
+        _install_query_tracing(connection=connection)
+
+    for config in settings.CACHES.values():
+        wrap_methods(import_string(config['BACKEND']), CACHE_METHODS, _traced_method('cache'), '_traced')
+    wrap_methods(import_string(settings.EMAIL_BACKEND), ('send_messages',), _traced_method('email'), '_traced')
+
+    try:
+        from celery import signals
+    except ImportError:
+        return
+    signals.before_task_publish.connect(_inject_task_headers, weak=False)
+    signals.task_prerun.connect(_start_task_span, weak=False)
+    signals.task_postrun.connect(_end_task_span, weak=False)
+
+
+# Celery propagation
+
+def _inject_task_headers(headers=None, **kwargs):
+    current = _current.get()
+    if current is not None and headers is not None:
+        headers['traceparent'] = current.traceparent
+
+
+def _start_task_span(task=None, **kwargs):
+    request = task.request
+    traceparent = getattr(request, 'traceparent', None) or (request.get('headers') or {}).get('traceparent')
+    request.trace_span = start_span(
+        f'task {task.name}', kind='consumer', attributes={'celery.task_id': request.id},
+        root=True, traceparent=traceparent,
+    )
+
+
+def _end_task_span(task=None, state=None, **kwargs):
+    current = getattr(task.request, 'trace_span', None)
+    if current is not None:
+        current.set_attribute('celery.state', state)
+        if state == 'FAILURE':
+            current.error = 'task failed'
+        end_span(current)
+
+
+# Export
+
+class FileExporter:
+    """Append spans as JSON lines."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, spans: list[Span]) -> None:
+        lines = ''.join(json.dumps(s.as_dict(), default=str) + '\n' for s in spans)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+class OTLPExporter:
+    """Send spans to an OTLP/HTTP collector using the JSON encoding."""
+
+    KINDS = {'internal': 1, 'server': 2, 'client': 3, 'consumer': 5}
+
+    def __init__(self, endpoint, service_name, timeout=2):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def _span(self, s: Span) -> dict:
+        data = {
+            'traceId': s.trace_id,
+            'spanId': s.span_id,
+            'name': s.name,
+            'kind': self.KINDS.get(s.kind, 1),
+            'startTimeUnixNano': str(s.start_ns),
+            'endTimeUnixNano': str(s.end_ns),
+            'attributes': [{'key': k, 'value': {'stringValue': str(v)}} for k, v in s.attributes.items()],
+            'status': {'code': 2, 'message': s.error} if s.error else {'code': 1},
+        }
+        if s.parent_id:
+            data['parentSpanId'] = s.parent_id
+        return data
+
+    def payload(self, spans: list[Span]) -> dict:
+        return {'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': self.service_name}}]},
+            'scopeSpans': [{'scope': {'name': 'apps.core.tracing'}, 'spans': [self._span(s) for s in spans]}],
+        }]}
+
+    def export(self, spans: list[Span]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self.payload(spans)).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def _timestamp(ns: int) -> datetime:
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc)
+
+
+class SentryExporter:
+    """Replay finished traces as Sentry transactions."""
+
+    def export(self, spans: list[Span]) -> None:
+        import sentry_sdk
+
+        children = {}
+        for s in spans:
+            children.setdefault(s.parent_id, []).append(s)
+        local_ids = {s.span_id for s in spans}
+
+        for root in spans:
+            if root.parent_id in local_ids:
+                continue
+            transaction = sentry_sdk.start_transaction(
+                name=root.name, op=root.kind, trace_id=root.trace_id, span_id=root.span_id,
+                parent_span_id=root.parent_id, sampled=True, start_timestamp=_timestamp(root.start_ns),
+            )
+            self._add_children(transaction, root, children)
+            self._finish(transaction, root)
+
+    def _add_children(self, sentry_span, span, children):
+        for child in children.get(span.span_id, []):
+            sentry_child = sentry_span.start_child(
+                op=child.name, description=child.attributes.get('db.statement'),
+                span_id=child.span_id, start_timestamp=_timestamp(child.start_ns),
+            )
+            self._add_children(sentry_child, child, children)
+            self._finish(sentry_child, child)
+
+    def _finish(self, sentry_span, span):
+        for key, value in span.attributes.items():
+            sentry_span.set_data(key, value)
+        sentry_span.set_status('internal_error' if span.error else 'ok')
+        sentry_span.finish(end_timestamp=_timestamp(span.end_ns))
+
+
+def get_exporters() -> list:
+    exporters = []
+    for name in getattr(settings, 'TRACING_EXPORTERS', []):
+        if name == 'file':
+            exporters.append(FileExporter(settings.TRACING_FILE_PATH))
+        elif name == 'otlp':
+            exporters.append(OTLPExporter(settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME))
+        elif name == 'sentry':
+            exporters.append(SentryExporter())
+        else:
+            logger.warning("Unknown tracing exporter: %s", name)
+    return exporters
+
+
+class TraceProcessor(BackgroundWorker):
+    """Queue finished traces and export them from a background thread."""
+
+    thread_name = 'trace-exporter'
+    max_queued = MAX_QUEUED_TRACES
+
+    def process(self, traces: list[list[Span]]) -> None:
+        spans = [s for trace in traces for s in trace]
+        # Taken even without spans, so flush() waits for an export in progress
+        with self.lock:
+            if not spans:
+                return
+            for exporter in get_exporters():
+                try:
+                    exporter.export(spans)
+                except Exception as e:
+                    logger.warning("Trace export failed: exporter=%s, error=%s", type(exporter).__name__, e)
+
+
+_processor = TraceProcessor()
+flush = _processor.flush
+atexit.register(flush)
@@ -36,4 +36,28 @@ def validate_swiss_postal_code(value):
         raise ValidationError(
             _('Swiss postal code must be exactly 4 digits'),
             code='invalid'
-        )
\ No newline at end of file
+        )
+
+
+def validate_profile_picture(value):
+    """
+    Validate profile picture upload size, format and dimensions.
+    Only the image header is inspected, pixel data is not decoded.
+
+    Files already in storage were validated when uploaded and are skipped,
+    so full_clean() does not read them back (or fail when they are gone).
+    """
+    from django.conf import settings
+
+    from apps.core.images import validate_image_upload
+
+    if getattr(value, '_committed', False):
+        return
+    try:
+        validate_image_upload(
+            value,
+            max_bytes=getattr(settings, 'PROFILE_PICTURE_MAX_UPLOAD_SIZE', 5 * 1024 * 1024),
+            max_pixels=getattr(settings, 'PROFILE_PICTURE_MAX_PIXELS', 40_000_000),
+        )
+    except OSError:
+        raise ValidationError(_('Upload a valid image.'), code='invalid_image')
@@ -1,10 +1,14 @@
 """
-Core views - includes legal document views.
+Core views - includes legal document and metrics views.
 """
 
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
 from django.views import View
 
+from apps.core.metrics import render_metrics
 from apps.core.models import LegalDocument
 
 
@@ -40,3 +44,23 @@ class PrivacyPolicyView(View):
             'document': document,
             'show_back_to_app': request.GET.get('app') == '1',
         })
+
+
+class MetricsView(View):
+    """
+    Prometheus metrics in the text exposition format.
+
+    When METRICS_AUTH_TOKEN is set, scrapers must send it as a bearer token.
+    Without a token the endpoint is public, unless METRICS_REQUIRE_TOKEN is
+    set (production), in which case it is not served at all.
+    """
+
+    def get(self, request):
+        token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+        if not token and getattr(settings, 'METRICS_REQUIRE_TOKEN', False):
+            raise Http404
+        if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse(status=401)
+
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,8 @@
+# Celery is a production-only dependency; load the app when it is installed
+# so that @shared_task binds to it.
+try:
+    from .celery import app as celery_app
+except ImportError:
+    celery_app = None
+
+__all__ = ('celery_app',)
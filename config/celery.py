@@ -0,0 +1,13 @@
+"""
+Celery application for Altea.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+app = Celery('altea')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration.
+
+Usage:
+    PROMETHEUS_MULTIPROC_DIR=/tmp/altea-metrics gunicorn -c config/gunicorn.py config.wsgi -w 4
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker writes its metrics to that
+directory and /metrics reports the sum over all workers. The directory is
+emptied when the server starts, and files of dead workers are cleaned up.
+"""
+
+import os
+import shutil
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
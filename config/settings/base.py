@@ -52,11 +52,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.TracingMiddleware',
+    'apps.core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.QueryCountMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    # After SessionMiddleware (reads the session's user), before anything
+    # that reads the database, so read-your-writes pinning covers it
+    'apps.core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',
+    'apps.core.middleware.ServerTimingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -91,9 +99,89 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD', default='dev_password'),
         'HOST': env('DB_HOST', default='localhost'),
         'PORT': env('DB_PORT', default='15432'),
+        # Persistent connections; overridden per environment (see production.py)
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=0),
+        'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=False),
     }
 }
 
+# Read replicas (see apps.core.db.routers): DB_REPLICA_HOSTS=host[:port],...
+# Replicas share the primary's name and credentials.
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(env.list('DB_REPLICA_HOSTS', default=[]), start=1):
+    _host, _, _port = _host.partition(':')
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'PORT': _port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{_index}')
+
+# Dedicated database for high-churn auth tokens (OTP, password reset and
+# email verification), keeping their WAL, vacuum and cache churn away from
+# the user tables. Disabled unless DB_AUTH_TOKENS_NAME is set; create the
+# tables with `manage.py setup_auth_token_database`.
+AUTH_TOKEN_MODELS = [
+    'accounts.otptoken',
+    'accounts.passwordresettoken',
+    'accounts.emailverificationtoken',
+]
+DATABASE_DEDICATED_MODELS = {}
+if env('DB_AUTH_TOKENS_NAME', default=''):
+    DATABASES['auth_tokens'] = {
+        **DATABASES['default'],
+        'NAME': env('DB_AUTH_TOKENS_NAME'),
+        'HOST': env('DB_AUTH_TOKENS_HOST', default=DATABASES['default']['HOST']),
+        'PORT': env('DB_AUTH_TOKENS_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_DEDICATED_MODELS = {label: 'auth_tokens' for label in AUTH_TOKEN_MODELS}
+
+DATABASE_ROUTERS = [
+    'apps.core.db.routers.DedicatedDatabaseRouter',
+    'apps.core.db.routers.ReplicaRouter',
+]
+DATABASE_REPLICA_MAX_LAG = env.int('DB_REPLICA_MAX_LAG', default=5)  # seconds; lagging replicas are skipped
+DATABASE_PRIMARY_PIN_SECONDS = env.int('DB_PRIMARY_PIN_SECONDS', default=10)  # read-your-writes window
+# Auth state read right after anonymous writes; never read from a replica
+DATABASE_PRIMARY_ONLY_MODELS = ['sessions.session', *AUTH_TOKEN_MODELS]
+# Per-request query counts (apps.core.middleware.QueryCountMiddleware)
+QUERY_COUNT_HEADERS = env.bool('QUERY_COUNT_HEADERS', default=False)  # X-DB-Query-* response headers
+QUERY_BUDGET_STRICT = env.bool('QUERY_BUDGET_STRICT', default=False)  # raise when a view exceeds query_budget
+# Slow query capture with EXPLAIN plans, listed in the admin (apps.core.db.slow_queries); 0 disables
+SLOW_QUERY_THRESHOLD_MS = env.float('SLOW_QUERY_THRESHOLD_MS', default=0)
+SLOW_QUERY_BUFFER_SIZE = env.int('SLOW_QUERY_BUFFER_SIZE', default=500)  # newest captures kept
+# Admin changelists on large tables count from planner estimates at or above this (apps.core.db.counts)
+ADMIN_EXACT_COUNT_THRESHOLD = env.int('ADMIN_EXACT_COUNT_THRESHOLD', default=10_000)
+# Cached users per country for the admin country filter (apps.accounts.facets); recounted after this many seconds
+COUNTRY_COUNTS_REFRESH_SECONDS = env.int('COUNTRY_COUNTS_REFRESH_SECONDS', default=3600)
+
+# Prometheus /metrics (apps.core.metrics); scrapers send this as a bearer token when set.
+# Multiple workers: set PROMETHEUS_MULTIPROC_DIR in the environment (see config/gunicorn.py).
+METRICS_AUTH_TOKEN = env('METRICS_AUTH_TOKEN', default='')
+# When set, /metrics returns 404 unless METRICS_AUTH_TOKEN is configured (on in production)
+METRICS_REQUIRE_TOKEN = env.bool('METRICS_REQUIRE_TOKEN', default=False)
+
+# Tracing (apps.core.tracing): spans for requests, services, queries, cache, email and Celery tasks
+TRACING_ENABLED = env.bool('TRACING_ENABLED', default=False)
+TRACING_SAMPLE_RATE = env.float('TRACING_SAMPLE_RATE', default=0.1)  # fraction of new traces recorded
+TRACING_EXPORTERS = env.list('TRACING_EXPORTERS', default=['file'])  # file, otlp, sentry
+TRACING_FILE_PATH = env('TRACING_FILE_PATH', default=str(BASE_DIR / 'logs' / 'traces.jsonl'))
+TRACING_OTLP_ENDPOINT = env('TRACING_OTLP_ENDPOINT', default='http://localhost:4318/v1/traces')
+TRACING_SERVICE_NAME = env('TRACING_SERVICE_NAME', default='altea')
+
+# Server-Timing header for staff sessions and signed debug requests (apps.core.server_timing).
+# Off by default: it wraps cache, email, hashers and renderers process-wide
+SERVER_TIMING_ENABLED = env.bool('SERVER_TIMING_ENABLED', default=False)
+SERVER_TIMING_TOKEN_MAX_AGE = env.int('SERVER_TIMING_TOKEN_MAX_AGE', default=60 * 60 * 24)  # seconds
+
+# On-demand request profiles for the same requesters (X-Profile: 1), see apps.core.profiling
+PROFILING_ENABLED = env.bool('PROFILING_ENABLED', default=True)
+PROFILING_DIR = env('PROFILING_DIR', default=str(BASE_DIR / 'logs' / 'profiles'))
+PROFILING_MAX_BYTES = env.int('PROFILING_MAX_BYTES', default=50 * 1024 * 1024)  # oldest profiles deleted beyond this
+PROFILING_INTERVAL_MS = env.float('PROFILING_INTERVAL_MS', default=1.0)
+
 # Cache Configuration
 CACHES = {
     'default': {
@@ -128,6 +216,19 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Profile picture uploads
+PROFILE_PICTURE_MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5 MB
+PROFILE_PICTURE_MAX_PIXELS = 40_000_000
+# Rendition name -> bounding box edge in pixels (WebP, metadata stripped)
+PROFILE_PICTURE_RENDITIONS = {
+    'small': 64,
+    'medium': 256,
+    'large': 1024,
+}
+PROFILE_PICTURE_RENDITION_QUALITY = 82
+# Generate renditions in a Celery worker instead of after the request commits
+PROFILE_PICTURE_RENDITIONS_ASYNC = env.bool('PROFILE_PICTURE_RENDITIONS_ASYNC', default=False)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -169,19 +270,32 @@ AUTH_PASSWORD_VALIDATORS = [
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'apps.core.api.authentication.JWTAuthentication',
+        'apps.core.api.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'TEST_REQUEST_RENDERER_CLASSES': [
+        'rest_framework.renderers.MultiPartRenderer',
+        'apps.core.api.renderers.ORJSONRenderer',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'EXCEPTION_HANDLER': 'apps.core.api.exception_handler.custom_exception_handler',
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'apps.core.api.throttling.AnonRateThrottle',
+        'apps.core.api.throttling.UserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -216,6 +330,16 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
 
+# Precomputed OpenAPI schema (see apps.core.api.schema)
+CODE_VERSION = env('CODE_VERSION', default='')  # e.g. git SHA, set at build time
+API_SCHEMA_CACHE_DIR = env('API_SCHEMA_CACHE_DIR', default=str(BASE_DIR / 'var' / 'api_schema'))
+API_SCHEMA_MAX_AGE = 300  # Cache-Control max-age in seconds; clients revalidate with ETag
+
+# Serve the auth endpoints (OTP, forgot password, me) from async views.
+# Only enable when running under an ASGI server (uvicorn); under WSGI every
+# async view is run in its own event loop, which is slower than the sync views.
+ASYNC_AUTH_VIEWS = env.bool('ASYNC_AUTH_VIEWS', default=False)
+
 # Email Configuration
 EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = env('EMAIL_HOST', default='')
@@ -227,6 +351,27 @@ DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='Altea <noreply@altea.ch>
 
 # Email Verification Token Settings
 EMAIL_VERIFICATION_TOKEN_EXPIRY_HOURS = 24
+# Lifetime of the verification links sent by bulk user imports (OTP codes
+# keep OTP_EXPIRY_MINUTES)
+USER_IMPORT_INVITE_EXPIRY_HOURS = env.int('USER_IMPORT_INVITE_EXPIRY_HOURS', default=72)
+
+# Object storage (S3-compatible) for media and direct uploads
+AWS_STORAGE_BUCKET_NAME = env('AWS_STORAGE_BUCKET_NAME', default='')
+AWS_S3_REGION_NAME = env('AWS_S3_REGION_NAME', default='eu-central-2')
+AWS_S3_ENDPOINT_URL = env('AWS_S3_ENDPOINT_URL', default=None)  # e.g. MinIO in development
+AWS_ACCESS_KEY_ID = env('AWS_ACCESS_KEY_ID', default='')
+AWS_SECRET_ACCESS_KEY = env('AWS_SECRET_ACCESS_KEY', default='')
+AWS_DEFAULT_ACL = None
+AWS_QUERYSTRING_EXPIRE = 3600  # Presigned read URL lifetime (cached per object)
+DIRECT_UPLOAD_EXPIRY_SECONDS = 900  # Presigned upload URL lifetime
+DIRECT_UPLOAD_MAX_SIZES = {
+    'profile_picture': PROFILE_PICTURE_MAX_UPLOAD_SIZE,
+    'logo': 2 * 1024 * 1024,
+}
+
+# Celery (worker: celery -A config worker -l info)
+CELERY_BROKER_URL = env('CELERY_BROKER_URL', default=env('REDIS_URL', default='redis://localhost:6379/0'))
+CELERY_TASK_IGNORE_RESULT = True
 
 # Site URL for email verification links
 # IMPORTANT: Set this in production to your actual domain
@@ -20,6 +20,9 @@ INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+# Query count headers on every response (apps.core.middleware.QueryCountMiddleware)
+QUERY_COUNT_HEADERS = env.bool('QUERY_COUNT_HEADERS', default=True)
+
 # Email backend for development (console)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -19,11 +19,46 @@ SECURE_HSTS_SECONDS = 31536000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
 
-# Production database (will use environment variables)
-# Already configured in base.py
+# Production database (connection settings from environment variables in base.py)
+# Persistent connections: each worker thread keeps its connection for up to
+# DB_CONN_MAX_AGE seconds instead of reconnecting (TCP + TLS + auth) on every
+# request. Health checks replace connections that died while idle (e.g. after
+# a database failover). The instrumented backend records pool metrics
+# (apps.core.db.metrics).
+# Under ASGI, Django cannot reuse connections across requests: run with
+# DB_CONN_MAX_AGE=0 behind PgBouncer instead.
+DATABASES['default'].update({
+    'ENGINE': env('DB_ENGINE', default='apps.core.db.backends.postgresql'),
+    'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=0 if ASYNC_AUTH_VIEWS else 600),
+    'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+    'OPTIONS': {
+        'connect_timeout': env.int('DB_CONNECT_TIMEOUT', default=5),
+    },
+})
+for _alias in set(DATABASES) - {'default'}:
+    DATABASES[_alias].update({
+        key: DATABASES['default'][key]
+        for key in ('ENGINE', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS')
+    })
+
+# Record statements slower than this with their EXPLAIN plan
+SLOW_QUERY_THRESHOLD_MS = env.float('SLOW_QUERY_THRESHOLD_MS', default=200)
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # Static files (will be served by Nginx/Whitenoise)
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+    },
+}
 
-# Static files (will be served by Nginx/Whitenoise)
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+# Media on object storage when a bucket is configured
+if AWS_STORAGE_BUCKET_NAME:
+    STORAGES['default'] = {
+        'BACKEND': 'apps.core.storage_backends.CachedPresignedS3Storage',
+    }
 
 # Email (configure for production)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -33,22 +68,64 @@ EMAIL_USE_TLS = env('EMAIL_USE_TLS', default=True)
 EMAIL_HOST_USER = env('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 
-# Logging
+# Profile picture renditions are produced by Celery workers
+PROFILE_PICTURE_RENDITIONS_ASYNC = env.bool('PROFILE_PICTURE_RENDITIONS_ASYNC', default=True)
+
+# Logging: JSON lines written by a listener thread (apps.core.log), so
+# request threads only enqueue records. LOG_SAMPLE_RATES keeps a fraction of
+# INFO records from busy loggers, e.g. "apps.accounts.services=0.1;apps.core=0.5".
+LOG_LEVEL = env('LOG_LEVEL', default='INFO')
+LOG_SAMPLE_RATES = env.dict('LOG_SAMPLE_RATES', cast={'value': float}, default={})
+LOG_QUEUE_SIZE = env.int('LOG_QUEUE_SIZE', default=10000)  # records dropped beyond this backlog
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'apps.core.log.JSONFormatter',
+        },
+    },
+    'filters': {
+        'sampling': {
+            '()': 'apps.core.log.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
+    },
     'handlers': {
         'file': {
-            'level': 'ERROR',
             'class': 'logging.FileHandler',
             'filename': BASE_DIR / 'logs' / 'django.log',
+            'formatter': 'json',
+        },
+        'queue': {
+            '()': 'apps.core.log.QueueHandler',
+            'handlers': ['file'],
+            'queue_size': LOG_QUEUE_SIZE,
+            'filters': ['sampling'],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['file'],
+            'handlers': ['queue'],
             'level': 'ERROR',
             'propagate': True,
         },
+        'apps': {
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
     },
-}
\ No newline at end of file
+}
+
+# /metrics is not served without METRICS_AUTH_TOKEN
+METRICS_REQUIRE_TOKEN = env.bool('METRICS_REQUIRE_TOKEN', default=True)
+
+# Sentry: errors, and traces exported by apps.core.tracing (TRACING_EXPORTERS=sentry)
+SENTRY_DSN = env('SENTRY_DSN', default='')
+if SENTRY_DSN:
+    import sentry_sdk
+
+    # Sentry's own transactions are dropped: apps.core.tracing samples and
+    # exports traces as transactions it marks sampled.
+    sentry_sdk.init(dsn=SENTRY_DSN, traces_sampler=lambda sampling_context: 0.0)
@@ -7,7 +7,10 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
+
+from apps.core.api.views import CachedSpectacularAPIView
+from apps.core.views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -22,9 +25,12 @@ urlpatterns = [
     path('api/v1/', include('config.urls_api')),
 
     # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/', CachedSpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+
+    # Prometheus
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
 
 # Serve media files in development